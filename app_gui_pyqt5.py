@@ -18,6 +18,7 @@ from PyQt5.QtGui import QFont, QIcon, QPixmap
 
 # Import the Nuke-inspired theme
 from python.gui_components.nuke_theme import apply_nuke_theme
+from python.mapping_utils.frame_ranges import compact_json_default
 
 # --- Start of VLC Path Configuration ---
 def get_application_path():
@@ -842,7 +843,7 @@ class CleanIncomingsApp(QMainWindow):
 
             # Connect debug/info handlers
             def show_item_data():
-                data_str = json.dumps(item_data, indent=2)
+                data_str = json.dumps(item_data, indent=2, default=compact_json_default)
                 QMessageBox.information(self, "Item Data", data_str)
             
             def copy_path():
@@ -899,7 +900,7 @@ class CleanIncomingsApp(QMainWindow):
                     print(f"[ERROR] Failed to open folder {folder_path}: {e}")
             
             def print_item():
-                print(f"[CONTEXT MENU] Item data: {json.dumps(item_data, indent=2)}")
+                print(f"[CONTEXT MENU] Item data: {json.dumps(item_data, indent=2, default=compact_json_default)}")
                 if hasattr(self, 'status_label'):
                     self.status_label.setText("Item data printed to console.")
             
@@ -1137,6 +1138,8 @@ class CleanIncomingsApp(QMainWindow):
             self.settings_window.exec_()
             # After closing, clear the reference
             self.settings_window = None
+            # Patterns/profiles may have been edited: update the current proposals in place
+            self._apply_config_change_delta()
         except ImportError as e:
             QMessageBox.warning(
                 self,
@@ -1144,6 +1147,23 @@ class CleanIncomingsApp(QMainWindow):
                 f"Settings window is not available:\n{e}"
             )
 
+    def _apply_config_change_delta(self):
+        """Incrementally re-map the current proposals after patterns.json/profiles.json edits."""
+        if not self.normalizer or not hasattr(self, 'tree_manager'):
+            return
+        try:
+            delta = self.normalizer.remap_after_config_change()
+        except Exception as e:
+            self.logger.error(f"Incremental re-map failed: {e}", exc_info=True)
+            return
+        if delta is None:
+            return
+        updated_count = self.tree_manager.apply_item_delta(delta["updated"])
+        message = f"Config changed: {updated_count} of {delta['checked']} proposals updated without rescanning."
+        self.status_label.setText(message)
+        if hasattr(self, 'status_manager'):
+            self.status_manager.add_log_message(message, "INFO")
+
     def _on_settings_changed(self):
         """Handle settings changes from the settings window."""
         # Reload settings
@@ -1325,143 +1345,43 @@ class CleanIncomingsApp(QMainWindow):
         if not selected_tree_items:
             return
             
-        updated_item_ids = []
+        selected_items_data = []
         for tree_item_widget in selected_tree_items:
             item_data = tree_item_widget.data(0, Qt.UserRole)
-            if not item_data or not isinstance(item_data, dict):
-                continue
-                
-            item_id = item_data.get('id')
-            if not item_id:
-                continue
-                
-            modified_item_data = item_data.copy()
-            changed = False
-            
-            # Update direct fields and normalized_parts
-            for field, value in changes.items():
-                if modified_item_data.get(field) != value:
-                    modified_item_data[field] = value
-                    changed = True
-                    
-                if 'normalized_parts' in modified_item_data and isinstance(modified_item_data['normalized_parts'], dict):
-                    if modified_item_data['normalized_parts'].get(field) != value:
-                        modified_item_data['normalized_parts'][field] = value
-                        changed = True
-                        
-            # If changes were made, regenerate the destination path
-            if changed:
-                # Only regenerate if no custom destination_path was explicitly provided
-                if 'destination_path' not in changes:
-                    try:
-                        # Get current profile and its rules
-                        profile_name = self.selected_profile_name.get()
-                        if self.normalizer and profile_name:
-                            # Get root output directory
-                            root_output_dir = self.selected_destination_folder.get()
-                            if not root_output_dir:
-                                root_output_dir = os.path.join(os.getcwd(), "output")
-                            
-                            # Use the normalizer's path generation method if available
-                            if hasattr(self.normalizer, 'get_batch_edit_preview_path'):
-                                # Create a dict of just the changes for this method
-                                field_changes = {k: v for k, v in changes.items() if k != 'destination_path'}
-                                new_destination_path = self.normalizer.get_batch_edit_preview_path(
-                                    modified_item_data, field_changes, root_output_dir
-                                )
-                                if new_destination_path and not new_destination_path.startswith("Error"):
-                                    modified_item_data['new_destination_path'] = new_destination_path
-                                    print(f"[BATCH_EDIT] Regenerated destination path for {modified_item_data.get('filename', 'unknown')}: {new_destination_path}")
-                                else:
-                                    print(f"[BATCH_EDIT] Failed to regenerate destination path for {modified_item_data.get('filename', 'unknown')}: {new_destination_path}")
-                            else:
-                                # Fallback to direct path generation
-                                from python.mapping_utils.generate_simple_target_path import generate_simple_target_path
-                                
-                                # Get profile rules
-                                if hasattr(self.normalizer, 'current_profile_rules') and self.normalizer.current_profile_rules:
-                                    profile_rules = self.normalizer.current_profile_rules
-                                elif hasattr(self.normalizer, 'all_profiles_data'):
-                                    profile_data = self.normalizer.all_profiles_data.get(profile_name, [])
-                                    if isinstance(profile_data, list):
-                                        profile_rules = profile_data
-                                    elif isinstance(profile_data, dict) and 'rules' in profile_data:
-                                        profile_rules = profile_data['rules']
-                                    else:
-                                        profile_rules = []
-                                else:
-                                    profile_rules = []
-                                
-                                if profile_rules:
-                                    filename = modified_item_data.get('filename', 'unknown.file')
-                                    normalized_parts = modified_item_data.get('normalized_parts', {})
-                                    
-                                    # Extract values from updated normalized parts
-                                    parsed_shot = normalized_parts.get('shot')
-                                    parsed_task = normalized_parts.get('task')
-                                    parsed_asset = normalized_parts.get('asset')
-                                    parsed_stage = normalized_parts.get('stage')
-                                    parsed_version = normalized_parts.get('version')
-                                    parsed_resolution = normalized_parts.get('resolution')
-                                    
-                                    # Generate new target path
-                                    path_result = generate_simple_target_path(
-                                        root_output_dir=root_output_dir,
-                                        profile_rules=profile_rules,
-                                        filename=filename,
-                                        parsed_shot=parsed_shot,
-                                        parsed_task=parsed_task,
-                                        parsed_asset=parsed_asset,
-                                        parsed_stage=parsed_stage,
-                                        parsed_version=parsed_version,
-                                        parsed_resolution=parsed_resolution
-                                    )
-                                    
-                                    new_target_path = path_result.get("target_path")
-                                    if new_target_path:
-                                        modified_item_data['new_destination_path'] = new_target_path
-                                        print(f"[BATCH_EDIT] Regenerated destination path for {filename}: {new_target_path}")
-                                    else:
-                                        # Handle ambiguous or failed path generation
-                                        if path_result.get("ambiguous_match"):
-                                            print(f"[BATCH_EDIT] Ambiguous path match for {filename}")
-                                        else:
-                                            print(f"[BATCH_EDIT] Failed to generate path for {filename}")
-                                else:
-                                    print(f"[BATCH_EDIT] No profile rules available for path regeneration")
-                        else:
-                            print(f"[BATCH_EDIT] No normalizer or profile available for path regeneration")
-                    except Exception as e:
-                        print(f"[BATCH_EDIT] Error regenerating path for {modified_item_data.get('filename', 'unknown')}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                else:
-                    # Use custom destination_path override
-                    custom_path = changes['destination_path']
-                    filename = modified_item_data.get('filename', '')
-                    if custom_path and filename:
-                        # If custom path ends with filename, use as-is; otherwise append filename
-                        if custom_path.endswith(filename):
-                            modified_item_data['new_destination_path'] = custom_path
-                        else:
-                            modified_item_data['new_destination_path'] = os.path.join(custom_path, filename)
-                        print(f"[BATCH_EDIT] Using custom destination path for {filename}: {modified_item_data['new_destination_path']}")
-                
-                # Update the item via tree manager
-                if hasattr(self.tree_manager, 'update_item_properties_and_refresh_display'):
-                    success = self.tree_manager.update_item_properties_and_refresh_display(item_id, modified_item_data)
-                    if success:
-                        updated_item_ids.append(item_id)
-                        self.preview_tree_item_data_map[item_id] = modified_item_data
-                        
-        if updated_item_ids:
+            if item_data and isinstance(item_data, dict) and item_data.get('id'):
+                selected_items_data.append(item_data)
+        if not selected_items_data:
+            return
+
+        if not self.normalizer or not self.selected_profile_name.get():
+            print(f"[BATCH_EDIT] No normalizer or profile available for path regeneration")
+            return
+
+        root_output_dir = self.selected_destination_folder.get()
+        if not root_output_dir:
+            root_output_dir = os.path.join(os.getcwd(), "output")
+
+        # All selected items in one call: each distinct resulting tag set is resolved once
+        try:
+            change_set = self.normalizer.apply_batch_edit(selected_items_data, changes, root_output_dir)
+        except Exception as e:
+            print(f"[BATCH_EDIT] Error applying batch edit: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+
+        if change_set["unresolved"]:
+            print(f"[BATCH_EDIT] Could not determine a destination path for {len(change_set['unresolved'])} items; their paths were kept")
+
+        updated_count = self.tree_manager.apply_item_delta(change_set["updated"])
+        if updated_count:
             self.tree_manager.rebuild_preview_tree_from_current_data(preserve_selection=True)
             if hasattr(self, 'status_label'):
-                self.status_label.setText(f"Batch edit applied to {len(updated_item_ids)} items.")
-        
+                self.status_label.setText(f"Batch edit applied to {updated_count} items.")
+
         # Update UI state
         self._on_tree_selection_change()
-        print(f"[DEBUG] Batch changes applied to {len(updated_item_ids)} items")
+        print(f"[DEBUG] Batch changes applied to {updated_count} items")
 
     def _on_tree_selection_change(self):
         """Handle tree selection changes."""
@@ -1559,6 +1479,10 @@ class CleanIncomingsApp(QMainWindow):
             print(f"Error toggling image viewer: {e}")
 
 if __name__ == '__main__':
+    # Required for process-pool mapping workers in frozen (PyInstaller) builds
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     # Enable High DPI support for better display scaling
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
@@ -2,7 +2,13 @@ import json
 import os
 from typing import Dict, Any
 
-PROFILES_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'config', 'profiles.json')
+try:
+    from .mapping_utils.config_service import get_config_service
+except ImportError:
+    # Fallback for direct script execution
+    from mapping_utils.config_service import get_config_service
+
+PROFILES_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'profiles.json')
 
 class ProfileNotFoundError(Exception):
     """Custom exception for when a profile is not found."""
@@ -30,18 +36,20 @@ def load_profile_from_file(profile_name: str) -> Dict[str, Any]:
     if not os.path.exists(PROFILES_PATH):
         raise ProfilesFileNotFoundError(f"Profiles configuration file not found at: {os.path.normpath(PROFILES_PATH)}")
 
-    try:
-        with open(PROFILES_PATH, 'r') as f:
-            all_profiles = json.load(f)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Error decoding profiles.json: {e}")
-    except Exception as e:
-        # Catch other potential file reading errors
-        raise ProfilesFileNotFoundError(f"Could not read profiles.json: {e}")
-
+    # Parsed once per change by the shared config service, like the GUI adapter
+    snapshot = get_config_service(profiles_path=PROFILES_PATH).snapshot()
+    if "profiles" in snapshot.errors:
+        raise ValueError(f"Error decoding profiles.json: {snapshot.errors['profiles']}")
+    all_profiles = snapshot.profiles
 
     if profile_name in all_profiles:
         profile_config = all_profiles[profile_name]
+        if isinstance(profile_config, list):
+            # profiles.json stores each profile as its bare rules list
+            profile_config = {"name": profile_name, "rules": profile_config}
+        else:
+            # Shallow copy; the snapshot is shared and must not be modified
+            profile_config = dict(profile_config)
         # Ensure the 'name' field in the loaded profile matches, or add it if missing
         if 'name' not in profile_config or profile_config['name'] != profile_name:
             profile_config['name'] = profile_name # Ensure consistency
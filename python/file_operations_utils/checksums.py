@@ -0,0 +1,218 @@
+"""
+Checksums
+
+Fast content digests for deliveries, computed inline while a file is being
+copied (the copy engines feed every buffer they move into a hasher), plus
+a per-batch JSON manifest of the digests and a verify pass that re-hashes
+only the destination side.
+
+xxHash (xxh3_128) is used when the optional xxhash package is installed,
+otherwise hashlib.blake2b. Files copied in parallel ranges (parallel_copy)
+are hashed per range; their digest is the hash of the range digests in
+order, and the manifest records the range size so verify can recompute it
+the same way.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .transfer_engine import DEFAULT_CHUNK_SIZE, reused_buffer
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+ALGORITHM_XXH3 = "xxh3_128"
+ALGORITHM_BLAKE2B = "blake2b"
+CHECKSUM_ALGORITHMS = (ALGORITHM_XXH3, ALGORITHM_BLAKE2B)
+MANIFEST_SCHEMA = 1
+DEFAULT_VERIFY_WORKERS = 8
+
+
+def default_algorithm() -> str:
+    """xxh3_128 if xxhash is installed, otherwise blake2b."""
+    return ALGORITHM_XXH3 if xxhash is not None else ALGORITHM_BLAKE2B
+
+
+def resolve_algorithm(algorithm: Optional[str]) -> str:
+    """Algorithm name for a request: None / "auto" / True pick default_algorithm()."""
+    if algorithm in (None, True, "auto"):
+        return default_algorithm()
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ValueError(f"Unknown checksum algorithm '{algorithm}'. Expected one of: auto, {', '.join(CHECKSUM_ALGORITHMS)}")
+    if algorithm == ALGORITHM_XXH3 and xxhash is None:
+        raise ValueError("Checksum algorithm 'xxh3_128' needs the xxhash package (pip install xxhash)")
+    return algorithm
+
+
+def new_hasher(algorithm: str):
+    """A hashlib-style object (update / hexdigest) for algorithm."""
+    if algorithm == ALGORITHM_XXH3:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=32)
+
+
+def combine_range_digests(algorithm: str, digests: Iterable[str]) -> str:
+    """Digest of a file hashed in ranges: the hash of the range digests in file order."""
+    hasher = new_hasher(algorithm)
+    for digest in digests:
+        hasher.update(bytes.fromhex(digest))
+    return hasher.hexdigest()
+
+
+def hash_file(path: str, algorithm: Optional[str] = None, range_size: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Digest of path's content. With range_size, hashed the way parallel_copy hashes a file
+    copied in ranges of that size (see combine_range_digests).
+    """
+    algorithm = resolve_algorithm(algorithm)
+    hasher = new_hasher(algorithm)
+    range_digests: List[str] = []
+    in_range = 0
+    buffer = reused_buffer(chunk_size)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            # Ranges are consecutive, so one sequential read starts a new hasher every range_size bytes
+            count = f.readinto(buffer[:min(chunk_size, range_size - in_range)] if range_size else buffer)
+            if not count:
+                break
+            hasher.update(buffer[:count])
+            in_range += count
+            if range_size and in_range == range_size:
+                range_digests.append(hasher.hexdigest())
+                hasher, in_range = new_hasher(algorithm), 0
+    if not range_size:
+        return hasher.hexdigest()
+    if in_range:
+        range_digests.append(hasher.hexdigest())
+    return combine_range_digests(algorithm, range_digests)
+
+
+class ChecksumManifest:
+    """
+    Digests of one batch's copies, saved as JSON:
+    {"schema", "batch_id", "algorithm", "created_at", "verified_at",
+     "files": [{"source", "destination", "size", "source_digest", "range_size",
+                "destination_digest", "verified"}, ...]}
+    Thread-safe.
+    """
+
+    def __init__(self, path: str, batch_id: Optional[str] = None, algorithm: Optional[str] = None):
+        self.path = path
+        self.batch_id = batch_id
+        self.algorithm = resolve_algorithm(algorithm)
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.verified_at: Optional[str] = None
+        self.files: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, source: str, destination: str, size: int, digest: str, range_size: Optional[int] = None) -> None:
+        """Record a finished copy; digest is the source content hashed as it was copied."""
+        entry = {
+            "source": source,
+            "destination": destination,
+            "size": size,
+            "source_digest": digest,
+            "range_size": range_size,
+            "destination_digest": None,
+            "verified": None,
+        }
+        with self._lock:
+            self.files.append(entry)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            files = [dict(entry) for entry in self.files]
+        return {
+            "schema": MANIFEST_SCHEMA,
+            "batch_id": self.batch_id,
+            "algorithm": self.algorithm,
+            "created_at": self.created_at,
+            "verified_at": self.verified_at,
+            "files": files,
+        }
+
+    def save(self) -> bool:
+        """Write the manifest (atomically replacing the old one). Returns False (and logs) on failure."""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            return True
+        except OSError as e:
+            print(f"Could not write checksum manifest {self.path}: {e}", file=sys.stderr)
+            return False
+
+    @classmethod
+    def load(cls, path: str) -> "ChecksumManifest":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        manifest = cls(path, data.get("batch_id"), data.get("algorithm"))
+        manifest.created_at = data.get("created_at", manifest.created_at)
+        manifest.verified_at = data.get("verified_at")
+        manifest.files = list(data.get("files", []))
+        return manifest
+
+
+def verify_manifest(
+    path: str,
+    max_workers: int = DEFAULT_VERIFY_WORKERS,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Re-hash every destination in the manifest at path, in parallel, and compare with the digest
+    recorded at copy time. The destination digests and results are written back into the manifest.
+
+    Returns:
+        {"success", "algorithm", "files", "verified", "mismatched": [destination, ...],
+         "missing": [destination, ...], "seconds", "manifest"}
+    """
+    manifest = ChecksumManifest.load(path)
+    start = time.perf_counter()
+    lock = threading.Lock()
+    done = [0]
+
+    def verify(entry: Dict[str, Any]) -> None:
+        try:
+            entry["destination_digest"] = hash_file(entry["destination"], manifest.algorithm, entry.get("range_size"))
+            entry["verified"] = entry["destination_digest"] == entry["source_digest"]
+        except OSError as e:
+            entry["destination_digest"] = None
+            entry["verified"] = False
+            entry["error"] = f"{type(e).__name__}: {e}"
+        with lock:
+            done[0] += 1
+            count = done[0]
+        if progress_callback is not None:
+            progress_callback(count, len(manifest.files))
+
+    if manifest.files:
+        workers = max(1, min(max_workers, len(manifest.files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="verify") as executor:
+            list(executor.map(verify, manifest.files))
+
+    manifest.verified_at = datetime.now().isoformat(timespec="seconds")
+    manifest.save()
+    missing = [entry["destination"] for entry in manifest.files if entry.get("error")]
+    mismatched = [entry["destination"] for entry in manifest.files if not entry["verified"] and not entry.get("error")]
+    return {
+        "success": not missing and not mismatched,
+        "algorithm": manifest.algorithm,
+        "files": len(manifest.files),
+        "verified": sum(1 for entry in manifest.files if entry["verified"]),
+        "mismatched": mismatched,
+        "missing": missing,
+        "seconds": round(time.perf_counter() - start, 3),
+        "manifest": path,
+    }
@@ -0,0 +1,131 @@
+"""
+Destination Directory Plan
+
+Creates every destination directory of a batch once, up front, before any
+data moves. The plan is built from the batch's destination paths: the
+unique directories are reduced to the leaves (makedirs of a leaf creates
+its parents) and created in parallel by a small thread pool, so a 100k
+frame delivery costs one makedirs per target folder instead of one per
+file.
+
+While a plan is active (DirectoryPlan.active()), directory_ready() answers
+"does this destination directory exist?" from memory, and the per-file
+paths (create_destination_directory_if_not_exists, FileOperations' copy and
+move, the sequence transfer) skip their makedirs / access round-trips for
+it. Directories the plan could not create are not marked ready, so the
+per-file code still tries and reports the error for its own file.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+DEFAULT_MKDIR_WORKERS = 16
+
+_active_plans: List["DirectoryPlan"] = []
+_active_lock = threading.Lock()
+
+
+def _key(directory: str) -> str:
+    return os.path.normcase(os.path.abspath(directory))
+
+
+def _ancestors(key: str) -> Iterator[str]:
+    parent = os.path.dirname(key)
+    while parent and parent != key:
+        yield parent
+        key, parent = parent, os.path.dirname(parent)
+
+
+class DirectoryPlan:
+    """The destination directories of one batch and which of them are known to exist. Thread-safe."""
+
+    def __init__(self, directories: Iterable[str] = ()):
+        unique: Dict[str, str] = {}
+        for directory in directories:
+            if directory:
+                unique.setdefault(_key(directory), directory)
+        # A directory that is an ancestor of another one is created along with it
+        inner: Set[str] = set()
+        for key in unique:
+            for ancestor in _ancestors(key):
+                if ancestor in inner:
+                    break
+                inner.add(ancestor)
+        self.directories = sorted(directory for key, directory in unique.items() if key not in inner)
+        self.total_directories = len(unique)
+        self.failed: Dict[str, str] = {}
+        self._ready: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str], is_file_path: bool = True) -> "DirectoryPlan":
+        """Plan for destination file paths (their parent directories) or directory paths."""
+        return cls(os.path.dirname(path) if is_file_path else path for path in paths if path)
+
+    def _mark_ready(self, directory: str) -> None:
+        key = _key(directory)
+        with self._lock:
+            self._ready.add(key)
+            for ancestor in _ancestors(key):
+                if ancestor in self._ready:
+                    break
+                self._ready.add(ancestor)
+
+    def create(self, max_workers: int = DEFAULT_MKDIR_WORKERS,
+               cancel_check: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        makedirs every planned directory in parallel.
+
+        Returns:
+            {"directories": unique directories in the plan, "created": leaf makedirs done,
+             "failed": {directory: error}, "seconds"}
+        """
+        start = time.perf_counter()
+
+        def make(directory: str) -> None:
+            if cancel_check is not None and cancel_check():
+                return
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError as e:
+                with self._lock:
+                    self.failed[directory] = f"{type(e).__name__}: {e}"
+                return
+            self._mark_ready(directory)
+
+        if self.directories:
+            workers = max(1, min(max_workers, len(self.directories)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mkdir") as executor:
+                list(executor.map(make, self.directories))
+        return {
+            "directories": self.total_directories,
+            "created": len(self.directories) - len(self.failed),
+            "failed": dict(self.failed),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+    def is_ready(self, directory: str) -> bool:
+        return _key(directory) in self._ready
+
+    @contextmanager
+    def active(self) -> Iterator["DirectoryPlan"]:
+        """Make directory_ready() consult this plan for the duration of the block."""
+        with _active_lock:
+            _active_plans.append(self)
+        try:
+            yield self
+        finally:
+            with _active_lock:
+                _active_plans.remove(self)
+
+
+def directory_ready(directory: str) -> bool:
+    """True if an active plan created directory, i.e. per-file code can skip creating / checking it."""
+    if not _active_plans or not directory:
+        return False
+    key = _key(directory)
+    return any(key in plan._ready for plan in list(_active_plans))
@@ -6,17 +6,38 @@ import time
 import subprocess
 import sys
 from pathlib import Path
-from typing import Callable, Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .transfer_engine import copy_file, resolve_engines, TransferCancelled, ENGINE_AUTO
+from .sequence_transfer import transfer_sequence, frame_paths, DEFAULT_SEQUENCE_WORKERS
+from .io_scheduler import get_transfer_scheduler, PRIORITY_NORMAL
+from .directory_plan import directory_ready
 
 logger = logging.getLogger(__name__)
 
+# FileTransfer engine that shells out to robocopy instead of copying in-process
+ROBOCOPY_ENGINE = "robocopy"
+
+
+def default_transfer_engine() -> str:
+    """robocopy on Windows, the in-process kernel copy engine elsewhere."""
+    return ROBOCOPY_ENGINE if sys.platform == "win32" else ENGINE_AUTO
+
+
 class FileTransfer:
-    def __init__(self, src: str, dst: str, status_callback_adapter: Optional[Callable] = None, transfer_id: Optional[str] = None):
+    def __init__(self, src: str, dst: str, status_callback_adapter: Optional[Callable] = None, transfer_id: Optional[str] = None,
+                 transfer_engine: Optional[str] = None, priority: int = PRIORITY_NORMAL):
         print(f"[FILETRANSFER_DEBUG] Initializing FileTransfer: '{src}' -> '{dst}'")
         self.src = src
         self.dst = dst
         self.status_callback_adapter = status_callback_adapter
         self.transfer_id = transfer_id # For GUI to track specific transfers
+        # "robocopy", or a transfer_engine.py engine ("auto", "copy_file_range", "sendfile", "readinto")
+        self.transfer_engine = transfer_engine or default_transfer_engine()
+        if self.transfer_engine != ROBOCOPY_ENGINE:
+            resolve_engines(self.transfer_engine)  # ValueError for unknown engine names
+        self.priority = priority  # I/O scheduler priority (io_scheduler.PRIORITY_*)
+        self._ticket = None  # Scheduler slot while copying
 
         if not os.path.exists(src):
             error_msg = f"Source file not found: {src}"
@@ -65,14 +86,72 @@ class FileTransfer:
         return self._pause_event.is_set()
 
     def copy(self):
-        """Executes the file copy operation using native Windows commands for maximum speed."""
-        print(f"[FILETRANSFER_DEBUG] Starting native Windows copy operation...")
-        self.start_time = time.time()
+        """Executes the file copy with the selected engine (robocopy or the in-process kernel copy)."""
         self.completed_successfully = False
         self.error_message = None
         
-        # Use native Windows commands for maximum 10GbE performance
-        return self._native_windows_copy()
+        # Wait for a slot on the source and destination volumes (io_scheduler.py)
+        try:
+            with get_transfer_scheduler().slot(self.src, self.dst, self.priority, self.transfer_id,
+                                               self.total_size, self.is_cancelled) as ticket:
+                self._ticket = ticket
+                self.start_time = time.time()
+                if self.transfer_engine == ROBOCOPY_ENGINE:
+                    # Use native Windows commands for maximum 10GbE performance
+                    print(f"[FILETRANSFER_DEBUG] Starting native Windows copy operation...")
+                    return self._native_windows_copy()
+                return self._engine_copy()
+        except TransferCancelled:
+            print(f"[FILETRANSFER_DEBUG] Copy cancelled while queued: {self.src}")
+            return False
+        finally:
+            self._ticket = None
+
+    def _engine_copy(self):
+        """In-process copy through transfer_engine.py with byte progress, pause and cancel."""
+        def on_progress(copied_bytes, total_bytes):
+            self.transferred_bytes = copied_bytes
+            if self._ticket is not None:
+                self._ticket.update(copied_bytes)  # Bandwidth limit
+            # Pausing blocks the copying thread between engine chunks
+            while self.is_paused() and not self.is_cancelled():
+                time.sleep(0.1)
+            now = time.time()
+            if self.status_callback_adapter and now - self.last_callback_time >= self.callback_interval:
+                elapsed = now - self.start_time
+                speed_bps = copied_bytes / elapsed if elapsed > 0 else 0
+                eta = (total_bytes - copied_bytes) / speed_bps if speed_bps > 0 else float('inf')
+                self.status_callback_adapter(copied_bytes, total_bytes, speed_bps, eta, "copying", self.transfer_id)
+                self.last_callback_time = now
+                self.last_callback_bytes = copied_bytes
+
+        try:
+            if self.status_callback_adapter:
+                self.status_callback_adapter(0, self.total_size, 0, 0, "copying", self.transfer_id)
+            result = copy_file(self.src, self.dst, engine=self.transfer_engine,
+                               cancel_check=self.is_cancelled, progress_callback=on_progress,
+                               copy_metadata=True)
+        except TransferCancelled:
+            print(f"[FILETRANSFER_DEBUG] Copy cancelled, partial file removed: {self.dst}")
+            return False
+        except Exception as e:
+            self.error_message = f"{type(e).__name__}: {e}"
+            print(f"[FILETRANSFER_ERROR] Engine copy failed: {self.error_message}")
+            return False
+
+        elapsed_time = max(result["seconds"], 0.001)
+        speed_bps = result["bytes"] / elapsed_time
+        print(f"[FILETRANSFER_DEBUG] {result['engine']} copy completed in {result['seconds']:.2f}s "
+              f"({speed_bps / (1024 * 1024):.2f} MB/s)")
+        if result["bytes"] != self.total_size:
+            self.error_message = f"Size mismatch after copy: expected {self.total_size}, copied {result['bytes']}"
+            print(f"[FILETRANSFER_ERROR] {self.error_message}")
+            return False
+        self.transferred_bytes = result["bytes"]
+        self.completed_successfully = True
+        if self.status_callback_adapter:
+            self.status_callback_adapter(self.total_size, self.total_size, speed_bps, 0, "completed", self.transfer_id)
+        return True
     
     def _native_windows_copy(self):
         """Ultra-fast copy using native Windows commands (robocopy/xcopy) for maximum 10GbE performance."""
@@ -213,6 +292,9 @@ def create_destination_directory_if_not_exists(destination_path: str, is_file_pa
     if not dest_dir: # Handle cases where dirname might be empty (e.g. for files in current dir)
         return True, None
 
+    if directory_ready(dest_dir):  # Created up front by the batch's DirectoryPlan
+        return True, None
+
     print(f"[CREATE_DIR_DEBUG] Attempting to create directory: '{dest_dir}'")
     print(f"[CREATE_DIR_DEBUG] Directory exists check: {os.path.exists(dest_dir)}")
     
@@ -259,11 +341,13 @@ def create_destination_directory_if_not_exists(destination_path: str, is_file_pa
 
 def copy_item(source_path: str, destination_path: str, 
               status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
-              transfer_id: Optional[str] = None) -> Tuple[bool, str]:
+              transfer_id: Optional[str] = None,
+              transfer_engine: Optional[str] = None) -> Tuple[bool, str]:
     """
     Copies a single file from source_path to destination_path using the FileTransfer class.
     This function is intended to be run in a worker thread.
     It provides progress, speed, ETA, and supports cancellation.
+    transfer_engine selects the FileTransfer engine (default: robocopy on Windows, "auto" elsewhere).
     Returns a tuple (success: bool, message: str).
     """
     
@@ -345,7 +429,8 @@ def copy_item(source_path: str, destination_path: str,
         # For now, this function runs it to completion or error/cancel.
         file_transfer_instance = FileTransfer(source_path, destination_path, 
                                               status_callback_adapter=_ft_progress_adapter,
-                                              transfer_id=transfer_id)
+                                              transfer_id=transfer_id,
+                                              transfer_engine=transfer_engine)
         
         print(f"[COPY_ITEM_DEBUG] FileTransfer initialized, starting copy operation...")
         # This call is blocking for the current thread (the worker thread).
@@ -402,7 +487,8 @@ def copy_item(source_path: str, destination_path: str,
 
 def move_item(source_path: str, destination_path: str, 
               status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
-              transfer_id: Optional[str] = None) -> Tuple[bool, str]:
+              transfer_id: Optional[str] = None,
+              transfer_engine: Optional[str] = None) -> Tuple[bool, str]:
     """
     Moves a single file from source_path to destination_path using the fastest method available.
     - Same drive: Instant filesystem move (like Windows Explorer)
@@ -479,11 +565,12 @@ def move_item(source_path: str, destination_path: str,
     else:
         # 🐌 CROSS DRIVE = Use copy + delete (slower but necessary)
         print(f"[MOVE_ITEM_DEBUG] Cross-drive move detected. Using copy + delete...")
-        return _cross_drive_move_item(source_path, destination_path, base_name, status_callback, transfer_id, _send_status)
+        return _cross_drive_move_item(source_path, destination_path, base_name, status_callback, transfer_id, _send_status,
+                                      transfer_engine)
 
 def _cross_drive_move_item(source_path: str, destination_path: str, base_name: str,
                           status_callback: Optional[Callable], transfer_id: Optional[str],
-                          _send_status: Callable) -> Tuple[bool, str]:
+                          _send_status: Callable, transfer_engine: Optional[str] = None) -> Tuple[bool, str]:
     """
     Performs cross-drive move using copy + delete for individual files.
     """
@@ -517,7 +604,8 @@ def _cross_drive_move_item(source_path: str, destination_path: str, base_name: s
         _send_status('progress', 'progress', f'Starting copy phase for cross-drive move of {base_name}...', percent=0)
         file_transfer_instance = FileTransfer(source_path, destination_path, 
                                               status_callback_adapter=_ft_progress_adapter_for_move,
-                                              transfer_id=transfer_id)
+                                              transfer_id=transfer_id,
+                                              transfer_engine=transfer_engine)
         file_transfer_instance.copy() # This call is blocking for the current worker thread.
 
         if file_transfer_instance.is_cancelled():
@@ -575,9 +663,15 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
                        transfer_id: Optional[str] = None,
                        file_count: Optional[int] = None,
                        total_size: Optional[int] = None,
-                       overwrite_existing: bool = False) -> Tuple[bool, str]:
+                       overwrite_existing: bool = False,
+                       frames: Optional[List[Any]] = None,
+                       transfer_engine: Optional[str] = None,
+                       max_workers: Optional[int] = None,
+                       cancel_check: Optional[Callable[[], bool]] = None,
+                       pause_check: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
     """
-    Copies an entire sequence/batch of files using native Windows commands for maximum speed.
+    Copies an entire sequence/batch of files in one operation: robocopy /MT on Windows,
+    the in-process parallel sequence transfer (sequence_transfer.py) everywhere else.
     Much more efficient than copying files one by one.
     Args:
         source_dir: Source directory containing the files
@@ -588,6 +682,12 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
         file_count: Optional pre-calculated file count (avoids redundant scanning)
         total_size: Optional total size (calculated during transfer if not provided)
         overwrite_existing: If True, overwrite existing files in destination; if False, skip them (default).
+        frames: The sequence's frames from the proposal (sequence_info["files"]: paths or file nodes).
+                Used instead of globbing file_pattern in source_dir when given.
+        transfer_engine: ROBOCOPY_ENGINE or a transfer_engine name (default: default_transfer_engine())
+        max_workers: Frames copied concurrently by the in-process transfer (robocopy uses /MT:32)
+        cancel_check: In-process transfer only: returning True cancels the batch
+        pause_check: In-process transfer only: while True, no new frames are started
     Returns:
         Tuple of (success: bool, message: str)
     """
@@ -607,9 +707,15 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
     Returns:
         Tuple of (success: bool, message: str)
     """
+    if transfer_engine is None:
+        transfer_engine = default_transfer_engine()
     # Always calculate total_files and total_size_bytes if not provided
     source_files = None
-    if file_count is not None:
+    if frames is not None:
+        frames = list(frames)
+        source_files = frame_paths(frames)
+        total_files = len(source_files)
+    elif file_count is not None:
         total_files = file_count
     else:
         import glob
@@ -618,6 +724,8 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
 
     if total_size is not None:
         total_size_bytes = total_size
+    elif frames is not None and transfer_engine != ROBOCOPY_ENGINE:
+        total_size_bytes = None  # The transfer workers stat the frames as they copy them
     else:
         # If we haven't already collected source_files, do it now
         if source_files is None:
@@ -667,9 +775,13 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
         _send_status('error', 'error', final_error_msg)
         return False, final_error_msg
 
+    scheduler = get_transfer_scheduler()
+    robocopy_ticket = None
     try:
         # Use pre-calculated values if provided, otherwise scan files
-        if file_count is not None and total_size is not None:
+        if frames is not None:
+            pass  # Counted from the proposal's frame list above
+        elif file_count is not None and total_size is not None:
             total_files = file_count
             total_size_bytes = total_size
             # print(f"[SEQUENCE_COPY_DEBUG] Using pre-calculated values: {total_files} files, {total_size_bytes} bytes")
@@ -690,6 +802,15 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
             _send_status('warning', 'warning', msg)
             return True, msg  # Not an error, just nothing to copy
 
+        if transfer_engine != ROBOCOPY_ENGINE:
+            if source_files is None:
+                import glob
+                source_files = glob.glob(os.path.join(source_dir, file_pattern))
+            return _native_sequence_batch(frames if frames is not None else source_files, destination_dir,
+                                          False, total_size_bytes, overwrite_existing, transfer_engine,
+                                          max_workers, cancel_check, pause_check, _send_status,
+                                          transfer_id)
+
         _send_status('progress', 'progress', f'Starting batch copy of {total_files} files...', 
                     total_files=total_files, total_size=total_size_bytes, percent=5)
 
@@ -703,6 +824,13 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
         
         start_time = time.time()
 
+        # The robocopy run is one scheduler transfer; its /MT is held to the destination volume's cap
+        robocopy_ticket = scheduler.acquire(os.path.join(source_dir, file_pattern),
+                                            os.path.join(destination_dir, file_pattern),
+                                            batch_id=transfer_id, size=total_size_bytes,
+                                            cancel_check=cancel_check)
+        robocopy_threads = min(32, scheduler.destination_cap(destination_dir))
+
         # Construct robocopy command for batch sequence copy
         cmd = [
             "robocopy",
@@ -710,7 +838,7 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
             destination_dir,
             file_pattern,
             "/NJH", "/NJS", "/NC", "/NS", "/NP", "/NFL", "/NDL",  # Suppress headers, summary, class, size, progress, file/folder list
-            "/MT:32",  # Multi-threaded (adjust as needed)
+            f"/MT:{robocopy_threads}",  # Multi-threaded, within the scheduler's per-volume cap
             "/R:1",    # Retry once on failure
             "/W:1",    # Wait 1 second between retries
             "/Z",      # Restartable mode
@@ -838,6 +966,7 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
         
         # Wait for robocopy to complete and capture results
         stdout, stderr = process.communicate()
+        scheduler.release(robocopy_ticket)
         
         # Stop background monitoring
         stop_monitoring = True
@@ -992,152 +1121,148 @@ def copy_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
             
             return (False, error_message)
             
+    except TransferCancelled as e:
+        msg = f"Batch copy cancelled: {e}"
+        _send_status('warning', 'warning', msg, operation='batch_copy')
+        return False, msg
     except Exception as e:
         print(f"[SEQUENCE_COPY_ERROR] Batch copy failed: {e}")
         import traceback
         traceback.print_exc()
-        return _python_sequence_fallback(source_dir, destination_dir, file_pattern, status_callback, transfer_id, total_files, total_size_bytes)
-
-def _python_sequence_fallback(source_dir: str, destination_dir: str, file_pattern: str,
-                            status_callback: Optional[Callable], transfer_id: Optional[str],
-                            total_files: int, total_size_bytes: int) -> Tuple[bool, str]:
-    """Fallback to Python shutil for batch sequence copying."""
-    
-    def _send_status(type_suffix: str, status_str: str, message: str, **kwargs):
-        if status_callback:
-            data = {
-                'status': status_str,
-                'message': message,
-                'source_dir': source_dir,
-                'transfer_id': transfer_id,
-                **kwargs
-            }
-            status_callback({'type': f'sequence_operation_{type_suffix}', 'data': data})
-    
-    try:
-        print(f"[SEQUENCE_COPY_DEBUG] Using Python shutil for batch sequence fallback")
-        print(f"[SEQUENCE_COPY_DEBUG] Source dir: {source_dir}")
-        print(f"[SEQUENCE_COPY_DEBUG] Dest dir: {destination_dir}")
-        print(f"[SEQUENCE_COPY_DEBUG] Pattern: {file_pattern}")
-        
-        # Get list of source files matching pattern
-        import glob
-        source_files = glob.glob(os.path.join(source_dir, file_pattern))
-        
-        if not source_files:
-            msg = f"No files found matching pattern: {file_pattern}"
-            print(f"[SEQUENCE_COPY_WARNING] {msg}")
-            _send_status('warning', 'warning', msg)
-            return True, msg
-        
-        print(f"[SEQUENCE_COPY_DEBUG] Found {len(source_files)} files to copy")
-        
-        # Send initial status
-        _send_status('progress', 'progress', f'Starting Python batch copy of {len(source_files)} files...', 
-                    total_files=len(source_files), total_size=total_size_bytes, percent=5)
-        
-        start_time = time.time()
-        copied_count = 0
-        failed_files = []
-        
-        for i, source_file in enumerate(source_files):
-            try:
-                filename = os.path.basename(source_file)
-                destination_file = os.path.join(destination_dir, filename)
-                
-                # Use shutil.copy2 to preserve metadata
-                shutil.copy2(source_file, destination_file)
-                copied_count += 1
-                
-                # Send progress updates every 10% or every 100 files
-                if i % max(1, len(source_files) // 10) == 0 or i % 100 == 0:
-                    progress_percent = min(95, (copied_count / len(source_files)) * 100)
-                    current_time = time.time()
-                    elapsed = current_time - start_time
-                    
-                    # Calculate real-time speed
-                    if elapsed > 0.001:
-                        estimated_bytes_copied = (copied_count / len(source_files)) * total_size_bytes
-                        speed_mbps = (estimated_bytes_copied / (1024 * 1024)) / elapsed
-                        speed_gbps = speed_mbps / 1000
-                        
-                        # Calculate ETA
-                        remaining_files = len(source_files) - copied_count
-                        if copied_count > 0:
-                            files_per_second = copied_count / elapsed
-                            eta_seconds = remaining_files / files_per_second if files_per_second > 0 else 0
-                            eta_str = time.strftime("%H:%M:%S", time.gmtime(eta_seconds)) if eta_seconds < 86400 else "Long time"
-                        else:
-                            eta_str = "Calculating..."
-                    else:
-                        speed_mbps = 0
-                        speed_gbps = 0
-                        eta_str = "Calculating..."
-                    
-                    # Send progress update
-                    _send_status('progress', 'progress', 
-                               f'Python copy: {copied_count}/{len(source_files)} ({progress_percent:.1f}%)', 
-                               percent=progress_percent,
-                               files_copied=copied_count,
-                               total_files=len(source_files),
-                               speed_mbps=round(speed_mbps, 2),
-                               speed_gbps=round(speed_gbps, 3),
-                               eta_str=eta_str)
-                
-            except Exception as file_error:
-                failed_files.append((source_file, str(file_error)))
-                print(f"[PYTHON_COPY_ERROR] Failed to copy {source_file}: {file_error}")
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        # Calculate final speed
-        speed_mbps = (total_size_bytes / (1024 * 1024)) / duration if duration > 0.001 and total_size_bytes > 0 else 0
-        speed_gbps = speed_mbps / 1000
-        
-        print(f"[SEQUENCE_COPY_DEBUG] Python batch copy completed in {duration:.2f}s")
-        print(f"[SEQUENCE_COPY_DEBUG] Copied: {copied_count}, Failed: {len(failed_files)}")
-        print(f"[SEQUENCE_COPY_DEBUG] Speed: {speed_mbps:.2f} MB/s ({speed_gbps:.2f} Gbps)")
-        
-        if len(failed_files) == 0:
-            success_message = f"✅ PYTHON BATCH COPY SUCCESS! {copied_count} files at {speed_mbps:.2f} MB/s"
-            
-            _send_status('success', 'success', success_message,
-                        total_files=copied_count,
-                        files_copied=copied_count,
-                        files_skipped=0,
-                        speed_mbps=round(speed_mbps, 2),
-                        speed_gbps=round(speed_gbps, 2),
-                        percent=100,
-                        operation='python_batch_copy')
-            
-            return True, success_message
+        if robocopy_ticket is not None:
+            scheduler.release(robocopy_ticket)  # The fallback takes its own slots per frame
+        # Robocopy unavailable or crashed: finish the batch with the in-process transfer
+        if source_files is None:
+            import glob
+            source_files = glob.glob(os.path.join(source_dir, file_pattern))
+        return _native_sequence_batch(source_files, destination_dir, False, total_size_bytes,
+                                      overwrite_existing, ENGINE_AUTO, max_workers, cancel_check,
+                                      pause_check, _send_status, transfer_id)
+    finally:
+        if robocopy_ticket is not None:
+            scheduler.release(robocopy_ticket)
+
+def _native_sequence_batch(frames: List[Any], destination_dir: str, move: bool,
+                           total_size_bytes: Optional[int], overwrite_existing: bool,
+                           transfer_engine: Optional[str], max_workers: Optional[int],
+                           cancel_check: Optional[Callable[[], bool]],
+                           pause_check: Optional[Callable[[], bool]],
+                           _send_status: Callable,
+                           transfer_id: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Copies (or moves) a sequence batch in-process with transfer_sequence: a bounded thread
+    pool, one zero-copy copy_file per frame, byte-accurate progress.
+    """
+    operation = 'native_batch_move' if move else 'native_batch_copy'
+    verb = 'move' if move else 'copy'
+    verb_past = 'moved' if move else 'copied'
+    total_files = len(frames)
+
+    def on_progress(progress: Dict[str, Any]):
+        total_bytes = progress['total_bytes']
+        if total_bytes > 0:
+            percent = min(99.0, progress['bytes_done'] * 100.0 / total_bytes)
         else:
-            # Some files failed
-            error_message = f"Partial success: {copied_count}/{len(source_files)} files copied, {len(failed_files)} failed"
-            for failed_file, error in failed_files[:5]:  # Show first 5 errors
-                error_message += f"\n  - {os.path.basename(failed_file)}: {error}"
-            if len(failed_files) > 5:
-                error_message += f"\n  ... and {len(failed_files) - 5} more errors"
-            
-            _send_status('error', 'error', error_message, operation='python_batch_copy')
-            return False, error_message
-            
-    except Exception as e:
-        error_message = f"Python batch copy fallback failed: {e}"
-        print(f"[SEQUENCE_COPY_ERROR] {error_message}")
-        _send_status('error', 'error', error_message, operation='python_batch_copy')
+            percent = min(99.0, progress['files_done'] * 100.0 / max(1, progress['total_files']))
+        speed_mbps = progress['speed_mbps']
+        remaining_bytes = max(0, total_bytes - progress['bytes_done'])
+        if speed_mbps > 0 and total_bytes > 0:
+            eta_seconds = remaining_bytes / (speed_mbps * 1024 * 1024)
+            eta_str = time.strftime("%H:%M:%S", time.gmtime(eta_seconds)) if eta_seconds < 86400 else f"{eta_seconds/3600:.1f} hrs"
+        else:
+            eta_str = "Calculating..."
+        _send_status('progress', 'progress',
+                     f'Parallel {verb}: {progress["files_done"]}/{progress["total_files"]} ({percent:.1f}%)',
+                     percent=percent,
+                     files_copied=progress['files_done'],
+                     total_files=progress['total_files'],
+                     bytes_copied=progress['bytes_done'],
+                     total_size=total_bytes,
+                     current_file=progress['current_file'],
+                     speed_mbps=round(speed_mbps, 2),
+                     speed_gbps=round(speed_mbps * 8 / 1000, 3),
+                     eta_str=eta_str)
+
+    print(f"[SEQUENCE_COPY_DEBUG] In-process parallel {verb} of {total_files} frames -> {destination_dir}")
+    _send_status('progress', 'progress', f'Starting parallel {verb} of {total_files} files...',
+                 total_files=total_files, total_size=total_size_bytes or 0, percent=1)
+    try:
+        result = transfer_sequence(
+            frames, destination_dir,
+            move=move,
+            max_workers=max_workers or DEFAULT_SEQUENCE_WORKERS,
+            overwrite_existing=overwrite_existing,
+            engine=transfer_engine,
+            total_size=total_size_bytes,
+            cancel_check=cancel_check,
+            pause_check=pause_check,
+            progress_callback=on_progress,
+            batch_id=transfer_id,
+        )
+    except TransferCancelled as e:
+        msg = f"Batch {verb} cancelled: {e}"
+        _send_status('warning', 'warning', msg, operation=operation)
+        return False, msg
+    except (OSError, ValueError) as e:
+        msg = f"Parallel batch {verb} failed: {e}"
+        logger.error(msg)
+        _send_status('error', 'error', msg, operation=operation)
+        return False, msg
+
+    speed_mbps = result['speed_mbps']
+    print(f"[SEQUENCE_COPY_DEBUG] Parallel {verb}: {result['files_copied']} copied, {result['files_skipped']} skipped, "
+          f"{result['files_failed']} failed, {result['bytes']} bytes in {result['seconds']:.2f}s "
+          f"({speed_mbps:.2f} MB/s, {result['workers']} workers, {result['engine']})")
+
+    if result['failed']:
+        error_message = f"Partial success: {result['files_copied']}/{total_files} files {verb_past}, {result['files_failed']} failed"
+        for failed_file, error in result['failed'][:5]:  # Show first 5 errors
+            error_message += f"\n  - {os.path.basename(failed_file)}: {error}"
+        if len(result['failed']) > 5:
+            error_message += f"\n  ... and {len(result['failed']) - 5} more errors"
+        _send_status('error', 'error', error_message, operation=operation)
         return False, error_message
 
+    if result['files_copied'] == 0 and result['files_skipped'] > 0:
+        success_message = f"⚠️ All {result['files_skipped']} files already exist at destination - no copying needed"
+        _send_status('warning', 'warning', success_message,
+                     total_files=total_files, files_skipped=result['files_skipped'],
+                     speed_mbps=0, speed_gbps=0, percent=100, operation=operation)
+    else:
+        success_message = (f"✅ BATCH {verb.upper()} SUCCESS! {result['files_copied']} files at {speed_mbps:.2f} MB/s "
+                           f"({speed_mbps * 8 / 1000:.2f} Gbps)")
+        if result['files_skipped'] > 0:
+            success_message += f" ({result['files_skipped']} files already existed)"
+        _send_status('success', 'success', success_message,
+                     total_files=total_files,
+                     files_copied=result['files_copied'],
+                     files_skipped=result['files_skipped'],
+                     bytes_copied=result['bytes'],
+                     speed_mbps=round(speed_mbps, 2),
+                     speed_gbps=round(speed_mbps * 8 / 1000, 3),
+                     percent=100,
+                     operation=operation)
+    # Always send a final progress update with percent=100 for UI
+    _send_status('progress', 'progress', f'{verb.title()} complete: {total_files}/{total_files} (100%)',
+                 percent=100, files_copied=total_files, total_files=total_files,
+                 speed_mbps=round(speed_mbps, 2), speed_gbps=round(speed_mbps * 8 / 1000, 3), eta_str="Done")
+    return True, success_message
+
 def move_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str,
                        status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
                        transfer_id: Optional[str] = None,
                        file_count: Optional[int] = None,
-                       total_size: Optional[int] = None) -> Tuple[bool, str]:
+                       total_size: Optional[int] = None,
+                       frames: Optional[List[Any]] = None,
+                       transfer_engine: Optional[str] = None,
+                       max_workers: Optional[int] = None,
+                       cancel_check: Optional[Callable[[], bool]] = None,
+                       pause_check: Optional[Callable[[], bool]] = None) -> Tuple[bool, str]:
     """
     Moves an entire sequence/batch of files using the fastest method available.
     - Same drive: Instant filesystem move (like Windows Explorer)
-    - Cross drive: Copy + delete using robocopy
+    - Cross drive: Copy + delete using robocopy on Windows, the in-process parallel
+      sequence transfer (sequence_transfer.py) everywhere else
     
     Args:
         source_dir: Source directory containing the files
@@ -1147,10 +1272,21 @@ def move_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
         transfer_id: Optional transfer ID for tracking
         file_count: Optional pre-calculated file count (avoids redundant scanning)
         total_size: Optional total size (calculated during transfer if not provided)
+        frames: The sequence's frames from the proposal (sequence_info["files"]: paths or file nodes).
+                Used instead of globbing file_pattern in source_dir when given.
+        transfer_engine: ROBOCOPY_ENGINE or a transfer_engine name (default: default_transfer_engine())
+        max_workers: Frames moved concurrently by the in-process transfer
+        cancel_check: In-process transfer only: returning True cancels the batch
+        pause_check: In-process transfer only: while True, no new frames are started
     
     Returns:
         Tuple of (success: bool, message: str)
     """
+    if transfer_engine is None:
+        transfer_engine = default_transfer_engine()
+    if frames is not None:
+        frames = list(frames)
+        file_count = len(frames)
     # Use provided file_count or calculate if needed (but don't calculate total_size unnecessarily)
     if file_count is None:
         matching_files = list(Path(source_dir).glob(file_pattern))
@@ -1209,7 +1345,10 @@ def move_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
             # print(f"[SEQUENCE_MOVE_DEBUG] Using pre-calculated values: {total_files} files, {total_size_bytes} bytes")
             
             # For instant moves, we still need the file list, but only if same drive
-            source_files = None  # We'll get this only if needed for same-drive moves
+            source_files = frame_paths(frames) if frames is not None else None
+        elif frames is not None:
+            source_files = frame_paths(frames)
+            total_files = len(source_files)
         else:
             # print(f"[SEQUENCE_MOVE_DEBUG] Scanning files (pre-calculated values not provided)...")
             # Count files to estimate progress (fallback)
@@ -1245,6 +1384,15 @@ def move_sequence_batch(source_dir: str, destination_dir: str, file_pattern: str
             
             return _instant_filesystem_move(source_files, destination_dir, total_files, total_size_bytes, 
                                            source_dir, status_callback, transfer_id, _send_status)
+        elif transfer_engine != ROBOCOPY_ENGINE:
+            print(f"[SEQUENCE_MOVE_DEBUG] Cross-drive move detected. Using parallel copy+delete...")
+            if source_files is None:
+                import glob
+                source_files = glob.glob(os.path.join(source_dir, file_pattern))
+            return _native_sequence_batch(frames if frames is not None else source_files, destination_dir,
+                                          True, total_size if total_size else None, True, transfer_engine,
+                                          max_workers, cancel_check, pause_check, _send_status,
+                                          transfer_id)
         else:
             # 🐌 CROSS DRIVE = Use robocopy copy+delete (slower but necessary)
             print(f"[SEQUENCE_MOVE_DEBUG] Cross-drive move detected. Using robocopy copy+delete...")
@@ -1372,12 +1520,20 @@ def _robocopy_cross_drive_move(source_dir: str, destination_dir: str, file_patte
     Performs cross-drive move using robocopy (copy + delete).
     This is the slower method used when source and destination are on different drives.
     """
+    scheduler = get_transfer_scheduler()
+    robocopy_ticket = None
     try:
         # print(f"[ROBOCOPY_MOVE_DEBUG] Using robocopy with /MOV for cross-drive move...")
         
         _send_status('progress', 'progress', f'Cross-drive move: {total_files} files...', 
                     total_files=total_files, total_size=total_size_bytes, percent=5)
         
+        # The robocopy run is one scheduler transfer; its /MT is held to the destination volume's cap
+        robocopy_ticket = scheduler.acquire(os.path.join(source_dir, file_pattern),
+                                            os.path.join(destination_dir, file_pattern),
+                                            batch_id=transfer_id, size=total_size_bytes)
+        robocopy_threads = min(32, scheduler.destination_cap(destination_dir))
+
         # Robocopy command for cross-drive MOVE (with /MOV flag)
         cmd = [
             'robocopy',
@@ -1386,7 +1542,7 @@ def _robocopy_cross_drive_move(source_dir: str, destination_dir: str, file_patte
             file_pattern,
             '/MOV',         # MOVE files (delete from source after successful copy)
             '/J',           # Unbuffered I/O for maximum speed
-            '/MT:32',       # 32 threads for 10GbE
+            f'/MT:{robocopy_threads}',  # Multi-threaded, within the scheduler's per-volume cap
             '/NFL',         # No file listing (CRITICAL for speed)
             '/NDL',         # No directory listing  
             '/NP',          # No progress meter (CRITICAL for speed)
@@ -1478,6 +1634,7 @@ def _robocopy_cross_drive_move(source_dir: str, destination_dir: str, file_patte
         
         # Wait for robocopy to complete
         stdout, stderr = process.communicate()
+        scheduler.release(robocopy_ticket)
         
         # Stop background monitoring
         monitor_thread.join(timeout=2.0)
@@ -1552,4 +1709,7 @@ def _robocopy_cross_drive_move(source_dir: str, destination_dir: str, file_patte
         error_message = f"Cross-drive move failed: {e}"
         # print(f"[ROBOCOPY_MOVE_ERROR] {error_message}")
         _send_status('error', 'error', error_message, operation='cross_drive_move')
-        return (False, error_message)
\ No newline at end of file
+        return (False, error_message)
+    finally:
+        if robocopy_ticket is not None:
+            scheduler.release(robocopy_ticket)
\ No newline at end of file
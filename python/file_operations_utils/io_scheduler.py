@@ -0,0 +1,413 @@
+"""
+I/O Scheduler
+
+One process-wide TransferScheduler that every copy/move path takes a slot
+from before it touches file data (FileOperations, FileTransfer, the
+sequence transfer, robocopy batches). It enforces:
+
+- per-volume concurrency: at most source_concurrency transfers reading
+  from a volume and destination_concurrency transfers writing to one,
+  however many batches and worker pools are running;
+- bandwidth shaping: a token bucket shared by all transfers; copies
+  report their bytes as they go (TransferTicket.update) and sleep when
+  they run ahead of the limit;
+- priorities: waiting transfers are admitted in (priority, arrival)
+  order, so a high-priority batch takes the next free slot on a volume
+  ahead of a bulk batch queued earlier.
+
+A volume is the mount point (POSIX, from st_dev) or drive / UNC share
+(Windows) holding the path. snapshot() returns the live queue state for
+the GUI.
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .transfer_engine import TransferCancelled
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITIES = {"high": PRIORITY_HIGH, "normal": PRIORITY_NORMAL, "low": PRIORITY_LOW}
+
+DEFAULT_VOLUME_CONCURRENCY = 8
+_WAIT_POLL_SECONDS = 0.2  # how often a queued transfer re-checks its cancel_check
+_RATE_WINDOW_SECONDS = 5.0
+_VOLUME_CACHE_LIMIT = 4096
+
+
+def parse_priority(priority: Any) -> int:
+    """PRIORITY_* from an int or a name ("high", "normal", "low"); None means normal."""
+    if priority is None:
+        return PRIORITY_NORMAL
+    if isinstance(priority, str):
+        if priority.lower() not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'. Expected one of: {', '.join(PRIORITIES)}")
+        return PRIORITIES[priority.lower()]
+    return int(priority)
+
+
+def volume_of(path: str) -> str:
+    """
+    The volume holding path: drive or UNC share on Windows, otherwise the mount point
+    (the topmost ancestor on the same st_dev). Works for paths that don't exist yet.
+    """
+    path = os.path.abspath(path)
+    if sys.platform == "win32":
+        drive = os.path.splitdrive(path)[0]
+        return drive.upper() if drive else path
+    probe = path
+    while True:
+        try:
+            device = os.stat(probe).st_dev
+            break
+        except OSError:
+            parent = os.path.dirname(probe)
+            if parent == probe:
+                return probe
+            probe = parent
+    while True:
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            return probe
+        try:
+            if os.stat(parent).st_dev != device:
+                return probe
+        except OSError:
+            return probe
+        probe = parent
+
+
+_device_cache: Dict[str, int] = {}
+
+
+def device_of(directory: str) -> Optional[int]:
+    """
+    st_dev of directory, or of its nearest existing ancestor if it doesn't exist yet (a
+    destination folder about to be created); None if nothing on the way can be stat'ed.
+    Cached for directories that exist.
+    """
+    directory = os.path.abspath(directory)
+    device = _device_cache.get(directory)
+    if device is not None:
+        return device
+    probe = directory
+    while True:
+        try:
+            device = os.stat(probe).st_dev
+            break
+        except OSError:
+            parent = os.path.dirname(probe)
+            if parent == probe:
+                return None
+            probe = parent
+    if probe == directory:
+        if len(_device_cache) >= _VOLUME_CACHE_LIMIT:
+            _device_cache.clear()
+        _device_cache[directory] = device
+    return device
+
+
+class TokenBucket:
+    """Bandwidth limiter: consume() blocks while the byte rate is above rate bytes/sec. Thread-safe."""
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate: Optional[float], burst: Optional[float] = None) -> None:
+        """rate in bytes/sec (None or <= 0: unlimited); burst defaults to a quarter second of rate."""
+        with self._lock:
+            self.rate = rate if rate and rate > 0 else None
+            self.burst = burst or (self.rate / 4 if self.rate else 0)
+            self._tokens = self.burst
+            self._last = time.monotonic()
+
+    def consume(self, nbytes: int, cancel_check: Optional[Callable[[], bool]] = None) -> float:
+        """Take nbytes, sleeping until the bucket has paid them back. Returns the seconds slept."""
+        with self._lock:
+            if self.rate is None or nbytes <= 0:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Going into debt lets a chunk larger than the burst through, then waits it off
+            self._tokens -= nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        deadline = time.monotonic() + wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return wait
+            if cancel_check is not None and cancel_check():
+                raise TransferCancelled("Transfer cancelled while throttled")
+            time.sleep(min(remaining, _WAIT_POLL_SECONDS))
+
+
+class TransferTicket:
+    """One transfer's place in the scheduler: queued, then active until its slot is released."""
+
+    def __init__(self, scheduler: "TransferScheduler", seq: int, src: str, dst: str,
+                 src_volume: str, dst_volume: str, priority: int, batch_id: Optional[str],
+                 size: Optional[int], cancel_check: Optional[Callable[[], bool]]):
+        self.scheduler = scheduler
+        self.seq = seq
+        self.src = src
+        self.dst = dst
+        self.src_volume = src_volume
+        self.dst_volume = dst_volume
+        self.priority = priority
+        self.batch_id = batch_id
+        self.size = size
+        self.cancel_check = cancel_check
+        self.queued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.bytes_done = 0
+        self._lock = threading.Lock()
+        self._granted = threading.Event()
+
+    @property
+    def rank(self) -> Tuple[int, int]:
+        return (self.priority, self.seq)
+
+    def throttle(self, nbytes: int) -> None:
+        """Account nbytes more transferred and wait out the bandwidth limit."""
+        with self._lock:
+            self.bytes_done += nbytes
+        self.scheduler._transferred(nbytes, self.cancel_check)
+
+    def update(self, bytes_done: int, total_bytes: Optional[int] = None) -> None:
+        """Progress-callback form of throttle(): bytes_done is the running total for this transfer."""
+        with self._lock:
+            delta = bytes_done - self.bytes_done
+            if delta <= 0:
+                return
+            self.bytes_done = bytes_done
+        self.scheduler._transferred(delta, self.cancel_check)
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "src": self.src,
+            "dst": self.dst,
+            "source_volume": self.src_volume,
+            "destination_volume": self.dst_volume,
+            "priority": self.priority,
+            "batch_id": self.batch_id,
+            "size": self.size,
+            "bytes_done": self.bytes_done,
+            "waited_seconds": round((self.started_at or now) - self.queued_at, 3),
+            "running_seconds": round(now - self.started_at, 3) if self.started_at is not None else None,
+        }
+
+
+class TransferScheduler:
+    """Admission control and bandwidth shaping for all transfers of this process. Thread-safe."""
+
+    def __init__(self, source_concurrency: int = DEFAULT_VOLUME_CONCURRENCY,
+                 destination_concurrency: int = DEFAULT_VOLUME_CONCURRENCY,
+                 bandwidth_limit: Optional[float] = None,
+                 volume_limits: Optional[Dict[str, int]] = None):
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._waiting: List[TransferTicket] = []  # sorted by rank
+        self._active: Dict[int, TransferTicket] = {}
+        self._reading: Dict[str, int] = {}
+        self._writing: Dict[str, int] = {}
+        self._volume_cache: Dict[str, str] = {}
+        self._bucket = TokenBucket()
+        self._rate_samples: deque = deque()
+        self._bytes_total = 0
+        self._completed = 0
+        self.volume_limits: Dict[str, int] = {}
+        self.configure(source_concurrency, destination_concurrency, bandwidth_limit, volume_limits)
+
+    def configure(self, source_concurrency: Optional[int] = None, destination_concurrency: Optional[int] = None,
+                  bandwidth_limit: Optional[float] = None, volume_limits: Optional[Dict[str, int]] = None) -> None:
+        """
+        Change the limits; running transfers keep their slots, queued ones see the new caps at once.
+
+        Args:
+            source_concurrency: Transfers reading from one volume at a time
+            destination_concurrency: Transfers writing to one volume at a time
+            bandwidth_limit: Aggregate bytes/sec for all transfers (None or 0: unlimited)
+            volume_limits: Per-volume cap overrides {volume: n} for both directions (see volume_of)
+        """
+        with self._lock:
+            if source_concurrency is not None:
+                self.source_concurrency = max(1, int(source_concurrency))
+            if destination_concurrency is not None:
+                self.destination_concurrency = max(1, int(destination_concurrency))
+            if volume_limits is not None:
+                self.volume_limits = {volume: max(1, int(limit)) for volume, limit in volume_limits.items()}
+            self.bandwidth_limit = bandwidth_limit if bandwidth_limit and bandwidth_limit > 0 else None
+            self._bucket.set_rate(self.bandwidth_limit)
+            self._dispatch()
+
+    def volume_of(self, path: str) -> str:
+        """volume_of(path), cached per directory."""
+        directory = os.path.dirname(os.path.abspath(path))
+        volume = self._volume_cache.get(directory)
+        if volume is None:
+            volume = volume_of(directory)
+            if len(self._volume_cache) >= _VOLUME_CACHE_LIMIT:
+                self._volume_cache.clear()
+            self._volume_cache[directory] = volume
+        return volume
+
+    def _source_cap(self, volume: str) -> int:
+        return self.volume_limits.get(volume, self.source_concurrency)
+
+    def _destination_cap(self, volume: str) -> int:
+        return self.volume_limits.get(volume, self.destination_concurrency)
+
+    def _dispatch(self) -> None:
+        # Lock held. Hand free slots to queued transfers in rank order; one whose volume is full
+        # doesn't hold back those behind it on other volumes. Only the admitted waiters wake up.
+        still_waiting = []
+        for waiter in self._waiting:
+            if (self._reading.get(waiter.src_volume, 0) < self._source_cap(waiter.src_volume)
+                    and self._writing.get(waiter.dst_volume, 0) < self._destination_cap(waiter.dst_volume)):
+                self._reading[waiter.src_volume] = self._reading.get(waiter.src_volume, 0) + 1
+                self._writing[waiter.dst_volume] = self._writing.get(waiter.dst_volume, 0) + 1
+                self._active[waiter.seq] = waiter
+                waiter.started_at = time.monotonic()
+                waiter._granted.set()
+            else:
+                still_waiting.append(waiter)
+        self._waiting = still_waiting
+
+    def acquire(self, src: str, dst: str, priority: int = PRIORITY_NORMAL, batch_id: Optional[str] = None,
+                size: Optional[int] = None, cancel_check: Optional[Callable[[], bool]] = None) -> TransferTicket:
+        """
+        Queue a transfer of src to dst and block until it may start. Pair with release();
+        slot() does both.
+
+        Raises:
+            TransferCancelled: cancel_check returned True while queued
+        """
+        ticket = TransferTicket(self, next(self._seq), src, dst, self.volume_of(src), self.volume_of(dst),
+                                priority, batch_id, size, cancel_check)
+        with self._lock:
+            position = len(self._waiting)
+            while position and self._waiting[position - 1].rank > ticket.rank:
+                position -= 1
+            self._waiting.insert(position, ticket)
+            self._dispatch()
+        poll = _WAIT_POLL_SECONDS if cancel_check is not None else None
+        while not ticket._granted.wait(poll):
+            if cancel_check():
+                with self._lock:
+                    granted = ticket._granted.is_set()
+                    if not granted:
+                        self._waiting.remove(ticket)
+                if granted:
+                    self.release(ticket)  # Admitted just now; hand the slot on
+                raise TransferCancelled(f"Transfer of {src} cancelled while queued")
+        return ticket
+
+    def release(self, ticket: TransferTicket) -> None:
+        with self._lock:
+            if self._active.pop(ticket.seq, None) is None:
+                return
+            for counts, volume in ((self._reading, ticket.src_volume), (self._writing, ticket.dst_volume)):
+                counts[volume] -= 1
+                if not counts[volume]:
+                    del counts[volume]
+            self._completed += 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, src: str, dst: str, priority: int = PRIORITY_NORMAL, batch_id: Optional[str] = None,
+             size: Optional[int] = None, cancel_check: Optional[Callable[[], bool]] = None) -> Iterator[TransferTicket]:
+        """Hold a transfer slot for the duration of the block; report bytes with ticket.update / throttle."""
+        ticket = self.acquire(src, dst, priority, batch_id, size, cancel_check)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def destination_cap(self, dst: str) -> int:
+        """Concurrency cap for writes to dst's volume (e.g. to size robocopy /MT)."""
+        with self._lock:
+            return self._destination_cap(self.volume_of(dst))
+
+    def _transferred(self, nbytes: int, cancel_check: Optional[Callable[[], bool]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._bytes_total += nbytes
+            self._rate_samples.append((now, nbytes))
+            while self._rate_samples and now - self._rate_samples[0][0] > _RATE_WINDOW_SECONDS:
+                self._rate_samples.popleft()
+        self._bucket.consume(nbytes, cancel_check)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Live scheduler state as a JSON-serializable dict:
+        {"limits", "rate_bytes_per_sec", "bytes_total", "completed", "active": [...], "queued": [...],
+         "volumes": {volume: {"reading", "writing", "queued", "source_cap", "destination_cap"}}}
+        """
+        now = time.monotonic()
+        with self._lock:
+            active = sorted(self._active.values(), key=lambda ticket: ticket.rank)
+            queued = list(self._waiting)
+            volumes: Dict[str, Dict[str, int]] = {}
+            for volume in set(self._reading) | set(self._writing) | {t.src_volume for t in queued} | {t.dst_volume for t in queued}:
+                volumes[volume] = {
+                    "reading": self._reading.get(volume, 0),
+                    "writing": self._writing.get(volume, 0),
+                    "queued": sum(1 for t in queued if volume in (t.src_volume, t.dst_volume)),
+                    "source_cap": self._source_cap(volume),
+                    "destination_cap": self._destination_cap(volume),
+                }
+            window = [sample for sample in self._rate_samples if now - sample[0] <= _RATE_WINDOW_SECONDS]
+            span = now - window[0][0] if len(window) > 1 else 0.0
+            rate = sum(nbytes for _, nbytes in window) / span if span > 0 else 0.0
+            return {
+                "limits": {
+                    "source_concurrency": self.source_concurrency,
+                    "destination_concurrency": self.destination_concurrency,
+                    "bandwidth_limit": self.bandwidth_limit,
+                    "volume_limits": dict(self.volume_limits),
+                },
+                "rate_bytes_per_sec": rate,
+                "bytes_total": self._bytes_total,
+                "completed": self._completed,
+                "active": [ticket.as_dict(now) for ticket in active],
+                "queued": [ticket.as_dict(now) for ticket in queued],
+                "volumes": volumes,
+            }
+
+
+def format_scheduler_state(snapshot: Dict[str, Any]) -> str:
+    """One-paragraph rendering of snapshot() for the progress window / log."""
+    limit = snapshot["limits"]["bandwidth_limit"]
+    lines = [
+        f"Transfers: {len(snapshot['active'])} active, {len(snapshot['queued'])} queued, "
+        f"{snapshot['rate_bytes_per_sec'] / (1024 * 1024):.1f} MB/s"
+        + (f" (limit {limit / (1024 * 1024):.0f} MB/s)" if limit else "")
+    ]
+    for volume, state in sorted(snapshot["volumes"].items()):
+        lines.append(
+            f"  {volume}: read {state['reading']}/{state['source_cap']}, "
+            f"write {state['writing']}/{state['destination_cap']}, {state['queued']} queued"
+        )
+    return "\n".join(lines)
+
+
+_scheduler: Optional[TransferScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_transfer_scheduler() -> TransferScheduler:
+    """The process-wide scheduler every transfer path submits to."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = TransferScheduler()
+        return _scheduler
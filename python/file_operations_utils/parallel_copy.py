@@ -0,0 +1,326 @@
+"""
+Parallel Range Copy
+
+Copies one large file with several threads writing straight into the
+final destination. The destination is preallocated to the source size
+(posix_fallocate where available, then ftruncate), split into ranges, and
+each worker copies its range at its own offset (copy_file_range with
+offsets or pread/pwrite, see transfer_engine.copy_range) through shared
+descriptors. No per-chunk temp files, no reassembly pass: every byte is
+written once.
+
+Completion is tracked per range. Ranges that fail are retried on their
+own, up to max_retries times, without recopying the ranges that finished.
+A copy that still fails keeps its destination (only a cancelled copy
+removes it), so it can be picked up again.
+The offset below which every range is written (the verified offset) is
+reported as it advances, once dst has been fsynced up to it, and a copy
+interrupted by a crash can be resumed from it: the ranges below it are
+kept, only the rest are copied.
+
+With checksum set, each range is hashed as it is copied and the file's
+digest is the hash of the range digests in order (see checksums.py).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from .checksums import combine_range_digests, new_hasher, resolve_algorithm
+from .transfer_engine import (
+    DEFAULT_CHUNK_SIZE,
+    TransferCancelled,
+    copy_range,
+    positional_io_supported,
+    reused_buffer,
+)
+
+MIN_RANGE_SIZE = 1024 * 1024
+MAX_RANGE_SIZE = 64 * 1024 * 1024
+DEFAULT_MAX_RETRIES = 2
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+class RangeCopyError(OSError):
+    """Some ranges still failed after all retries. .ranges holds the per-range state."""
+
+    def __init__(self, message: str, ranges: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.ranges = ranges
+
+
+def default_range_size(file_size: int, max_workers: int) -> int:
+    """file_size / max_workers clamped to 1-64 MB."""
+    return max(MIN_RANGE_SIZE, min(MAX_RANGE_SIZE, file_size // max(1, max_workers)))
+
+
+def plan_ranges(file_size: int, max_workers: int, range_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Split a file into ranges: range_size bytes each, by default default_range_size().
+    Each range: {"index", "offset", "length", "done", "attempts", "error", "digest"}.
+    """
+    if range_size is None:
+        range_size = default_range_size(file_size, max_workers)
+    ranges = []
+    for index, offset in enumerate(range(0, file_size, range_size)):
+        ranges.append({
+            "index": index,
+            "offset": offset,
+            "length": min(range_size, file_size - offset),
+            "done": False,
+            "attempts": 0,
+            "error": None,
+            "digest": None,
+        })
+    return ranges
+
+
+def _preallocate(dst_fd: int, file_size: int) -> None:
+    if file_size and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(dst_fd, 0, file_size)
+        except OSError:
+            pass  # Not supported by this filesystem; ftruncate below still sizes the file
+    os.ftruncate(dst_fd, file_size)
+
+
+def _hash_source_range(src: str, offset: int, length: int, chunk_size: int, hasher: Any) -> None:
+    # A resumed range isn't copied again, but its digest still has to come from the source
+    buffer = reused_buffer(min(chunk_size, max(length, 1)))
+    with open(src, "rb", buffering=0) as f:
+        f.seek(offset)
+        remaining = length
+        while remaining:
+            count = f.readinto(buffer[:min(len(buffer), remaining)])
+            if not count:
+                raise OSError(f"short read hashing {src} at {offset + length - remaining} (source changed?)")
+            hasher.update(buffer[:count])
+            remaining -= count
+
+
+def _sync_file(dst: str, dst_fd: Optional[int]) -> None:
+    # Preallocation makes dst full-size from the start, so only a flushed range may be reported
+    if dst_fd is not None:
+        os.fsync(dst_fd)
+        return
+    fd = os.open(dst, os.O_RDWR | _O_BINARY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _copy_range_seek(src: str, dst: str, offset: int, length: int, chunk_size: int,
+                     on_chunk: Callable[[int], None], hasher: Any = None) -> int:
+    # No pread/pwrite (Windows): private descriptors, so seeking doesn't race other workers
+    buffer = reused_buffer(min(chunk_size, max(length, 1)))
+    copied = 0
+    src_fd = os.open(src, os.O_RDONLY | _O_BINARY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | _O_BINARY)
+        try:
+            os.lseek(src_fd, offset, os.SEEK_SET)
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            with open(src_fd, "rb", buffering=0, closefd=False) as fsrc:
+                while copied < length:
+                    count = fsrc.readinto(buffer[:min(len(buffer), length - copied)])
+                    if not count:
+                        break
+                    view = buffer[:count]
+                    if hasher is not None:
+                        hasher.update(view)
+                    while view:
+                        view = view[os.write(dst_fd, view):]
+                    copied += count
+                    on_chunk(copied)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    return copied
+
+
+def parallel_copy_file(
+    src: str,
+    dst: str,
+    max_workers: int = 8,
+    range_size: Optional[int] = None,
+    engine: Optional[str] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checksum: Optional[str] = None,
+    resume_offset: int = 0,
+    offset_callback: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Copy src to dst with up to max_workers threads writing their ranges into dst in place.
+
+    Args:
+        src, dst: File paths; dst's directory must exist. dst is created or resized to src's size.
+        max_workers: Worker threads
+        range_size: Bytes per range (default: see plan_ranges)
+        engine: transfer_engine engine name; "copy_file_range"/"auto" copy in the kernel,
+                anything else uses pread/pwrite
+        cancel_check: Polled after every chunk; True cancels the copy
+        progress_callback: progress_callback(bytes_done, total_bytes); bytes of a failed
+                           range attempt are taken back out before it is retried
+        max_retries: Extra attempts for each failed range
+        chunk_size: Bytes per kernel call / read inside a range
+        checksum: Hash the ranges as they are copied ("auto" or a checksums algorithm; the
+                  ranges then go through pread/pwrite instead of copy_file_range)
+        resume_offset: Verified offset of an interrupted copy of src to dst: ranges below it
+                       are kept (and only hashed, with checksum). Ignored unless dst is still
+                       src's size, i.e. the preallocated file of that copy.
+        offset_callback: offset_callback(verified_offset) whenever the offset below which every
+                         range is written advances; dst is fsynced before each call
+
+    Returns:
+        {"bytes", "ranges", "retried_ranges", "resumed_bytes", "seconds", "workers",
+         "digest" (None without checksum), "algorithm", "range_size"}
+
+    Raises:
+        TransferCancelled: Cancelled (dst has been removed)
+        RangeCopyError: Ranges still failing after max_retries (dst is kept, see .ranges)
+    """
+    file_size = os.path.getsize(src)
+    range_size = range_size or default_range_size(file_size, max_workers)
+    ranges = plan_ranges(file_size, max_workers, range_size)
+    if resume_offset:
+        try:
+            resume_offset = resume_offset if os.path.getsize(dst) == file_size else 0
+        except OSError:
+            resume_offset = 0
+    resumed = [entry for entry in ranges if entry["offset"] + entry["length"] <= resume_offset]
+    algorithm = resolve_algorithm(checksum) if checksum else None
+    workers = max(1, min(max_workers, len(ranges)))
+    positional = positional_io_supported()
+    start = time.perf_counter()
+
+    lock = threading.Lock()
+    range_bytes = [0] * len(ranges)
+    bytes_done = 0
+    cancelled = threading.Event()
+    verified_offset = 0
+
+    def is_cancelled() -> bool:
+        if not cancelled.is_set() and cancel_check is not None and cancel_check():
+            cancelled.set()
+        return cancelled.is_set()
+
+    def add_bytes(index: int, copied_in_range: int) -> None:
+        nonlocal bytes_done
+        with lock:
+            bytes_done += copied_in_range - range_bytes[index]
+            range_bytes[index] = copied_in_range
+            total = bytes_done
+        if progress_callback is not None:
+            progress_callback(total, file_size)
+
+    def run_range(entry: Dict[str, Any], src_fd: Optional[int], dst_fd: Optional[int]) -> None:
+        index = entry["index"]
+
+        def on_chunk(copied_in_range: int) -> None:
+            add_bytes(index, copied_in_range)
+            if is_cancelled():
+                raise TransferCancelled(f"Copy of {src} cancelled")
+
+        hasher = new_hasher(algorithm) if algorithm else None
+        if positional:
+            copied = copy_range(src_fd, dst_fd, entry["offset"], entry["length"], engine, on_chunk, chunk_size, hasher)
+        else:
+            copied = _copy_range_seek(src, dst, entry["offset"], entry["length"], chunk_size, on_chunk, hasher)
+        if copied != entry["length"]:
+            raise OSError(f"short copy in range {index}: {copied} of {entry['length']} bytes (source changed?)")
+        if hasher is not None:
+            entry["digest"] = hasher.hexdigest()
+
+    src_fd = dst_fd = None
+    retried = 0
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | _O_BINARY, 0o666)
+        _preallocate(dst_fd, file_size)
+        if positional:
+            src_fd = os.open(src, os.O_RDONLY | _O_BINARY)
+        else:
+            os.close(dst_fd)
+            dst_fd = None
+
+        for entry in resumed:
+            if algorithm:
+                hasher = new_hasher(algorithm)
+                _hash_source_range(src, entry["offset"], entry["length"], chunk_size, hasher)
+                entry["digest"] = hasher.hexdigest()
+            entry["done"] = True
+            add_bytes(entry["index"], entry["length"])
+            verified_offset = entry["offset"] + entry["length"]
+
+        for attempt in range(max_retries + 1):
+            pending = [entry for entry in ranges if not entry["done"]]
+            if not pending:
+                break
+            if attempt:
+                retried += len(pending)
+            with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                futures = {executor.submit(run_range, entry, src_fd, dst_fd): entry for entry in pending}
+                for future in as_completed(futures):
+                    entry = futures[future]
+                    entry["attempts"] += 1
+                    try:
+                        future.result()
+                        entry["done"], entry["error"] = True, None
+                        advanced = verified_offset
+                        while advanced < file_size and ranges[advanced // range_size]["done"]:
+                            advanced = min(file_size, advanced + range_size)
+                        if advanced > verified_offset:
+                            verified_offset = advanced
+                            if offset_callback is not None:
+                                _sync_file(dst, dst_fd)
+                                offset_callback(verified_offset)
+                    except TransferCancelled:
+                        cancelled.set()
+                    except Exception as e:
+                        entry["error"] = f"{type(e).__name__}: {e}"
+                        add_bytes(entry["index"], 0)  # Its partial bytes will be copied again
+            if cancelled.is_set():
+                raise TransferCancelled(f"Copy of {src} cancelled after {bytes_done} of {file_size} bytes")
+
+        failed = [entry for entry in ranges if not entry["done"]]
+        if failed:
+            raise RangeCopyError(
+                f"{len(failed)} of {len(ranges)} ranges of {src} failed after {max_retries + 1} attempts: "
+                + "; ".join(f"range {entry['index']} @{entry['offset']}: {entry['error']}" for entry in failed[:5]),
+                ranges,
+            )
+    except TransferCancelled:
+        # A failed copy keeps dst: its finished ranges (and journaled verified offset)
+        # let a retry or resume_batch continue instead of starting over
+        for fd in (src_fd, dst_fd):
+            if fd is not None:
+                os.close(fd)
+        src_fd = dst_fd = None
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+    finally:
+        for fd in (src_fd, dst_fd):
+            if fd is not None:
+                os.close(fd)
+
+    return {
+        "bytes": bytes_done,
+        "ranges": len(ranges),
+        "retried_ranges": retried,
+        "resumed_bytes": sum(entry["length"] for entry in resumed),
+        "seconds": time.perf_counter() - start,
+        "workers": workers,
+        "digest": combine_range_digests(algorithm, (entry["digest"] for entry in ranges)) if algorithm else None,
+        "algorithm": algorithm,
+        "range_size": range_size,
+    }
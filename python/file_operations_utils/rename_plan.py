@@ -0,0 +1,102 @@
+"""
+Rename Plan
+
+Same-volume detection for a batch of moves. A move within one filesystem
+is a rename: no data moves, it costs one metadata operation. Rather than
+trying os.rename on every file and falling back on EXDEV, a batch
+compares st_dev once per (source folder, destination folder) pair and
+splits its files into a rename group and a cross-device group
+(split_by_device). The rename group goes through rename_files, a tight
+parallel loop of bare os.rename calls with no existence probes and no
+per-file logging; the cross-device group is copied and deleted through
+the transfer engine.
+
+A rename that still fails (a bind mount sharing st_dev across
+filesystems, a Windows destination that already exists, a permission
+problem) is handed back to the caller, which runs it through its regular
+per-file move path.
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .io_scheduler import device_of
+
+DEFAULT_RENAME_WORKERS = 16
+RENAME_CHUNK = 64  # renames a worker claims at a time; cancellation is checked between chunks
+
+
+def split_by_device(tasks: Sequence[Sequence[Any]]) -> Tuple[List[Any], List[Any]]:
+    """
+    Split move tasks (src, dst, ...) into (same_volume, cross_device). st_dev is compared once
+    per (source folder, destination folder) pair; destination folders should exist already
+    (a DirectoryPlan), otherwise their nearest existing ancestor is compared.
+    """
+    same_pairs: Dict[Tuple[str, str], bool] = {}
+    same_volume, cross_device = [], []
+    for task in tasks:
+        pair = (os.path.dirname(task[0]), os.path.dirname(task[1]))
+        same = same_pairs.get(pair)
+        if same is None:
+            src_device = device_of(pair[0])
+            same = same_pairs[pair] = src_device is not None and src_device == device_of(pair[1])
+        (same_volume if same else cross_device).append(task)
+    return same_volume, cross_device
+
+
+def rename_files(
+    pairs: Sequence[Tuple[str, str]],
+    max_workers: int = DEFAULT_RENAME_WORKERS,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    on_renamed: Optional[Callable[[int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    os.rename every (src, dst) pair, max_workers threads each claiming RENAME_CHUNK pairs at a time.
+
+    Args:
+        pairs: (src, dst) paths on the same volume; destination folders must exist
+        max_workers: Rename threads (renames on network shares are latency-bound)
+        cancel_check: Polled between chunks; True stops the loop (unclaimed pairs are left alone)
+        on_renamed: on_renamed(index) after pairs[index] was renamed; runs on a worker thread
+
+    Returns:
+        {"renamed": count, "failed": {index: OSError}, "cancelled", "seconds"}
+    """
+    start = time.perf_counter()
+    next_chunk = itertools.count(0, RENAME_CHUNK).__next__
+    cancelled = [False]
+
+    def worker() -> Tuple[int, Dict[int, OSError]]:
+        rename = os.rename
+        renamed, failed = 0, {}
+        while True:
+            first = next_chunk()
+            if first >= len(pairs):
+                break
+            if cancel_check is not None and cancel_check():
+                cancelled[0] = True
+                break
+            for index in range(first, min(first + RENAME_CHUNK, len(pairs))):
+                src, dst = pairs[index]
+                try:
+                    rename(src, dst)
+                except OSError as e:
+                    failed[index] = e
+                    continue
+                renamed += 1
+                if on_renamed is not None:
+                    on_renamed(index)
+        return renamed, failed
+
+    renamed, failed = 0, {}
+    if pairs:
+        workers = max(1, min(max_workers, -(-len(pairs) // RENAME_CHUNK)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rename") as executor:
+            for future in [executor.submit(worker) for _ in range(workers)]:
+                worker_renamed, worker_failed = future.result()
+                renamed += worker_renamed
+                failed.update(worker_failed)
+    return {"renamed": renamed, "failed": failed, "cancelled": cancelled[0], "seconds": time.perf_counter() - start}
@@ -0,0 +1,262 @@
+"""
+Sequence Transfer
+
+Cross-platform, in-process copy/move of a whole image sequence: the
+counterpart of robocopy /MT for copy_sequence_batch and
+move_sequence_batch. The frame list comes from the proposal (no re-glob of
+the source directory), the destination directory is created once, and a
+bounded pool of worker threads copies one frame at a time with
+transfer_engine.copy_file (copy_file_range / sendfile / readinto). Each
+frame takes a slot from the I/O scheduler, so the per-volume caps and the
+bandwidth limit hold across concurrent batches.
+
+Sequence frames are small and numerous, so throughput comes from keeping
+many copies in flight rather than from splitting files: workers pull
+frames from a shared iterator, so only max_workers frames are in flight
+however long the sequence is. Progress is counted in bytes as the engine
+reports each chunk, not estimated from the file count.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .checksums import new_hasher, resolve_algorithm
+from .directory_plan import directory_ready
+from .io_scheduler import PRIORITY_NORMAL, get_transfer_scheduler
+from .transfer_engine import DEFAULT_CHUNK_SIZE, TransferCancelled, copy_file, resolve_engines
+
+# Like robocopy's /MT default range: frames are small, so the pool is I/O-bound, not CPU-bound
+DEFAULT_SEQUENCE_WORKERS = 16
+MAX_SEQUENCE_WORKERS = 128
+DEFAULT_PROGRESS_INTERVAL = 0.5  # seconds between progress callbacks
+
+# A frame is a source path, or a {"path": ..., "size": ...} node from the scan tree
+Frame = Union[str, Dict[str, Any]]
+
+
+def frame_paths(frames: Iterable[Frame]) -> List[str]:
+    """Source paths of a proposal's sequence_info["files"] (path strings or file nodes with "path")."""
+    paths = []
+    for frame in frames:
+        path = frame.get("path") if isinstance(frame, dict) else frame
+        if path:
+            paths.append(path)
+    return paths
+
+
+def transfer_sequence(
+    frames: Iterable[Frame],
+    destination_dir: str,
+    move: bool = False,
+    max_workers: int = DEFAULT_SEQUENCE_WORKERS,
+    overwrite_existing: bool = False,
+    engine: Optional[str] = None,
+    total_size: Optional[int] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    pause_check: Optional[Callable[[], bool]] = None,
+    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    priority: int = PRIORITY_NORMAL,
+    batch_id: Optional[str] = None,
+    checksum: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Copy (or move: copy, then delete the source) every frame into destination_dir, keeping file names.
+
+    Args:
+        frames: Source paths or file nodes with "path" (and optionally "size")
+        destination_dir: Target directory; created once if missing
+        move: Delete each source frame after it was copied
+        max_workers: Frames copied concurrently (clamped to 1-128 and to the frame count)
+        overwrite_existing: Replace frames already at the destination; otherwise they are skipped
+        engine: transfer_engine engine name (None = fastest available)
+        total_size: Total bytes of the frames if already known (otherwise taken from the
+                    file nodes' "size", or stat'ed by the workers as they go)
+        cancel_check: Polled between frames and every chunk; True cancels the transfer
+        pause_check: While it returns True, workers wait before starting their next frame
+        progress_callback: Called at most every progress_interval seconds, and once at the end,
+                           with {"bytes_done", "total_bytes", "files_done", "files_copied",
+                           "files_skipped", "files_failed", "total_files", "current_file",
+                           "elapsed", "speed_mbps"}. Runs on a worker thread.
+        progress_interval: Seconds between progress callbacks
+        chunk_size: Bytes per kernel call / read
+        priority, batch_id: How the frames are queued in the I/O scheduler
+        checksum: Hash every frame as it is copied ("auto" or a checksums algorithm)
+
+    Returns:
+        {"files_copied", "files_skipped", "files_failed", "failed": [(path, error), ...],
+         "total_files", "bytes", "total_bytes", "seconds", "speed_mbps", "workers", "engine",
+         "algorithm", "checksums": [{"source", "destination", "size", "digest"}, ...]}
+
+    Raises:
+        TransferCancelled: Cancelled; frames already transferred stay in place, the frame
+                           being copied is removed
+    """
+    resolve_engines(engine)  # Unknown engine names fail before any work starts
+    algorithm = resolve_algorithm(checksum) if checksum else None
+    items: List[Tuple[str, Optional[int]]] = []
+    sizes_known = True
+    for frame in frames:
+        if isinstance(frame, dict):
+            path, size = frame.get("path"), frame.get("size")
+        else:
+            path, size = frame, None
+        if not path:
+            continue
+        items.append((path, size))
+        sizes_known = sizes_known and size is not None
+    total_files = len(items)
+    if total_size is None and sizes_known:
+        total_size = sum(size for _, size in items)
+
+    workers = max(1, min(max_workers or DEFAULT_SEQUENCE_WORKERS, MAX_SEQUENCE_WORKERS, total_files or 1))
+    scheduler = get_transfer_scheduler()
+    if not directory_ready(destination_dir):
+        os.makedirs(destination_dir, exist_ok=True)
+
+    lock = threading.Lock()
+    cancelled = threading.Event()
+    state = {
+        "bytes_done": 0,
+        "total_bytes": total_size or 0,
+        "files_copied": 0,
+        "files_skipped": 0,
+        "files_failed": 0,
+        "current_file": "",
+        "engine": None,
+    }
+    failed: List[Tuple[str, str]] = []
+    checksums: List[Dict[str, Any]] = []
+    next_item = iter(items).__next__
+    start = time.perf_counter()
+    last_report = [start]
+
+    def is_cancelled() -> bool:
+        if not cancelled.is_set() and cancel_check is not None and cancel_check():
+            cancelled.set()
+        return cancelled.is_set()
+
+    def report(force: bool = False) -> None:
+        if progress_callback is None:
+            return
+        now = time.perf_counter()
+        with lock:
+            if not force and now - last_report[0] < progress_interval:
+                return
+            last_report[0] = now
+            elapsed = now - start
+            files_done = state["files_copied"] + state["files_skipped"] + state["files_failed"]
+            snapshot = {
+                "bytes_done": state["bytes_done"],
+                "total_bytes": state["total_bytes"],
+                "files_done": files_done,
+                "files_copied": state["files_copied"],
+                "files_skipped": state["files_skipped"],
+                "files_failed": state["files_failed"],
+                "total_files": total_files,
+                "current_file": state["current_file"],
+                "elapsed": elapsed,
+                "speed_mbps": (state["bytes_done"] / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0,
+            }
+        progress_callback(snapshot)
+
+    def transfer_one(src: str, size: Optional[int]) -> None:
+        dst = os.path.join(destination_dir, os.path.basename(src))
+        if size is None:
+            size = os.path.getsize(src)
+            if total_size is None:
+                with lock:
+                    state["total_bytes"] += size
+        if not overwrite_existing and os.path.exists(dst):
+            with lock:
+                state["files_skipped"] += 1
+                state["total_bytes"] -= size  # Progress covers the bytes actually copied
+            return
+
+        frame_bytes = [0]
+
+        def on_chunk(copied: int, file_size: int) -> None:
+            with lock:
+                state["bytes_done"] += copied - frame_bytes[0]
+                state["current_file"] = src
+            frame_bytes[0] = copied
+            ticket.update(copied)
+            report()
+
+        try:
+            with scheduler.slot(src, dst, priority, batch_id, size, is_cancelled) as ticket:
+                result = copy_file(src, dst, engine, is_cancelled, on_chunk, chunk_size, copy_metadata=True,
+                                   hasher=new_hasher(algorithm) if algorithm else None)
+        except BaseException as e:
+            with lock:
+                state["bytes_done"] -= frame_bytes[0]
+            if not isinstance(e, TransferCancelled):
+                # Don't leave a truncated frame that a later run would skip as "already there"
+                try:
+                    if os.path.getsize(dst) != size:
+                        os.remove(dst)
+                except OSError:
+                    pass
+            raise
+        if move:
+            os.remove(src)
+        with lock:
+            state["files_copied"] += 1
+            state["bytes_done"] += result["bytes"] - frame_bytes[0]
+            state["total_bytes"] += result["bytes"] - size  # The frame changed since the scan
+            state["engine"] = state["engine"] or result["engine"]
+            if algorithm:
+                checksums.append({"source": src, "destination": dst, "size": result["bytes"], "digest": result["digest"]})
+
+    def worker() -> None:
+        while not is_cancelled():
+            while pause_check is not None and pause_check() and not is_cancelled():
+                time.sleep(0.1)
+            with lock:
+                try:
+                    src, size = next_item()
+                except StopIteration:
+                    return
+            if is_cancelled():
+                return
+            try:
+                transfer_one(src, size)
+            except TransferCancelled:
+                cancelled.set()
+                return
+            except Exception as e:
+                with lock:
+                    state["files_failed"] += 1
+                    failed.append((src, f"{type(e).__name__}: {e}"))
+            report()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seq-transfer") as executor:
+        for future in [executor.submit(worker) for _ in range(workers)]:
+            future.result()
+
+    report(force=True)
+    seconds = time.perf_counter() - start
+    if cancelled.is_set():
+        raise TransferCancelled(
+            f"Sequence transfer to {destination_dir} cancelled after "
+            f"{state['files_copied']} of {total_files} frames"
+        )
+    return {
+        "files_copied": state["files_copied"],
+        "files_skipped": state["files_skipped"],
+        "files_failed": state["files_failed"],
+        "failed": failed,
+        "total_files": total_files,
+        "bytes": state["bytes_done"],
+        "total_bytes": state["total_bytes"],
+        "seconds": seconds,
+        "speed_mbps": (state["bytes_done"] / (1024 * 1024)) / seconds if seconds > 0 else 0.0,
+        "workers": workers,
+        "engine": state["engine"],
+        "algorithm": algorithm,
+        "checksums": checksums,
+    }
@@ -0,0 +1,282 @@
+"""
+Transfer Engine
+
+Kernel-side file copies for FileOperations and FileTransfer. The bytes
+move with os.copy_file_range (in-kernel, reflink/server-side copy where the
+filesystem supports it) or os.sendfile, and fall back to large readinto()
+calls on a reused per-thread buffer where neither is available (Windows,
+macOS, or a filesystem pair that rejects them).
+
+Each call moves up to chunk_size bytes, so cancellation and progress are
+checked every few MB instead of per Python-sized chunk. A cancelled copy
+removes its partial destination and raises TransferCancelled.
+
+copy_range() copies one byte range at explicit offsets (copy_file_range
+with offsets, or pread/pwrite), so several threads can fill one
+destination file through shared descriptors (see parallel_copy.py).
+
+Both can hash the bytes as they pass (see checksums.py). The kernel
+engines never bring the data into this process, so a hashed copy always
+takes the readinto / pread path.
+"""
+
+import errno
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ENGINE_AUTO = "auto"
+ENGINE_COPY_FILE_RANGE = "copy_file_range"
+ENGINE_SENDFILE = "sendfile"
+ENGINE_READINTO = "readinto"
+TRANSFER_ENGINES = (ENGINE_AUTO, ENGINE_COPY_FILE_RANGE, ENGINE_SENDFILE, ENGINE_READINTO)
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # bytes per syscall; cancellation/progress granularity
+
+# The kernel can't do this copy for this pair of files; try the next engine
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.ENOTSUP,
+                    getattr(errno, "EOPNOTSUPP", errno.ENOTSUP), getattr(errno, "ENOTSOCK", errno.EINVAL)}
+
+_buffers = threading.local()
+
+
+class TransferCancelled(Exception):
+    """The copy was cancelled; the partial destination file has been removed."""
+
+
+class _EngineUnavailable(Exception):
+    pass
+
+
+def available_engines() -> List[str]:
+    """Engines usable on this platform, fastest first (readinto is always available)."""
+    engines = []
+    if hasattr(os, "copy_file_range"):
+        engines.append(ENGINE_COPY_FILE_RANGE)
+    if hasattr(os, "sendfile") and os.name == "posix":
+        engines.append(ENGINE_SENDFILE)
+    engines.append(ENGINE_READINTO)
+    return engines
+
+
+def resolve_engines(engine: Optional[str]) -> List[str]:
+    """
+    Engines to try, in order, for a requested engine name (None means "auto").
+    A specific engine still falls back to readinto if the kernel rejects it.
+    """
+    engine = engine or ENGINE_AUTO
+    if engine not in TRANSFER_ENGINES:
+        raise ValueError(f"Unknown transfer engine '{engine}'. Expected one of: {', '.join(TRANSFER_ENGINES)}")
+    available = available_engines()
+    if engine == ENGINE_AUTO:
+        return available
+    if engine not in available:
+        return [ENGINE_READINTO]
+    return [engine] if engine == ENGINE_READINTO else [engine, ENGINE_READINTO]
+
+
+def reused_buffer(size: int) -> memoryview:
+    """A size-byte view of this thread's copy buffer (grown on demand, reused across copies)."""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(size)
+        _buffers.buffer = buffer
+    return memoryview(buffer)[:size]
+
+
+def _copy_kernel(kernel_call, src_fd: int, dst_fd: int, file_size: int, chunk_size: int,
+                 on_chunk: Callable[[int], None]) -> int:
+    copied = 0
+    while True:
+        try:
+            count = kernel_call(src_fd, dst_fd, chunk_size)
+        except OSError as e:
+            if copied == 0 and e.errno in _FALLBACK_ERRNOS:
+                raise _EngineUnavailable(str(e)) from e
+            raise
+        if count == 0:
+            if copied == 0 and file_size > 0:
+                # Some filesystems (procfs, certain FUSE mounts) report 0 instead of failing
+                raise _EngineUnavailable("kernel copy returned no data")
+            return copied
+        copied += count
+        on_chunk(copied)
+
+
+def _copy_readinto(src_fd: int, dst_fd: int, chunk_size: int, on_chunk: Callable[[int], None],
+                   hasher: Any = None) -> int:
+    buffer = reused_buffer(chunk_size)
+    copied = 0
+    with open(src_fd, "rb", buffering=0, closefd=False) as fsrc:
+        while True:
+            count = fsrc.readinto(buffer)
+            if not count:
+                return copied
+            view = buffer[:count]
+            if hasher is not None:
+                hasher.update(view)
+            while view:
+                written = os.write(dst_fd, view)
+                view = view[written:]
+            copied += count
+            on_chunk(copied)
+
+
+def _copy_file_range_call(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dst_fd, count)
+
+
+def _sendfile_call(src_fd: int, dst_fd: int, count: int) -> int:
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def positional_io_supported() -> bool:
+    """True if ranges can be copied at explicit offsets through shared descriptors (pread/pwrite)."""
+    return hasattr(os, "pwrite") and hasattr(os, "pread")
+
+
+def copy_range(
+    src_fd: int,
+    dst_fd: int,
+    offset: int,
+    length: int,
+    engine: Optional[str] = None,
+    on_chunk: Optional[Callable[[int], None]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    hasher: Any = None,
+) -> int:
+    """
+    Copy length bytes at offset from src_fd to the same offset in dst_fd without moving either
+    descriptor's file position (safe with descriptors shared between threads). Needs
+    positional_io_supported(). on_chunk(bytes_copied_in_range) runs after every chunk and may
+    raise (e.g. TransferCancelled) to stop the copy. hasher (hashlib-style) is updated with the
+    range's bytes in order. Returns the bytes copied (less than length only if the source ended early).
+    """
+    notify = on_chunk or (lambda copied: None)
+    copied = 0
+    # sendfile can't write at an offset, so anything but copy_file_range uses pread/pwrite
+    if hasher is None and resolve_engines(engine)[0] == ENGINE_COPY_FILE_RANGE:
+        try:
+            while copied < length:
+                count = os.copy_file_range(src_fd, dst_fd, min(chunk_size, length - copied),
+                                           offset + copied, offset + copied)
+                if count == 0:
+                    if copied == 0 and length > 0:
+                        raise _EngineUnavailable("kernel copy returned no data")
+                    return copied
+                copied += count
+                notify(copied)
+            return copied
+        except _EngineUnavailable:
+            pass
+        except OSError as e:
+            if copied != 0 or e.errno not in _FALLBACK_ERRNOS:
+                raise
+
+    # pread/pwrite through the reused per-thread buffer
+    buffer = reused_buffer(min(chunk_size, max(length, 1)))
+    while copied < length:
+        want = min(len(buffer), length - copied)
+        if hasattr(os, "preadv"):
+            count = os.preadv(src_fd, [buffer[:want]], offset + copied)
+            data = buffer[:count]
+        else:
+            data = os.pread(src_fd, want, offset + copied)
+            count = len(data)
+        if count == 0:
+            return copied
+        if hasher is not None:
+            hasher.update(data)
+        written = 0
+        while written < count:
+            written += os.pwrite(dst_fd, data[written:], offset + copied + written)
+        copied += count
+        notify(copied)
+    return copied
+
+
+def copy_file(
+    src: str,
+    dst: str,
+    engine: Optional[str] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    copy_metadata: bool = False,
+    hasher: Any = None,
+) -> Dict[str, Any]:
+    """
+    Copy src to dst (created or truncated) with the fastest available engine.
+
+    Args:
+        src, dst: File paths; dst's directory must exist
+        engine: One of TRANSFER_ENGINES; None or "auto" picks the fastest available
+        cancel_check: Called every chunk_size bytes; returning True cancels the copy
+        progress_callback: progress_callback(bytes_copied, total_bytes) every chunk_size bytes.
+                           It runs on the copying thread, so blocking in it pauses the copy.
+        chunk_size: Bytes per kernel call / read
+        copy_metadata: Also copy permission bits and timestamps (like shutil.copy2)
+        hasher: hashlib-style object updated with every byte copied (forces the readinto engine)
+
+    Returns:
+        {"engine": engine used, "bytes": bytes copied, "seconds": elapsed,
+         "digest": hasher.hexdigest() or None}
+
+    Raises:
+        TransferCancelled: cancel_check returned True (dst has been removed)
+        OSError: The copy failed (dst is left as written so far)
+    """
+    engines = resolve_engines(engine)
+    if hasher is not None:
+        engines = [ENGINE_READINTO]  # The bytes have to pass through this process to be hashed
+    file_size = os.path.getsize(src)
+    start = time.perf_counter()
+
+    def on_chunk(copied: int) -> None:
+        if cancel_check is not None and cancel_check():
+            raise TransferCancelled(f"Copy of {src} cancelled after {copied} bytes")
+        if progress_callback is not None:
+            progress_callback(copied, file_size)
+
+    if cancel_check is not None and cancel_check():
+        raise TransferCancelled(f"Copy of {src} cancelled before it started")
+
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            for used_engine in engines:
+                try:
+                    if used_engine == ENGINE_COPY_FILE_RANGE:
+                        copied = _copy_kernel(_copy_file_range_call, src_fd, dst_fd, file_size, chunk_size, on_chunk)
+                    elif used_engine == ENGINE_SENDFILE:
+                        copied = _copy_kernel(_sendfile_call, src_fd, dst_fd, file_size, chunk_size, on_chunk)
+                    else:
+                        copied = _copy_readinto(src_fd, dst_fd, chunk_size, on_chunk, hasher)
+                    break
+                except _EngineUnavailable:
+                    # Nothing was written; rewind both files for the next engine
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    continue
+        finally:
+            os.close(dst_fd)
+    except TransferCancelled:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+    finally:
+        os.close(src_fd)
+
+    if copy_metadata:
+        shutil.copystat(src, dst)
+    return {
+        "engine": used_engine,
+        "bytes": copied,
+        "seconds": time.perf_counter() - start,
+        "digest": hasher.hexdigest() if hasher is not None else None,
+    }
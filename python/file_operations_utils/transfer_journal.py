@@ -0,0 +1,261 @@
+"""
+Transfer Journal
+
+Write-ahead record of a batch's file transfers in operations.db, so a batch
+that dies halfway (GUI closed, CLI killed, machine rebooted) can be resumed
+instead of restarted. Before any data moves, every file of the batch is
+written to the operations table as "planned", and the batch's options to
+progress_tracking. As the batch runs each file goes to "in_progress", then
+"done" or "failed"; a large file copied in ranges also records the offset
+below which every range has been written (its verified offset).
+
+A finished file also records how it got there (METHOD_RENAME,
+METHOD_COPY_DELETE or METHOD_COPY) and the st_dev of its source and
+destination folders. For a move batch that is the transaction log undo
+replays: undo_log() lists the moved files, newest first.
+
+State changes are buffered and written in one transaction at most
+FLUSH_INTERVAL seconds after they happen (and when the batch ends), so a
+100k frame delivery doesn't pay a database commit per frame. The journal
+only ever lags behind the files: after a crash a finished file may still
+read "in_progress" and is copied again, but no file is ever "done" before
+it is.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+STATUS_PLANNED = "planned"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_UNDONE = "undone"
+
+METHOD_RENAME = "rename"
+METHOD_COPY_DELETE = "copy_delete"
+METHOD_COPY = "copy"
+
+FLUSH_INTERVAL = 0.5  # seconds a buffered state change may wait
+FLUSH_ROWS = 1024  # ...or sooner when this many file updates are waiting
+
+# The tables operations.db ships with; created if the database is new
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS operations (
+                id TEXT PRIMARY KEY,
+                batch_id TEXT NOT NULL,
+                old_path TEXT NOT NULL,
+                new_path TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                is_sequence BOOLEAN DEFAULT FALSE,
+                sequence_info TEXT,
+                file_size INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                error_message TEXT
+            )""",
+    """CREATE TABLE IF NOT EXISTS progress_tracking (
+                batch_id TEXT PRIMARY KEY,
+                total_operations INTEGER NOT NULL,
+                completed_operations INTEGER DEFAULT 0,
+                failed_operations INTEGER DEFAULT 0,
+                total_size INTEGER DEFAULT 0,
+                processed_size INTEGER DEFAULT 0,
+                start_time TEXT NOT NULL,
+                end_time TEXT,
+                status TEXT DEFAULT 'running',
+                current_file TEXT
+            )""",
+)
+# Columns the journal adds to those tables
+_COLUMNS = {
+    "operations": {"bytes_done": "INTEGER DEFAULT 0", "method": "TEXT", "src_device": "INTEGER", "dst_device": "INTEGER"},
+    "progress_tracking": {"operation_type": "TEXT", "options": "TEXT"},
+}
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _row_id(batch_id: str, destination: str) -> str:
+    # Destinations are unique within a batch
+    return f"{batch_id}:{os.path.normpath(destination)}"
+
+
+class TransferJournal:
+    """The transfer journal in one operations.db. Thread-safe; one connection per instance."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Any, ...]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            for table, columns in _COLUMNS.items():
+                existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                for column, declaration in columns.items():
+                    if column not in existing:
+                        self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_operations_batch ON operations (batch_id)")
+
+    def begin_batch(
+        self,
+        batch_id: str,
+        operation_type: str,
+        files: Iterable[Tuple[str, str, Optional[int]]],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Journal a batch before it moves any data: its options and every (source, destination, size)
+        as "planned". Files already journaled for the batch (a resume) keep their state.
+        Returns the number of files newly planned.
+        """
+        timestamp = _now()
+        rows = [
+            (_row_id(batch_id, dst), batch_id, src, os.path.normpath(dst), operation_type, timestamp, size or 0, STATUS_PLANNED)
+            for src, dst, size in files
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO operations (id, batch_id, old_path, new_path, operation, timestamp, file_size, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            planned = self._conn.total_changes - before
+            self._conn.execute(
+                "INSERT INTO progress_tracking (batch_id, total_operations, total_size, start_time, status, operation_type, options) "
+                "VALUES (?, ?, ?, ?, 'running', ?, ?) "
+                "ON CONFLICT(batch_id) DO UPDATE SET status = 'running', end_time = NULL, "
+                "operation_type = excluded.operation_type, options = excluded.options",
+                (batch_id, len(rows), sum(row[6] for row in rows), timestamp, operation_type, json.dumps(options or {})),
+            )
+        return planned
+
+    def record(self, batch_id: str, destination: str, status: str,
+               bytes_done: Optional[int] = None, error: Optional[str] = None, method: Optional[str] = None,
+               src_device: Optional[int] = None, dst_device: Optional[int] = None) -> None:
+        """
+        Buffer a file's new state. bytes_done is its verified offset, or its size once done;
+        method and the devices are recorded when it is done.
+        """
+        with self._lock:
+            self._pending[_row_id(batch_id, destination)] = (status, bytes_done, error, _now(), method, src_device, dst_device)
+            if len(self._pending) >= FLUSH_ROWS:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        rows = [state + (row_id,) for row_id, state in self._pending.items()]
+        self._pending.clear()
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE operations SET status = ?, bytes_done = COALESCE(?, bytes_done), error_message = ?, "
+                    "timestamp = ?, method = COALESCE(?, method), src_device = COALESCE(?, src_device), "
+                    "dst_device = COALESCE(?, dst_device) WHERE id = ?",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            # A lost update only means the file is redone on resume
+            print(f"[JOURNAL] Could not write {len(rows)} updates to {self.path}: {e}", file=sys.stderr)
+
+    def finish_batch(self, batch_id: str, status: str) -> None:
+        """Flush the batch's file states and close its progress_tracking row with status."""
+        with self._lock:
+            self._flush_locked()
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE progress_tracking SET status = ?, end_time = ?, "
+                    "completed_operations = (SELECT COUNT(*) FROM operations WHERE batch_id = ? AND status = ?), "
+                    "failed_operations = (SELECT COUNT(*) FROM operations WHERE batch_id = ? AND status = ?), "
+                    "processed_size = (SELECT COALESCE(SUM(file_size), 0) FROM operations WHERE batch_id = ? AND status = ?) "
+                    "WHERE batch_id = ?",
+                    (status, _now(), batch_id, STATUS_DONE, batch_id, STATUS_FAILED, batch_id, STATUS_DONE, batch_id),
+                )
+
+    def load_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        A journaled batch, or None:
+        {"batch_id", "operation_type", "options", "status", "start_time", "end_time",
+         "files": [{"source", "destination", "size", "status", "bytes_done", "error"}, ...]}
+        """
+        self.flush()
+        with self._lock:
+            batch = self._conn.execute(
+                "SELECT operation_type, options, status, start_time, end_time FROM progress_tracking WHERE batch_id = ?",
+                (batch_id,),
+            ).fetchone()
+            if batch is None:
+                return None
+            files = self._conn.execute(
+                "SELECT old_path, new_path, file_size, status, bytes_done, error_message FROM operations "
+                "WHERE batch_id = ? ORDER BY rowid",
+                (batch_id,),
+            ).fetchall()
+        return {
+            "batch_id": batch_id,
+            "operation_type": batch[0],
+            "options": json.loads(batch[1]) if batch[1] else {},
+            "status": batch[2],
+            "start_time": batch[3],
+            "end_time": batch[4],
+            "files": [
+                {"source": src, "destination": dst, "size": size, "status": status, "bytes_done": bytes_done or 0, "error": error}
+                for src, dst, size, status, bytes_done, error in files
+            ],
+        }
+
+    def last_batch(self, operation_type: str = "move") -> Optional[str]:
+        """The most recent finished (not running, not undone) batch of operation_type, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT batch_id FROM progress_tracking WHERE operation_type = ? AND status NOT IN ('running', ?) "
+                "ORDER BY start_time DESC, rowid DESC LIMIT 1",
+                (operation_type, STATUS_UNDONE),
+            ).fetchone()
+        return row[0] if row else None
+
+    def undo_log(self, batch_id: str) -> List[Dict[str, Any]]:
+        """
+        The batch's finished files, newest first:
+        [{"source", "destination", "size", "method", "src_device", "dst_device"}, ...]
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT old_path, new_path, file_size, method, src_device, dst_device FROM operations "
+                "WHERE batch_id = ? AND status = ? ORDER BY timestamp DESC, rowid DESC",
+                (batch_id, STATUS_DONE),
+            ).fetchall()
+        return [
+            {"source": src, "destination": dst, "size": size, "method": method, "src_device": src_device, "dst_device": dst_device}
+            for src, dst, size, method, src_device, dst_device in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
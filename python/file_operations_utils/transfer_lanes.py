@@ -0,0 +1,166 @@
+"""
+Transfer Lanes
+
+Size-aware scheduling for a batch of file copies/moves. Files go to one of
+two lanes:
+
+- the small-file lane: many workers, one file each. Small files (EXR/DPX
+  frames, sidecars) are bound by per-file latency (open, create, metadata),
+  so throughput comes from keeping many in flight;
+- the large-file lane: a few workers, each copying one big file in ranges
+  (parallel_copy). A handful of chunked streams saturate the link without
+  thrashing the disks.
+
+Both lanes draw from one ByteBudget: the bytes in flight across the batch
+(a small file's size, a large file's chunk window). Whichever lane has work
+gets the spare budget, so a 200 GB ProRes doesn't hold back thousands of
+frames and a frame flood doesn't starve the big streams; each lane keeps a
+reserved share so neither can be shut out by the other.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .transfer_engine import DEFAULT_CHUNK_SIZE, TransferCancelled
+
+LANE_SMALL = "small"
+LANE_LARGE = "large"
+
+SMALL_FILE_THRESHOLD = 10 * 1024 * 1024  # below this a file is copied whole, in the small lane
+DEFAULT_SMALL_LANE_WORKERS = 16
+DEFAULT_LARGE_LANE_WORKERS = 4
+DEFAULT_BYTE_BUDGET = 512 * 1024 * 1024
+_WAIT_POLL_SECONDS = 0.2
+
+
+class ByteBudget:
+    """
+    Bytes in flight shared by the lanes. A lane may always have up to its reserve in flight;
+    beyond that it takes from the shared capacity. Thread-safe.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BYTE_BUDGET, reserve: Optional[Dict[str, int]] = None):
+        self.capacity = max(1, int(capacity))
+        # By default a quarter of the budget is kept for each lane
+        self.reserve = dict(reserve) if reserve is not None else {LANE_SMALL: self.capacity // 4, LANE_LARGE: self.capacity // 4}
+        self._cond = threading.Condition()
+        self._in_flight: Dict[str, int] = {}
+        self._total = 0
+        self.peak = 0
+
+    def acquire(self, lane: str, nbytes: int, cancel_check: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Block until lane may put nbytes (clamped to the capacity) in flight. Returns the bytes
+        claimed, to hand back to release().
+
+        Raises:
+            TransferCancelled: cancel_check returned True while waiting
+        """
+        nbytes = max(1, min(int(nbytes), self.capacity))
+        with self._cond:
+            while True:
+                lane_bytes = self._in_flight.get(lane, 0)
+                if (not lane_bytes or self._total + nbytes <= self.capacity
+                        or lane_bytes + nbytes <= self.reserve.get(lane, 0)):
+                    break
+                if cancel_check is not None and cancel_check():
+                    raise TransferCancelled(f"Cancelled while waiting for {nbytes} bytes of {lane} lane budget")
+                self._cond.wait(_WAIT_POLL_SECONDS)
+            self._in_flight[lane] = lane_bytes + nbytes
+            self._total += nbytes
+            self.peak = max(self.peak, self._total)
+        return nbytes
+
+    def release(self, lane: str, nbytes: int) -> None:
+        with self._cond:
+            self._in_flight[lane] -= nbytes
+            self._total -= nbytes
+            self._cond.notify_all()
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._in_flight, total=self._total)
+
+
+class DualLaneExecutor:
+    """
+    Runs file tasks in a small-file and a large-file thread pool that share a ByteBudget.
+    Use as a context manager; submit(size, fn, ...) returns a Future.
+    """
+
+    def __init__(
+        self,
+        small_workers: int = DEFAULT_SMALL_LANE_WORKERS,
+        large_workers: int = DEFAULT_LARGE_LANE_WORKERS,
+        byte_budget: int = DEFAULT_BYTE_BUDGET,
+        small_file_threshold: int = SMALL_FILE_THRESHOLD,
+        large_stream_bytes: Optional[int] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+    ):
+        """
+        Args:
+            small_workers: Concurrent files in the small-file lane
+            large_workers: Concurrent files (streams) in the large-file lane
+            byte_budget: Bytes in flight across both lanes
+            small_file_threshold: Files smaller than this go to the small-file lane
+            large_stream_bytes: Budget one large file holds while it copies (its chunk window;
+                                default 8 chunks of transfer_engine.DEFAULT_CHUNK_SIZE)
+            cancel_check: Stops tasks that are still waiting for budget
+        """
+        self.small_file_threshold = small_file_threshold
+        self.large_stream_bytes = large_stream_bytes or 8 * DEFAULT_CHUNK_SIZE
+        self.cancel_check = cancel_check
+        self.budget = ByteBudget(byte_budget)
+        self.workers = {LANE_SMALL: max(1, int(small_workers)), LANE_LARGE: max(1, int(large_workers))}
+        self._pools = {
+            lane: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{lane}-lane")
+            for lane, workers in self.workers.items()
+        }
+        self._stats_lock = threading.Lock()
+        self._stats = {lane: {"files": 0, "bytes": 0, "busy_seconds": 0.0} for lane in self._pools}
+        self._start = time.perf_counter()
+
+    def lane_for(self, size: int) -> str:
+        return LANE_SMALL if size < self.small_file_threshold else LANE_LARGE
+
+    def submit(self, size: int, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) for a file of size bytes in its lane."""
+        lane = self.lane_for(size)
+        claim = size if lane == LANE_SMALL else min(size, self.large_stream_bytes)
+        return self._pools[lane].submit(self._run, lane, size, claim, fn, args, kwargs)
+
+    def _run(self, lane: str, size: int, claim: int, fn: Callable[..., Any], args, kwargs) -> Any:
+        claimed = self.budget.acquire(lane, claim, self.cancel_check)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.budget.release(lane, claimed)
+            with self._stats_lock:
+                stats = self._stats[lane]
+                stats["files"] += 1
+                stats["bytes"] += size
+                stats["busy_seconds"] += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        """{"small": {...}, "large": {...}, "peak_bytes_in_flight", "seconds"} for the batch report."""
+        with self._stats_lock:
+            lanes = {lane: dict(stats, workers=self.workers[lane]) for lane, stats in self._stats.items()}
+        lanes["peak_bytes_in_flight"] = self.budget.peak
+        lanes["seconds"] = round(time.perf_counter() - self._start, 3)
+        return lanes
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=cancel_futures)
+        if wait:
+            for pool in self._pools.values():
+                pool.shutdown(wait=True)
+
+    def __enter__(self) -> "DualLaneExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown(wait=True, cancel_futures=exc_type is not None)
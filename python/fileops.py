@@ -1,3 +1,4 @@
+import errno
 import os
 import sys
 import shutil
@@ -5,25 +6,92 @@ import uuid
 import json
 import time
 import threading
-import queue
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Set, Tuple
 
+try:
+    from .file_operations_utils.transfer_engine import copy_file, resolve_engines, TransferCancelled, ENGINE_AUTO
+    from .file_operations_utils.parallel_copy import parallel_copy_file, RangeCopyError
+    from .file_operations_utils.io_scheduler import get_transfer_scheduler, parse_priority, device_of, PRIORITY_NORMAL
+    from .file_operations_utils.transfer_lanes import (
+        DualLaneExecutor, LANE_SMALL, LANE_LARGE, SMALL_FILE_THRESHOLD,
+        DEFAULT_SMALL_LANE_WORKERS, DEFAULT_BYTE_BUDGET,
+    )
+    from .file_operations_utils.directory_plan import DirectoryPlan, directory_ready
+    from .file_operations_utils.rename_plan import split_by_device, rename_files
+    from .file_operations_utils.checksums import (
+        ChecksumManifest, new_hasher, resolve_algorithm, verify_manifest, DEFAULT_VERIFY_WORKERS,
+    )
+    from .file_operations_utils.transfer_journal import (
+        TransferJournal, STATUS_IN_PROGRESS, STATUS_DONE, STATUS_FAILED, STATUS_UNDONE,
+        METHOD_RENAME, METHOD_COPY_DELETE, METHOD_COPY,
+    )
+    from .file_operations_utils.sequence_transfer import frame_paths
+    from .mapping_utils.frame_ranges import as_sequence_files
+except ImportError:
+    # Fallback for direct script execution
+    from file_operations_utils.transfer_engine import copy_file, resolve_engines, TransferCancelled, ENGINE_AUTO
+    from file_operations_utils.parallel_copy import parallel_copy_file, RangeCopyError
+    from file_operations_utils.io_scheduler import get_transfer_scheduler, parse_priority, device_of, PRIORITY_NORMAL
+    from file_operations_utils.transfer_lanes import (
+        DualLaneExecutor, LANE_SMALL, LANE_LARGE, SMALL_FILE_THRESHOLD,
+        DEFAULT_SMALL_LANE_WORKERS, DEFAULT_BYTE_BUDGET,
+    )
+    from file_operations_utils.directory_plan import DirectoryPlan, directory_ready
+    from file_operations_utils.rename_plan import split_by_device, rename_files
+    from file_operations_utils.checksums import (
+        ChecksumManifest, new_hasher, resolve_algorithm, verify_manifest, DEFAULT_VERIFY_WORKERS,
+    )
+    from file_operations_utils.transfer_journal import (
+        TransferJournal, STATUS_IN_PROGRESS, STATUS_DONE, STATUS_FAILED, STATUS_UNDONE,
+        METHOD_RENAME, METHOD_COPY_DELETE, METHOD_COPY,
+    )
+    from file_operations_utils.sequence_transfer import frame_paths
+    from mapping_utils.frame_ranges import as_sequence_files
+
+
+def _sequence_frame_paths(sequence_info: Dict[str, Any]) -> List[str]:
+    """
+    Source paths of a sequence mapping's frames. sequence_info["files"] is a SequenceFiles,
+    its JSON form (proposals read back from a JSON file), path strings or scan-tree file nodes.
+    """
+    return frame_paths(as_sequence_files(sequence_info.get("files") or []))
+
+
+def _sequence_frame_count(sequence_info: Dict[str, Any]) -> int:
+    return len(as_sequence_files(sequence_info.get("files") or []))
+
 
 class FileOperations:
     """Handles file move/copy operations, conflict detection, and progress tracking."""
 
-    def __init__(self, debug_mode=False):
+    def __init__(self, debug_mode=False, transfer_engine: str = ENGINE_AUTO, journal_path: Optional[str] = None):
         """Initialize FileOperations
         
         Args:
             debug_mode: Enable additional debug logging
+            transfer_engine: Default copy engine ("auto", "copy_file_range", "sendfile", "readinto");
+                             apply_mappings can override it per batch
+            journal_path: SQLite database of the transfer journal (default: the repo's operations.db)
         """
+        resolve_engines(transfer_engine)  # Reject unknown engine names up front
         self.debug_mode = debug_mode
+        self.transfer_engine = transfer_engine
         self.progress_dir = os.path.join(os.path.dirname(__file__), "_progress")
         os.makedirs(self.progress_dir, exist_ok=True)
         self.cancelled_operations = set()  # Track cancelled batch IDs
         self.active_threads = {}  # Track active operation threads for force-kill
+        # Every file copy takes a slot from the process-wide I/O scheduler (per-volume caps,
+        # bandwidth limit, batch priorities); see file_operations_utils/io_scheduler.py
+        self.scheduler = get_transfer_scheduler()
+        self.batch_priorities = {}  # batch_id -> PRIORITY_*
+        self.batch_directories = {}  # batch_id -> DirectoryPlan (destination dirs created up front)
+        self.batch_manifests = {}  # batch_id -> ChecksumManifest when the batch hashes its copies
+        # Batches are journaled file by file in operations.db so they can be resumed after a crash;
+        # see file_operations_utils/transfer_journal.py
+        self.journal_path = journal_path or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "operations.db")
+        self.journal = None  # TransferJournal, opened by the first batch
+        self.batch_resumes = {}  # batch_id -> {destination: verified offset} while a batch is resumed
         
         if self.debug_mode:
             print("[DEBUG] FileOperations initialized with debug mode", file=sys.stderr)
@@ -32,94 +100,169 @@ class FileOperations:
     def _progress_path(self, batch_id: str) -> str:
         return os.path.join(self.progress_dir, f"progress_{batch_id}.json")
 
-    def _atomic_move(self, src: str, dst: str, batch_id: Optional[str] = None) -> None:
+    def _transfer_slot(self, src: str, dst: str, batch_id: Optional[str], size: Optional[int],
+                       cancel_event: Optional[threading.Event] = None):
+        """Scheduler slot for one file copy of this batch (waits in the queue, cancellable)."""
+        return self.scheduler.slot(
+            src, dst,
+            priority=self.batch_priorities.get(batch_id, PRIORITY_NORMAL),
+            batch_id=batch_id,
+            size=size,
+            cancel_check=lambda: bool(cancel_event and cancel_event.is_set()) or bool(batch_id and self.is_cancelled(batch_id)),
+        )
+
+    def _manifest_path(self, batch_id: str) -> str:
+        return os.path.join(self.progress_dir, f"manifest_{batch_id}.json")
+
+    def _start_manifest(self, batch_id: str, checksum: Optional[str]) -> None:
+        """Hash this batch's copies inline into a checksum manifest (checksum: "auto", "xxh3_128", "blake2b")."""
+        if not checksum:
+            return
+        path = self._manifest_path(batch_id)
+        if batch_id in self.batch_resumes and os.path.isfile(path):
+            # A resumed batch adds to the digests of the files it finished before it stopped
+            self.batch_manifests[batch_id] = ChecksumManifest.load(path)
+        else:
+            self.batch_manifests[batch_id] = ChecksumManifest(path, batch_id, checksum)
+
+    def _finish_manifest(self, batch_id: str) -> Optional[str]:
+        """Write the batch's checksum manifest; returns its path, or None if the batch wasn't hashed."""
+        manifest = self.batch_manifests.pop(batch_id, None)
+        if manifest is None:
+            return None
+        manifest.save()
+        print(f"[CHECKSUM] {len(manifest.files)} {manifest.algorithm} digests written to {manifest.path}", file=sys.stderr)
+        return manifest.path
+
+    def verify_batch(self, batch_id_or_manifest: str, max_workers: int = DEFAULT_VERIFY_WORKERS) -> Dict[str, Any]:
+        """
+        Re-hash the destinations recorded in a batch's checksum manifest (by batch ID or manifest path)
+        in parallel and compare them with the digests taken while copying.
+        """
+        path = batch_id_or_manifest if os.path.isfile(batch_id_or_manifest) else self._manifest_path(batch_id_or_manifest)
+        if not os.path.isfile(path):
+            return {"success": False, "error": f"No checksum manifest for {batch_id_or_manifest}"}
+        return verify_manifest(path, max_workers=max_workers)
+
+    def _directory_ready(self, batch_id: Optional[str], directory: str) -> bool:
+        """True if the batch's directory plan already created directory (skip makedirs/access checks)."""
+        plan = self.batch_directories.get(batch_id)
+        return (plan is not None and plan.is_ready(directory)) or directory_ready(directory)
+
+    def _create_directory_plan(self, batch_id: str, destination_paths) -> DirectoryPlan:
+        """Create the batch's destination directories once, in parallel, before any data moves."""
+        plan = DirectoryPlan.from_paths(destination_paths)
+        report = plan.create(cancel_check=lambda: self.is_cancelled(batch_id))
+        self.batch_directories[batch_id] = plan
+        print(f"[DIRPLAN] {report['directories']} destination directories ({report['created']} makedirs, "
+              f"{len(report['failed'])} failed) in {report['seconds']:.3f}s", file=sys.stderr)
+        for directory, error in report["failed"].items():
+            print(f"[DIRPLAN] Could not create {directory}: {error}", file=sys.stderr)
+        return plan
+
+    def _forget_batch(self, batch_id: str) -> None:
+        """Drop a finished, cancelled or failed batch's per-batch state (priority, directory plan, resume offsets)."""
+        self.batch_priorities.pop(batch_id, None)
+        self.batch_directories.pop(batch_id, None)
+        self.batch_resumes.pop(batch_id, None)
+        self.batch_manifests.pop(batch_id, None)
+
+    def _get_journal(self) -> Optional[TransferJournal]:
+        """The transfer journal, or None if its database can't be opened (batches then run unjournaled)."""
+        if self.journal is None:
+            try:
+                self.journal = TransferJournal(self.journal_path)
+            except Exception as e:
+                print(f"[JOURNAL] Could not open transfer journal {self.journal_path}: {e}", file=sys.stderr)
+        return self.journal
+
+    def _begin_journal(self, batch_id: str, operation_type: str, files, options: Dict[str, Any]) -> None:
+        """Journal the batch's (source, destination, size) files as planned before any data moves."""
+        journal = self._get_journal()
+        if journal is None:
+            return
+        try:
+            planned = journal.begin_batch(batch_id, operation_type, files, options)
+            print(f"[JOURNAL] Batch {batch_id}: {planned} files planned in {self.journal_path}", file=sys.stderr)
+        except Exception as e:
+            print(f"[JOURNAL] Could not journal batch {batch_id}: {e}", file=sys.stderr)
+
+    def _journal_file(self, batch_id: Optional[str], dst: str, status: str,
+                      bytes_done: Optional[int] = None, error: Optional[str] = None) -> None:
+        if self.journal is not None and batch_id:
+            self.journal.record(batch_id, dst, status, bytes_done, error)
+
+    def _journal_done(self, batch_id: Optional[str], src: str, dst: str, size: int, method: str) -> None:
+        """Journal a finished file with how it got there and its source/destination devices (the undo log)."""
+        if self.journal is not None and batch_id:
+            self.journal.record(batch_id, dst, STATUS_DONE, size, method=method,
+                                src_device=device_of(os.path.dirname(src)), dst_device=device_of(os.path.dirname(dst)))
+
+    def _finish_journal(self, batch_id: str, status: str) -> None:
+        if self.journal is not None:
+            try:
+                self.journal.finish_batch(batch_id, status)
+            except Exception as e:
+                print(f"[JOURNAL] Could not close batch {batch_id} in the journal: {e}", file=sys.stderr)
+
+    def _atomic_move(self, src: str, dst: str, batch_id: Optional[str] = None, transfer_engine: Optional[str] = None,
+                     try_rename: bool = True) -> str:
         """
         Perform an atomic move operation that works across drives.
-        First tries os.rename (fast, atomic), falls back to copy+delete.
+        First tries os.rename (fast, atomic), falls back to copy+delete; try_rename=False goes
+        straight to copy+delete for a file the batch already knows crosses devices.
         Includes cancellation checks for long operations.
+        Returns how the file was moved: METHOD_RENAME or METHOD_COPY_DELETE.
         """
-        print(f"[DEBUG] _atomic_move called: {src} -> {dst}", file=sys.stderr)
-        print(
-            f"[DEBUG] Source exists before move: {os.path.exists(src)}", file=sys.stderr
-        )
-
         # Check for cancellation before starting
         if batch_id and self.is_cancelled(batch_id):
             raise Exception(f"Operation cancelled before moving {src}")
 
-        try:
-            # Try atomic rename first (works only on same filesystem)
-            print(f"[DEBUG] Attempting os.rename...", file=sys.stderr)
-            os.rename(src, dst)
-            print(f"[DEBUG] os.rename succeeded for {src}", file=sys.stderr)
-            print(
-                f"[DEBUG] Source exists after rename: {os.path.exists(src)}",
-                file=sys.stderr,
-            )
-        except OSError as e:
-            # Cross-filesystem move: copy then delete
-            print(f"[DEBUG] os.rename failed with error: {e}", file=sys.stderr)
-            print(
-                f"[DEBUG] Cross-filesystem move detected, using copy+delete for {src}",
-                file=sys.stderr,
-            )
+        if try_rename:
+            try:
+                # Try atomic rename first (works only on same filesystem)
+                os.rename(src, dst)
+                if self.debug_mode:
+                    print(f"[DEBUG] os.rename succeeded: {src} -> {dst}", file=sys.stderr)
+                return METHOD_RENAME
+            except OSError as e:
+                if self.debug_mode:
+                    print(f"[DEBUG] os.rename failed ({e}), using copy+delete for {src}", file=sys.stderr)
 
-            # Check for cancellation before copy
-            if batch_id and self.is_cancelled(batch_id):
-                raise Exception(f"Operation cancelled before copying {src}")
+        # Cross-filesystem move: copy then delete
+        if batch_id and self.is_cancelled(batch_id):
+            raise Exception(f"Operation cancelled before copying {src}")
 
-            # Ensure destination directory exists
+        # Ensure destination directory exists
+        if not self._directory_ready(batch_id, os.path.dirname(dst)):
             os.makedirs(os.path.dirname(dst), exist_ok=True)
 
-            # Copy the file with FORCE-KILLABLE copy for immediate cancellation
-            print(f"[DEBUG] Copying file with force-kill capability...", file=sys.stderr)
-            self._force_kill_copy(src, dst, batch_id)
-            print(
-                f"[DEBUG] Copy completed, destination exists: {os.path.exists(dst)}",
-                file=sys.stderr,
-            )
-
-            # Check for cancellation before deleting source
-            if batch_id and self.is_cancelled(batch_id):
-                # Clean up partial copy if cancelled
-                if os.path.exists(dst):
-                    os.remove(dst)
-                raise Exception(f"Operation cancelled before deleting source {src}")
+        # Copy the file with FORCE-KILLABLE copy for immediate cancellation
+        self._force_kill_copy(src, dst, batch_id, transfer_engine)
 
-            # Verify copy was successful before deleting source
+        # Check for cancellation before deleting source
+        if batch_id and self.is_cancelled(batch_id):
+            # Clean up partial copy if cancelled
             if os.path.exists(dst):
-                print(
-                    f"[DEBUG] Copy verified, now deleting source: {src}",
-                    file=sys.stderr,
-                )
-                os.remove(src)
-                print(f"[DEBUG] Source file deleted: {src}", file=sys.stderr)
-                print(
-                    f"[DEBUG] Source exists after delete: {os.path.exists(src)}",
-                    file=sys.stderr,
-                )
-            else:
-                print(
-                    f"[CRITICAL ERROR] Copy failed - destination does not exist: {dst}",
-                    file=sys.stderr,
-                )
-                raise Exception(
-                    f"Copy operation failed - destination file not created: {dst}"
-                )
+                os.remove(dst)
+            raise Exception(f"Operation cancelled before deleting source {src}")
 
-        # Final verification
-        print(
-            f"[DEBUG] Final verification - Source exists: {os.path.exists(src)}, Destination exists: {os.path.exists(dst)}",
-            file=sys.stderr,
-        )
+        # Verify copy was successful before deleting source
+        if not os.path.exists(dst):
+            print(f"[CRITICAL ERROR] Copy failed - destination does not exist: {dst}", file=sys.stderr)
+            raise Exception(f"Copy operation failed - destination file not created: {dst}")
+        os.remove(src)
+        if self.debug_mode:
+            print(f"[DEBUG] Copied and deleted source: {src} -> {dst}", file=sys.stderr)
+        return METHOD_COPY_DELETE
 
-    def _force_kill_copy(self, src: str, dst: str, batch_id: Optional[str] = None) -> None:
+    def _force_kill_copy(self, src: str, dst: str, batch_id: Optional[str] = None, transfer_engine: Optional[str] = None) -> None:
         """
         Copy a file with IMMEDIATE cancellation capability - can be killed mid-write.
-        Uses threading.Event for instant cancellation response with micro-chunks.
+        The bytes move through the transfer engine (copy_file_range / sendfile / readinto,
+        see file_operations_utils/transfer_engine.py); cancellation is checked after every
+        engine chunk (a few MB) and a cancelled copy removes its partial destination.
         """
-        import threading
-        
         # Check for cancellation before starting
         if batch_id and self.is_cancelled(batch_id):
             raise Exception(f"Operation cancelled before copying {src}")
@@ -133,77 +276,24 @@ class FileOperations:
                 self.active_threads[batch_id] = []
             self.active_threads[batch_id].append(cancel_event)
         
+        manifest = self.batch_manifests.get(batch_id)
         try:
-            # Use MICRO chunks for maximum cancellation responsiveness
-            chunk_size = 1024  # 1KB chunks - check cancellation every 1KB!
-            
-            print(f"[FORCE-KILL] Starting copy with 1KB micro-chunks for immediate cancellation", file=sys.stderr)
-            
-            with open(src, 'rb') as fsrc:
-                with open(dst, 'wb') as fdst:
-                    bytes_copied = 0
-                    chunk_count = 0
-                    
-                    while True:
-                        # IMMEDIATE cancellation check before every single chunk
-                        if cancel_event.is_set() or (batch_id and self.is_cancelled(batch_id)):
-                            print(f"[FORCE-KILL] CANCELLED during copy at {bytes_copied} bytes ({chunk_count} chunks)", file=sys.stderr)
-                            # FORCE KILL - close files immediately and clean up
-                            try:
-                                fdst.close()
-                            except:
-                                pass
-                            if os.path.exists(dst):
-                                try:
-                                    os.remove(dst)
-                                    print(f"[FORCE-KILL] Cleaned up partial file: {dst}", file=sys.stderr)
-                                except:
-                                    pass
-                            raise Exception(f"Operation FORCE CANCELLED during copy of {src} (copied {bytes_copied} bytes)")
-                        
-                        chunk = fsrc.read(chunk_size)
-                        if not chunk:
-                            break
-                        
-                        # ANOTHER cancellation check before writing
-                        if cancel_event.is_set() or (batch_id and self.is_cancelled(batch_id)):
-                            print(f"[FORCE-KILL] CANCELLED before write at {bytes_copied} bytes", file=sys.stderr)
-                            try:
-                                fdst.close()
-                            except:
-                                pass
-                            if os.path.exists(dst):
-                                try:
-                                    os.remove(dst)
-                                except:
-                                    pass
-                            raise Exception(f"Operation FORCE CANCELLED during copy of {src} (copied {bytes_copied} bytes)")
-                        
-                        fdst.write(chunk)
-                        bytes_copied += len(chunk)
-                        chunk_count += 1
-                        
-                        # Log progress every 1MB for debugging
-                        if chunk_count % 1024 == 0:  # Every 1MB
-                            print(f"[FORCE-KILL] Copied {bytes_copied // (1024*1024)}MB, checking cancellation...", file=sys.stderr)
-                        
-                        # THIRD cancellation check after writing (triple safety)
-                        if cancel_event.is_set() or (batch_id and self.is_cancelled(batch_id)):
-                            print(f"[FORCE-KILL] CANCELLED after write at {bytes_copied} bytes", file=sys.stderr)
-                            try:
-                                fdst.close()
-                            except:
-                                pass
-                            if os.path.exists(dst):
-                                try:
-                                    os.remove(dst)
-                                except:
-                                    pass
-                            raise Exception(f"Operation FORCE CANCELLED during copy of {src} (copied {bytes_copied} bytes)")
-                        
-                        # NO DELAYS - maximum speed and responsiveness
-                        
-            print(f"[FORCE-KILL] Copy completed successfully: {bytes_copied} bytes", file=sys.stderr)
+            try:
+                with self._transfer_slot(src, dst, batch_id, os.path.getsize(src), cancel_event) as ticket:
+                    result = copy_file(
+                        src, dst,
+                        engine=transfer_engine or self.transfer_engine,
+                        cancel_check=lambda: cancel_event.is_set() or bool(batch_id and self.is_cancelled(batch_id)),
+                        progress_callback=ticket.update,
+                        hasher=new_hasher(manifest.algorithm) if manifest else None,
+                    )
+            except TransferCancelled as e:
+                print(f"[FORCE-KILL] {e}; partial file removed: {dst}", file=sys.stderr)
+                raise Exception(f"Operation FORCE CANCELLED during copy of {src}") from e
+            if manifest:
+                manifest.add(src, dst, result["bytes"], result["digest"])
+            if self.debug_mode:
+                print(f"[FORCE-KILL] Copy completed with {result['engine']}: {result['bytes']} bytes in {result['seconds']:.3f}s", file=sys.stderr)
                         
         finally:
             # Clean up the cancel event
@@ -215,13 +305,12 @@ class FileOperations:
                 except (ValueError, KeyError):
                     pass
 
-    def _multithreaded_copy(self, src: str, dst: str, batch_id: Optional[str] = None, max_workers: int = 8) -> None:
+    def _multithreaded_copy(self, src: str, dst: str, batch_id: Optional[str] = None, max_workers: int = 8, transfer_engine: Optional[str] = None) -> None:
         """
         Copy a file using multiple threads for maximum 10G network utilization.
-        Splits the file into chunks and copies them in parallel.
+        Splits the file into ranges that worker threads write in place into the
+        preallocated destination; a failed range is retried without restarting the file.
         """
-        import threading
-        
         print(f"[MULTITHREAD] _multithreaded_copy called with src={src}, dst={dst}", file=sys.stderr)
         # Verify source file exists
         print(f"[MULTITHREAD] Checking source file: {src}", file=sys.stderr)
@@ -237,25 +326,28 @@ class FileOperations:
         dst_dir = os.path.dirname(dst)
         print(f"[MULTITHREAD] Determined destination directory for {dst}: {dst_dir}", file=sys.stderr)
 
-        # Verify write permissions to the path where the destination directory will be created.
-        # If dst_dir doesn't exist yet, check permission on its parent.
-        parent_check_path = os.path.dirname(dst_dir) if not os.path.exists(dst_dir) and os.path.dirname(dst_dir) != dst_dir else dst_dir
-        # Handle cases where dst_dir might be a root like 'D:\', making parent_check_path also 'D:\'
-        if not parent_check_path or parent_check_path == dst_dir and not os.path.exists(dst_dir):
-             # If dst_dir is 'D:\vfx' and doesn't exist, parent_check_path is 'D:\'. If 'D:\' doesn't exist, this is problematic.
-             # However, os.access on a non-existent path usually returns False. Let's ensure parent_check_path is valid for os.access.
-             # If dst_dir is 'D:\NewFolder', parent_check_path is 'D:\'.
-             # If dst_dir is 'NewFolder' (relative), parent_check_path is '.' (cwd).
-             drive, tail = os.path.splitdrive(dst_dir)
-             if drive and not tail: # It's a root like D:\
-                 parent_check_path = drive
-             elif not drive and not os.path.isabs(dst_dir): # relative path
-                 parent_check_path = "."
+        # Skipped when the batch's directory plan already created dst_dir
+        dst_dir_ready = self._directory_ready(batch_id, dst_dir)
+        if not dst_dir_ready:
+            # Verify write permissions to the path where the destination directory will be created.
+            # If dst_dir doesn't exist yet, check permission on its parent.
+            parent_check_path = os.path.dirname(dst_dir) if not os.path.exists(dst_dir) and os.path.dirname(dst_dir) != dst_dir else dst_dir
+            # Handle cases where dst_dir might be a root like 'D:\', making parent_check_path also 'D:\'
+            if not parent_check_path or parent_check_path == dst_dir and not os.path.exists(dst_dir):
+                 # If dst_dir is 'D:\vfx' and doesn't exist, parent_check_path is 'D:\'. If 'D:\' doesn't exist, this is problematic.
+                 # However, os.access on a non-existent path usually returns False. Let's ensure parent_check_path is valid for os.access.
+                 # If dst_dir is 'D:\NewFolder', parent_check_path is 'D:\'.
+                 # If dst_dir is 'NewFolder' (relative), parent_check_path is '.' (cwd).
+                 drive, tail = os.path.splitdrive(dst_dir)
+                 if drive and not tail: # It's a root like D:\
+                     parent_check_path = drive
+                 elif not drive and not os.path.isabs(dst_dir): # relative path
+                     parent_check_path = "."
 
-        print(f"[MULTITHREAD] Checking write permissions for path: {parent_check_path}", file=sys.stderr)
-        if not os.access(parent_check_path, os.W_OK):
-            print(f"[ERROR][MULTITHREAD] No write permission to destination parent path: {parent_check_path} (to create {dst_dir})", file=sys.stderr)
-            raise PermissionError(f"No write permission to destination parent path: {parent_check_path} (to create {dst_dir})")
+            print(f"[MULTITHREAD] Checking write permissions for path: {parent_check_path}", file=sys.stderr)
+            if not os.access(parent_check_path, os.W_OK):
+                print(f"[ERROR][MULTITHREAD] No write permission to destination parent path: {parent_check_path} (to create {dst_dir})", file=sys.stderr)
+                raise PermissionError(f"No write permission to destination parent path: {parent_check_path} (to create {dst_dir})")
         
         # Check for cancellation before starting any heavy work (like makedirs or small file copy)
         if batch_id and self.is_cancelled(batch_id):
@@ -264,202 +356,88 @@ class FileOperations:
         
         # (The 'Verify destination directory exists' comment is now handled by os.makedirs logic below)
         
-        # For small files (< 10MB), use single-threaded copy
-        if file_size < 10 * 1024 * 1024:
+        # For small files (< 10MB, the small-file lane), use single-threaded copy
+        if file_size < SMALL_FILE_THRESHOLD:
             print(f"[MULTITHREAD] Small file detected ({file_size} bytes), using simple copy method", file=sys.stderr)
+            if batch_id in self.batch_manifests:
+                # shutil can't hash while copying; the engine copy hashes the bytes it moves
+                return self._force_kill_copy(src, dst, batch_id, transfer_engine)
             try:
                 # Try a direct shutil copy first for maximum compatibility
                 print(f"[MULTITHREAD] Attempting direct shutil copy for small file", file=sys.stderr)
-                shutil.copy2(src, dst)
+                with self._transfer_slot(src, dst, batch_id, file_size) as ticket:
+                    shutil.copy2(src, dst)
+                    ticket.throttle(file_size)
                 print(f"[MULTITHREAD] Direct copy succeeded using shutil.copy2", file=sys.stderr)
                 return
             except Exception as direct_copy_error:
                 print(f"[WARNING] Direct copy failed, falling back to _force_kill_copy: {direct_copy_error}", file=sys.stderr)
-                return self._force_kill_copy(src, dst, batch_id)
+                return self._force_kill_copy(src, dst, batch_id, transfer_engine)
         
-        # Calculate optimal chunk size for 10G network
-        # Target: 64MB chunks for large files, minimum 1MB
-        chunk_size = max(1024 * 1024, min(64 * 1024 * 1024, file_size // max_workers))
-        num_chunks = (file_size + chunk_size - 1) // chunk_size
-        
-        print(f"[MULTITHREAD] Starting multithreaded copy: {file_size} bytes in {num_chunks} chunks of {chunk_size//1024//1024}MB each", file=sys.stderr)
-        print(f"[MULTITHREAD] Using {min(max_workers, num_chunks)} worker threads", file=sys.stderr)
-        
-        # Create cancellation events for all threads
-        cancel_events = []
-        for _ in range(min(max_workers, num_chunks)):
-            cancel_event = threading.Event()
-            cancel_events.append(cancel_event)
-            if batch_id:
-                if batch_id not in self.active_threads:
-                    self.active_threads[batch_id] = []
-                self.active_threads[batch_id].append(cancel_event)
-        
-        # Create temporary files for each chunk
-        temp_files = []
-        chunk_results = queue.Queue()
+        # One cancel event for this copy; cancel_operation() sets it
+        cancel_event = threading.Event()
+        if batch_id:
+            if batch_id not in self.active_threads:
+                self.active_threads[batch_id] = []
+            self.active_threads[batch_id].append(cancel_event)
         
         try:
             # Ensure destination directory exists
-            _dst_dir_for_makedirs = os.path.dirname(dst)
-            print(f"[INFO][MULTITHREAD] Attempting os.makedirs for: '{_dst_dir_for_makedirs}'", file=sys.stderr)
-            try:
-                os.makedirs(_dst_dir_for_makedirs, exist_ok=True)
-                print(f"[INFO][MULTITHREAD] Successfully created/ensured directory: '{_dst_dir_for_makedirs}'", file=sys.stderr)
-            except FileNotFoundError as e_fnf: 
-                print(f"[ERROR][MULTITHREAD] FileNotFoundError during os.makedirs('{_dst_dir_for_makedirs}'): {e_fnf}", file=sys.stderr)
-                print(f"[ERROR][MULTITHREAD] Exception details: type={type(e_fnf)}, args={e_fnf.args}, filename='{e_fnf.filename}', filename2='{e_fnf.filename2 if hasattr(e_fnf, 'filename2') else 'N/A'}' (strerror: {e_fnf.strerror}, winerror: {e_fnf.winerror if hasattr(e_fnf, 'winerror') else 'N/A'})")
-                raise
-            except OSError as e_os:
-                print(f"[ERROR][MULTITHREAD] OSError during os.makedirs('{_dst_dir_for_makedirs}'): {e_os}", file=sys.stderr)
-                print(f"[ERROR][MULTITHREAD] Exception details: type={type(e_os)}, args={e_os.args}, filename='{e_os.filename if hasattr(e_os, 'filename') else 'N/A'}' (strerror: {e_os.strerror if hasattr(e_os, 'strerror') else 'N/A'}, winerror: {e_os.winerror if hasattr(e_os, 'winerror') else 'N/A'})")
-                raise
-            
-            def copy_chunk(chunk_index: int, start_pos: int, chunk_size: int, cancel_event: threading.Event):
-                """Copy a specific chunk of the file"""
-                temp_file = f"{dst}.chunk_{chunk_index}"
-                temp_files.append(temp_file)
-                
+            if not dst_dir_ready:
+                _dst_dir_for_makedirs = os.path.dirname(dst)
+                print(f"[INFO][MULTITHREAD] Attempting os.makedirs for: '{_dst_dir_for_makedirs}'", file=sys.stderr)
                 try:
-                    with open(src, 'rb') as fsrc:
-                        with open(temp_file, 'wb') as fdst:
-                            fsrc.seek(start_pos)
-                            remaining = chunk_size
-                            bytes_copied = 0
-                            
-                            # Use 1MB sub-chunks for cancellation responsiveness
-                            sub_chunk_size = 1024 * 1024  # 1MB
-                            
-                            while remaining > 0 and not cancel_event.is_set():
-                                # Check for cancellation
-                                if batch_id and self.is_cancelled(batch_id):
-                                    print(f"[MULTITHREAD] Chunk {chunk_index} cancelled at {bytes_copied} bytes", file=sys.stderr)
-                                    raise Exception(f"Chunk {chunk_index} cancelled")
-                                
-                                read_size = min(sub_chunk_size, remaining)
-                                data = fsrc.read(read_size)
-                                if not data:
-                                    break
-                                
-                                fdst.write(data)
-                                bytes_copied += len(data)
-                                remaining -= len(data)
-                            
-                            if cancel_event.is_set():
-                                raise Exception(f"Chunk {chunk_index} cancelled by event")
-                            
-                            chunk_results.put((chunk_index, bytes_copied, None))
-                            print(f"[MULTITHREAD] Chunk {chunk_index} completed: {bytes_copied} bytes", file=sys.stderr)
-                            
-                except Exception as e:
-                    chunk_results.put((chunk_index, 0, str(e)))
-                    print(f"[MULTITHREAD] Chunk {chunk_index} failed: {e}", file=sys.stderr)
-                    # Clean up failed chunk file
-                    try:
-                        if os.path.exists(temp_file):
-                            os.remove(temp_file)
-                    except:
-                        pass
+                    os.makedirs(_dst_dir_for_makedirs, exist_ok=True)
+                    print(f"[INFO][MULTITHREAD] Successfully created/ensured directory: '{_dst_dir_for_makedirs}'", file=sys.stderr)
+                except FileNotFoundError as e_fnf: 
+                    print(f"[ERROR][MULTITHREAD] FileNotFoundError during os.makedirs('{_dst_dir_for_makedirs}'): {e_fnf}", file=sys.stderr)
+                    print(f"[ERROR][MULTITHREAD] Exception details: type={type(e_fnf)}, args={e_fnf.args}, filename='{e_fnf.filename}', filename2='{e_fnf.filename2 if hasattr(e_fnf, 'filename2') else 'N/A'}' (strerror: {e_fnf.strerror}, winerror: {e_fnf.winerror if hasattr(e_fnf, 'winerror') else 'N/A'})")
+                    raise
+                except OSError as e_os:
+                    print(f"[ERROR][MULTITHREAD] OSError during os.makedirs('{_dst_dir_for_makedirs}'): {e_os}", file=sys.stderr)
+                    print(f"[ERROR][MULTITHREAD] Exception details: type={type(e_os)}, args={e_os.args}, filename='{e_os.filename if hasattr(e_os, 'filename') else 'N/A'}' (strerror: {e_os.strerror if hasattr(e_os, 'strerror') else 'N/A'}, winerror: {e_os.winerror if hasattr(e_os, 'winerror') else 'N/A'})")
+                    raise
             
-            # Start all chunk copy operations in parallel
-            with ThreadPoolExecutor(max_workers=min(max_workers, num_chunks)) as executor:
-                futures = []
-                
-                for i in range(num_chunks):
-                    start_pos = i * chunk_size
-                    actual_chunk_size = min(chunk_size, file_size - start_pos)
-                    cancel_event = cancel_events[i % len(cancel_events)]
-                    
-                    future = executor.submit(copy_chunk, i, start_pos, actual_chunk_size, cancel_event)
-                    futures.append(future)
-                
-                # Wait for all chunks to complete
-                completed_chunks = 0
-                failed_chunks = 0
-                total_bytes_copied = 0
-                
-                for future in as_completed(futures):
-                    try:
-                        print(f"[DEBUG] Processing result from future {future}", file=sys.stderr)
-                        future.result()  # This will raise any exception from the chunk
-                    except Exception as e:
-                        print(f"[ERROR] Chunk operation failed: {e}", file=sys.stderr)
-                        import traceback
-                        traceback.print_exc(file=sys.stderr)
-                        failed_chunks += 1
-                        # Cancel all other operations
-                        for event in cancel_events:
-                            event.set()
-                        break
-                
-                # Collect results
-                while not chunk_results.empty():
-                    chunk_index, bytes_copied, error = chunk_results.get()
-                    if error:
-                        failed_chunks += 1
-                        print(f"[MULTITHREAD] Chunk {chunk_index} error: {error}", file=sys.stderr)
-                    else:
-                        completed_chunks += 1
-                        total_bytes_copied += bytes_copied
-                
-                # Check if operation was cancelled or failed
-                if batch_id and self.is_cancelled(batch_id):
-                    raise Exception("Multithreaded copy cancelled")
-                
-                if failed_chunks > 0:
-                    raise Exception(f"Multithreaded copy failed: {failed_chunks} chunks failed")
-                
-                print(f"[MULTITHREAD] All {completed_chunks} chunks completed, reassembling file...", file=sys.stderr)
-                
-                # Reassemble the file from chunks
-            print(f"[MULTITHREAD] Reassembling file from {num_chunks} chunks", file=sys.stderr)
+            # Workers write their ranges straight into the preallocated destination
+            # (see file_operations_utils/parallel_copy.py); failed ranges are retried on their own
+            manifest = self.batch_manifests.get(batch_id)
             try:
-                with open(dst, 'wb') as fdst:
-                    for i in range(num_chunks):
-                        chunk_file = f"{dst}.chunk_{i}"
-                        print(f"[MULTITHREAD] Processing chunk {i}, file: {chunk_file}", file=sys.stderr)
-                        if os.path.exists(chunk_file):
-                            chunk_size = os.path.getsize(chunk_file)
-                            print(f"[MULTITHREAD] Chunk {i} exists, size: {chunk_size} bytes", file=sys.stderr)
-                            with open(chunk_file, 'rb') as chunk_src:
-                                bytes_written = shutil.copyfileobj(chunk_src, fdst)
-                                print(f"[MULTITHREAD] Chunk {i} written to destination", file=sys.stderr)
-                        else:
-                            print(f"[CRITICAL] Missing chunk file: {chunk_file}", file=sys.stderr)
-                            raise Exception(f"Missing chunk file: {chunk_file}")
-                print(f"[MULTITHREAD] All chunks successfully reassembled", file=sys.stderr)
-            except Exception as reassembly_error:
-                print(f"[CRITICAL] Failed to reassemble file: {reassembly_error}", file=sys.stderr)
-                # If destination file was created but incomplete, remove it
-                if os.path.exists(dst):
-                    try:
-                        os.remove(dst)
-                        print(f"[MULTITHREAD] Removed incomplete destination file: {dst}", file=sys.stderr)
-                    except Exception as cleanup_error:
-                        print(f"[WARNING] Failed to clean up incomplete file: {cleanup_error}", file=sys.stderr)
-                raise
-                
-                # Verify the final file
-                final_size = os.path.getsize(dst)
-                if final_size != file_size:
-                    raise Exception(f"Size mismatch after reassembly: expected {file_size}, got {final_size}")
+                # The whole ranged copy is one transfer for the scheduler's volume caps
+                with self._transfer_slot(src, dst, batch_id, file_size, cancel_event) as ticket:
+                    result = parallel_copy_file(
+                        src, dst,
+                        max_workers=max_workers,
+                        engine=transfer_engine or self.transfer_engine,
+                        cancel_check=lambda: cancel_event.is_set() or bool(batch_id and self.is_cancelled(batch_id)),
+                        progress_callback=ticket.update,
+                        checksum=manifest.algorithm if manifest else None,
+                        resume_offset=self.batch_resumes.get(batch_id, {}).get(dst, 0),
+                        offset_callback=lambda offset: self._journal_file(batch_id, dst, STATUS_IN_PROGRESS, offset),
+                    )
+                if manifest:
+                    manifest.add(src, dst, result["bytes"], result["digest"], result["range_size"])
+            except TransferCancelled as e:
+                print(f"[MULTITHREAD] {e}; partial file removed: {dst}", file=sys.stderr)
+                raise Exception("Multithreaded copy cancelled") from e
+            except RangeCopyError as e:
+                print(f"[MULTITHREAD] {e}; partial file kept for resume: {dst}", file=sys.stderr)
+                raise Exception(f"Multithreaded copy failed: {e}") from e
+            
+            print(f"[MULTITHREAD] Copied {result['bytes']} bytes in {result['ranges']} ranges with {result['workers']} workers "
+                  f"({result['retried_ranges']} range retries, {result['resumed_bytes']} bytes resumed) in {result['seconds']:.2f}s", file=sys.stderr)
+            
+            # Verify the final file
+            final_size = os.path.getsize(dst)
+            if final_size != file_size:
+                raise Exception(f"Size mismatch after copy: expected {file_size}, got {final_size}")
         
         finally:
-            # Clean up temporary chunk files
-            for temp_file in temp_files:
+            # Clean up the cancel event
+            if batch_id and batch_id in self.active_threads:
                 try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                except:
+                    self.active_threads[batch_id].remove(cancel_event)
+                except (ValueError, KeyError):
                     pass
-            
-            # Clean up cancel events
-            if batch_id and batch_id in self.active_threads:
-                for event in cancel_events:
-                    try:
-                        self.active_threads[batch_id].remove(event)
-                    except (ValueError, KeyError):
-                        pass
                 if not self.active_threads[batch_id]:
                     del self.active_threads[batch_id]
 
@@ -470,7 +448,12 @@ class FileOperations:
         validate_sequences: bool = True,
         batch_id: Optional[str] = None,
         max_workers: int = 8,
-        file_workers: int = 4
+        file_workers: int = 4,
+        transfer_engine: Optional[str] = None,
+        priority: Optional[Any] = None,
+        small_file_workers: Optional[int] = None,
+        byte_budget: Optional[int] = None,
+        checksum: Optional[str] = None
     ) -> Dict[str, Any]:
         print(f"[DEBUG] apply_mappings_multithreaded called with operation_type={operation_type}, {len(mappings)} mappings", file=sys.stderr)
         """
@@ -482,303 +465,385 @@ class FileOperations:
             validate_sequences: Whether to validate sequences
             batch_id: Batch ID for progress tracking
             max_workers: Maximum worker threads for file chunks (default 8)
-            file_workers: Maximum concurrent files to process (default 4)
+            file_workers: Concurrent large files (chunked streams) in the large-file lane (default 4)
+            transfer_engine: Copy engine for this batch (default: the instance's transfer_engine)
+            priority: Scheduling priority of this batch's copies ("high", "normal", "low")
+            small_file_workers: Concurrent files in the small-file lane (default 16)
+            byte_budget: Bytes in flight shared by both lanes (default 512 MB)
+            checksum: Hash every copy inline and write a checksum manifest ("auto", "xxh3_128", "blake2b")
         """
         print(f"[DEBUG] Starting apply_mappings_multithreaded with {len(mappings)} mappings", file=sys.stderr)
         print(f"[DEBUG] Operation type: {operation_type}", file=sys.stderr)
         if batch_id is None:
             batch_id = str(uuid.uuid4())
+        self.batch_priorities[batch_id] = parse_priority(priority)
+        self._start_manifest(batch_id, checksum)
         
-        total = len(mappings)
-        completed = 0
-        failed = 0
-        start_time = time.time()
+        try:
+            total = len(mappings)
+            completed = 0
+            failed = 0
+            start_time = time.time()
         
-        # Calculate total files for better progress tracking
-        total_files = 0
-        for m in mappings:
-            if m.get("type") == "sequence" and "sequence" in m:
-                total_files += len(m["sequence"].get("files", []))
-            else:
-                total_files += 1
+            # Calculate total files for better progress tracking
+            total_files = 0
+            for m in mappings:
+                if m.get("type") == "sequence" and "sequence" in m:
+                    total_files += _sequence_frame_count(m["sequence"])
+                else:
+                    total_files += 1
         
-        files_processed = 0
-        files_lock = threading.Lock()
+            files_processed = 0
+            files_lock = threading.Lock()
         
-        # Initialize progress
-        progress = {
-            "batchId": batch_id,
-            "totalOperations": total,
-            "completedOperations": 0,
-            "failedOperations": 0,
-            "progressPercentage": 0.0,
-            "totalSize": 0,
-            "processedSize": 0,
-            "etaSeconds": None,
-            "status": "running",
-            "isPaused": False,
-            "isCancelled": False,
-            "currentFile": None,
-            "totalFiles": total_files,
-            "filesProcessed": 0,
-        }
+            # Initialize progress
+            progress = {
+                "batchId": batch_id,
+                "totalOperations": total,
+                "completedOperations": 0,
+                "failedOperations": 0,
+                "progressPercentage": 0.0,
+                "totalSize": 0,
+                "processedSize": 0,
+                "etaSeconds": None,
+                "status": "running",
+                "isPaused": False,
+                "isCancelled": False,
+                "currentFile": None,
+                "totalFiles": total_files,
+                "filesProcessed": 0,
+            }
         
-        # Calculate total size
-        print(f"[DEBUG] Calculating total size for {len(mappings)} mappings", file=sys.stderr)
-        for m in mappings:
-            node = m.get("node") or m.get("sequence", {})
-            if node:
-                if m.get("type") == "sequence":
-                    progress["totalSize"] += m.get("sequence", {}).get("total_size", 0)
-                else:
-                    progress["totalSize"] += node.get("size", 0)
+            # Calculate total size
+            print(f"[DEBUG] Calculating total size for {len(mappings)} mappings", file=sys.stderr)
+            for m in mappings:
+                node = m.get("node") or m.get("sequence", {})
+                if node:
+                    if m.get("type") == "sequence":
+                        progress["totalSize"] += m.get("sequence", {}).get("total_size", 0)
+                    else:
+                        progress["totalSize"] += node.get("size", 0)
         
-        print(f"[DEBUG] Total size: {progress['totalSize']} bytes", file=sys.stderr)
-        print(f"[DEBUG] Writing initial progress for batch {batch_id}", file=sys.stderr)
-        self._write_progress(batch_id, progress)
-        results = []
-        results_lock = threading.Lock()
+            print(f"[DEBUG] Total size: {progress['totalSize']} bytes", file=sys.stderr)
+            print(f"[DEBUG] Writing initial progress for batch {batch_id}", file=sys.stderr)
+            self._write_progress(batch_id, progress)
+            results = []
+            results_lock = threading.Lock()
         
-        def update_progress_thread_safe():
-            """Thread-safe progress update"""
-            with files_lock:
-                progress["filesProcessed"] = files_processed
-                progress["completedOperations"] = completed
-                progress["failedOperations"] = failed
+            def update_progress_thread_safe():
+                """Thread-safe progress update"""
+                with files_lock:
+                    progress["filesProcessed"] = files_processed
+                    progress["completedOperations"] = completed
+                    progress["failedOperations"] = failed
                 
-                if total_files > 0:
-                    progress["progressPercentage"] = (files_processed / total_files) * 100
-                else:
-                    progress["progressPercentage"] = (completed / total) * 100 if total else 100
+                    if total_files > 0:
+                        progress["progressPercentage"] = (files_processed / total_files) * 100
+                    else:
+                        progress["progressPercentage"] = (completed / total) * 100 if total else 100
                 
-                elapsed = time.time() - start_time
-                if files_processed > 0 and elapsed > 0:
-                    files_per_sec = files_processed / elapsed
-                    remaining_files = total_files - files_processed
-                    progress["etaSeconds"] = (
-                        int(remaining_files / files_per_sec) if files_per_sec > 0 else None
-                    )
+                    elapsed = time.time() - start_time
+                    if files_processed > 0 and elapsed > 0:
+                        files_per_sec = files_processed / elapsed
+                        remaining_files = total_files - files_processed
+                        progress["etaSeconds"] = (
+                            int(remaining_files / files_per_sec) if files_per_sec > 0 else None
+                        )
                 
-                self._write_progress(batch_id, progress)
+                    self._write_progress(batch_id, progress)
                 
-        def process_single_file(src_file: str, dst_file: str, file_size: int, file_name: str):
-            """Process a single file with multithreaded copy"""
-            nonlocal files_processed
+            def process_single_file(src_file: str, dst_file: str, file_size: int, file_name: str, try_rename: bool = True):
+                """Process a single file with multithreaded copy (try_rename=False: a move known to cross devices)"""
+                nonlocal files_processed
             
-            try:
-                # Check for cancellation
-                if batch_id and self.is_cancelled(batch_id):
-                    raise Exception("Operation cancelled")
-                    raise
+                try:
+                    # Check for cancellation
+                    if batch_id and self.is_cancelled(batch_id):
+                        raise Exception("Operation cancelled")
+                        raise
         
-                print(f"[MULTITHREAD] Processing file: {file_name} ({file_size} bytes)", file=sys.stderr)
+                    print(f"[MULTITHREAD] Processing file: {file_name} ({file_size} bytes)", file=sys.stderr)
+                    self._journal_file(batch_id, dst_file, STATUS_IN_PROGRESS)
                 
-                if operation_type == "copy":
-                    # Use multithreaded copy for large files
-                    print(f"[MULTITHREAD] Starting COPY operation from {src_file} to {dst_file}", file=sys.stderr)
+                    if operation_type == "copy":
+                        # Use multithreaded copy for large files
+                        print(f"[MULTITHREAD] Starting COPY operation from {src_file} to {dst_file}", file=sys.stderr)
                     
-                    # Ensure paths are properly formatted and normalized
-                    src_norm = os.path.normpath(src_file)
-                    dst_norm = os.path.normpath(dst_file)
-                    print(f"[MULTITHREAD] Normalized paths - src: {src_norm}, dst: {dst_norm}", file=sys.stderr)
+                        # Ensure paths are properly formatted and normalized
+                        src_norm = os.path.normpath(src_file)
+                        dst_norm = os.path.normpath(dst_file)
+                        print(f"[MULTITHREAD] Normalized paths - src: {src_norm}, dst: {dst_norm}", file=sys.stderr)
                     
-                    try:
-                        self._multithreaded_copy(src_norm, dst_norm, batch_id, max_workers)
-                        print(f"[MULTITHREAD] COPY operation completed successfully", file=sys.stderr)
+                        try:
+                            self._multithreaded_copy(src_norm, dst_norm, batch_id, max_workers, transfer_engine)
+                            print(f"[MULTITHREAD] COPY operation completed successfully", file=sys.stderr)
                         
-                        # Double-check that file was actually copied
-                        if not os.path.exists(dst_norm):
-                            print(f"[CRITICAL] Copy reported success but destination file doesn't exist: {dst_norm}", file=sys.stderr)
-                            raise FileNotFoundError(f"Destination file not created: {dst_norm}")
+                            # Double-check that file was actually copied
+                            if not os.path.exists(dst_norm):
+                                print(f"[CRITICAL] Copy reported success but destination file doesn't exist: {dst_norm}", file=sys.stderr)
+                                raise FileNotFoundError(f"Destination file not created: {dst_norm}")
                             
-                    except Exception as copy_error:
-                        print(f"[CRITICAL] COPY operation failed with error: {copy_error}", file=sys.stderr)
-                        raise
+                        except Exception as copy_error:
+                            print(f"[CRITICAL] COPY operation failed with error: {copy_error}", file=sys.stderr)
+                            raise
                     
-                    # Verify copy
-                    if not os.path.exists(dst_file):
-                        raise RuntimeError(f"Copy failed - destination not created: {dst_file}")
+                        # Verify copy
+                        if not os.path.exists(dst_file):
+                            raise RuntimeError(f"Copy failed - destination not created: {dst_file}")
                     
-                    dst_size = os.path.getsize(dst_file)
-                    if dst_size != file_size:
-                        raise RuntimeError(f"Copy size mismatch - expected: {file_size}, got: {dst_size}")
+                        dst_size = os.path.getsize(dst_file)
+                        if dst_size != file_size:
+                            raise RuntimeError(f"Copy size mismatch - expected: {file_size}, got: {dst_size}")
+                        method = METHOD_COPY
                     
-                else:  # move
-                    # For move operations, use atomic move (which may fall back to copy+delete)
-                    self._atomic_move(src_file, dst_file, batch_id)
+                    else:  # move
+                        # For move operations, use atomic move (which may fall back to copy+delete)
+                        method = self._atomic_move(src_file, dst_file, batch_id, transfer_engine, try_rename)
                     
-                    # Verify move
-                    if os.path.exists(src_file):
-                        raise RuntimeError(f"Move failed - source still exists: {src_file}")
+                        # Verify move
+                        if os.path.exists(src_file):
+                            raise RuntimeError(f"Move failed - source still exists: {src_file}")
                 
-                # Update progress
-                with files_lock:
-                    files_processed += 1
-                    progress["processedSize"] += file_size
+                    # Update progress
+                    with files_lock:
+                        files_processed += 1
+                        progress["processedSize"] += file_size
                 
-                update_progress_thread_safe()
-                print(f"[MULTITHREAD] File completed: {file_name}", file=sys.stderr)
-                return True
+                    self._journal_done(batch_id, src_file, dst_file, file_size, method)
+                    update_progress_thread_safe()
+                    print(f"[MULTITHREAD] File completed: {file_name}", file=sys.stderr)
+                    return True
                 
-            except Exception as e:
-                print(f"[MULTITHREAD] File failed {file_name}: {e}", file=sys.stderr)
-                return False
+                except Exception as e:
+                    print(f"[MULTITHREAD] File failed {file_name}: {e}", file=sys.stderr)
+                    self._journal_file(batch_id, dst_file, STATUS_FAILED, error=str(e))
+                    return False
         
-        def process_mapping(mapping: Dict[str, Any]):
-            """Process a single mapping (which may contain multiple files for sequences)"""
-            nonlocal completed, failed
+            def plan_mapping(mapping: Dict[str, Any]):
+                """
+                Validate a mapping and expand it into file tasks (src, dst, size, name).
+                Returns (result, tasks): result is set when the mapping fails before any file is queued.
+                """
+                mapping_id = mapping.get('id', 'unknown-id')
+                print(f"[DEBUG] Planning mapping with ID: {mapping_id}", file=sys.stderr)
             
-            mapping_id = mapping.get('id', 'unknown-id')
-            print(f"[DEBUG] Starting process_mapping with ID: {mapping_id}", file=sys.stderr)
-            
-            try:
-                if self.is_cancelled(batch_id):
-                    print(f"[DEBUG] Operation cancelled for mapping {mapping_id}", file=sys.stderr)
-                    return {"id": mapping_id, "success": False, "error": "Operation cancelled"}
-                
-                # Get source and target paths, ensuring they're present
-                src = mapping.get("sourcePath")
-                dst = mapping.get("targetPath")
+                try:
+                    # Get source and target paths, ensuring they're present
+                    src = mapping.get("sourcePath")
+                    dst = mapping.get("targetPath")
                 
-                if not src:
-                    print(f"[ERROR] Missing source path in mapping {mapping_id}", file=sys.stderr)
-                    return {"id": mapping_id, "success": False, "error": "Missing source path"}
+                    if not src:
+                        print(f"[ERROR] Missing source path in mapping {mapping_id}", file=sys.stderr)
+                        return {"id": mapping_id, "success": False, "error": "Missing source path"}, []
                     
-                if not dst:
-                    print(f"[ERROR] Missing target path in mapping {mapping_id}", file=sys.stderr)
-                    return {"id": mapping_id, "success": False, "error": "Missing target path"}
+                    if not dst:
+                        print(f"[ERROR] Missing target path in mapping {mapping_id}", file=sys.stderr)
+                        return {"id": mapping_id, "success": False, "error": "Missing target path"}, []
                     
-                # Normalize paths
-                src = os.path.normpath(src)
-                dst = os.path.normpath(dst)
+                    # Normalize paths
+                    src = os.path.normpath(src)
+                    dst = os.path.normpath(dst)
                 
-                print(f"[DEBUG] Processing mapping - src: {src}", file=sys.stderr)
-                print(f"[DEBUG] Processing mapping - dst: {dst}", file=sys.stderr)
+                    print(f"[DEBUG] Processing mapping - src: {src}", file=sys.stderr)
+                    print(f"[DEBUG] Processing mapping - dst: {dst}", file=sys.stderr)
                 
-                if mapping.get("type") == "sequence" and "sequence" in mapping:
-                    # Handle sequence - process files in parallel
-                    print(f"[DEBUG] Handling sequence mapping", file=sys.stderr)
-                    seq_info = mapping["sequence"]
-                    print(f"[DEBUG] Sequence info keys: {seq_info.keys() if isinstance(seq_info, dict) else 'Not a dict'}", file=sys.stderr)
-                    
-                    actual_files = seq_info.get("files", [])
-                    print(f"[DEBUG] Found {len(actual_files)} files in sequence", file=sys.stderr)
-                    
-                    if not actual_files:
-                        print(f"[DEBUG] No files found in sequence, returning error", file=sys.stderr)
-                        return {"id": mapping.get("id"), "success": False, "error": "No files found in sequence"}
+                    if mapping.get("type") == "sequence" and "sequence" in mapping:
+                        # Handle sequence - every frame is its own task in the small-file lane
+                        print(f"[DEBUG] Handling sequence mapping", file=sys.stderr)
+                        seq_info = mapping["sequence"]
+                        print(f"[DEBUG] Sequence info keys: {seq_info.keys() if isinstance(seq_info, dict) else 'Not a dict'}", file=sys.stderr)
                     
-                    dst_dir = os.path.dirname(dst)
-                    print(f"[DEBUG] Destination directory: {dst_dir}", file=sys.stderr)
+                        actual_files = _sequence_frame_paths(seq_info)
+                        print(f"[DEBUG] Found {len(actual_files)} files in sequence", file=sys.stderr)
                     
-                    # Print first few files for debugging
-                    for i, file_info in enumerate(actual_files[:3]):
-                        print(f"[DEBUG] File {i+1} info: path={file_info.get('path')}, name={file_info.get('name')}, size={file_info.get('size')}", file=sys.stderr)
+                        if not actual_files:
+                            print(f"[DEBUG] No files found in sequence, returning error", file=sys.stderr)
+                            return {"id": mapping.get("id"), "success": False, "error": "No files found in sequence"}, []
                     
-                    frames_processed = 0
+                        dst_dir = os.path.dirname(dst)
+                        print(f"[DEBUG] Destination directory: {dst_dir}", file=sys.stderr)
                     
-                    print(f"[MULTITHREAD] Processing sequence with {len(actual_files)} files", file=sys.stderr)
+                        # Print first few files for debugging
+                        for i, src_file in enumerate(actual_files[:3]):
+                            print(f"[DEBUG] File {i+1}: {src_file}", file=sys.stderr)
                     
-                    # Process sequence files with limited concurrency to avoid overwhelming the system
-                    with ThreadPoolExecutor(max_workers=min(file_workers, len(actual_files))) as seq_executor:
-                        seq_futures = []
-                        
-                        for file_info in actual_files:
-                            if self.is_cancelled(batch_id):
-                                break
-                            
-                            src_file = file_info.get("path", "")
-                            filename = file_info.get("name", "")
-                            file_size = file_info.get("size", 0)
-                            
-                            if not src_file or not os.path.exists(src_file):
-                                continue
-                            
-                            dst_file = os.path.join(dst_dir, filename)
-                            
-                            future = seq_executor.submit(process_single_file, src_file, dst_file, file_size, filename)
-                            seq_futures.append(future)
-                        
-                        # Wait for all sequence files to complete
-                        for future in as_completed(seq_futures):
-                            if future.result():
-                                frames_processed += 1
+                        tasks = []
+                        for src_file in actual_files:
+                            filename = os.path.basename(src_file)
+                            try:
+                                file_size = os.path.getsize(src_file)
+                            except OSError:
+                                continue  # Missing frame
+                            tasks.append((src_file, os.path.join(dst_dir, filename), file_size, filename))
                     
-                    # Determine sequence result
-                    if frames_processed == 0:
-                        return {"id": mapping.get("id"), "success": False, "error": "No files could be processed"}
-                    elif frames_processed < len(actual_files):
-                        return {"id": mapping.get("id"), "success": True, "warning": f"Partial success: {frames_processed}/{len(actual_files)} files"}
-                    else:
-                        return {"id": mapping.get("id"), "success": True}
+                        print(f"[MULTITHREAD] Queued sequence with {len(tasks)} of {len(actual_files)} files", file=sys.stderr)
+                        return None, tasks
                 
-                else:
                     # Handle single file
-                    if not src or not os.path.exists(src):
-                        return {"id": mapping.get("id"), "success": False, "error": f"Source file not found: {src}"}
-                    
-                    file_size = os.path.getsize(src)
-                    filename = os.path.basename(src)
-                    
-                    if process_single_file(src, dst, file_size, filename):
-                        return {"id": mapping.get("id"), "success": True}
-                    else:
-                        return {"id": mapping.get("id"), "success": False, "error": "File processing failed"}
+                    if not os.path.exists(src):
+                        return {"id": mapping.get("id"), "success": False, "error": f"Source file not found: {src}"}, []
+                
+                    return None, [(src, dst, os.path.getsize(src), os.path.basename(src))]
                         
-            except Exception as e:
-                return {"id": mapping.get("id"), "success": False, "error": str(e)}
-        
-        # Process all mappings with limited concurrency
-        print(f"[MULTITHREAD] Starting multithreaded processing with {file_workers} concurrent mappings", file=sys.stderr)
+                except Exception as e:
+                    return {"id": mapping.get("id"), "success": False, "error": str(e)}, []
         
-        with ThreadPoolExecutor(max_workers=file_workers) as executor:
-            mapping_futures = []
+            def mapping_result(mapping: Dict[str, Any], outcomes: List[Any]) -> Dict[str, Any]:
+                """Wait for a mapping's file tasks (lane futures, or True for files renamed in place) and fold them into one result."""
+                files_ok = 0
+                for outcome in outcomes:
+                    try:
+                        if outcome is True or (outcome is not None and outcome.result()):
+                            files_ok += 1
+                    except Exception as e:  # Cancelled while waiting for lane budget
+                        print(f"[MULTITHREAD] File task not run: {e}", file=sys.stderr)
+            
+                if mapping.get("type") == "sequence" and "sequence" in mapping:
+                    total_frames = _sequence_frame_count(mapping["sequence"])
+                    if files_ok == 0:
+                        return {"id": mapping.get("id"), "success": False, "error": "No files could be processed"}
+                    elif files_ok < total_frames:
+                        return {"id": mapping.get("id"), "success": True, "warning": f"Partial success: {files_ok}/{total_frames} files"}
+                    return {"id": mapping.get("id"), "success": True}
             
+                if files_ok:
+                    return {"id": mapping.get("id"), "success": True}
+                return {"id": mapping.get("id"), "success": False, "error": "File processing failed"}
+        
+            # Small files and large files run in separate lanes that share one in-flight byte budget
+            # (see file_operations_utils/transfer_lanes.py), so neither kind holds up the other
+            lanes = DualLaneExecutor(
+                small_workers=small_file_workers or DEFAULT_SMALL_LANE_WORKERS,
+                large_workers=file_workers,
+                byte_budget=byte_budget or DEFAULT_BYTE_BUDGET,
+                cancel_check=lambda: self.is_cancelled(batch_id),
+            )
+            print(f"[MULTITHREAD] Starting dual-lane processing: {lanes.workers[LANE_SMALL]} small-file workers, "
+                  f"{lanes.workers[LANE_LARGE]} large-file streams, {lanes.budget.capacity // (1024 * 1024)} MB in flight", file=sys.stderr)
+        
+            planned = []
             for mapping in mappings:
                 if self.is_cancelled(batch_id):
                     break
-                future = executor.submit(process_mapping, mapping)
-                mapping_futures.append(future)
+                early_result, tasks = plan_mapping(mapping)
+                planned.append((mapping, early_result, tasks))
+        
+            self._begin_journal(batch_id, operation_type, [(src_file, dst_file, size) for _, _, tasks in planned for src_file, dst_file, size, _ in tasks], {
+                "mode": "multithreaded",
+                "max_workers": max_workers,
+                "file_workers": file_workers,
+                "small_file_workers": small_file_workers,
+                "byte_budget": byte_budget,
+                "transfer_engine": transfer_engine,
+                "priority": priority,
+                "checksum": checksum,
+            })
+        
+            # Every destination directory is created once, up front; the per-file copies skip theirs
+            self._create_directory_plan(batch_id, [dst_file for _, _, tasks in planned for _, dst_file, _, _ in tasks])
+        
+            # Per task: True once renamed in place, else its lane future
+            outcomes = [[None] * len(tasks) for _, _, tasks in planned]
+            cross_device = set()
+            rename_stats = None
+            if operation_type == "move" and not self.is_cancelled(batch_id):
+                # Moves within a volume are renames: st_dev is compared once per (source folder, destination
+                # folder) pair and those files go through one tight parallel rename loop, not the lanes
+                same_volume, crossing = split_by_device([
+                    (src_file, dst_file, m_index, t_index)
+                    for m_index, (_, _, tasks) in enumerate(planned)
+                    for t_index, (src_file, dst_file, _, _) in enumerate(tasks)
+                ])
+                cross_device = {(m_index, t_index) for _, _, m_index, t_index in crossing}
+                last_write = [time.monotonic()]
             
-            # Collect results
-            for future in as_completed(mapping_futures):
-                if self.is_cancelled(batch_id):
-                    break
+                def on_renamed(index: int) -> None:
+                    nonlocal files_processed
+                    src_file, dst_file, m_index, t_index = same_volume[index]
+                    file_size = planned[m_index][2][t_index][2]
+                    outcomes[m_index][t_index] = True
+                    self._journal_done(batch_id, src_file, dst_file, file_size, METHOD_RENAME)
+                    with files_lock:
+                        files_processed += 1
+                        progress["processedSize"] += file_size
+                        write = time.monotonic() - last_write[0] >= 0.25
+                        if write:
+                            last_write[0] = time.monotonic()
+                    if write:
+                        update_progress_thread_safe()
+            
+                rename_stats = rename_files(
+                    [(src_file, dst_file) for src_file, dst_file, _, _ in same_volume],
+                    max_workers=small_file_workers or DEFAULT_SMALL_LANE_WORKERS,
+                    cancel_check=lambda: self.is_cancelled(batch_id),
+                    on_renamed=on_renamed,
+                )
+                update_progress_thread_safe()
+                print(f"[RENAME] {rename_stats['renamed']} of {len(same_volume)} same-volume moves renamed in "
+                      f"{rename_stats['seconds']:.3f}s; {len(crossing)} cross-device moves go to the lanes", file=sys.stderr)
+                for index, error in list(rename_stats["failed"].items())[:10]:
+                    print(f"[RENAME] Rename failed, retrying through the regular move: {same_volume[index][0]}: {error}", file=sys.stderr)
+                rename_stats = {"renamed": rename_stats["renamed"], "cancelled": rename_stats["cancelled"],
+                                "seconds": round(rename_stats["seconds"], 3)}
+                rename_stats["fallbacks"] = len(same_volume) - rename_stats["renamed"]
+                rename_stats["cross_device"] = len(crossing)
+        
+            with lanes:
+                for m_index, (_, _, tasks) in enumerate(planned):
+                    for t_index, (src_file, dst_file, size, name) in enumerate(tasks):
+                        if outcomes[m_index][t_index] is None:
+                            outcomes[m_index][t_index] = lanes.submit(
+                                size, process_single_file, src_file, dst_file, size, name, (m_index, t_index) not in cross_device)
+            
+                # Collect results
+                for (mapping, early_result, _), mapping_outcomes in zip(planned, outcomes):
+                    if self.is_cancelled(batch_id):
+                        break
                 
-                result = future.result()
+                    result = early_result or mapping_result(mapping, mapping_outcomes)
                 
-                with results_lock:
-                    results.append(result)
-                    if result.get("success"):
-                        completed += 1
-                    else:
-                        failed += 1
+                    with results_lock:
+                        results.append(result)
+                        if result.get("success"):
+                            completed += 1
+                        else:
+                            failed += 1
                 
-                update_progress_thread_safe()
+                    update_progress_thread_safe()
         
-        # Final status
-        if self.is_cancelled(batch_id):
-            progress["status"] = "cancelled"
-            progress["isCancelled"] = True
-            success = False
-            message = f"Operation cancelled after {completed} successful operations"
-        else:
-            progress["status"] = "completed"
-            success = True
-            message = f"Completed {completed} operations, {failed} failed"
+            lane_stats = lanes.stats()
+            print(f"[MULTITHREAD] Lanes: {lane_stats}", file=sys.stderr)
+            manifest_path = self._finish_manifest(batch_id)
         
-        self._write_progress(batch_id, progress)
+            # Final status
+            if self.is_cancelled(batch_id):
+                progress["status"] = "cancelled"
+                progress["isCancelled"] = True
+                success = False
+                message = f"Operation cancelled after {completed} successful operations"
+            else:
+                progress["status"] = "completed"
+                success = True
+                message = f"Completed {completed} operations, {failed} failed"
         
-        return {
-            "success": success,
-            "success_count": completed,
-            "error_count": failed,
-            "results": results,
-            "batch_id": batch_id,
-            "operations_count": total,
-            "cancelled": self.is_cancelled(batch_id),
-            "message": message
-        }
+            self._write_progress(batch_id, progress)
+            self._finish_journal(batch_id, progress["status"])
+        
+            return {
+                "success": success,
+                "success_count": completed,
+                "error_count": failed,
+                "results": results,
+                "batch_id": batch_id,
+                "operations_count": total,
+                "cancelled": self.is_cancelled(batch_id),
+                "message": message,
+                "lanes": lane_stats,
+                "renames": rename_stats,
+                "manifest": manifest_path
+            }
+        finally:
+            self._forget_batch(batch_id)
 
     def apply_mappings(
         self,
@@ -786,32 +851,79 @@ class FileOperations:
         operation_type: str = "move",
         validate_sequences: bool = True,
         batch_id: Optional[str] = None,
+        transfer_engine: Optional[str] = None,
+        priority: Optional[Any] = None,
+        checksum: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Apply file move/copy operations and update progress state for frontend polling.
+        transfer_engine selects the copy engine for this batch ("auto", "copy_file_range",
+        "sendfile", "readinto"); by default the instance's transfer_engine is used.
+        priority ("high", "normal", "low") orders this batch's copies in the I/O scheduler queue.
+        checksum ("auto", "xxh3_128", "blake2b") hashes every copy inline into a checksum manifest
+        (see verify_batch); renames within a volume move no bytes and are not hashed.
         """
+        if transfer_engine is not None:
+            resolve_engines(transfer_engine)  # Reject unknown engine names before touching any file
         if batch_id is None:
             batch_id = str(uuid.uuid4())
-        total = len(mappings)
-        completed = 0
-        failed = 0
-        start_time = time.time()
+        self.batch_priorities[batch_id] = parse_priority(priority)
+        self._start_manifest(batch_id, checksum)
+        try:
+            total = len(mappings)
+            completed = 0
+            failed = 0
+            start_time = time.time()
         
-        # Calculate total files for better progress tracking
-        total_files = 0
-        for m in mappings:
-            if m.get("type") == "sequence" and "sequence" in m:
-                total_files += len(m["sequence"].get("files", []))
-            else:
-                total_files += 1
+            # Calculate total files for better progress tracking
+            total_files = 0
+            for m in mappings:
+                if m.get("type") == "sequence" and "sequence" in m:
+                    total_files += _sequence_frame_count(m["sequence"])
+                else:
+                    total_files += 1
         
-        files_processed = 0
+            files_processed = 0
         
-        # Try to load existing progress, or create new if none exists
-        try:
-            progress = self.get_progress(batch_id)
-            if "error" in progress:
-                # No existing progress, create new
+            # Try to load existing progress, or create new if none exists
+            try:
+                progress = self.get_progress(batch_id)
+                if "error" in progress:
+                    # No existing progress, create new
+                    progress = {
+                        "batchId": batch_id,
+                        "totalOperations": total,
+                        "completedOperations": 0,
+                        "failedOperations": 0,
+                        "progressPercentage": 0.0,
+                        "totalSize": 0,
+                        "processedSize": 0,
+                        "etaSeconds": None,
+                        "status": "running",
+                        "isPaused": False,
+                        "isCancelled": False,
+                        "currentFile": None,
+                        "totalFiles": total_files,
+                        "filesProcessed": 0,
+                    }
+                    # Calculate total size
+                    for m in mappings:
+                        node = m.get("node") or m.get("sequence", {})
+                        if node:
+                            if m.get("type") == "sequence":
+                                progress["totalSize"] += m.get("sequence", {}).get("total_size", 0)
+                            else:
+                                progress["totalSize"] += node.get("size", 0)
+                            
+                    # Reset progress state
+                    progress["status"] = "running"
+                    progress["isCancelled"] = False
+                    progress["isPaused"] = False
+                    progress["startTime"] = time.time()
+                    progress["processedSize"] = 0
+                    self._write_progress(batch_id, progress)
+            except Exception:
+                # Fallback to creating new progress
                 progress = {
                     "batchId": batch_id,
                     "totalOperations": total,
@@ -827,7 +939,9 @@ class FileOperations:
                     "currentFile": None,
                     "totalFiles": total_files,
                     "filesProcessed": 0,
+                    "startTime": time.time()
                 }
+            
                 # Calculate total size
                 for m in mappings:
                     node = m.get("node") or m.get("sequence", {})
@@ -836,371 +950,375 @@ class FileOperations:
                             progress["totalSize"] += m.get("sequence", {}).get("total_size", 0)
                         else:
                             progress["totalSize"] += node.get("size", 0)
-                            
-                # Reset progress state
-                progress["status"] = "running"
-                progress["isCancelled"] = False
-                progress["isPaused"] = False
-                progress["startTime"] = time.time()
-                progress["processedSize"] = 0
                 self._write_progress(batch_id, progress)
-        except Exception:
-            # Fallback to creating new progress
-            progress = {
-                "batchId": batch_id,
-                "totalOperations": total,
-                "completedOperations": 0,
-                "failedOperations": 0,
-                "progressPercentage": 0.0,
-                "totalSize": 0,
-                "processedSize": 0,
-                "etaSeconds": None,
-                "status": "running",
-                "isPaused": False,
-                "isCancelled": False,
-                "currentFile": None,
-                "totalFiles": total_files,
-                "filesProcessed": 0,
-                "startTime": time.time()
-            }
-            
-            # Calculate total size
-            for m in mappings:
-                node = m.get("node") or m.get("sequence", {})
-                if node:
-                    if m.get("type") == "sequence":
-                        progress["totalSize"] += m.get("sequence", {}).get("total_size", 0)
-                    else:
-                        progress["totalSize"] += node.get("size", 0)
-            self._write_progress(batch_id, progress)
         
-        results = []
+            results = []
         
-        def update_progress_with_files():
-            """Update progress based on files processed, not just mappings completed"""
-            progress["filesProcessed"] = files_processed
-            progress["completedOperations"] = completed
-            progress["failedOperations"] = failed
-            
-            # Calculate percentage based on files processed for more granular updates
-            if total_files > 0:
-                file_percentage = (files_processed / total_files) * 100
-                mapping_percentage = (completed / total) * 100 if total > 0 else 0
-                # Use the more granular file-based percentage
-                progress["progressPercentage"] = file_percentage
-            else:
-                progress["progressPercentage"] = (completed / total) * 100 if total else 100
+            def update_progress_with_files():
+                """Update progress based on files processed, not just mappings completed"""
+                progress["filesProcessed"] = files_processed
+                progress["completedOperations"] = completed
+                progress["failedOperations"] = failed
             
-            elapsed = time.time() - start_time
-            if files_processed > 0 and elapsed > 0:
-                files_per_sec = files_processed / elapsed
-                remaining_files = total_files - files_processed
-                progress["etaSeconds"] = (
-                    int(remaining_files / files_per_sec) if files_per_sec > 0 else None
-                )
+                # Calculate percentage based on files processed for more granular updates
+                if total_files > 0:
+                    file_percentage = (files_processed / total_files) * 100
+                    mapping_percentage = (completed / total) * 100 if total > 0 else 0
+                    # Use the more granular file-based percentage
+                    progress["progressPercentage"] = file_percentage
+                else:
+                    progress["progressPercentage"] = (completed / total) * 100 if total else 100
             
-            # Write to JSON file (for fallback)
-            self._write_progress(batch_id, progress)
+                elapsed = time.time() - start_time
+                if files_processed > 0 and elapsed > 0:
+                    files_per_sec = files_processed / elapsed
+                    remaining_files = total_files - files_processed
+                    progress["etaSeconds"] = (
+                        int(remaining_files / files_per_sec) if files_per_sec > 0 else None
+                    )
             
-        for i, mapping in enumerate(mappings):
-            # Check for cancellation before processing each mapping
-            if self.is_cancelled(batch_id):
-                print(f"[INFO] Operation cancelled by user at mapping {i+1}/{total}", file=sys.stderr)
-                progress["status"] = "cancelled"
-                progress["isCancelled"] = True
+                # Write to JSON file (for fallback)
                 self._write_progress(batch_id, progress)
-                return {
-                    "success": False,
-                    "success_count": completed,
-                    "error_count": failed,
-                    "results": results,
-                    "batch_id": batch_id,
-                    "operations_count": total,
-                    "cancelled": True,
-                    "message": f"Operation cancelled after {completed} successful operations"
-                }
+        
+            # Journal every file of the batch as planned before any data moves
+            journal_files = []
+            for m in mappings:
+                if not m.get("targetPath"):
+                    continue
+                if m.get("type") == "sequence" and "sequence" in m:
+                    seq_dst_dir = os.path.dirname(m["targetPath"])
+                    journal_files.extend(
+                        (path, os.path.join(seq_dst_dir, os.path.basename(path)), None)
+                        for path in _sequence_frame_paths(m["sequence"])
+                    )
+                elif m.get("sourcePath"):
+                    journal_files.append((m["sourcePath"], m["targetPath"], (m.get("node") or {}).get("size")))
+            self._begin_journal(batch_id, operation_type, journal_files, {
+                "mode": "sequential",
+                "transfer_engine": transfer_engine,
+                "priority": priority,
+                "checksum": checksum,
+            })
+        
+            # Sequence frames and single files all land in dirname(targetPath): create those once, up front
+            self._create_directory_plan(batch_id, [os.path.normpath(m["targetPath"]) for m in mappings if m.get("targetPath")])
             
-            try:
-                src = mapping.get("sourcePath")
-                dst = mapping.get("targetPath")
-                progress["currentFile"] = src
-                # Ensure destination directory exists
-                if dst:
-                    dst_dir_for_mapping = os.path.dirname(dst)
-                    print(f"[INFO][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Attempting os.makedirs for: '{dst_dir_for_mapping}' (src='{src}', dst='{dst}')", file=sys.stderr)
-                    try:
-                        os.makedirs(dst_dir_for_mapping, exist_ok=True)
-                        print(f"[INFO][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Successfully created/ensured directory: '{dst_dir_for_mapping}'", file=sys.stderr)
-                    except FileNotFoundError as e_fnf:
-                        print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] FileNotFoundError during os.makedirs('{dst_dir_for_mapping}'): {e_fnf}", file=sys.stderr)
-                        print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Exception details: type={type(e_fnf)}, args={e_fnf.args}, filename='{e_fnf.filename}', filename2='{getattr(e_fnf, 'filename2', 'N/A')}' (strerror: {e_fnf.strerror}, winerror: {getattr(e_fnf, 'winerror', 'N/A')})", file=sys.stderr)
-                        results.append({"id": mapping.get("id"), "success": False, "error": f"Failed to create destination directory {dst_dir_for_mapping}: {e_fnf}"})
-                        failed += 1
-                        update_progress_with_files() # Local helper function
-                        continue # Skip to next mapping
-                    except OSError as e_os:
-                        print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] OSError during os.makedirs('{dst_dir_for_mapping}'): {e_os}", file=sys.stderr)
-                        print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Exception details: type={type(e_os)}, args={e_os.args}, filename='{getattr(e_os, 'filename', 'N/A')}' (strerror: {getattr(e_os, 'strerror', 'N/A')}, winerror: {getattr(e_os, 'winerror', 'N/A')})", file=sys.stderr)
-                        results.append({"id": mapping.get("id"), "success": False, "error": f"OSError creating destination directory {dst_dir_for_mapping}: {e_os}"})
-                        failed += 1
-                        update_progress_with_files() # Local helper function
-                        continue # Skip to next mapping
-                if mapping.get("type") == "sequence" and "sequence" in mapping:
-                    # Handle image sequence: use the actual discovered file list
-                    seq_info = mapping["sequence"]
-                    actual_files = seq_info.get("files", [])
+            for i, mapping in enumerate(mappings):
+                # Check for cancellation before processing each mapping
+                if self.is_cancelled(batch_id):
+                    print(f"[INFO] Operation cancelled by user at mapping {i+1}/{total}", file=sys.stderr)
+                    progress["status"] = "cancelled"
+                    progress["isCancelled"] = True
+                    self._write_progress(batch_id, progress)
+                    self._finish_journal(batch_id, "cancelled")
+                    return {
+                        "success": False,
+                        "success_count": completed,
+                        "error_count": failed,
+                        "results": results,
+                        "batch_id": batch_id,
+                        "operations_count": total,
+                        "cancelled": True,
+                        "manifest": self._finish_manifest(batch_id),
+                        "message": f"Operation cancelled after {completed} successful operations"
+                    }
+            
+                try:
+                    src = mapping.get("sourcePath")
+                    dst = mapping.get("targetPath")
+                    progress["currentFile"] = src
+                    # Ensure destination directory exists (unless the directory plan already created it)
+                    if dst and not self._directory_ready(batch_id, os.path.dirname(dst)):
+                        dst_dir_for_mapping = os.path.dirname(dst)
+                        print(f"[INFO][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Attempting os.makedirs for: '{dst_dir_for_mapping}' (src='{src}', dst='{dst}')", file=sys.stderr)
+                        try:
+                            os.makedirs(dst_dir_for_mapping, exist_ok=True)
+                            print(f"[INFO][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Successfully created/ensured directory: '{dst_dir_for_mapping}'", file=sys.stderr)
+                        except FileNotFoundError as e_fnf:
+                            print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] FileNotFoundError during os.makedirs('{dst_dir_for_mapping}'): {e_fnf}", file=sys.stderr)
+                            print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Exception details: type={type(e_fnf)}, args={e_fnf.args}, filename='{e_fnf.filename}', filename2='{getattr(e_fnf, 'filename2', 'N/A')}' (strerror: {e_fnf.strerror}, winerror: {getattr(e_fnf, 'winerror', 'N/A')})", file=sys.stderr)
+                            results.append({"id": mapping.get("id"), "success": False, "error": f"Failed to create destination directory {dst_dir_for_mapping}: {e_fnf}"})
+                            failed += 1
+                            update_progress_with_files() # Local helper function
+                            continue # Skip to next mapping
+                        except OSError as e_os:
+                            print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] OSError during os.makedirs('{dst_dir_for_mapping}'): {e_os}", file=sys.stderr)
+                            print(f"[ERROR][APPLY_MAPPINGS_GENERIC_MAKEDIRS] Exception details: type={type(e_os)}, args={e_os.args}, filename='{getattr(e_os, 'filename', 'N/A')}' (strerror: {getattr(e_os, 'strerror', 'N/A')}, winerror: {getattr(e_os, 'winerror', 'N/A')})", file=sys.stderr)
+                            results.append({"id": mapping.get("id"), "success": False, "error": f"OSError creating destination directory {dst_dir_for_mapping}: {e_os}"})
+                            failed += 1
+                            update_progress_with_files() # Local helper function
+                            continue # Skip to next mapping
+                    if mapping.get("type") == "sequence" and "sequence" in mapping:
+                        # Handle image sequence: use the actual discovered file list
+                        seq_info = mapping["sequence"]
+                        actual_files = _sequence_frame_paths(seq_info)
 
-                    if not actual_files:
-                        results.append(
-                            {
-                                "id": mapping.get("id"),
-                                "success": False,
-                                "error": "No files found in sequence",
-                            }
-                        )
-                        failed += 1
-                        continue
+                        if not actual_files:
+                            results.append(
+                                {
+                                    "id": mapping.get("id"),
+                                    "success": False,
+                                    "error": "No files found in sequence",
+                                }
+                            )
+                            failed += 1
+                            continue
 
-                    dst_dir = os.path.dirname(dst)
-                    frames_processed = 0
+                        dst_dir = os.path.dirname(dst)
+                        frames_processed = 0
 
-                    print(
-                        f"[DEBUG] Processing sequence with {len(actual_files)} files",
-                        file=sys.stderr,
-                    )
+                        print(
+                            f"[DEBUG] Processing sequence with {len(actual_files)} files",
+                            file=sys.stderr,
+                        )
 
-                    for file_index, file_info in enumerate(actual_files):
-                        # Check for cancellation before processing each file in sequence
-                        if self.is_cancelled(batch_id):
-                            print(f"[INFO] Operation cancelled during sequence processing at file {file_index+1}/{len(actual_files)}", file=sys.stderr)
-                            progress["status"] = "cancelled"
-                            progress["isCancelled"] = True
-                            self._write_progress(batch_id, progress)
+                        for file_index, src_file in enumerate(actual_files):
+                            # Check for cancellation before processing each file in sequence
+                            if self.is_cancelled(batch_id):
+                                print(f"[INFO] Operation cancelled during sequence processing at file {file_index+1}/{len(actual_files)}", file=sys.stderr)
+                                progress["status"] = "cancelled"
+                                progress["isCancelled"] = True
+                                self._write_progress(batch_id, progress)
+                                self._finish_journal(batch_id, "cancelled")
                             
-                            # Send immediate WebSocket update
-                            return {
-                                "success": False,
-                                "success_count": completed,
-                                "error_count": failed,
-                                "results": results,
-                                "batch_id": batch_id,
-                                "operations_count": total,
-                                "cancelled": True,
-                                "message": f"Operation cancelled during sequence processing at file {file_index+1}/{len(actual_files)}"
-                            }
+                                # Send immediate WebSocket update
+                                return {
+                                    "success": False,
+                                    "success_count": completed,
+                                    "error_count": failed,
+                                    "results": results,
+                                    "batch_id": batch_id,
+                                    "operations_count": total,
+                                    "cancelled": True,
+                                    "manifest": self._finish_manifest(batch_id),
+                                    "message": f"Operation cancelled during sequence processing at file {file_index+1}/{len(actual_files)}"
+                                }
                         
-                        src_file = file_info.get("path", "")
-                        filename = file_info.get("name", "")
+                            filename = os.path.basename(src_file)
 
-                        if not src_file or not os.path.exists(src_file):
-                            continue
+                            if not os.path.exists(src_file):
+                                continue
                         
-                        dst_file = os.path.join(dst_dir, filename)
+                            dst_file = os.path.join(dst_dir, filename)
 
-                        try:
-                            os.makedirs(os.path.dirname(dst_file), exist_ok=True)
-                            # Get file size from the file info or actual file
-                            file_size = file_info.get("size", 0)
-                            if file_size == 0 and os.path.exists(src_file):
+                            try:
+                                if not self._directory_ready(batch_id, dst_dir):
+                                    os.makedirs(dst_dir, exist_ok=True)
                                 file_size = os.path.getsize(src_file)
 
-                            # Update progress BEFORE starting file operation
-                            progress["currentFile"] = src_file
-                            update_progress_with_files()
-
-                            print(
-                                f"[DEBUG] Sequence file: {operation_type} from {src_file} to {dst_file}",
-                                file=sys.stderr,
-                            )
+                                # Update progress BEFORE starting file operation
+                                progress["currentFile"] = src_file
+                                update_progress_with_files()
 
-                            # Pre-operation checks
-                            if not os.access(src_file, os.R_OK):
-                                raise PermissionError(f"No read permission for {src_file}")
-                            
-                            if os.path.exists(dst_file):
-                                print(f"[WARNING] Destination file already exists, will overwrite: {dst_file}", file=sys.stderr)
-
-                            if operation_type == "copy":
-                                print(
-                                    f"[DEBUG] Performing FORCE-KILLABLE COPY on {filename}",
-                                    file=sys.stderr,
-                                )
-                                self._force_kill_copy(src_file, dst_file, batch_id)
-                                
-                                # Verify copy was successful
-                                if not os.path.exists(dst_file):
-                                    raise RuntimeError(f"Copy operation failed - destination file not created: {dst_file}")
-                                
-                                dst_size = os.path.getsize(dst_file)
-                                src_size = os.path.getsize(src_file)
-                                if dst_size != src_size:
-                                    raise RuntimeError(f"Copy size mismatch - src: {src_size}, dst: {dst_size}")
-                                
-                                print(f"[DEBUG] Copy verified: {dst_size} bytes", file=sys.stderr)
-                                
-                            else:  # move
                                 print(
-                                    f"[DEBUG] Performing MOVE on {filename}",
+                                    f"[DEBUG] Sequence file: {operation_type} from {src_file} to {dst_file}",
                                     file=sys.stderr,
                                 )
-                                self._atomic_move(src_file, dst_file, batch_id)
 
-                                # Verify the move actually happened
-                                if os.path.exists(src_file):
-                                    print(
-                                        f"[CRITICAL ERROR] Source file still exists after move: {src_file}",
-                                        file=sys.stderr,
-                                    )
+                                self._journal_file(batch_id, dst_file, STATUS_IN_PROGRESS)
+                                # Pre-operation checks
+                                if not os.access(src_file, os.R_OK):
+                                    raise PermissionError(f"No read permission for {src_file}")
+                            
+                                if os.path.exists(dst_file):
+                                    print(f"[WARNING] Destination file already exists, will overwrite: {dst_file}", file=sys.stderr)
+
+                                if operation_type == "copy":
                                     print(
-                                        f"[CRITICAL ERROR] This indicates the move operation failed!",
+                                        f"[DEBUG] Performing FORCE-KILLABLE COPY on {filename}",
                                         file=sys.stderr,
                                     )
-                                    raise RuntimeError(f"Move operation failed - source file still exists: {src_file}")
-                                else:
+                                    self._force_kill_copy(src_file, dst_file, batch_id, transfer_engine)
+                                
+                                    # Verify copy was successful
+                                    if not os.path.exists(dst_file):
+                                        raise RuntimeError(f"Copy operation failed - destination file not created: {dst_file}")
+                                
+                                    dst_size = os.path.getsize(dst_file)
+                                    src_size = os.path.getsize(src_file)
+                                    if dst_size != src_size:
+                                        raise RuntimeError(f"Copy size mismatch - src: {src_size}, dst: {dst_size}")
+                                
+                                    print(f"[DEBUG] Copy verified: {dst_size} bytes", file=sys.stderr)
+                                    method = METHOD_COPY
+                                
+                                else:  # move
                                     print(
-                                        f"[DEBUG] Move verified: source file deleted: {src_file}",
+                                        f"[DEBUG] Performing MOVE on {filename}",
                                         file=sys.stderr,
                                     )
+                                    method = self._atomic_move(src_file, dst_file, batch_id, transfer_engine)
 
-                            print(
-                                f"[DEBUG] File {filename} operation completed successfully",
-                                file=sys.stderr,
-                            )
-                            progress["processedSize"] += file_size
-                            frames_processed += 1
-                            files_processed += 1
+                                    # Verify the move actually happened
+                                    if os.path.exists(src_file):
+                                        print(
+                                            f"[CRITICAL ERROR] Source file still exists after move: {src_file}",
+                                            file=sys.stderr,
+                                        )
+                                        print(
+                                            f"[CRITICAL ERROR] This indicates the move operation failed!",
+                                            file=sys.stderr,
+                                        )
+                                        raise RuntimeError(f"Move operation failed - source file still exists: {src_file}")
+                                    else:
+                                        print(
+                                            f"[DEBUG] Move verified: source file deleted: {src_file}",
+                                            file=sys.stderr,
+                                        )
+
+                                print(
+                                    f"[DEBUG] File {filename} operation completed successfully",
+                                    file=sys.stderr,
+                                )
+                                progress["processedSize"] += file_size
+                                frames_processed += 1
+                                files_processed += 1
+                                self._journal_done(batch_id, src_file, dst_file, file_size, method)
                             
-                            # Update progress AFTER each file (more frequent updates)
-                            progress["currentFile"] = src_file
-                            update_progress_with_files()
+                                # Update progress AFTER each file (more frequent updates)
+                                progress["currentFile"] = src_file
+                                update_progress_with_files()
                             
-                            # Additional cancellation check every 10 files for responsiveness
-                            if file_index % 10 == 0 and self.is_cancelled(batch_id):
-                                print(f"[INFO] Operation cancelled during sequence processing (periodic check) at file {file_index+1}/{len(actual_files)}", file=sys.stderr)
-                                progress["status"] = "cancelled"
-                                progress["isCancelled"] = True
-                                self._write_progress(batch_id, progress)
+                                # Additional cancellation check every 10 files for responsiveness
+                                if file_index % 10 == 0 and self.is_cancelled(batch_id):
+                                    print(f"[INFO] Operation cancelled during sequence processing (periodic check) at file {file_index+1}/{len(actual_files)}", file=sys.stderr)
+                                    progress["status"] = "cancelled"
+                                    progress["isCancelled"] = True
+                                    self._write_progress(batch_id, progress)
+                                    self._finish_journal(batch_id, "cancelled")
                                 
-                                return {
-                                    "success": False,
-                                    "success_count": completed,
-                                    "error_count": failed,
-                                    "results": results,
-                                    "batch_id": batch_id,
-                                    "operations_count": total,
-                                    "cancelled": True,
-                                    "message": f"Operation cancelled during sequence processing at file {file_index+1}/{len(actual_files)}"
-                                }
+                                    return {
+                                        "success": False,
+                                        "success_count": completed,
+                                        "error_count": failed,
+                                        "results": results,
+                                        "batch_id": batch_id,
+                                        "operations_count": total,
+                                        "cancelled": True,
+                                        "manifest": self._finish_manifest(batch_id),
+                                        "message": f"Operation cancelled during sequence processing at file {file_index+1}/{len(actual_files)}"
+                                    }
                             
-                        except Exception as e:
-                            error_msg = f"File {filename}: {e}"
-                            print(f"[ERROR] Failed to {operation_type} file {filename}: {e}", file=sys.stderr)
-                            print(f"[ERROR] Source: {src_file}", file=sys.stderr)
-                            print(f"[ERROR] Destination: {dst_file}", file=sys.stderr)
-                            print(f"[ERROR] Source exists: {os.path.exists(src_file)}", file=sys.stderr)
-                            print(f"[ERROR] Destination exists: {os.path.exists(dst_file)}", file=sys.stderr)
+                            except Exception as e:
+                                error_msg = f"File {filename}: {e}"
+                                self._journal_file(batch_id, dst_file, STATUS_FAILED, error=str(e))
+                                print(f"[ERROR] Failed to {operation_type} file {filename}: {e}", file=sys.stderr)
+                                print(f"[ERROR] Source: {src_file}", file=sys.stderr)
+                                print(f"[ERROR] Destination: {dst_file}", file=sys.stderr)
+                                print(f"[ERROR] Source exists: {os.path.exists(src_file)}", file=sys.stderr)
+                                print(f"[ERROR] Destination exists: {os.path.exists(dst_file)}", file=sys.stderr)
                             
-                            # Don't fail the entire sequence for individual file errors
-                            # Instead, track the error but continue processing other files
-                            print(f"[WARNING] Continuing with remaining files in sequence", file=sys.stderr)
+                                # Don't fail the entire sequence for individual file errors
+                                # Instead, track the error but continue processing other files
+                                print(f"[WARNING] Continuing with remaining files in sequence", file=sys.stderr)
 
-                    # Check if any files were actually processed
-                    print(f"[SUMMARY] Sequence processing complete:", file=sys.stderr)
-                    print(f"[SUMMARY]   Total files in sequence: {len(actual_files)}", file=sys.stderr)
-                    print(f"[SUMMARY]   Files successfully processed: {frames_processed}", file=sys.stderr)
-                    print(f"[SUMMARY]   Success rate: {(frames_processed/len(actual_files)*100):.1f}%", file=sys.stderr)
+                        # Check if any files were actually processed
+                        print(f"[SUMMARY] Sequence processing complete:", file=sys.stderr)
+                        print(f"[SUMMARY]   Total files in sequence: {len(actual_files)}", file=sys.stderr)
+                        print(f"[SUMMARY]   Files successfully processed: {frames_processed}", file=sys.stderr)
+                        print(f"[SUMMARY]   Success rate: {(frames_processed/len(actual_files)*100):.1f}%", file=sys.stderr)
                     
-                    if frames_processed == 0:
-                        failed += 1
-                        results.append(
-                            {
-                                "id": mapping.get("id"),
-                                "success": False,
-                                "error": f"No files could be processed - all {len(actual_files)} source files missing or inaccessible",
-                            }
-                        )
-                        print(f"[SUMMARY] Sequence marked as FAILED - no files processed", file=sys.stderr)
-                    elif frames_processed < len(actual_files):
-                        # Partial success - some files failed
-                        completed += 1
-                        results.append({
-                            "id": mapping.get("id"), 
-                            "success": True,
-                            "warning": f"Partial success: {frames_processed}/{len(actual_files)} files processed"
-                        })
-                        print(f"[SUMMARY] Sequence marked as SUCCESS with WARNING - partial processing", file=sys.stderr)
+                        if frames_processed == 0:
+                            failed += 1
+                            results.append(
+                                {
+                                    "id": mapping.get("id"),
+                                    "success": False,
+                                    "error": f"No files could be processed - all {len(actual_files)} source files missing or inaccessible",
+                                }
+                            )
+                            print(f"[SUMMARY] Sequence marked as FAILED - no files processed", file=sys.stderr)
+                        elif frames_processed < len(actual_files):
+                            # Partial success - some files failed
+                            completed += 1
+                            results.append({
+                                "id": mapping.get("id"), 
+                                "success": True,
+                                "warning": f"Partial success: {frames_processed}/{len(actual_files)} files processed"
+                            })
+                            print(f"[SUMMARY] Sequence marked as SUCCESS with WARNING - partial processing", file=sys.stderr)
+                        else:
+                            # Complete success
+                            completed += 1
+                            results.append({"id": mapping.get("id"), "success": True})
+                            print(f"[SUMMARY] Sequence marked as SUCCESS - all files processed", file=sys.stderr)
                     else:
-                        # Complete success
-                        completed += 1
-                        results.append({"id": mapping.get("id"), "success": True})
-                        print(f"[SUMMARY] Sequence marked as SUCCESS - all files processed", file=sys.stderr)
-                else:
-                    # Single file logic
-                    print(
-                        f"[DEBUG] Single file operation: {operation_type}",
-                        file=sys.stderr,
-                    )
-                    print(f"[DEBUG] Source: {src}", file=sys.stderr)
-                    print(f"[DEBUG] Destination: {dst}", file=sys.stderr)
+                        # Single file logic
+                        print(
+                            f"[DEBUG] Single file operation: {operation_type}",
+                            file=sys.stderr,
+                        )
+                        print(f"[DEBUG] Source: {src}", file=sys.stderr)
+                        print(f"[DEBUG] Destination: {dst}", file=sys.stderr)
 
-                    # Get file size before operation
-                    file_size = os.path.getsize(src) if os.path.exists(src) else 0
-                    print(f"[DEBUG] File size: {file_size}", file=sys.stderr)
+                        # Get file size before operation
+                        file_size = os.path.getsize(src) if os.path.exists(src) else 0
+                        print(f"[DEBUG] File size: {file_size}", file=sys.stderr)
+                        self._journal_file(batch_id, dst, STATUS_IN_PROGRESS)
 
-                    if operation_type == "copy":
-                        print(f"[DEBUG] Performing FORCE-KILLABLE COPY operation", file=sys.stderr)
-                        self._force_kill_copy(src, dst, batch_id)
-                    else:  # move
-                        print(f"[DEBUG] Performing MOVE operation", file=sys.stderr)
-                        self._atomic_move(src, dst, batch_id)
+                        if operation_type == "copy":
+                            print(f"[DEBUG] Performing FORCE-KILLABLE COPY operation", file=sys.stderr)
+                            self._force_kill_copy(src, dst, batch_id, transfer_engine)
+                            method = METHOD_COPY
+                        else:  # move
+                            print(f"[DEBUG] Performing MOVE operation", file=sys.stderr)
+                            method = self._atomic_move(src, dst, batch_id, transfer_engine)
 
-                        # Verify the move actually happened
-                        if os.path.exists(src):
-                            print(
-                                f"[CRITICAL ERROR] Source file still exists after move: {src}",
-                                file=sys.stderr,
-                            )
-                            print(
-                                f"[CRITICAL ERROR] This indicates the move operation failed!",
-                                file=sys.stderr,
-                            )
-                        else:
-                            print(
-                                f"[DEBUG] Move verified: source file deleted: {src}",
-                                file=sys.stderr,
-                            )
+                            # Verify the move actually happened
+                            if os.path.exists(src):
+                                print(
+                                    f"[CRITICAL ERROR] Source file still exists after move: {src}",
+                                    file=sys.stderr,
+                                )
+                                print(
+                                    f"[CRITICAL ERROR] This indicates the move operation failed!",
+                                    file=sys.stderr,
+                                )
+                            else:
+                                print(
+                                    f"[DEBUG] Move verified: source file deleted: {src}",
+                                    file=sys.stderr,
+                                )
 
-                    print(f"[DEBUG] Operation completed successfully", file=sys.stderr)
-                    completed += 1
-                    files_processed += 1
-                    progress["processedSize"] += file_size
-                    results.append({"id": mapping.get("id"), "success": True})
+                        print(f"[DEBUG] Operation completed successfully", file=sys.stderr)
+                        self._journal_done(batch_id, src, dst, file_size, method)
+                        completed += 1
+                        files_processed += 1
+                        progress["processedSize"] += file_size
+                        results.append({"id": mapping.get("id"), "success": True})
                 
-                # Update progress after each mapping
-                update_progress_with_files()
+                    # Update progress after each mapping
+                    update_progress_with_files()
                 
-            except Exception as e:
-                failed += 1
-                results.append(
-                    {"id": mapping.get("id"), "success": False, "error": str(e)}
-                )
-                update_progress_with_files()
+                except Exception as e:
+                    failed += 1
+                    results.append(
+                        {"id": mapping.get("id"), "success": False, "error": str(e)}
+                    )
+                    if dst and not (mapping.get("type") == "sequence" and "sequence" in mapping):
+                        self._journal_file(batch_id, dst, STATUS_FAILED, error=str(e))
+                    update_progress_with_files()
                 
-        progress["status"] = (
-            "completed"
-            if failed == 0
-            else ("completed_with_errors" if completed > 0 else "failed")
-        )
-        progress["currentFile"] = None
-        self._write_progress(batch_id, progress)
-        return {
-            "success": failed == 0,
-            "success_count": completed,
-            "error_count": failed,
-            "results": results,
-            "batch_id": batch_id,
-            "operations_count": total,
-        }
+            progress["status"] = (
+                "completed"
+                if failed == 0
+                else ("completed_with_errors" if completed > 0 else "failed")
+            )
+            progress["currentFile"] = None
+            self._write_progress(batch_id, progress)
+            self._finish_journal(batch_id, progress["status"])
+            manifest_path = self._finish_manifest(batch_id)
+            return {
+                "success": failed == 0,
+                "success_count": completed,
+                "error_count": failed,
+                "results": results,
+                "batch_id": batch_id,
+                "operations_count": total,
+                "manifest": manifest_path,
+            }
+        finally:
+            self._forget_batch(batch_id)
 
     def apply_mappings_async(
         self,
@@ -1208,6 +1326,9 @@ class FileOperations:
         operation_type: str = "move",
         validate_sequences: bool = True,
         batch_id: Optional[str] = None,
+        transfer_engine: Optional[str] = None,
+        priority: Optional[Any] = None,
+        checksum: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Start file operations asynchronously and return immediately with batch_id.
@@ -1215,6 +1336,11 @@ class FileOperations:
         """
         if batch_id is None:
             batch_id = str(uuid.uuid4())
+        if transfer_engine is not None:
+            resolve_engines(transfer_engine)
+        parse_priority(priority)  # Reject unknown priorities before starting the thread
+        if checksum:
+            resolve_algorithm(checksum)
         
         total = len(mappings)
         
@@ -1222,7 +1348,7 @@ class FileOperations:
         total_files = 0
         for m in mappings:
             if m.get("type") == "sequence" and "sequence" in m:
-                total_files += len(m["sequence"].get("files", []))
+                total_files += _sequence_frame_count(m["sequence"])
             else:
                 total_files += 1
         
@@ -1265,7 +1391,7 @@ class FileOperations:
                 
                 # Run the actual operations (reuse existing logic)
                 result = self.apply_mappings(
-                    mappings, operation_type, validate_sequences, batch_id
+                    mappings, operation_type, validate_sequences, batch_id, transfer_engine, priority, checksum
                 )
                 
                 # The apply_mappings method will handle all progress updates
@@ -1297,6 +1423,222 @@ class FileOperations:
             "async": True
         }
 
+    def resume_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Resume a journaled batch that crashed, was killed or was cancelled: files the journal has as
+        done are skipped, large files continue from their verified offset, everything else is
+        transferred again. The rest of the batch runs through apply_mappings_multithreaded with the
+        batch's original options; the result adds "resumed": {"files_done", "files_remaining",
+        "partial_files", "partial_bytes"}. GUI copies and moves (gui_components/file_operations_manager.py)
+        are journaled the same way and resume through this executor too. A batch that was undone (fully or partially) is not resumed:
+        that would redo the moves undo_batch just put back.
+        """
+        journal = self._get_journal()
+        batch = journal.load_batch(batch_id) if journal is not None else None
+        if batch is None:
+            return {"success": False, "batch_id": batch_id, "error": f"No journal found for batch {batch_id}"}
+        if batch["status"] in (STATUS_UNDONE, "partially_undone"):
+            return {"success": False, "batch_id": batch_id,
+                    "error": f"Batch {batch_id} was undone ({batch['status']}); start a new batch to move its files again"}
+        
+        operation_type = batch["operation_type"] or "move"
+        options = batch["options"]
+        mappings = []
+        offsets = {}
+        files_done = 0
+        for entry in batch["files"]:
+            src, dst = entry["source"], entry["destination"]
+            if entry["status"] == STATUS_DONE:
+                files_done += 1
+                continue
+            if entry["status"] == STATUS_UNDONE:
+                continue
+            if operation_type == "move" and not os.path.exists(src) and os.path.exists(dst):
+                # Moved just before the batch stopped, ahead of the journal
+                same_volume = device_of(os.path.dirname(src)) == device_of(os.path.dirname(dst))
+                self._journal_done(batch_id, src, dst, entry["size"], METHOD_RENAME if same_volume else METHOD_COPY_DELETE)
+                files_done += 1
+                continue
+            if entry["status"] in (STATUS_IN_PROGRESS, STATUS_FAILED) and entry["bytes_done"]:
+                # A failed ranged copy keeps its destination and verified offset too
+                offsets[dst] = entry["bytes_done"]
+            mappings.append({"id": f"{batch_id}:{len(mappings)}", "type": "file", "sourcePath": src, "targetPath": dst})
+        
+        print(f"[JOURNAL] Resuming batch {batch_id} ({batch['status']}): {files_done} files done, "
+              f"{len(mappings)} to go, {len(offsets)} partial", file=sys.stderr)
+        self.batch_resumes[batch_id] = offsets
+        result = self.apply_mappings_multithreaded(
+            mappings,
+            operation_type=operation_type,
+            validate_sequences=False,
+            batch_id=batch_id,
+            max_workers=options.get("max_workers") or 8,
+            file_workers=options.get("file_workers") or 4,
+            transfer_engine=options.get("transfer_engine"),
+            priority=options.get("priority"),
+            small_file_workers=options.get("small_file_workers"),
+            byte_budget=options.get("byte_budget"),
+            checksum=options.get("checksum"),
+        )
+        result["resumed"] = {
+            "files_done": files_done,
+            "files_remaining": len(mappings),
+            "partial_files": len(offsets),
+            "partial_bytes": sum(offsets.values()),
+        }
+        return result
+
+    def undo_batch(self, batch_id: str, max_workers: int = DEFAULT_SMALL_LANE_WORKERS,
+                   transfer_engine: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Undo a journaled move batch: replay its transaction log newest first with parallel workers and
+        put every moved file back at its source path. Files moved within a volume (same st_dev) are
+        renamed back; files moved across volumes are copied back through the transfer engine and the
+        I/O scheduler in the dual-lane executor, then removed from the destination. A file whose source
+        path has been taken again is left where it is and reported.
+        
+        Progress is written under "undo-<batch_id>" in the same format as a forward batch, and
+        cancel_operation("undo-<batch_id>") stops the undo.
+        """
+        journal = self._get_journal()
+        if journal is None:
+            return {"success": False, "batch_id": batch_id, "error": "The transfer journal is not available"}
+        entries = [entry for entry in journal.undo_log(batch_id) if entry["method"] in (METHOD_RENAME, METHOD_COPY_DELETE)]
+        if not entries:
+            return {"success": False, "batch_id": batch_id, "error": f"No moved files to undo in batch {batch_id}"}
+        
+        undo_id = f"undo-{batch_id}"
+        start_time = time.time()
+        progress = {
+            "batchId": undo_id,
+            "totalOperations": len(entries),
+            "completedOperations": 0,
+            "failedOperations": 0,
+            "progressPercentage": 0.0,
+            "totalSize": sum(entry["size"] or 0 for entry in entries),
+            "processedSize": 0,
+            "etaSeconds": None,
+            "status": "running",
+            "isPaused": False,
+            "isCancelled": False,
+            "currentFile": None,
+            "totalFiles": len(entries),
+            "filesProcessed": 0,
+        }
+        self._write_progress(undo_id, progress)
+        lock = threading.Lock()
+        failed = []
+        counts = {METHOD_RENAME: 0, METHOD_COPY_DELETE: 0}
+        last_write = [0.0]
+        
+        def finished(entry: Dict[str, Any], method: Optional[str], error: Optional[str] = None) -> None:
+            with lock:
+                progress["filesProcessed"] += 1
+                if error is None:
+                    counts[method] += 1
+                    progress["completedOperations"] += 1
+                    progress["processedSize"] += entry["size"] or 0
+                else:
+                    progress["failedOperations"] += 1
+                    failed.append({"source": entry["source"], "destination": entry["destination"], "error": error})
+                done = progress["filesProcessed"]
+                progress["currentFile"] = entry["destination"]
+                progress["progressPercentage"] = done / len(entries) * 100
+                elapsed = time.time() - start_time
+                if elapsed > 0:
+                    progress["etaSeconds"] = int((len(entries) - done) / (done / elapsed))
+                # Renames finish thousands a second: write the progress file at most 4 times a second
+                if time.monotonic() - last_write[0] >= 0.25 or done == len(entries):
+                    last_write[0] = time.monotonic()
+                    self._write_progress(undo_id, progress)
+        
+        def copy_back(moved_from: str, moved_to: str) -> str:
+            self._multithreaded_copy(moved_to, moved_from, undo_id, transfer_engine=transfer_engine)
+            os.remove(moved_to)
+            return METHOD_COPY_DELETE
+        
+        def undo_one(entry: Dict[str, Any], same_volume: bool) -> None:
+            moved_from, moved_to = entry["source"], entry["destination"]
+            if self.is_cancelled(undo_id):
+                return
+            method = None
+            try:
+                if os.path.lexists(moved_from):
+                    raise FileExistsError(f"{moved_from} exists again; not overwriting it")
+                if same_volume:
+                    try:
+                        os.rename(moved_to, moved_from)
+                        method = METHOD_RENAME
+                    except OSError as e:
+                        if e.errno != errno.EXDEV:
+                            raise
+                        method = copy_back(moved_from, moved_to)  # The volumes were remounted since
+                else:
+                    method = copy_back(moved_from, moved_to)
+            except Exception as e:
+                finished(entry, None, f"{type(e).__name__}: {e}")
+                return
+            journal.record(batch_id, moved_to, STATUS_UNDONE)
+            finished(entry, method)
+        
+        # Source folders the batch emptied may be gone: recreate them once, up front
+        self._create_directory_plan(undo_id, [entry["source"] for entry in entries])
+        renames, copies = [], []
+        for entry in entries:
+            if entry["src_device"] is not None and entry["dst_device"] is not None:
+                same_volume = entry["src_device"] == entry["dst_device"]
+            else:
+                same_volume = entry["method"] == METHOD_RENAME
+            (renames if same_volume else copies).append(entry)
+        print(f"[UNDO] Batch {batch_id}: {len(renames)} renames and {len(copies)} cross-volume copies back, "
+              f"newest first, {max_workers} workers", file=sys.stderr)
+        
+        lanes = DualLaneExecutor(small_workers=max_workers, cancel_check=lambda: self.is_cancelled(undo_id))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="undo-rename") as rename_pool, lanes:
+            futures = [rename_pool.submit(undo_one, entry, True) for entry in renames]
+            futures += [lanes.submit(entry["size"] or 0, undo_one, entry, False) for entry in copies]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:  # Cancelled while waiting for lane budget
+                    print(f"[UNDO] File not undone: {e}", file=sys.stderr)
+        self.batch_directories.pop(undo_id, None)
+        
+        cancelled = self.is_cancelled(undo_id)
+        if cancelled:
+            progress["status"] = "cancelled"
+            progress["isCancelled"] = True
+        else:
+            progress["status"] = "completed" if not failed else "completed_with_errors"
+        progress["currentFile"] = None
+        self._write_progress(undo_id, progress)
+        fully_undone = not failed and not cancelled
+        self._finish_journal(batch_id, STATUS_UNDONE if fully_undone else "partially_undone")
+        for failure in failed[:20]:
+            print(f"[UNDO] Could not undo {failure['destination']}: {failure['error']}", file=sys.stderr)
+        
+        return {
+            "success": fully_undone,
+            "batch_id": batch_id,
+            "undo_batch_id": undo_id,
+            "success_count": progress["completedOperations"],
+            "error_count": len(failed),
+            "renamed": counts[METHOD_RENAME],
+            "copied_back": counts[METHOD_COPY_DELETE],
+            "failed": failed,
+            "cancelled": cancelled,
+            "seconds": round(time.time() - start_time, 3),
+            "message": f"Undid {progress['completedOperations']} of {len(entries)} moves of batch {batch_id}",
+        }
+
+    def undo_last_batch(self) -> Dict[str, Any]:
+        """Undo the most recent finished move batch in the transfer journal (see undo_batch)."""
+        journal = self._get_journal()
+        batch_id = journal.last_batch("move") if journal is not None else None
+        if batch_id is None:
+            return {"success": False, "error": "No move batch to undo"}
+        return self.undo_batch(batch_id)
+
     def _write_progress(self, batch_id: str, progress: Dict[str, Any]):
         try:
             # Calculate percentage properly before writing to file
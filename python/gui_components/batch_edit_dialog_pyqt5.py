@@ -7,7 +7,7 @@ Fields are enabled via checkboxes. Dropdowns are populated from the normalizer/c
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QHBoxLayout, QCheckBox, QLineEdit, QComboBox, QDialogButtonBox, QLabel, QWidget, QMessageBox
 )
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, QTimer
 from typing import List, Dict, Any, Optional
 import os
 
@@ -156,6 +156,9 @@ class BatchEditDialogPyQt5(QDialog):
         Update the destination path preview label in real time as fields are edited.
         Shows a simplified preview of how the path might change.
         """
+        if self.normalizer and hasattr(self.normalizer, 'path_preview_service'):
+            # Any pending resolved preview is for an older state of the form
+            self.normalizer.path_preview_service.cancel_pending()
         try:
             # Gather current values from widgets
             values = {}
@@ -181,14 +184,24 @@ class BatchEditDialogPyQt5(QDialog):
                     if current_dest:
                         # Show which fields will change
                         changes = []
+                        field_changes = {}
                         for field_key, value in values.items():
                             if field_key != 'destination_path' and value and value != '<multiple values>':
                                 current_value = sample_item.get('normalized_parts', {}).get(field_key, '')
                                 if current_value != value:
                                     changes.append(f"{field_key}: {current_value} → {value}")
+                                    field_changes[field_key] = value
                         
                         if changes:
                             preview_text = f"Changes: {', '.join(changes)}\nBase: {os.path.basename(current_dest)}"
+                            if self.normalizer and hasattr(self.normalizer, 'request_path_preview'):
+                                # Debounced: only the last edit of a burst is resolved, on the GUI thread
+                                self.normalizer.request_path_preview(
+                                    sample_item,
+                                    field_changes,
+                                    lambda path, text=preview_text: self._show_resolved_preview(text, path),
+                                    schedule=lambda delay, fn: QTimer.singleShot(int(delay * 1000), fn)
+                                )
                         else:
                             preview_text = f"No changes (base: {os.path.basename(current_dest)})"
                     else:
@@ -203,6 +216,16 @@ class BatchEditDialogPyQt5(QDialog):
                 
         self.dest_path_preview_label.setText(preview_text)
 
+    def _show_resolved_preview(self, preview_text: str, predicted_path: str):
+        """Append the resolved destination path to the preview once the debounced request fires."""
+        if getattr(self, '_is_closing', False):
+            return
+        try:
+            if predicted_path and not predicted_path.startswith("Error"):
+                self.dest_path_preview_label.setText(f"{preview_text}\nNew path: {predicted_path}")
+        except RuntimeError:
+            pass  # Dialog already deleted
+
     def _get_dropdown_options(self, field_key, normalizer_method):
         """
         Fetch dropdown options from the normalizer for the current profile.
@@ -226,6 +249,8 @@ class BatchEditDialogPyQt5(QDialog):
             
         self._is_closing = True
         print("[DEBUG] BatchEditDialogPyQt5 closeEvent: dialog is closing")
+        if self.normalizer and hasattr(self.normalizer, 'path_preview_service'):
+            self.normalizer.path_preview_service.cancel_pending()
         
         # Emit finished signal manually to ensure it's called
         # (sometimes Qt doesn't emit it properly)
@@ -55,8 +55,12 @@ class CopyMoveProgressWindow(QDialog):
         self.label_files = QLabel("Files: 0 / 0")
         self.label_bytes = QLabel("Bytes: 0 / 0")
         self.label_type = QLabel(f"Operation: {operation_type}")
+        self.label_queue = QLabel("")  # Live I/O scheduler state (see queue_state_provider)
+        self.label_queue.setStyleSheet("QLabel { font-size: 9pt; color: #B0B0B0; }")
+        # Optional callable returning the scheduler state as text; polled by the 1s timer
+        self.queue_state_provider = None
 
-        for lbl in [self.label_file, self.label_speed, self.label_eta, self.label_files, self.label_bytes, self.label_type]:
+        for lbl in [self.label_file, self.label_speed, self.label_eta, self.label_files, self.label_bytes, self.label_type, self.label_queue]:
             layout.addWidget(lbl)
 
         # Buttons
@@ -183,7 +187,11 @@ class CopyMoveProgressWindow(QDialog):
 
     def _update_speed_eta(self):
         # Called every second by timer, but smoothing is every 5s
-        pass
+        if self.queue_state_provider is not None:
+            try:
+                self.label_queue.setText(self.queue_state_provider())
+            except Exception as e:
+                self.label_queue.setText(f"Queue state unavailable: {e}")
 
     def _on_pause_resume(self):
         self.is_paused = not self.is_paused
@@ -12,6 +12,11 @@ import time
 import concurrent.futures
 from typing import Callable, Dict, Any, List
 from python.file_operations_utils.file_management import copy_item, move_item, copy_sequence_batch, move_sequence_batch
+from python.file_operations_utils.sequence_transfer import frame_paths
+from python.file_operations_utils.io_scheduler import get_transfer_scheduler, format_scheduler_state, device_of
+from python.file_operations_utils.directory_plan import DirectoryPlan
+from python.file_operations_utils.transfer_journal import STATUS_FAILED, METHOD_COPY, METHOD_COPY_DELETE, METHOD_RENAME
+from python.fileops import FileOperations
 from PyQt5.QtCore import QMetaObject, Qt, QTimer, pyqtSignal, QObject
 from python.gui_components.copy_move_progress_window_pyqt5 import CopyMoveProgressWindow
 
@@ -38,6 +43,9 @@ class FileOperationsManager:
         self.max_concurrent_transfers = 4  # Maximum concurrent file transfers
         self.thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent_transfers)
         self.shutdown_requested = False
+        # Journals GUI batches in operations.db like apply_mappings does, so "normalizer resume <batch_id>"
+        # can finish a batch the GUI didn't (see file_operations_utils/transfer_journal.py); opened by the first batch
+        self.file_operations = None
         # --- Batch progress signal helper for thread-safe UI updates ---
         self._batch_signal_helper = BatchProgressSignalHelper()
         self._batch_signal_helper.batch_progress_update.connect(self._on_batch_progress_update)
@@ -128,14 +136,15 @@ class FileOperationsManager:
                 
                 if files_list and sequence_dest_path:
                     # Get source directory from first file
-                    first_file_path = files_list[0].get('path', '')
+                    source_paths = frame_paths(files_list)
+                    first_file_path = source_paths[0] if source_paths else ''
                     if first_file_path:
                         source_dir = os.path.dirname(first_file_path)
                         dest_dir = os.path.dirname(sequence_dest_path)
                         
                         # Create a pattern for the sequence files
                         # Extract the common pattern from the filename
-                        base_names = [os.path.basename(f.get('path', '')) for f in files_list if f.get('path')]
+                        base_names = [os.path.basename(path) for path in source_paths]
                         if base_names:
                             # Find common prefix and create pattern
                             # For OLNT0010_main_arch_rgb_LL1804k_sRGBg24_PREVIZ_v022.1001.png
@@ -146,13 +155,16 @@ class FileOperationsManager:
                             
                             # Always calculate total size for sequence batches to enable accurate progress reporting
                             total_size_bytes = 0
-                            for f in files_list:
+                            journal_files = []  # (source, destination, size) per frame
+                            for file_path in source_paths:
+                                file_size = None
                                 try:
-                                    file_path = f.get('path')
                                     if file_path and os.path.isfile(file_path):
-                                        total_size_bytes += os.path.getsize(file_path)
+                                        file_size = os.path.getsize(file_path)
+                                        total_size_bytes += file_size
                                 except Exception as e:
                                     print(f"[BATCH_DEBUG] Could not get size for file {file_path}: {e}")
+                                journal_files.append((file_path, os.path.join(dest_dir, os.path.basename(file_path)), file_size))
                             print(f"[BATCH_DEBUG] Calculated total size for sequence batch: {total_size_bytes} bytes")
                             
                             # No per-batch dialog here; dialog is handled in main thread before starting batch copy
@@ -161,10 +173,12 @@ class FileOperationsManager:
                                 'source_dir': source_dir,
                                 'dest_dir': dest_dir, 
                                 'pattern': pattern,
+                                'frames': files_list,
                                 'file_count': len(files_list),
                                 'total_size': total_size_bytes,
                                 'sequence_name': item_data.get('filename', 'Unknown Sequence'),
-                                'overwrite_existing': overwrite_existing
+                                'overwrite_existing': overwrite_existing,
+                                'journal_files': journal_files
                             }
                             sequence_batches.append(sequence_batch)
                             print(f"[BATCH_DEBUG] Created sequence batch:")
@@ -221,6 +235,7 @@ class FileOperationsManager:
         progress_window = self._copy_move_progress_window
         print(f"[DEBUG] Progress window CREATED: {progress_window} (id(self)={id(self)})", flush=True)
         progress_window.set_total(total_files, 0)
+        progress_window.queue_state_provider = lambda: format_scheduler_state(get_transfer_scheduler().snapshot())
         progress_window.pause_resume_requested.connect(self._on_pause_resume)
         progress_window.cancel_requested.connect(self._on_cancel)
         progress_window.show()
@@ -243,8 +258,31 @@ class FileOperationsManager:
                     }
                 })
 
+        # Frames copied concurrently per sequence batch; the I/O scheduler caps what actually runs per volume
+        batch_copy_threads = int(self.app.settings_manager.get_setting('performance', 'batch_copy_threads', 32))
+        volume_concurrency = int(self.app.settings_manager.get_setting('performance', 'volume_concurrency', 8))
+        bandwidth_limit_mbps = float(self.app.settings_manager.get_setting('performance', 'bandwidth_limit_mbps', 0) or 0)
+        get_transfer_scheduler().configure(
+            source_concurrency=volume_concurrency,
+            destination_concurrency=volume_concurrency,
+            bandwidth_limit=bandwidth_limit_mbps * 1024 * 1024,
+        )
+
+        batch_id = self.current_batch_id
+        file_operations = self._get_file_operations()
+
+        def journal_done(src, dst, size):
+            if operation_type == "Copy":
+                method = METHOD_COPY
+            elif device_of(os.path.dirname(src)) == device_of(os.path.dirname(dst)):
+                method = METHOD_RENAME
+            else:
+                method = METHOD_COPY_DELETE
+            file_operations._journal_done(batch_id, src, dst, size or 0, method)
+
         # Start optimized multithreaded operations
-        def start_optimized_operations():
+        def run_optimized_operations():
+            failures = 0
             try:
                 # Process sequence batches first (much faster)
                 for batch_data in sequence_batches:
@@ -276,7 +314,11 @@ class FileOperationsManager:
                             transfer_id=transfer_id,
                             file_count=batch_data['file_count'],
                             total_size=batch_data['total_size'],
-                            overwrite_existing=batch_data.get('overwrite_existing', False)
+                            overwrite_existing=batch_data.get('overwrite_existing', False),
+                            frames=batch_data['frames'],
+                            max_workers=batch_copy_threads,
+                            cancel_check=lambda: self.shutdown_requested,
+                            pause_check=lambda: self._pause_requested
                         )
                     else:
                         success, message = move_sequence_batch(
@@ -286,9 +328,18 @@ class FileOperationsManager:
                             status_callback=create_batch_progress_callback(),
                             transfer_id=transfer_id,
                             file_count=batch_data['file_count'],
-                            total_size=batch_data['total_size']
+                            total_size=batch_data['total_size'],
+                            frames=batch_data['frames'],
+                            max_workers=batch_copy_threads,
+                            cancel_check=lambda: self.shutdown_requested,
+                            pause_check=lambda: self._pause_requested
                         )
-                    if not success:
+                    if success:
+                        for src, dst, size in batch_data['journal_files']:
+                            journal_done(src, dst, size)
+                    else:
+                        # Frames stay planned; a resume copies them again (moves that landed count as done)
+                        failures += 1
                         def mark_batch_error():
                             self.app.status_manager.add_log_message(
                                 f"Batch failed: {message}", "ERROR"
@@ -327,7 +378,10 @@ class FileOperationsManager:
                         file_data = future_to_file[future]
                         try:
                             result = future.result()
+                            journal_done(file_data['source_path'], file_data['destination_path'], file_data['total_size'])
                         except Exception as e:
+                            failures += 1
+                            file_operations._journal_file(batch_id, file_data['destination_path'], STATUS_FAILED, error=str(e))
                             self.app.status_manager.add_log_message(
                                 f"Error processing {file_data['file_name']}: {str(e)}", "ERROR"
                             )
@@ -339,14 +393,55 @@ class FileOperationsManager:
                     )
                 
             except Exception as e:
+                failures += 1
                 self.app.status_manager.add_log_message(
                     f"Error in optimized {operation_type.lower()} operation: {str(e)}", "ERROR"
                 )
+            finally:
+                if self.shutdown_requested:
+                    status = "cancelled"
+                else:
+                    status = "completed" if not failures else "completed_with_errors"
+                file_operations._finish_journal(batch_id, status)
+        
+        def start_optimized_operations():
+            # Every frame and file is journaled as planned before any data moves
+            file_operations._begin_journal(
+                batch_id,
+                operation_type.lower(),
+                [journal_file for batch_data in sequence_batches for journal_file in batch_data['journal_files']]
+                + [(file_data['source_path'], file_data['destination_path'], file_data['total_size'])
+                   for file_data in individual_files if file_data['destination_path']],
+                {"mode": "gui", "max_workers": batch_copy_threads},
+            )
+            self.app.status_manager.add_log_message(
+                f"  • Journaled as batch {batch_id}; if this run is interrupted, 'normalizer resume {batch_id}' finishes it", "INFO"
+            )
+            # Create every destination folder once, in parallel, before any data moves;
+            # the per-file and per-sequence directory checks are skipped for these
+            plan = DirectoryPlan(
+                [batch_data['dest_dir'] for batch_data in sequence_batches]
+                + [os.path.dirname(file_data['destination_path']) for file_data in individual_files if file_data['destination_path']]
+            )
+            plan_report = plan.create(cancel_check=lambda: self.shutdown_requested)
+            self.app.status_manager.add_log_message(
+                f"  • Prepared {plan_report['directories']} destination folders in {plan_report['seconds']:.2f}s", "INFO"
+            )
+            for directory, error in plan_report['failed'].items():
+                self.app.status_manager.add_log_message(f"Could not create folder {directory}: {error}", "ERROR")
+            with plan.active():
+                run_optimized_operations()
         
         # Start in background thread
         batch_thread = threading.Thread(target=start_optimized_operations, daemon=True)
         batch_thread.start()
 
+    def _get_file_operations(self) -> FileOperations:
+        """The FileOperations whose transfer journal records this manager's batches."""
+        if self.file_operations is None:
+            self.file_operations = FileOperations()
+        return self.file_operations
+
     def _find_common_prefix(self, filenames: List[str]) -> str:
         """Find the common prefix of a list of filenames for pattern creation."""
         if not filenames:
@@ -533,11 +628,12 @@ class FileOperationsManager:
                 files_list = sequence_info.get('files', [])
                 sequence_dest_path = item.get('new_destination_path', '')
                 if files_list and sequence_dest_path:
-                    first_file_path = files_list[0].get('path', '')
+                    source_paths = frame_paths(files_list)
+                    first_file_path = source_paths[0] if source_paths else ''
                     if first_file_path:
                         source_dir = os.path.dirname(first_file_path)
                         dest_dir = os.path.dirname(sequence_dest_path)
-                        base_names = [os.path.basename(f.get('path', '')) for f in files_list if f.get('path')]
+                        base_names = [os.path.basename(path) for path in source_paths]
                         if base_names:
                             common_prefix = self._find_common_prefix(base_names)
                             file_extension = os.path.splitext(base_names[0])[1]
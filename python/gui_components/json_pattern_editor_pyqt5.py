@@ -1,5 +1,5 @@
 import json
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel, QMessageBox
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel, QMessageBox, QFileDialog
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
@@ -7,9 +7,13 @@ class JsonEditorDialog(QDialog):
     """
     Generic JSON editor dialog for editing and validating JSON files (patterns, profiles, etc).
     """
-    def __init__(self, parent=None, file_path=None, title=None):
+    def __init__(self, parent=None, file_path=None, title=None, pattern_report_provider=None, lint_patterns=False):
         super().__init__(parent)
         self.file_path = file_path
+        # Callable returning the last pattern profiling report (patterns.json only), or None
+        self.pattern_report_provider = pattern_report_provider
+        # patterns.json: lint and stress-time the regexes before saving
+        self.lint_patterns = lint_patterns
         self.setWindowTitle(title or "JSON Editor")
         self.setMinimumSize(700, 500)
         layout = QVBoxLayout(self)
@@ -35,8 +39,23 @@ class JsonEditorDialog(QDialog):
                 self.text_edit.setText("")
                 QMessageBox.warning(self, "Load Error", f"Could not load file:\n{e}")
 
+        if self.lint_patterns:
+            self.verdict_label = QLabel("Pattern check: not run yet (runs on save)")
+            self.verdict_label.setStyleSheet("color: gray; font-size: 12px;")
+            layout.addWidget(self.verdict_label)
+
         # Buttons
         btn_row = QHBoxLayout()
+        if self.lint_patterns:
+            self.check_btn = QPushButton("Check Patterns...")
+            self.check_btn.setToolTip("Rewrite inline flags, lint for catastrophic backtracking and time each regex on long filenames")
+            self.check_btn.clicked.connect(self.check_patterns)
+            btn_row.addWidget(self.check_btn)
+        if self.pattern_report_provider is not None:
+            self.report_btn = QPushButton("Performance Report...")
+            self.report_btn.setToolTip("Per-pattern timing, never-matching patterns and regex errors from the last profiled scan")
+            self.report_btn.clicked.connect(self.show_pattern_report)
+            btn_row.addWidget(self.report_btn)
         self.save_btn = QPushButton("Save")
         self.save_btn.clicked.connect(self.save_json)
         self.cancel_btn = QPushButton("Cancel")
@@ -46,30 +65,115 @@ class JsonEditorDialog(QDialog):
         btn_row.addWidget(self.cancel_btn)
         layout.addLayout(btn_row)
 
+    def show_pattern_report(self):
+        report = self.pattern_report_provider()
+        if not report:
+            QMessageBox.information(self, "Pattern Performance Report",
+                                    "No profiled scan yet. Enable 'Profile pattern performance during scans' "
+                                    "under Settings > Advanced and run a scan.")
+            return
+        from python.mapping_utils.pattern_profiler import format_pattern_report
+        ReportDialog(self, "Pattern Performance Report", format_pattern_report(report), report, "pattern_report.json").exec_()
+
+    def _run_pattern_check(self, parsed):
+        """Lint patterns.json data and show the verdict; returns the report."""
+        from python.mapping_utils.pattern_compiler import lint_patterns_config
+        report = lint_patterns_config(parsed)
+        counts = report["counts"]
+        colors = {"ok": "#4caf50", "warn": "#ff9800", "reject": "#f44336"}
+        self.verdict_label.setText(f"Pattern check: {report['verdict'].upper()} "
+                                   f"({counts['ok']} ok, {counts['warn']} warnings, {counts['reject']} rejected)")
+        self.verdict_label.setStyleSheet(f"color: {colors[report['verdict']]}; font-size: 12px;")
+        return report
+
+    def check_patterns(self):
+        from python.mapping_utils.pattern_compiler import format_lint_report
+        try:
+            parsed = json.loads(self.text_edit.toPlainText())
+        except Exception as e:
+            QMessageBox.critical(self, "Invalid JSON", f"Could not check patterns: Invalid JSON.\n{e}")
+            return
+        report = self._run_pattern_check(parsed)
+        ReportDialog(self, "Pattern Check", format_lint_report(report), report, "pattern_check.json").exec_()
+
+    def _confirm_pattern_check(self, parsed):
+        """Lint before saving; rejected patterns need confirmation. Returns True to save."""
+        from python.mapping_utils.pattern_compiler import format_lint_report
+        report = self._run_pattern_check(parsed)
+        if report["verdict"] == "ok":
+            return True
+        box = QMessageBox(self)
+        box.setWindowTitle("Pattern Check")
+        box.setDetailedText(format_lint_report(report))
+        if report["verdict"] == "reject":
+            box.setIcon(QMessageBox.Warning)
+            box.setText(f"{report['counts']['reject']} pattern(s) can backtrack catastrophically and will be "
+                        f"matched as plain substrings instead of regexes.\n\nSave anyway?")
+            box.setStandardButtons(QMessageBox.Save | QMessageBox.Cancel)
+            box.setDefaultButton(QMessageBox.Cancel)
+            return box.exec_() == QMessageBox.Save
+        box.setIcon(QMessageBox.Information)
+        box.setText(f"Saved with {report['counts']['warn']} pattern warning(s). See details.")
+        box.exec_()
+        return True
+
     def save_json(self):
         text = self.text_edit.toPlainText()
         try:
             parsed = json.loads(text)
+        except Exception as e:
+            QMessageBox.critical(self, "Invalid JSON", f"Could not save: Invalid JSON.\n{e}")
+            return
+        if self.lint_patterns and not self._confirm_pattern_check(parsed):
+            return
+        try:
             pretty = json.dumps(parsed, indent=4, ensure_ascii=False)
             if self.file_path:
                 with open(self.file_path, "w", encoding="utf-8") as f:
                     f.write(pretty)
-            self.accept()
         except Exception as e:
-            QMessageBox.critical(self, "Invalid JSON", f"Could not save: Invalid JSON.\n{e}")
-        layout.addWidget(self.text_edit)
+            QMessageBox.critical(self, "Save Error", f"Could not save:\n{e}")
+            return
+        self.accept()
 
-        button_layout = QHBoxLayout()
-        save_button = QPushButton("Save")
-        cancel_button = QPushButton("Cancel")
+    def get_patterns(self):
+        return self.text_edit.toPlainText()
 
-        save_button.clicked.connect(self.accept)
-        cancel_button.clicked.connect(self.reject)
 
-        button_layout.addWidget(save_button)
-        button_layout.addWidget(cancel_button)
+class ReportDialog(QDialog):
+    """Read-only text view of a pattern report (profiling or pattern check), with JSON export."""
+    def __init__(self, parent, title, text, report, export_name="report.json"):
+        super().__init__(parent)
+        self.report = report
+        self.export_name = export_name
+        self.setWindowTitle(title)
+        self.setMinimumSize(900, 600)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
 
-        layout.addLayout(button_layout)
+        text_view = QTextEdit()
+        text_view.setReadOnly(True)
+        text_view.setLineWrapMode(QTextEdit.NoWrap)
+        text_view.setFont(QFont("Courier New", 10))
+        text_view.setPlainText(text)
+        layout.addWidget(text_view)
 
-    def get_patterns(self):
-        return self.text_edit.toPlainText()
+        btn_row = QHBoxLayout()
+        export_btn = QPushButton("Export JSON...")
+        export_btn.clicked.connect(self.export_json)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_row.addStretch(1)
+        btn_row.addWidget(export_btn)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Report", self.export_name, "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Could not write report:\n{e}")
@@ -12,6 +12,9 @@ from PyQt5.QtCore import QTimer
 from queue import Queue, Empty
 from typing import Dict, Any, Optional
 
+from python.mapping_utils.run_report import format_run_report
+from python.mapping_utils.external_sequence_grouping import EXTERNAL_GROUPING_MIN_FILES
+
 
 class ScanManager:
     """Manages scanning operations and queue processing for the GUI."""
@@ -47,6 +50,13 @@ class ScanManager:
             self.app.status_label.setText("Error: Normalizer not available. Check logs.")
             return
 
+        # Instrumentation mode for pattern extraction (Settings > Advanced)
+        pattern_profiling = self.app.settings_manager.get_setting("performance", "pattern_profiling", False)
+        self.app.normalizer.mapping_generator.set_pattern_profiling(pattern_profiling)
+        # Scans this large group their sequences out of core (Settings > Advanced)
+        external_grouping_min_files = self.app.settings_manager.get_setting("performance", "external_grouping_min_files", EXTERNAL_GROUPING_MIN_FILES)
+        self.app.normalizer.mapping_generator.set_external_grouping_threshold(external_grouping_min_files)
+
         # Start the scan progress system
         self.app.status_manager.start_scan_progress()
 
@@ -290,6 +300,9 @@ class ScanManager:
                 base_name = os.path.basename(source_path) if source_path else "selected folder"
                 self.app.status_label.setText(f"Scan Complete. Generated {num_proposals} proposals from {base_name}.")
                 print(f"Scan complete (from worker). Generated proposals: {num_proposals}")
+                run_report = result_data_dict.get('run_report')
+                if run_report:
+                    self.app.status_manager.add_log_message(format_run_report(run_report), "PERF")
                 # Finish progress successfully
                 self.app.status_manager.finish_scan_progress(True)
                 if hasattr(self.app, 'progress_panel'):
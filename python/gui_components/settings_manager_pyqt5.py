@@ -50,6 +50,9 @@ class SettingsManager:
                 "max_concurrent_scans": 8,
                 "max_concurrent_copies": 16,  # Balanced for good 10GbE performance
                 "batch_copy_threads": 32,  # User-configurable threads for Robocopy/rsync
+                "volume_concurrency": 8,  # Transfers reading from / writing to one volume at a time
+                "bandwidth_limit_mbps": 0,  # Aggregate copy bandwidth limit in MB/s (0 = unlimited)
+                "external_grouping_min_files": 2000000,  # Scans this large group sequences out of core (0 = never)
                 "progress_update_interval": 0.5,  # How often to update progress (seconds)
                 "memory_limit_mb": 2048,  # Memory limit for large operations
                 "enable_file_caching": True  # Whether to enable file operation caching
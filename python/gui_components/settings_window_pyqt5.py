@@ -190,11 +190,25 @@ class SettingsWindow(QDialog):
         
         self.tab_widget.addTab(tab, "Normalization Rules")
 
+    def _reload_shared_config(self):
+        """Publish the saved patterns.json / profiles.json to every consumer of the shared config service."""
+        from python.mapping_utils.config_service import get_config_service
+        get_config_service(os.path.join(self.config_dir, "patterns.json"),
+                           os.path.join(self.config_dir, "profiles.json")).reload()
+
+    def _pattern_profile_report(self):
+        """Report of the last profiled scan, or None if no scan was profiled yet."""
+        normalizer = getattr(self.parent_app, "normalizer", None)
+        profiler = normalizer.mapping_generator.pattern_profiler if normalizer else None
+        return profiler.report() if profiler else None
+
     def _open_patterns_editor_dialog(self):
         from python.gui_components.json_pattern_editor_pyqt5 import JsonEditorDialog
         patterns_path = os.path.join(self.config_dir, "patterns.json")
-        dlg = JsonEditorDialog(self, file_path=patterns_path, title="Edit Patterns (patterns.json)")
+        dlg = JsonEditorDialog(self, file_path=patterns_path, title="Edit Patterns (patterns.json)",
+                               pattern_report_provider=self._pattern_profile_report, lint_patterns=True)
         if dlg.exec_():
+            self._reload_shared_config()
             # Reload content after save
             try:
                 with open(patterns_path, 'r', encoding='utf-8') as f:
@@ -207,6 +221,7 @@ class SettingsWindow(QDialog):
         profiles_path = os.path.join(self.config_dir, "profiles.json")
         dlg = JsonEditorDialog(self, file_path=profiles_path, title="Edit Profiles (profiles.json)")
         if dlg.exec_():
+            self._reload_shared_config()
             # Reload content after save
             try:
                 with open(profiles_path, 'r', encoding='utf-8') as f:
@@ -219,6 +234,7 @@ class SettingsWindow(QDialog):
         patterns_path = os.path.join(self.config_dir, "patterns.json")
         dlg = GraphicalJsonEditorDialog(self, file_path=patterns_path, title="Graphical Edit Patterns (patterns.json)")
         if dlg.exec_():
+            self._reload_shared_config()
             try:
                 with open(patterns_path, 'r', encoding='utf-8') as f:
                     self.patterns_editor.setText(f.read())
@@ -230,6 +246,7 @@ class SettingsWindow(QDialog):
         profiles_path = os.path.join(self.config_dir, "profiles.json")
         dlg = GraphicalJsonEditorDialog(self, file_path=profiles_path, title="Graphical Edit Profiles (profiles.json)")
         if dlg.exec_():
+            self._reload_shared_config()
             try:
                 with open(profiles_path, 'r', encoding='utf-8') as f:
                     self.profiles_editor.setText(f.read())
@@ -274,6 +291,32 @@ class SettingsWindow(QDialog):
         self.batch_copy_threads_spin.setToolTip("Number of threads Robocopy uses for parallel file copy within a batch operation. Too high may overload your system.")
         layout.addRow(QLabel("Batch Copy Threads (Robocopy /MT):"), self.batch_copy_threads_spin)
 
+        # I/O scheduler limits shared by all copy/move operations
+        self.volume_concurrency_spin = QSpinBox()
+        self.volume_concurrency_spin.setMinimum(1)
+        self.volume_concurrency_spin.setMaximum(128)
+        self.volume_concurrency_spin.setValue(8)
+        self.volume_concurrency_spin.setToolTip("Maximum transfers reading from, and writing to, any one drive or share at a time, across all running batches.")
+        layout.addRow(QLabel("Transfers per Volume:"), self.volume_concurrency_spin)
+
+        self.bandwidth_limit_spin = QSpinBox()
+        self.bandwidth_limit_spin.setMinimum(0)
+        self.bandwidth_limit_spin.setMaximum(100000)
+        self.bandwidth_limit_spin.setSuffix(" MB/s")
+        self.bandwidth_limit_spin.setSpecialValueText("Unlimited")
+        self.bandwidth_limit_spin.setToolTip("Total copy bandwidth for all transfers. Use it to leave headroom on a shared NAS.")
+        layout.addRow(QLabel("Bandwidth Limit:"), self.bandwidth_limit_spin)
+
+        # Mapping: out-of-core sequence grouping for very large scans
+        self.external_grouping_min_files_spin = QSpinBox()
+        self.external_grouping_min_files_spin.setMinimum(0)
+        self.external_grouping_min_files_spin.setMaximum(2000000000)
+        self.external_grouping_min_files_spin.setSingleStep(100000)
+        self.external_grouping_min_files_spin.setValue(2000000)
+        self.external_grouping_min_files_spin.setSpecialValueText("Never")
+        self.external_grouping_min_files_spin.setToolTip("Scans with at least this many files group their sequences in sorted runs on disk instead of in memory. Lower it if mapping runs out of memory.")
+        layout.addRow(QLabel("Out-of-core Grouping From (files):"), self.external_grouping_min_files_spin)
+
         # Progress Update Interval
         from PyQt5.QtWidgets import QDoubleSpinBox
         self.progress_update_interval_spin = QDoubleSpinBox()
@@ -285,6 +328,11 @@ class SettingsWindow(QDialog):
         self.progress_update_interval_spin.setToolTip("How often the progress bar updates during batch copy/move operations.")
         layout.addRow(QLabel("Progress Update Interval (seconds):"), self.progress_update_interval_spin)
 
+        # Pattern profiling (report viewable from the Patterns editor)
+        self.pattern_profiling_check = QCheckBox("Profile pattern performance during scans")
+        self.pattern_profiling_check.setToolTip("Records per-pattern evaluation count, time and matches for each scan. Slows mapping slightly; view the report from the Patterns editor.")
+        layout.addRow(self.pattern_profiling_check)
+
         self.tab_widget.addTab(tab, "Advanced")
 
     def _create_action_buttons(self, main_layout):
@@ -347,6 +395,10 @@ class SettingsWindow(QDialog):
         self.temp_folder_edit.setText(self.settings_manager.get_setting("ui_state", "temporary_files_path", "")) # Corrected section
         self.batch_copy_threads_spin.setValue(self.settings_manager.get_setting("performance", "batch_copy_threads", 32))
         self.progress_update_interval_spin.setValue(self.settings_manager.get_setting("performance", "progress_update_interval", 0.5))
+        self.volume_concurrency_spin.setValue(self.settings_manager.get_setting("performance", "volume_concurrency", 8))
+        self.bandwidth_limit_spin.setValue(int(self.settings_manager.get_setting("performance", "bandwidth_limit_mbps", 0)))
+        self.external_grouping_min_files_spin.setValue(int(self.settings_manager.get_setting("performance", "external_grouping_min_files", 2000000)))
+        self.pattern_profiling_check.setChecked(self.settings_manager.get_setting("performance", "pattern_profiling", False))
 
     def apply_settings(self):
         """Apply current settings without closing the dialog."""
@@ -383,6 +435,7 @@ class SettingsWindow(QDialog):
             profiles_path = os.path.join(self.config_dir, "profiles.json")
             with open(profiles_path, 'w') as f:
                 f.write(self.profiles_editor.toPlainText())
+            self._reload_shared_config()
         except Exception as e:
             QMessageBox.critical(self, "Error Saving Rules", f"Could not save normalization rules: {e}")
 
@@ -391,6 +444,10 @@ class SettingsWindow(QDialog):
         self.settings_manager.update_setting("ui_state", "temporary_files_path", self.temp_folder_edit.text()) # Corrected section
         self.settings_manager.update_setting("performance", "batch_copy_threads", self.batch_copy_threads_spin.value())
         self.settings_manager.update_setting("performance", "progress_update_interval", self.progress_update_interval_spin.value())
+        self.settings_manager.update_setting("performance", "volume_concurrency", self.volume_concurrency_spin.value())
+        self.settings_manager.update_setting("performance", "bandwidth_limit_mbps", self.bandwidth_limit_spin.value())
+        self.settings_manager.update_setting("performance", "external_grouping_min_files", self.external_grouping_min_files_spin.value())
+        self.settings_manager.update_setting("performance", "pattern_profiling", self.pattern_profiling_check.isChecked())
 
 # Example usage (for testing, typically instantiated by the main app)
 if __name__ == '__main__':
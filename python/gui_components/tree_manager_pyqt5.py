@@ -421,12 +421,22 @@ class TreeManager:
             summary_lines.append(f"  sequence_base_name: {seq_info.get('base_name')}")
             summary_lines.append(f"  sequence_directory: {seq_info.get('directory')}")
         print('\n'.join(summary_lines))
+        self._refresh_item_widget(item_id, tree_item_widget, updated_item_data)
+        # Clean, organized log for master_item_data_list after update
+        summary_lines = [f"[DEBUG] master_item_data_list after update: {len(self.master_item_data_list)} items"]
+        for i, item in enumerate(self.master_item_data_list):
+            summary_lines.append(f"  [{i}] id: {item.get('id')}, filename: {item.get('filename')}, new_destination_path: {item.get('new_destination_path')}")
+        print('\n'.join(summary_lines))
+        return True
+
+    def _refresh_item_widget(self, item_id: str, tree_item_widget: QTreeWidgetItem, updated_item_data: dict):
+        """Refresh the columns, icon, tooltip and stored data of one preview tree widget."""
         try:
             display_details = self.app.normalizer.get_item_display_details(updated_item_data)
             columns_dict = display_details.get('columns', {})
         except Exception as e:
             if hasattr(self.app, 'logger'):
-                self.app.logger.error(f"update_item_properties_and_refresh_display: Error getting display details for item {item_id}: {e}")
+                self.app.logger.error(f"_refresh_item_widget: Error getting display details for item {item_id}: {e}")
             columns_dict = {}
         # Update columns in the existing widget
         tree_item_widget.setText(COL_FILENAME, columns_dict.get('Filename', 'N/A'))
@@ -453,16 +463,36 @@ class TreeManager:
                     tree_item_widget.setIcon(COL_FILENAME, icon)
             except Exception as e:
                 if hasattr(self.app, 'logger'):
-                    self.app.logger.error(f"update_item_properties_and_refresh_display: Error getting icon '{icon_name}' for item {item_id}: {e}", exc_info=True)
+                    self.app.logger.error(f"_refresh_item_widget: Error getting icon '{icon_name}' for item {item_id}: {e}", exc_info=True)
         tree_item_widget.setToolTip(COL_FILENAME, display_details.get('tooltip', '') if 'display_details' in locals() else '')
         # Update the stored item data in the widget
         tree_item_widget.setData(0, Qt.UserRole, updated_item_data.copy())
-        # Clean, organized log for master_item_data_list after update
-        summary_lines = [f"[DEBUG] master_item_data_list after update: {len(self.master_item_data_list)} items"]
-        for i, item in enumerate(self.master_item_data_list):
-            summary_lines.append(f"  [{i}] id: {item.get('id')}, filename: {item.get('filename')}, new_destination_path: {item.get('new_destination_path')}")
-        print('\n'.join(summary_lines))
-        return True
+
+    def apply_item_delta(self, updated_items: List[Dict[str, Any]]) -> int:
+        """
+        Apply a batch of updated items (e.g. from GuiNormalizerAdapter.remap_after_config_change)
+        in place, without rebuilding the tree. Items are matched by id.
+
+        Returns:
+            int: Number of items found and updated.
+        """
+        if not updated_items:
+            return 0
+        index_by_id = {item.get('id'): idx for idx, item in enumerate(self.master_item_data_list)}
+        updated_count = 0
+        for updated_item_data in updated_items:
+            item_id = updated_item_data.get('id')
+            idx = index_by_id.get(item_id)
+            if idx is None:
+                continue
+            self.master_item_data_list[idx] = updated_item_data.copy()
+            if hasattr(self.app, 'preview_tree_item_data_map'):
+                self.app.preview_tree_item_data_map[item_id] = updated_item_data.copy()
+            tree_item_widget = self._item_id_to_widget_map.get(item_id)
+            if tree_item_widget:
+                self._refresh_item_widget(item_id, tree_item_widget, updated_item_data)
+            updated_count += 1
+        return updated_count
 
     def apply_current_sort(self):
         # print("[DEBUG]  # (Silenced for normal use. Re-enable for troubleshooting.) Entering apply_current_sort")
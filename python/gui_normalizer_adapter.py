@@ -1,4 +1,3 @@
-import json
 import os
 import sys
 import time
@@ -10,6 +9,12 @@ from typing import List, Dict, Any, Optional, Callable
 
 from .scanner import FileSystemScanner
 from .mapping import MappingGenerator
+from .mapping_utils.incremental_remap import remap_proposals
+from .mapping_utils.gui_item_view import GuiItemView
+from .mapping_utils.batch_edit import apply_batch_edit
+from .mapping_utils.path_preview_service import PathPreviewService
+from .mapping_utils.config_service import profile_rules_from_entry
+from .mapping_utils.run_report import RunReport, append_run_history
 
 class GuiNormalizerAdapter:
     def __init__(self, config_dir_path: str):
@@ -32,19 +37,31 @@ class GuiNormalizerAdapter:
         self.scanner = FileSystemScanner()
         self.mapping_generator = MappingGenerator(config_path=str(self.patterns_json_path))
         
-        try:
-            with open(self.profiles_json_path, 'r', encoding='utf-8') as f:
-                self.all_profiles_data = json.load(f)
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Error decoding {self.profiles_json_path}: {e}") # Log the error
-            raise ValueError(f"Error decoding {self.profiles_json_path}: {e}")
-        except Exception as e:
-            self.logger.error(f"Could not read {self.profiles_json_path}: {e}") # Log the error
-            raise IOError(f"Could not read {self.profiles_json_path}: {e}")
+        # Shared, versioned view of patterns.json / profiles.json (same service as the mapping generator)
+        self.config_service = self.mapping_generator.config_service
+        snapshot = self.config_service.snapshot(force_check=True)
+        if "profiles" in snapshot.errors:
+            self.logger.error(snapshot.errors["profiles"]) # Log the error
+            raise ValueError(snapshot.errors["profiles"])
 
         self.current_profile_name: Optional[str] = None
         self.current_profile_rules: Optional[List[Dict[str, Any]]] = None
 
+        # Config snapshot and the last mapping run, for incremental re-mapping
+        self._config_snapshot = snapshot
+        self._last_mapping: Optional[Dict[str, Any]] = None
+
+        # Compiled-profile path previews for the batch edit UI
+        self.path_preview_service = PathPreviewService()
+
+        # One JSON line per scan with its stage timings (see mapping_utils/run_report.py)
+        self.run_history_path = self.config_dir_path.parent / "run_history.jsonl"
+
+    @property
+    def all_profiles_data(self) -> Dict[str, Any]:
+        """Parsed profiles.json from the current config snapshot (read-only)."""
+        return self.config_service.snapshot().profiles
+
     def set_profile(self, profile_name: str) -> bool:
         """
         Sets the active profile for the normalizer and loads its rules.
@@ -55,13 +72,14 @@ class GuiNormalizerAdapter:
         Returns:
             True if the profile was successfully set, False otherwise.
         """
-        if profile_name not in self.all_profiles_data:
-            self.logger.error(f"Profile '{profile_name}' not found. Available: {list(self.all_profiles_data.keys())}")
+        all_profiles_data = self.all_profiles_data
+        if profile_name not in all_profiles_data:
+            self.logger.error(f"Profile '{profile_name}' not found. Available: {list(all_profiles_data.keys())}")
             self.current_profile_name = None
             self.current_profile_rules = None
             return False
 
-        profile_config_entry = self.all_profiles_data[profile_name]
+        profile_config_entry = all_profiles_data[profile_name]
         actual_rules_list: Optional[List[Dict[str, Any]]] = None
 
         if isinstance(profile_config_entry, list):
@@ -114,7 +132,8 @@ class GuiNormalizerAdapter:
             return False
 
         self.current_profile_name = profile_name
-        self.current_profile_rules = actual_rules_list
+        # The snapshot's own list (validated above), so its compiled rule index is reused
+        self.current_profile_rules = profile_rules_from_entry(profile_config_entry)
         # self.logger.info(  # (Silenced for normal use. Re-enable for troubleshooting.)f"Successfully set active profile to: '{profile_name}' with {len(self.current_profile_rules)} rule sets.")
         return True
 
@@ -170,6 +189,8 @@ class GuiNormalizerAdapter:
                 }
 
         batch_id = str(uuid.uuid4())
+        run_report = RunReport(batch_id, {"profile": self.current_profile_name, "source": base_path})
+        scan_start = time.perf_counter()
 
         # --- Threaded Scanning --- 
         scan_thread_completed = threading.Event()
@@ -237,6 +258,8 @@ class GuiNormalizerAdapter:
 
         scan_result = scan_progress.get("result", {})
         original_scan_tree = scan_result.get("tree")
+        run_report.add_stage("scan", time.perf_counter() - scan_start,
+                             (scan_result.get("stats") or {}).get("total_files"))
         if not original_scan_tree: # Handles cases where tree is None or an empty dict from scan_result.get('tree')
             self.logger.warning("Scan completed, but the final tree structure is missing or malformed (e.g., None or empty dict from scan result).")
             # Return structure expected by ScanManager on error
@@ -274,9 +297,18 @@ class GuiNormalizerAdapter:
             profile=profile_object_for_generator,
             root_output_dir=destination_root,
             batch_id=batch_id,
-            status_callback=status_callback
+            status_callback=status_callback,
+            run_report=run_report
         )
 
+        # Keep the raw proposals and the compiled config they came from for remap_after_config_change
+        self._last_mapping = {
+            "proposals": proposals or [],
+            "root_output_dir": destination_root,
+            "pattern_set": self.mapping_generator.pattern_set,
+            "rule_index": self.mapping_generator.get_rule_index(profile_object_for_generator),
+        }
+
         if status_callback:
             status_callback({'type': 'mapping_generation', 'data': {'status': 'completed', 'message': 'Mapping generation complete. Transforming results...'}})
 
@@ -285,58 +317,9 @@ class GuiNormalizerAdapter:
 
         transformed_proposals = []
         if proposals: 
-            for p_item in proposals:
-                original_item = p_item.get('original_item', {})
-                source_path_str = str(original_item.get('path', 'N/A'))
-                tags_data = p_item.get('tags', {})
-                if not isinstance(tags_data, dict):
-                    tags_data = {} 
-
-                matched_tags = {k: v for k, v in tags_data.items() if v is not None and v != ''}
-                gui_matched_tags = {k: v for k, v in tags_data.items() if v is not None and v != ''}
-
-                normalized_parts_dict = {
-                    'shot': tags_data.get('shot'),
-                    'task': tags_data.get('task'),
-                    'asset': tags_data.get('asset_name') or tags_data.get('asset') or tags_data.get('asset_type'),
-                    'version': tags_data.get('version'),
-                    'resolution': tags_data.get('resolution'),
-                    'stage': tags_data.get('stage')
-                }
-                normalized_parts_dict = {k: v for k, v in normalized_parts_dict.items() if v is not None}
-
-                # Determine correct size based on item type
-                original_item_type_lower = original_item.get('type', 'file').lower()
-                current_item_size = None
-                if original_item_type_lower == 'sequence':
-                    current_item_size = original_item.get('total_size_bytes')
-                    if current_item_size is None:
-                        # self.logger.debug(f"Sequence '{original_item.get('name')}' missing 'total_size_bytes', falling back to 'size'.")  # (Silenced for normal use. Re-enable for troubleshooting.)
-                        current_item_size = original_item.get('size') 
-                else:
-                    current_item_size = original_item.get('size')
-
-                # Ensure sequence_info is available for tooltip and other uses
-                current_sequence_info = p_item.get('sequence_info')
-                if not current_sequence_info and original_item_type_lower == 'sequence':
-                    current_sequence_info = original_item
-
-                transformed_item = {
-                    'id': p_item.get('id', str(uuid.uuid4())),
-                    'source_path': source_path_str,
-                    'filename': original_item.get('name', 'N/A'),
-                    'new_destination_path': p_item.get('targetPath', ''),
-                    'new_name': Path(p_item.get('targetPath', '')).name if p_item.get('targetPath') else original_item.get('name', 'N/A'),
-                    'type': original_item.get('type', 'file').capitalize(),
-                    'size': current_item_size,
-                    'sequence_info': current_sequence_info,
-                    'matched_rules': p_item.get('matched_rules', []),
-                    'matched_tags': gui_matched_tags,
-                    'normalized_parts': normalized_parts_dict,
-                    'status': p_item.get('status', 'unknown'),
-                    'error_message': p_item.get('error_message') or p_item.get('error')
-                }
-                transformed_proposals.append(transformed_item)
+            # Views compute GUI fields on access; nothing is copied per proposal here
+            with run_report.stage("transform", len(proposals)):
+                transformed_proposals = [GuiItemView(p_item) for p_item in proposals]
         else: 
              if status_callback:
                 status_callback({'type': 'mapping_generation', 'data': {'status': 'warning', 'message': 'No proposals generated.'}})
@@ -344,11 +327,71 @@ class GuiNormalizerAdapter:
         if status_callback:
             status_callback({'type': 'transformation', 'data': {'status': 'completed', 'message': 'Proposals transformed.'}})
 
+        report = run_report.finish()
+        append_run_history(report, str(self.run_history_path))
+
         return {
             "original_scan_tree": original_scan_tree,
-            "proposals": transformed_proposals
+            "proposals": transformed_proposals,
+            "run_report": report
         }
 
+    def remap_after_config_change(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Re-maps the last scan's proposals after patterns.json or profiles.json changed.
+
+        Only the proposals a change can affect are recomputed (see
+        mapping_utils/incremental_remap.py); no rescan happens.
+
+        Returns None if nothing was scanned yet or no config file changed, otherwise a delta:
+        {"updated": [GUI item views, same ids as before], "checked": int,
+         "changed_categories": [...], "rules_changed": bool}.
+        """
+        if self._last_mapping is None or not self.current_profile_name:
+            return None
+
+        snapshot = self.config_service.snapshot(force_check=True)
+        # Unchanged files keep their parsed objects across snapshots
+        patterns_changed = snapshot.patterns is not self._config_snapshot.patterns
+        profiles_changed = snapshot.profiles is not self._config_snapshot.profiles
+        if not (patterns_changed or profiles_changed or force):
+            return None
+        self._config_snapshot = snapshot
+
+        if patterns_changed or force:
+            self.mapping_generator.reload_patterns()
+        if profiles_changed or force:
+            if "profiles" in snapshot.errors:
+                self.logger.error(f"Could not reload {self.profiles_json_path}: {snapshot.errors['profiles']}")
+                return None
+            if not self.set_profile(self.current_profile_name):
+                return None
+
+        profile = {"name": self.current_profile_name, "rules": self.current_profile_rules}
+        new_pattern_set = self.mapping_generator.pattern_set
+        new_rule_index = self.mapping_generator.get_rule_index(profile)
+        delta = remap_proposals(
+            self._last_mapping["proposals"],
+            self._last_mapping["pattern_set"],
+            new_pattern_set,
+            self._last_mapping["rule_index"],
+            new_rule_index,
+            self._last_mapping["root_output_dir"],
+        )
+        self._last_mapping["pattern_set"] = new_pattern_set
+        self._last_mapping["rule_index"] = new_rule_index
+
+        delta["updated"] = [self._transform_proposal(p_item) for p_item in delta["updated"]]
+        self.logger.info(
+            f"Incremental re-map: {len(delta['updated'])} of {delta['checked']} proposals changed "
+            f"(pattern categories: {delta['changed_categories'] or 'none'}, rules changed: {delta['rules_changed']})"
+        )
+        return delta
+
+    def _transform_proposal(self, p_item: Dict[str, Any]) -> GuiItemView:
+        """Wraps a mapping proposal in a lazy view with the flat item keys used by the GUI."""
+        return GuiItemView(p_item)
+
     def _format_size_for_display(self, size_bytes: Optional[Any]) -> str:
         """Helper to format size in bytes to a human-readable string."""
         if size_bytes is None or not isinstance(size_bytes, (int, float)):
@@ -448,6 +491,10 @@ class GuiNormalizerAdapter:
                 if 'file_count' in seq_info:
                     file_count = seq_info.get('file_count', 0)
                 tooltip_parts.append("Sequence Details: " + frame_range_str + " (" + str(file_count) + " files)")
+                gaps = seq_info.get('gaps')
+                if gaps:
+                    missing_count = sum(end - start + 1 for start, end in gaps)
+                    tooltip_parts.append("Missing Frames: " + str(missing_count) + " in " + str(len(gaps)) + " gap(s)")
             else:
                 tooltip_parts.append("Sequence Details: N/A (info missing)")
 
@@ -470,8 +517,7 @@ class GuiNormalizerAdapter:
 
     def get_available_tasks_for_profile(self, profile_name: str) -> List[str]:
         try:
-            with open(self.patterns_json_path, 'r', encoding='utf-8') as f:
-                patterns_data = json.load(f)
+            patterns_data = self.config_service.snapshot().patterns
             task_patterns = patterns_data.get('taskPatterns', {})
             if isinstance(task_patterns, dict):
                 # Task patterns are expected to be like: {"task_name_for_display": ["keyword1", "keyword2"]}
@@ -507,8 +553,7 @@ class GuiNormalizerAdapter:
         Handles both dict and list structures for assetPatterns.
         """
         try:
-            with open(self.patterns_json_path, 'r', encoding='utf-8') as f:
-                patterns_data = json.load(f)
+            patterns_data = self.config_service.snapshot().patterns
             asset_patterns = patterns_data.get('assetPatterns', {})
             if isinstance(asset_patterns, dict):
                 # If assetPatterns is a dict, return its keys
@@ -529,8 +574,7 @@ class GuiNormalizerAdapter:
         Robustly handles both dict and list structures for resolutionPatterns.
         """
         try:
-            with open(self.patterns_json_path, 'r', encoding='utf-8') as f:
-                patterns_data = json.load(f)
+            patterns_data = self.config_service.snapshot().patterns
             res_patterns = patterns_data.get('resolutionPatterns', {})
             if isinstance(res_patterns, dict):
                 return sorted(list(res_patterns.keys()))
@@ -548,8 +592,7 @@ class GuiNormalizerAdapter:
         Robustly handles both dict and list structures for stagePatterns.
         """
         try:
-            with open(self.patterns_json_path, 'r', encoding='utf-8') as f:
-                patterns_data = json.load(f)
+            patterns_data = self.config_service.snapshot().patterns
             stage_patterns = patterns_data.get('stagePatterns', {})
             if isinstance(stage_patterns, dict):
                 return sorted(list(stage_patterns.keys()))
@@ -594,66 +637,13 @@ class GuiNormalizerAdapter:
             self.logger.error(f"No rules loaded for current profile '{self.current_profile_name}', cannot generate path preview.")
             return "Error: Profile rules not loaded for preview."
 
-        self.logger.debug(
-            f"get_path_preview called with: item_data.id={item_data.get('id')}, "
-            f"changed_field='{changed_field}', new_value='{new_value}', "
-            f"profile='{profile_name}', dest_root='{destination_root}'"
-        )
-
         if not item_data or not profile_name or not destination_root:
             self.logger.warning("get_path_preview: Missing critical input data.")
             return "Error: Missing input data for preview."
 
-        original_item_details = {
-            'name': item_data.get('filename'),
-            'path': item_data.get('source_path'),
-            'type': item_data.get('type', 'file').lower(),
-            'size': item_data.get('size')
-        }
-        if item_data.get('sequence_info'):
-            original_item_details['sequence_info'] = item_data.get('sequence_info')
-
-        modified_parts = item_data.get('normalized_parts', {}).copy()
-        
-        if new_value is None or new_value == '':
-            modified_parts.pop(changed_field, None)
-        else:
-            modified_parts[changed_field] = new_value
-
-        profile_for_preview = {
-            "name": self.current_profile_name,
-            "rules": self.current_profile_rules
-        }
-
         try:
-            if hasattr(self.mapping_generator, 'generate_path_from_proposal_data'):
-                temp_proposal_for_path_gen = {
-                    'original_item': original_item_details,
-                    'tags': modified_parts, 
-                    'id': item_data.get('id') 
-                }
-                predicted_path = self.mapping_generator.generate_path_from_proposal_data(
-                    proposal_data=temp_proposal_for_path_gen,
-                    profile=profile_for_preview,
-                    root_output_dir=destination_root
-                )
-                self.logger.debug(f"get_path_preview: Predicted path = {predicted_path}")
-                return predicted_path
-            else:
-                self.logger.warning(
-                    "MappingGenerator does not have 'generate_path_from_proposal_data'. "
-                    "Path preview will be a placeholder."
-                )
-                parts_for_name = [
-                    modified_parts.get('asset', original_item_details.get('name', 'item').split('.')[0]),
-                    modified_parts.get('task'),
-                    modified_parts.get('version')
-                ]
-                base_name = "_".join(filter(None, parts_for_name))
-                extension = Path(original_item_details.get('name', '')).suffix
-                dest_root_path = Path(destination_root)
-                return str(dest_root_path / "PREVIEW_PATH_FOR" / f"{base_name}{extension}") + " (Method not fully implemented)"
-
+            self._sync_path_preview_profile()
+            return self.path_preview_service.preview(item_data, {changed_field: new_value}, destination_root)
         except Exception as e:
             self.logger.error(f"Error during path preview generation: {e}", exc_info=True)
             return f"Error generating preview: {e}"
@@ -666,8 +656,7 @@ class GuiNormalizerAdapter:
         """
         options = {}
         try:
-            with open(self.patterns_json_path, 'r', encoding='utf-8') as f:
-                patterns_data = json.load(f)
+            patterns_data = self.config_service.snapshot().patterns
             # Map internal field names to patterns.json keys
             field_to_pattern_key = {
                 'shot_name': 'shotPatterns',
@@ -720,42 +709,102 @@ class GuiNormalizerAdapter:
         if not self.current_profile_name:
             self.logger.warning("get_batch_edit_preview_path: No profile set.")
             return "Error: No profile set."
-        modified_parts = item_data.get('normalized_parts', {}).copy()
-        for k, v in changes.items():
-            if v is None or v == '':
-                modified_parts.pop(k, None)
-            else:
-                modified_parts[k] = v
-        profile_for_preview = {
-            "name": self.current_profile_name,
-            "rules": self.current_profile_rules
-        }
-        original_item_details = {
-            'name': item_data.get('filename'),
-            'path': item_data.get('source_path'),
-            'type': item_data.get('type', 'file').lower(),
-            'size': item_data.get('size')
-        }
-        if item_data.get('sequence_info'):
-            original_item_details['sequence_info'] = item_data.get('sequence_info')
         try:
-            if hasattr(self.mapping_generator, 'generate_path_from_proposal_data'):
-                temp_proposal_for_path_gen = {
-                    'original_item': original_item_details,
-                    'tags': modified_parts,
-                    'id': item_data.get('id')
-                }
-                predicted_path = self.mapping_generator.generate_path_from_proposal_data(
-                    proposal_data=temp_proposal_for_path_gen,
-                    profile=profile_for_preview,
-                    root_output_dir=destination_root
-                )
-                return predicted_path
-            else:
-                return "Preview not available (mapping_generator missing method)"
+            self._sync_path_preview_profile()
+            return self.path_preview_service.preview(item_data, changes, destination_root)
         except Exception as e:
             self.logger.error(f"Error during batch edit preview path generation: {e}", exc_info=True)
             return f"Error generating preview: {e}"
 
+    def _sync_path_preview_profile(self) -> None:
+        """Point the preview service at the current profile (no-op if it already is)."""
+        self.path_preview_service.set_profile(self.current_profile_name, self.current_profile_rules or [])
+
+    def request_path_preview(
+        self,
+        item_data: Dict[str, Any],
+        changes: Dict[str, Any],
+        callback: Callable[[str], None],
+        destination_root: Optional[str] = None,
+        schedule: Optional[Callable[[float, Callable[[], None]], None]] = None
+    ) -> None:
+        """
+        Debounced preview for interactive editors: callback(path) runs once edits pause.
+        A newer request replaces a pending one, so typing never queues up path resolutions.
 
-        
\ No newline at end of file
+        Args:
+            item_data: The GUI item being previewed.
+            changes: Dict of field overrides (e.g., {"task": "comp"}).
+            callback: Receives the predicted path (or an "Error: ..." string).
+            destination_root: Root output directory; defaults to the last scan's.
+            schedule: Optional (delay_seconds, fn) scheduler, e.g. one using QTimer.singleShot
+                      so the callback runs on the GUI thread.
+        """
+        if not self.current_profile_name:
+            callback("Error: No profile set.")
+            return
+        if not destination_root and self._last_mapping is not None:
+            destination_root = self._last_mapping["root_output_dir"]
+        self._sync_path_preview_profile()
+        self.path_preview_service.request(item_data, changes, destination_root or "", callback, schedule=schedule)
+
+    def apply_batch_edit(self, items: List[Dict[str, Any]], changes: Dict[str, Any], destination_root: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Applies batch-edit changes to many GUI items at once (see mapping_utils/batch_edit.py).
+
+        The proposals behind the items are updated in place, so later re-maps and file
+        operations see the edit. Each distinct resulting tag set is resolved once.
+
+        Args:
+            items: GUI items (views or their dict copies) selected for editing.
+            changes: Dict of field overrides from the batch edit dialog (e.g., {"task": "comp"}).
+            destination_root: Root output directory; defaults to the last scan's.
+
+        Returns:
+            {"updated": [GUI item views], "unresolved": [ids whose target could not be resolved],
+             "distinct_tag_sets": int}
+        """
+        if not self.current_profile_name:
+            raise ValueError("No profile set.")
+        if not destination_root and self._last_mapping is not None:
+            destination_root = self._last_mapping["root_output_dir"]
+        if not destination_root:
+            raise ValueError("No destination root for batch edit.")
+
+        proposals_by_id = {}
+        if self._last_mapping is not None:
+            proposals_by_id = {p_item.get('id'): p_item for p_item in self._last_mapping["proposals"]}
+
+        proposals = []
+        for item_data in items:
+            proposal = proposals_by_id.get(item_data.get('id'))
+            if proposal is None:
+                # Not from the last scan: edit a proposal rebuilt from the item itself
+                proposal = {
+                    'id': item_data.get('id'),
+                    'original_item': {
+                        'name': item_data.get('filename'),
+                        'path': item_data.get('source_path'),
+                        'type': str(item_data.get('type', 'file')).lower(),
+                        'size': item_data.get('size'),
+                    },
+                    'targetPath': item_data.get('new_destination_path'),
+                    'type': str(item_data.get('type', 'file')).lower(),
+                    'status': item_data.get('status', 'manual'),
+                    'tags': dict(item_data.get('normalized_parts') or {}),
+                    'sequence_info': item_data.get('sequence_info'),
+                    'matched_rules': item_data.get('matched_rules', []),
+                }
+            proposals.append(proposal)
+
+        profile = {"name": self.current_profile_name, "rules": self.current_profile_rules}
+        change_set = apply_batch_edit(proposals, changes, self.mapping_generator.get_rule_index(profile), destination_root)
+        self.logger.info(
+            f"Batch edit: {len(change_set['updated'])} items updated from "
+            f"{change_set['distinct_tag_sets']} distinct tag sets, {len(change_set['unresolved'])} unresolved"
+        )
+        return {
+            "updated": [GuiItemView(p_item) for p_item in change_set["updated"]],
+            "unresolved": [p_item.get('id') for p_item in change_set["unresolved"]],
+            "distinct_tag_sets": change_set["distinct_tag_sets"],
+        }
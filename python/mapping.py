@@ -1,10 +1,12 @@
 import re
+import sys
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable # Added for type hinting
 from pathlib import Path
 from .mapping_utils.init_patterns_from_profile import init_patterns_from_profile
 from .mapping_utils.generate_mappings import generate_mappings
-from .mapping_utils.group_image_sequences import group_image_sequences
+from .mapping_utils.batch_sequence_detection import group_image_sequences_batch
 from .mapping_utils.finalize_sequences import finalize_sequences
 from .mapping_utils.is_network_path import is_network_path
 from .mapping_utils.create_sequence_mapping import create_sequence_mapping
@@ -12,13 +14,19 @@ from .mapping_utils.create_simple_mapping import create_simple_mapping
 from .mapping_utils.generate_simple_target_path import generate_simple_target_path
 from .mapping_utils.extract_sequence_info import extract_sequence_info
 from .mapping_utils.process_file_for_sequence import process_file_for_sequence
-from .mapping_utils.config_loader import load_config
+from .mapping_utils.config_service import get_config_service
 from .mapping_utils.shot_extractor import extract_shot_simple
 from .mapping_utils.task_extractor import extract_task_simple
 from .mapping_utils.version_extractor import extract_version_simple
 from .mapping_utils.resolution_extractor import extract_resolution_simple
 from .mapping_utils.asset_extractor import extract_asset_simple
 from .mapping_utils.stage_extractor import extract_stage_simple
+from .mapping_utils.pattern_set import PatternSet
+from .mapping_utils.pattern_profiler import PatternProfiler, format_pattern_report
+from .mapping_utils.run_report import RunReport, format_run_report
+from .mapping_utils.profile_rule_index import ProfileRuleIndex
+from .mapping_utils.stream_mappings import stream_mappings, iter_tree_files
+from .mapping_utils.external_sequence_grouping import EXTERNAL_GROUPING_MIN_FILES
 
 
 class MappingGenerator:
@@ -28,6 +36,8 @@ class MappingGenerator:
             script_dir = Path(__file__).parent.parent
             config_path = script_dir / "config" / "patterns.json"
         self.config_path = Path(config_path)  # Ensure config_path is a Path object
+        # patterns.json and the sibling profiles.json, parsed once and shared with the GUI adapter
+        self.config_service = get_config_service(str(self.config_path))
         self.config = {}
         self.shot_patterns = []
         self.task_patterns = {}
@@ -35,38 +45,40 @@ class MappingGenerator:
         self.version_patterns = []
         self.asset_patterns = []
         self.stage_patterns = []
+        self.pattern_set = PatternSet()
+        self.rule_indexes: Dict[str, ProfileRuleIndex] = {}  # profile name -> compiled rules
+        # Above this many files, generate_mappings streams the tree and groups sequences
+        # out of core (sorted runs on disk) instead of collecting every file node first; 0 never does
+        self.external_grouping_threshold = EXTERNAL_GROUPING_MIN_FILES
+        self.external_grouping_spill_dir: Optional[str] = None
+        # Instrumentation mode: per-pattern timing of the next runs (see mapping_utils/pattern_profiler.py)
+        self.pattern_profiling = False
+        self.pattern_profiler: Optional[PatternProfiler] = None  # Profiler of the last profiled run
+        self.last_run_report: Optional[RunReport] = None  # Stage timings of the last generate_mappings run
         self.max_depth = 10
         self.current_frame_numbers = []  # Initialize frame numbers storage
         self.reload_patterns()  # Load patterns on initialization
 
     def reload_patterns(self):
-        """Reload patterns from the config file."""
+        """Reload patterns from the config file (through the shared config service)."""
         print(f"Reloading patterns from: {self.config_path}")
         try:
-            self.config = load_config(self.config_path)
-            self.shot_patterns = self.config.get("shotPatterns", [])
-            self.task_patterns = self.config.get("taskPatterns", {})
-            self.resolution_patterns = self.config.get("resolutionPatterns", [])
-            self.version_patterns = self.config.get("versionPatterns", [])
-            self.asset_patterns = self.config.get("assetPatterns", [])
-            self.stage_patterns = self.config.get("stagePatterns", [])
-
-            # Ensure patterns that should be lists are lists
-            if not isinstance(self.shot_patterns, list):
-                self.shot_patterns = []
-            if not isinstance(self.resolution_patterns, list):
-                self.resolution_patterns = []
-            if not isinstance(self.version_patterns, list):
-                self.version_patterns = []
-            if not isinstance(self.asset_patterns, list):
-                self.asset_patterns = []
-            if not isinstance(self.stage_patterns, list):
-                self.stage_patterns = []
-            if not isinstance(self.task_patterns, dict):
-                self.task_patterns = {}
+            snapshot = self.config_service.snapshot(force_check=True)
+            self.config = snapshot.patterns
+            # PatternSet.from_config already dropped values of the wrong type
+            self.pattern_set = snapshot.pattern_set
+            self.shot_patterns = self.pattern_set.raw["shot"]
+            self.task_patterns = self.pattern_set.raw["task"]
+            self.resolution_patterns = self.pattern_set.raw["resolution"]
+            self.version_patterns = self.pattern_set.raw["version"]
+            self.asset_patterns = self.pattern_set.raw["asset"]
+            self.stage_patterns = self.pattern_set.raw["stage"]
+            if "patterns" in snapshot.errors:
+                print(f"ERROR: {snapshot.errors['patterns']}. Keeping the last loaded patterns.")
+                return False
 
             print(
-                f"Patterns reloaded: "
+                f"Patterns reloaded (config v{snapshot.version}): "
                 f"{len(self.shot_patterns)} shot, "
                 f"{len(self.task_patterns)} task, "
                 f"{len(self.version_patterns)} version, "
@@ -75,16 +87,6 @@ class MappingGenerator:
                 f"{len(self.stage_patterns)} stage patterns."
             )
             return True
-        except FileNotFoundError:
-            print(f"ERROR: Config file not found at {self.config_path}. Patterns not loaded.")
-            self.config = {}
-            self.shot_patterns = []
-            self.task_patterns = {}
-            self.resolution_patterns = []
-            self.version_patterns = []
-            self.asset_patterns = []
-            self.stage_patterns = []
-            return False
         except Exception as e:
             print(f"ERROR: Failed to load or parse config from {self.config_path}: {e}. Patterns not loaded.")
             self.config = {}
@@ -94,6 +96,7 @@ class MappingGenerator:
             self.version_patterns = []
             self.asset_patterns = []
             self.stage_patterns = []
+            self.pattern_set = PatternSet()
             return False
 
     def _extract_shot_simple(self, filename: str, path: str) -> str:
@@ -119,7 +122,35 @@ class MappingGenerator:
         # IMPORTANT: Only use patterns from patterns.json, only search filename
         return extract_stage_simple(filename, self.stage_patterns)
 
-    def _create_sequence_mapping(self, sequence, full_profile_data: Dict[str, Any], root_output_dir: str, original_base_name=None):
+    def get_rule_index(self, profile: Dict[str, Any]) -> ProfileRuleIndex:
+        """Return the compiled rule index for a profile, recompiling if its rules changed."""
+        profile_rules = profile.get('rules', [])
+        profile_name = profile.get('name', '')
+        # Rules straight from the shared config snapshot: use the snapshot's compiled index
+        snapshot = self.config_service.snapshot()
+        if profile_rules is snapshot.profile_rules(profile_name):
+            return snapshot.rule_index(profile_name)
+        rule_index = self.rule_indexes.get(profile_name)
+        if rule_index is None or not rule_index.matches(profile_rules):
+            rule_index = ProfileRuleIndex(profile_rules)
+            self.rule_indexes[profile_name] = rule_index
+        return rule_index
+
+    def set_pattern_profiling(self, enabled: bool):
+        """Turn pattern profiling on or off for subsequent mapping runs."""
+        self.pattern_profiling = bool(enabled)
+
+    def set_external_grouping_threshold(self, min_files: int):
+        """Group sequences out of core from this many files on (0: never) in subsequent mapping runs."""
+        self.external_grouping_threshold = max(0, int(min_files))
+
+    def _start_pattern_profiler(self) -> Optional[PatternProfiler]:
+        if not self.pattern_profiling:
+            return None
+        self.pattern_profiler = PatternProfiler(self.pattern_set)
+        return self.pattern_profiler
+
+    def _create_sequence_mapping(self, sequence, full_profile_data: Dict[str, Any], root_output_dir: str, original_base_name=None, rule_index=None, pattern_set=None):
         return create_sequence_mapping(
             sequence=sequence,
             profile=full_profile_data,
@@ -139,10 +170,12 @@ class MappingGenerator:
             p_version=self.version_patterns,
             p_resolution=self.resolution_patterns,
             p_asset=self.asset_patterns,
-            p_stage=self.stage_patterns
+            p_stage=self.stage_patterns,
+            rule_index=rule_index,
+            pattern_set=pattern_set
         )
 
-    def _create_simple_mapping(self, node, profile_rules, root_output_dir: str):
+    def _create_simple_mapping(self, node, profile_rules, root_output_dir: str, rule_index=None, pattern_set=None):
         return create_simple_mapping(
             node=node,
             profile_rules=profile_rules,
@@ -158,11 +191,15 @@ class MappingGenerator:
             p_version=self.version_patterns,
             p_resolution=self.resolution_patterns,
             p_asset=self.asset_patterns,
-            p_stage=self.stage_patterns
+            p_stage=self.stage_patterns,
+            rule_index=rule_index,
+            pattern_set=pattern_set
         )
 
     def _group_image_sequences(self, files, batch_id=None, **kwargs):
-        return group_image_sequences(files, batch_id=batch_id, **kwargs)
+        # Batch detection gives the same result as group_image_sequences with the
+        # built-in extract_sequence_info, parsing all names in one regex pass
+        return group_image_sequences_batch(files, batch_id=batch_id)
 
     def _process_file_for_sequence(self, file_node, file_groups, single_files, sequence_extensions):
         return process_file_for_sequence(file_node, file_groups, single_files, sequence_extensions)
@@ -176,6 +213,20 @@ class MappingGenerator:
     def _init_patterns_from_profile(self, profile):
         return init_patterns_from_profile(self, profile)
 
+    def use_external_grouping(self, tree) -> bool:
+        """Whether a scan tree has external_grouping_threshold files or more."""
+        if not self.external_grouping_threshold or not isinstance(tree, dict):
+            return False
+        if tree.get("_all_files"):
+            return len(tree["_all_files"]) >= self.external_grouping_threshold
+        # Counting walks the tree without collecting its file nodes
+        file_count = 0
+        for _ in iter_tree_files(tree):
+            file_count += 1
+            if file_count >= self.external_grouping_threshold:
+                return True
+        return False
+
     def generate_mappings(self, tree, profile: Dict[str, Any], root_output_dir: str, batch_id=None, status_callback: Optional[Callable[[Dict[str, Any]], None]] = None, **kwargs):
         rules_list = profile.get('rules', [])
         if not isinstance(rules_list, list):
@@ -185,20 +236,84 @@ class MappingGenerator:
             )
 
         actual_status_callback = kwargs.pop('status_callback', status_callback)
-
-        return generate_mappings(
+        # Callers that time more stages (scan, GUI transform) pass their own report
+        run_report = kwargs.pop('run_report', None)
+        owns_run_report = run_report is None
+        if owns_run_report:
+            run_report = RunReport(batch_id, {"profile": profile.get('name')})
+        self.last_run_report = run_report
+        rule_index = self.get_rule_index(profile)
+        if self.use_external_grouping(tree):
+            # Too many files to hold as node lists: stream the tree through out-of-core grouping
+            stage_start = time.perf_counter()
+            mappings = list(self.stream_mappings(
+                iter_tree_files(tree), profile, root_output_dir, batch_id=batch_id,
+                status_callback=actual_status_callback, external_grouping=True,
+            ))
+            run_report.add_stage("stream_mappings_external", time.perf_counter() - stage_start, len(mappings))
+            if owns_run_report:
+                print(format_run_report(run_report.finish()), file=sys.stderr)
+            return mappings
+
+        profiler = self._start_pattern_profiler()
+        if profiler is not None:
+            # Worker processes would keep their stats to themselves, and with one thread
+            # the per-pattern wall times aren't inflated by GIL hand-offs
+            kwargs.setdefault('use_process_pool', False)
+            kwargs.setdefault('max_workers', 1)
+
+        mappings = generate_mappings(
             tree=tree,
             profile=profile,
             batch_id=batch_id,
             group_image_sequences=self._group_image_sequences,
             extract_sequence_info=self._extract_sequence_info,
             is_network_path=is_network_path,
-            create_sequence_mapping=lambda seq, prof_dict, orig_base_name: self._create_sequence_mapping(seq, prof_dict, root_output_dir, orig_base_name),
-            create_simple_mapping=lambda node, prof_dict: self._create_simple_mapping(node, prof_dict['rules'], root_output_dir),
+            create_sequence_mapping=lambda seq, prof_dict, orig_base_name: self._create_sequence_mapping(seq, prof_dict, root_output_dir, orig_base_name, rule_index, profiler),
+            create_simple_mapping=lambda node, prof_dict: self._create_simple_mapping(node, prof_dict['rules'], root_output_dir, rule_index, profiler),
             finalize_sequences=self._finalize_sequences,
             status_callback=actual_status_callback, # Pass it here
+            root_output_dir=root_output_dir,
+            pattern_set=self.pattern_set,
+            run_report=run_report,
             **kwargs # Pass remaining kwargs
         )
+        if profiler is not None:
+            print(format_pattern_report(profiler.report(), top=10), file=sys.stderr)
+        if owns_run_report:
+            print(format_run_report(run_report.finish()), file=sys.stderr)
+        return mappings
+
+    def stream_mappings(self, files, profile: Dict[str, Any], root_output_dir: str, batch_id=None, status_callback: Optional[Callable[[Dict[str, Any]], None]] = None, max_open_directories: int = 1, external_grouping: bool = False):
+        """
+        Yield proposals for an iterable of file nodes (or paths) as they are produced.
+        See mapping_utils/stream_mappings.py for ordering and buffering; external_grouping
+        spills sequence candidates to self.external_grouping_spill_dir.
+        """
+        rule_index = self.get_rule_index(profile)
+        profiler = self._start_pattern_profiler()
+        pattern_set = profiler or self.pattern_set
+        return stream_mappings(
+            files,
+            profile,
+            group_image_sequences=lambda candidates: group_image_sequences_batch(candidates, batch_id=batch_id, verbose=False),
+            create_sequence_mapping=lambda seq, prof_dict, orig_base_name: self._create_sequence_mapping(seq, prof_dict, root_output_dir, orig_base_name, rule_index, profiler),
+            create_simple_mapping=lambda node, prof_dict: create_simple_mapping(
+                node=node,
+                profile_rules=prof_dict.get('rules', []),
+                root_output_dir=root_output_dir,
+                pattern_set=pattern_set,
+                rule_index=rule_index
+            ),
+            status_callback=status_callback,
+            max_open_directories=max_open_directories,
+            external_grouping=external_grouping,
+            spill_dir=self.external_grouping_spill_dir,
+        )
+
+    def generate_mappings_with_progress(self, tree, profile: Dict[str, Any], root_output_dir: str, batch_id=None, status_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Streaming variant of generate_mappings: a generator of proposals for a scan tree."""
+        return self.stream_mappings(iter_tree_files(tree), profile, root_output_dir, batch_id=batch_id, status_callback=status_callback)
 
     def _init_patterns_from_profile(self, profile):
         return init_patterns_from_profile(self, profile)
@@ -255,6 +370,7 @@ class MappingGenerator:
             profile_name = profile.get("name", "Unknown Profile")
             print(f"[MappingGenerator] Error: Profile '{profile_name}' is missing 'rules' or rules are not a list.")
             return f"Error: Invalid rules for profile '{profile_name}'."
+        rule_index = self.get_rule_index(profile)
 
         parsed_shot = modified_tags.get('shot')
         parsed_task = modified_tags.get('task')
@@ -274,7 +390,8 @@ class MappingGenerator:
                 parsed_asset=parsed_asset,
                 parsed_stage=parsed_stage,
                 parsed_version=parsed_version,
-                parsed_resolution=parsed_resolution
+                parsed_resolution=parsed_resolution,
+                rule_index=rule_index
             )
             
             target_path = path_gen_result.get("target_path")
@@ -0,0 +1,95 @@
+"""
+Bulk Batch Edit
+
+Applies one set of batch-edit changes (task, asset, version, ...) to many
+proposals at once. Proposals are grouped by their resulting tag tuple and
+each distinct tuple is resolved once through the profile's ProfileRuleIndex;
+every proposal in the group only joins its own filename onto that directory.
+Editing 20k items that end up with a handful of distinct tag sets costs a
+handful of path resolutions instead of 20k.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+from .profile_rule_index import join_target_path
+
+# Batch-edit fields that are proposal tags, in ProfileRuleIndex.resolve_directory order
+BATCH_EDIT_TAG_KEYS = ("shot", "task", "asset", "stage", "version", "resolution")
+
+
+def _custom_target_path(custom_destination: str, filename: str) -> str:
+    # A custom destination that already ends with the filename is used as-is
+    if custom_destination.endswith(filename):
+        return custom_destination
+    return os.path.join(custom_destination, filename)
+
+
+def apply_batch_edit(
+    proposals: List[Dict[str, Any]],
+    changes: Dict[str, Any],
+    rule_index,
+    root_output_dir: str,
+) -> Dict[str, Any]:
+    """
+    Apply batch-edit changes to proposals in place.
+
+    Args:
+        proposals: Proposals to edit (records or dicts with 'tags' and 'original_item')
+        changes: {field: value} from the batch edit dialog. Tag fields set the tag
+                 (an empty value clears it); 'destination_path' overrides the target path.
+        rule_index: ProfileRuleIndex of the current profile
+        root_output_dir: Root directory for resolved target paths
+
+    Returns:
+        Change set: {"updated": [edited proposals, input order],
+                     "unresolved": [proposals whose new tags have no unambiguous target;
+                                    their tags changed but targetPath was kept],
+                     "distinct_tag_sets": number of path resolutions performed}
+    """
+    tag_changes = {key: (value if value not in (None, "") else None)
+                   for key, value in changes.items() if key in BATCH_EDIT_TAG_KEYS}
+    custom_destination: Optional[str] = (changes.get("destination_path") or "").strip() or None
+
+    updated: List[Dict[str, Any]] = []
+    unresolved: List[Dict[str, Any]] = []
+    if not proposals or not (tag_changes or custom_destination):
+        return {"updated": updated, "unresolved": unresolved, "distinct_tag_sets": 0}
+
+    # Pass 1: new tags and their tag tuple per proposal
+    tag_tuples = []
+    for proposal in proposals:
+        tags = proposal.get("tags")
+        new_tags = dict(tags) if isinstance(tags, dict) else {}
+        new_tags.update(tag_changes)
+        proposal["tags"] = new_tags
+        tag_tuples.append(tuple(new_tags.get(key) for key in BATCH_EDIT_TAG_KEYS))
+
+    # One resolution per distinct tag tuple
+    directories: Dict[tuple, Dict[str, Any]] = {}
+    if custom_destination is None:
+        for tag_tuple in tag_tuples:
+            if tag_tuple not in directories:
+                directories[tag_tuple] = rule_index.resolve_directory(root_output_dir, *tag_tuple)
+
+    # Pass 2: target paths
+    for proposal, tag_tuple in zip(proposals, tag_tuples):
+        filename = (proposal.get("original_item") or {}).get("name", "")
+        if custom_destination is not None:
+            if filename:
+                proposal["targetPath"] = _custom_target_path(custom_destination, filename)
+            updated.append(proposal)
+            continue
+        directory_result = directories[tag_tuple]
+        target_dir = directory_result["target_dir"]
+        if target_dir is None:
+            unresolved.append(proposal)
+        else:
+            target_path = join_target_path(target_dir, filename)
+            matched_rule = directory_result["matched_rule"]
+            proposal["targetPath"] = target_path
+            proposal["status"] = "auto" if not target_path.endswith("unmatched") else "manual"
+            proposal["matched_rules"] = [matched_rule] if matched_rule else []
+        updated.append(proposal)
+
+    return {"updated": updated, "unresolved": unresolved, "distinct_tag_sets": len(directories)}
@@ -0,0 +1,185 @@
+"""
+Batch Sequence Detection
+
+Detects image sequences over a whole file table at once instead of calling
+extract_sequence_info per file. All names are parsed by one compiled regex in a
+single pass over a newline-joined buffer, and files are grouped by
+(directory id, base name, extension) with a sort instead of a dict of lists.
+
+Produces exactly the same (sequences, single_files) as group_image_sequences
+with the default extract_sequence_info, except that each sequence is stored
+in the compact frame-range form (see frame_ranges.py) instead of a list of nodes.
+"""
+
+import os
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional
+
+from .frame_token_parser import FRAME_TOKEN_BUFFER_RE, LAYOUT_GROUPS, parse_frame_token
+from .group_image_sequences import SEQUENCE_EXTENSIONS
+from .frame_ranges import build_sequence_files
+
+class FileTable:
+    """Column-oriented view of a file list: names plus interned directory ids."""
+
+    def __init__(self, nodes: List[Dict[str, Any]], names: List[str], extensions: List[str],
+                 dir_ids: List[int], directories: List[str]):
+        self.nodes = nodes
+        self.names = names
+        self.extensions = extensions
+        self.dir_ids = dir_ids
+        self.directories = directories  # dir id -> str(Path(file_path).parent)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_nodes(cls, files: List[Dict[str, Any]]) -> "FileTable":
+        names = []
+        extensions = []
+        dir_ids = []
+        directories: List[str] = []
+        prefix_to_id: Dict[str, int] = {}
+        windows_separators = os.sep == "\\"
+
+        for file_node in files:
+            names.append(file_node.get("name", ""))
+            extensions.append(file_node.get("extension", "").lower())
+            file_path = file_node.get("path", "")
+            if windows_separators:
+                cut = max(file_path.rfind("/"), file_path.rfind("\\"))
+            else:
+                cut = file_path.rfind("/")
+            prefix = file_path[:cut] if cut >= 0 else ""
+            dir_id = prefix_to_id.get(prefix)
+            if dir_id is None:
+                # Path.parent is only computed once per distinct directory
+                dir_id = len(directories)
+                prefix_to_id[prefix] = dir_id
+                directories.append(str(Path(file_path).parent))
+            dir_ids.append(dir_id)
+
+        return cls(files, names, extensions, dir_ids, directories)
+
+
+def parse_frame_tokens(names: List[str]) -> List[Optional[Tuple[str, int]]]:
+    """
+    Parse (base_name, frame) for every name in one regex pass.
+
+    Returns None for names that are not sequence frames. Names the joined buffer
+    can't represent (embedded newlines) and matches that fail validation go
+    through parse_frame_token, so results are identical to extract_sequence_info.
+    """
+    results: List[Optional[Tuple[str, int]]] = [None] * len(names)
+    buffer_indices = []
+    for index, name in enumerate(names):
+        if not name or "\n" in name:
+            token = parse_frame_token(name) if name else None
+            if token:
+                results[index] = token[:2]
+        else:
+            buffer_indices.append(index)
+
+    buffer = "\n".join(names[i] for i in buffer_indices)
+    matches = FRAME_TOKEN_BUFFER_RE.finditer(buffer)
+    for index, match in zip(buffer_indices, matches):
+        layout = LAYOUT_GROUPS.get(match.lastindex)
+        if layout is None:
+            continue
+        _, base_group, frame_group, middle_group, _ = layout
+        base_name = match.group(base_group)
+        if middle_group is not None:
+            base_name = f"{base_name}_{match.group(middle_group)}"
+        frame_num = int(match.group(frame_group))
+        name = names[index]
+        if "sequence_" in name:
+            continue
+        if frame_num > 999999 or base_name == "_" or "sequence_" in base_name:
+            # Rejected by this layout; parse_frame_token tries the later ones
+            token = parse_frame_token(name)
+            if token:
+                results[index] = token[:2]
+            continue
+        results[index] = (base_name, frame_num)
+    return results
+
+
+def build_sequence_record(directory: str, base_name: str, file_ext: str, names: List[str],
+                          frames: List[int], paths: List[str], size: int) -> Dict[str, Any]:
+    """Sequence dict in the compact form: pattern + padding + frame ranges; the file nodes are not kept."""
+    seq_files = build_sequence_files(directory, names, frames, paths)
+    frame_ranges = seq_files.frames
+    return {
+        "base_name": base_name,
+        "suffix": file_ext,
+        "files": seq_files,
+        "directory": directory,
+        "frame_count": len(names),
+        "frame_numbers": frame_ranges,
+        "frame_range": f"{frame_ranges.first}-{frame_ranges.last}",
+        "pattern": seq_files.pattern,
+        "padding": seq_files.padding,
+        "frame_ranges": frame_ranges.to_json(),
+        "gaps": [list(gap) for gap in frame_ranges.gaps],
+        "size": size,
+    }
+
+
+def group_image_sequences_batch(files: List[Dict[str, Any]], batch_id=None, table: FileTable = None, verbose: bool = True, **kwargs) -> Tuple[list, list]:
+    """
+    Batch equivalent of group_image_sequences.
+    Args:
+        files: List of file nodes to process
+        batch_id: Optional batch ID for progress tracking
+        table: Prebuilt FileTable for files (built here if omitted)
+        verbose: Print the per-call summary lines (off when called per directory)
+    Returns:
+        Tuple of (sequences, single_files)
+    """
+    if table is None:
+        table = FileTable.from_nodes(files)
+    nodes = table.nodes
+    total_files = len(table)
+    if verbose:
+        print(f"[SEQUENCE_GROUPING] Batch processing {total_files} files for sequence detection...")
+
+    candidate_indices = [i for i, ext in enumerate(table.extensions) if ext in SEQUENCE_EXTENSIONS]
+    parsed = parse_frame_tokens([table.names[i] for i in candidate_indices])
+
+    # (dir id, base, ext, input index, frame) for every frame; singles keep input order
+    records = []
+    single_flags = [True] * total_files
+    for index, token in zip(candidate_indices, parsed):
+        if token is not None:
+            records.append((table.dir_ids[index], token[0], table.extensions[index], index, token[1]))
+            single_flags[index] = False
+
+    # Sort-based grouping; the input index in the key keeps each group in input order
+    records.sort()
+    groups = []
+    for key, run in groupby(records, key=itemgetter(0, 1, 2)):
+        groups.append((key, list(run)))
+    # Restore first-seen group order, as a dict of lists would produce
+    groups.sort(key=lambda g: g[1][0][3])
+
+    single_files = [nodes[i] for i in range(total_files) if single_flags[i]]
+    sequences = []
+    for (dir_id, base_name, file_ext), run in groups:
+        if len(run) > 1:
+            sequences.append(build_sequence_record(
+                table.directories[dir_id],
+                base_name,
+                file_ext,
+                [table.names[r[3]] for r in run],
+                [r[4] for r in run],
+                [nodes[r[3]].get("path", "") for r in run],
+                sum(nodes[r[3]].get("size", 0) or 0 for r in run),
+            ))
+        else:
+            single_files.append(nodes[run[0][3]])
+
+    if verbose:
+        print(f"[SEQUENCE_GROUPING] Results: {len(sequences)} sequences, {len(single_files)} single files")
+    return sequences, single_files
@@ -0,0 +1,209 @@
+"""
+Shared Config Service
+
+One place that reads patterns.json and profiles.json. Each file is parsed
+once per change and published as an immutable, versioned ConfigSnapshot
+together with what is compiled from it (the PatternSet, and a
+ProfileRuleIndex per profile, compiled on first use). MappingGenerator, the
+GUI adapter and config_loader all read the same snapshot instead of opening
+the files themselves.
+
+snapshot() stats both files (at most once per check_interval unless forced)
+and, when a file's mtime or size changed, re-parses only that file and swaps
+in a new snapshot under a lock. A file that fails to parse keeps its previous
+contents and records the error on the snapshot, so a half-saved edit never
+replaces a working config.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pattern_set import PatternSet
+from .profile_rule_index import ProfileRuleIndex
+
+DEFAULT_CHECK_INTERVAL = 0.5  # seconds between mtime checks on the interactive path
+
+FileSignature = Optional[Tuple[int, int]]  # (st_mtime_ns, st_size); None if the file is missing
+
+
+def _file_signature(path: str) -> FileSignature:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object at the top level, got {type(data).__name__}")
+    return data
+
+
+def profile_rules_from_entry(entry: Any) -> Optional[List[Dict[str, Any]]]:
+    """A profiles.json entry (bare rules list or {"rules": [...]}) as its rules list, or None if malformed."""
+    if isinstance(entry, dict):
+        entry = entry.get("rules")
+    if not isinstance(entry, list) or not all(isinstance(rule, dict) for rule in entry):
+        return None
+    return entry
+
+
+class ConfigSnapshot:
+    """Parsed patterns.json and profiles.json at one point in time. Treat the data as read-only."""
+
+    def __init__(self, version: int, patterns: Dict[str, Any], profiles: Dict[str, Any],
+                 patterns_signature: FileSignature, profiles_signature: FileSignature,
+                 pattern_set: PatternSet, errors: Dict[str, str],
+                 rule_indexes: Optional[Dict[str, ProfileRuleIndex]] = None):
+        self.version = version
+        self.patterns = patterns
+        self.profiles = profiles
+        self.patterns_signature = patterns_signature
+        self.profiles_signature = profiles_signature
+        self.pattern_set = pattern_set
+        self.errors = errors  # "patterns"/"profiles" -> last load error, if the file failed to load
+        self._rule_indexes: Dict[str, ProfileRuleIndex] = rule_indexes if rule_indexes is not None else {}
+        self._lock = threading.Lock()
+
+    @property
+    def patterns_mtime(self) -> float:
+        return self.patterns_signature[0] / 1e9 if self.patterns_signature else 0.0
+
+    @property
+    def profiles_mtime(self) -> float:
+        return self.profiles_signature[0] / 1e9 if self.profiles_signature else 0.0
+
+    def profile_rules(self, profile_name: str) -> Optional[List[Dict[str, Any]]]:
+        """The profile's rules list, or None if the profile is missing or malformed."""
+        return profile_rules_from_entry(self.profiles.get(profile_name))
+
+    def rule_index(self, profile_name: str) -> Optional[ProfileRuleIndex]:
+        """Compiled rules of a profile, built once per profiles.json version. None if the profile is invalid."""
+        rule_index = self._rule_indexes.get(profile_name)
+        if rule_index is not None:
+            return rule_index
+        profile_rules = self.profile_rules(profile_name)
+        if profile_rules is None:
+            return None
+        with self._lock:
+            rule_index = self._rule_indexes.get(profile_name)
+            if rule_index is None:
+                rule_index = ProfileRuleIndex(profile_rules)
+                self._rule_indexes[profile_name] = rule_index
+        return rule_index
+
+
+class ConfigService:
+    """Loads patterns.json / profiles.json once and reloads them when they change on disk."""
+
+    def __init__(self, patterns_path: str, profiles_path: str, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.patterns_path = os.path.abspath(str(patterns_path))
+        self.profiles_path = os.path.abspath(str(profiles_path))
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._last_check = 0.0
+        self.reload_count = 0
+
+    def snapshot(self, force_check: bool = False) -> ConfigSnapshot:
+        """
+        The current snapshot, reloaded first if either file changed on disk.
+        Without force_check the files are stat'ed at most once per check_interval.
+        """
+        current = self._snapshot
+        if current is not None and not force_check and time.monotonic() - self._last_check < self.check_interval:
+            return current
+        with self._lock:
+            self._last_check = time.monotonic()
+            current = self._snapshot
+            patterns_signature = _file_signature(self.patterns_path)
+            profiles_signature = _file_signature(self.profiles_path)
+            if (current is not None and patterns_signature == current.patterns_signature
+                    and profiles_signature == current.profiles_signature):
+                return current
+            self._snapshot = self._load(current, patterns_signature, profiles_signature)
+            return self._snapshot
+
+    def reload(self) -> ConfigSnapshot:
+        """Re-read both files regardless of their mtimes (e.g. right after an editor saved them)."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            self._snapshot = self._load(self._snapshot, _file_signature(self.patterns_path),
+                                        _file_signature(self.profiles_path), reuse_unchanged=False)
+            return self._snapshot
+
+    def _load(self, previous: Optional[ConfigSnapshot], patterns_signature: FileSignature,
+              profiles_signature: FileSignature, reuse_unchanged: bool = True) -> ConfigSnapshot:
+        """Build the next snapshot. Unchanged files are reused; files that fail to parse keep previous data."""
+        errors: Dict[str, str] = {}
+
+        if reuse_unchanged and previous is not None and patterns_signature == previous.patterns_signature:
+            patterns, pattern_set = previous.patterns, previous.pattern_set
+            if "patterns" in previous.errors:
+                errors["patterns"] = previous.errors["patterns"]
+        else:
+            patterns, error = self._parse(self.patterns_path, previous.patterns if previous else None)
+            if error:
+                errors["patterns"] = error
+            if previous is not None and patterns is previous.patterns:
+                pattern_set = previous.pattern_set
+            else:
+                pattern_set = PatternSet.from_config(patterns)
+
+        if reuse_unchanged and previous is not None and profiles_signature == previous.profiles_signature:
+            profiles = previous.profiles
+            if "profiles" in previous.errors:
+                errors["profiles"] = previous.errors["profiles"]
+        else:
+            profiles, error = self._parse(self.profiles_path, previous.profiles if previous else None)
+            if error:
+                errors["profiles"] = error
+        # Same profiles object, same compiled rules
+        rule_indexes = previous._rule_indexes if previous is not None and profiles is previous.profiles else None
+
+        self.reload_count += 1
+        version = previous.version + 1 if previous is not None else 1
+        print(f"Config snapshot v{version} loaded from: {os.path.dirname(self.patterns_path)}", file=sys.stderr)
+        return ConfigSnapshot(version, patterns, profiles, patterns_signature, profiles_signature,
+                              pattern_set, errors, rule_indexes)
+
+    @staticmethod
+    def _parse(path: str, fallback: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Parsed file and None, or (fallback or {}) and the error message."""
+        try:
+            return _read_json(path), None
+        except Exception as e:
+            message = f"Failed to load config from {path}: {e}"
+            print(message + (" (keeping the previous version)" if fallback is not None else ""), file=sys.stderr)
+            return (fallback if fallback is not None else {}), message
+
+
+_services: Dict[Tuple[str, str], ConfigService] = {}
+_services_lock = threading.Lock()
+
+
+def get_config_service(patterns_path: Optional[str] = None, profiles_path: Optional[str] = None) -> ConfigService:
+    """
+    The process-wide ConfigService for a patterns.json / profiles.json pair.
+    A missing path defaults to the sibling file of the other one (the config/ directory layout).
+    """
+    if patterns_path is None and profiles_path is None:
+        raise ValueError("get_config_service needs patterns_path or profiles_path")
+    if patterns_path is None:
+        patterns_path = os.path.join(os.path.dirname(str(profiles_path)), "patterns.json")
+    if profiles_path is None:
+        profiles_path = os.path.join(os.path.dirname(str(patterns_path)), "profiles.json")
+    key = (os.path.abspath(str(patterns_path)), os.path.abspath(str(profiles_path)))
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = ConfigService(*key)
+            _services[key] = service
+        return service
@@ -11,6 +11,7 @@ import re
 from pathlib import Path
 from typing import Union, Dict, Any, List
 from .pattern_cache import extract_all_patterns_cached
+from .proposal_record import ProposalRecord
 
 
 def create_sequence_mapping(
@@ -34,6 +35,8 @@ def create_sequence_mapping(
     p_asset: List[str] = None,
     p_stage: List[str] = None,
     override_extracted_values: Dict[str, Any] = None,  # New parameter for batch editing
+    rule_index=None,  # Precompiled ProfileRuleIndex for the profile
+    pattern_set=None,  # Precompiled PatternSet; replaces the p_* lists for extraction when given
 ):
     """
     Creates a mapping proposal for a sequence using optimized pattern caching.
@@ -41,7 +44,6 @@ def create_sequence_mapping(
     Key optimization: Pattern matching is done once per sequence using the sequence base name
     instead of per individual file, dramatically improving performance.
     """
-    import uuid
     from .generate_simple_target_path import generate_simple_target_path
 
     try:
@@ -54,6 +56,7 @@ def create_sequence_mapping(
             frame_range = sequence.get("frame_range", "")
             frame_count = sequence.get("frame_count", 0)
             frame_numbers = sequence.get("frame_numbers", [])
+            total_size = sequence.get("size")
         elif isinstance(sequence, list):
             files_list = sequence
             base_name = original_base_name or ""
@@ -62,6 +65,7 @@ def create_sequence_mapping(
             frame_range = ""
             frame_count = len(sequence)
             frame_numbers = []
+            total_size = None
         else:
             return {
                 "source": "unknown",
@@ -94,18 +98,22 @@ def create_sequence_mapping(
 
         # Extract all patterns at once using cached extraction
         # This single call replaces multiple individual extract_*_simple calls
-        if (p_shot is not None and p_task is not None and p_version is not None and 
+        if pattern_set is not None or (p_shot is not None and p_task is not None and p_version is not None and 
             p_resolution is not None and p_asset is not None and p_stage is not None):
             
-            pattern_results = extract_all_patterns_cached(
-                extraction_filename,
-                p_shot,
-                p_task,
-                p_version,
-                p_resolution,
-                p_asset,
-                p_stage
-            )
+            if pattern_set is not None:
+                # Precompiled patterns (or a PatternProfiler wrapping them)
+                pattern_results = pattern_set.extract_all(extraction_filename)
+            else:
+                pattern_results = extract_all_patterns_cached(
+                    extraction_filename,
+                    p_shot,
+                    p_task,
+                    p_version,
+                    p_resolution,
+                    p_asset,
+                    p_stage
+                )
             
             shot = pattern_results['shot']
             task = pattern_results['task']
@@ -170,7 +178,8 @@ def create_sequence_mapping(
             parsed_asset=asset,
             parsed_stage=stage,
             parsed_version=version,
-            parsed_resolution=resolution
+            parsed_resolution=resolution,
+            rule_index=rule_index
         )
 
         # Extract the actual path from the result
@@ -178,42 +187,48 @@ def create_sequence_mapping(
         if not target_path:
             target_path = os.path.join(root_output_dir, "unmatched", sequence_pattern)
 
+        if total_size is None:
+            total_size = sum(f.get("size", 0) if isinstance(f, dict) else 0 for f in files_list)
+
+        sequence_info = {
+            "base_name": base_name,
+            "suffix": suffix,
+            "files": files_list,
+            "frame_numbers": frame_numbers,
+            "frame_range": frame_range,
+            "frame_count": frame_count,
+            "directory": directory
+        }
+        if isinstance(sequence, dict):
+            # Compact frame-range form (see frame_ranges.py); files/frame_numbers are lazy views
+            for compact_key in ("pattern", "padding", "frame_ranges", "gaps"):
+                if compact_key in sequence:
+                    sequence_info[compact_key] = sequence[compact_key]
+
         # Create the sequence proposal
-        sequence_proposal = {
-            "id": str(uuid.uuid4()),
-            "original_item": {
+        sequence_proposal = ProposalRecord(
+            original_item={
                 "name": sequence_pattern,
                 "path": source_pattern,
                 "type": "sequence",
-                "size": sum(f.get("size", 0) if isinstance(f, dict) else 0 for f in files_list),
-            "frame_count": frame_count,
+                "size": total_size,
+                "frame_count": frame_count,
                 "frame_range": frame_range
             },
-            "targetPath": target_path,
-            "type": "sequence",
-            "status": "auto" if target_path and not target_path.endswith("unmatched") else "manual",
-            "tags": {
-            "shot": shot,
-            "task": task,
-            "version": version,
+            target_path=target_path,
+            item_type="sequence",
+            status="auto" if target_path and not target_path.endswith("unmatched") else "manual",
+            tags={
+                "shot": shot,
+                "task": task,
+                "version": version,
                 "resolution": resolution,
                 "asset": asset,
-            "stage": stage
-            },
-            "sequence_info": {
-                "base_name": base_name,
-                "suffix": suffix,
-                "files": files_list,
-                "frame_numbers": frame_numbers,
-                "frame_range": frame_range,
-                "frame_count": frame_count,
-                "directory": directory
+                "stage": stage
             },
-            "matched_rules": [],
-            "used_default_footage_rule": False,
-            "ambiguous_match": False,
-            "ambiguous_options": []
-        }
+            sequence_info=sequence_info,
+            matched_rule=target_path_result.get("matched_rule")
+        )
 
         # # print(f"[OPTIMIZED] Created sequence proposal: {sequence_pattern} -> {target_path}", file=sys.stderr)  # (Silenced for normal use. Re-enable for troubleshooting.)
         return sequence_proposal
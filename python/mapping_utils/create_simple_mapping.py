@@ -7,9 +7,9 @@ for improved performance.
 
 import os
 import sys
-import uuid
 from typing import Dict, Any, List
 from .pattern_cache import extract_all_patterns_cached
+from .proposal_record import ProposalRecord
 
 
 def create_simple_mapping(
@@ -27,7 +27,9 @@ def create_simple_mapping(
     p_version: List[str] = None,
     p_resolution: List[str] = None,
     p_asset: List[str] = None,
-    p_stage: List[str] = None
+    p_stage: List[str] = None,
+    pattern_set=None,
+    rule_index=None
 ):
     """
     Creates a mapping proposal for an individual file using optimized pattern caching.
@@ -40,17 +42,22 @@ def create_simple_mapping(
     try:
         filename = node.get("name", "")
         if not filename:
-            return {
-                "id": str(uuid.uuid4()),
-                "status": "error",
-                "error_message": "Missing filename in node"
-            }
+            return ProposalRecord(node, None, "file", "error", {}, error_message="Missing filename in node")
 
         # print(f"[OPTIMIZED] Processing individual file: '{filename}'", file=sys.stderr)  # (Silenced for normal use. Re-enable for troubleshooting.)
 
         # OPTIMIZATION: Extract all patterns at once using cached extraction
         # This single call replaces multiple individual extract_*_simple calls
-        if (p_shot is not None and p_task is not None and p_version is not None and 
+        if pattern_set is not None:
+            # Precompiled patterns (used by process-pool workers)
+            pattern_results = pattern_set.extract_all(filename)
+            shot = pattern_results['shot']
+            task = pattern_results['task']
+            version = pattern_results['version']
+            resolution = pattern_results['resolution']
+            asset = pattern_results['asset']
+            stage = pattern_results['stage']
+        elif (p_shot is not None and p_task is not None and p_version is not None and 
             p_resolution is not None and p_asset is not None and p_stage is not None):
             
             pattern_results = extract_all_patterns_cached(
@@ -91,7 +98,8 @@ def create_simple_mapping(
             parsed_asset=asset,
             parsed_stage=stage,
             parsed_version=version,
-            parsed_resolution=resolution
+            parsed_resolution=resolution,
+            rule_index=rule_index
         )
 
         # Extract the actual path from the result
@@ -100,19 +108,18 @@ def create_simple_mapping(
             target_path = os.path.join(root_output_dir, "unmatched", filename)
 
         # Create the file proposal
-        file_proposal = {
-            "id": str(uuid.uuid4()),
-            "original_item": {
+        file_proposal = ProposalRecord(
+            original_item={
                 "name": filename,
                 "path": node.get("path", ""),
                 "type": "file",
                 "size": node.get("size", 0),
                 "extension": node.get("extension", "")
             },
-            "targetPath": target_path,
-            "type": "file",
-            "status": "auto" if target_path and not target_path.endswith("unmatched") else "manual",
-            "tags": {
+            target_path=target_path,
+            item_type="file",
+            status="auto" if target_path and not target_path.endswith("unmatched") else "manual",
+            tags={
                 "shot": shot,
                 "task": task,
                 "version": version,
@@ -120,27 +127,12 @@ def create_simple_mapping(
                 "asset": asset,
                 "stage": stage
             },
-            "matched_rules": [],
-            "used_default_footage_rule": False,
-            "ambiguous_match": False,
-            "ambiguous_options": []
-        }
+            matched_rule=target_path_result.get("matched_rule")
+        )
 
         # print(f"[OPTIMIZED] Created file proposal: {filename} -> {target_path}", file=sys.stderr)  # (Silenced for normal use. Re-enable for troubleshooting.)
         return file_proposal
 
     except Exception as e:
         print(f"[ERROR] Error in optimized create_simple_mapping for '{node.get('name', 'unknown')}': {e}", file=sys.stderr)
-        return {
-            "id": str(uuid.uuid4()),
-            "original_item": node,
-            "status": "error",
-            "error_message": f"Error processing file: {e}",
-            "targetPath": None,
-            "type": "file",
-            "tags": {},
-            "matched_rules": [],
-            "used_default_footage_rule": False,
-            "ambiguous_match": False,
-            "ambiguous_options": []
-        } 
\ No newline at end of file
+        return ProposalRecord(node, None, "file", "error", {}, error_message=f"Error processing file: {e}")
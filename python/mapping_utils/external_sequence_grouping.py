@@ -0,0 +1,166 @@
+"""
+External-Memory Sequence Grouping
+
+Out-of-core variant of group_image_sequences_batch for file counts that don't
+fit in memory as node tables plus group dicts. Files are consumed from an
+iterator (a tree walk, NDJSON records) and never collected: files that can't
+be frames are yielded right away, and sequence-frame candidates are spilled
+as (dir, base, ext, ordinal, frame, size, name, path) records to sorted runs on
+disk. The runs are merged with a streaming k-way merge, and each (dir, base,
+ext) group is yielded as soon as the merge moves past it. Memory is bounded
+by the run size plus the largest single group.
+
+Groups come out in (directory, base name, extension) order rather than
+first-seen order; frames within a group keep their input order. A candidate
+that ends up alone in its group is yielded as a single file rebuilt from its
+record (name, path, size, extension), the fields a scan-tree file node has.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .batch_sequence_detection import parse_frame_tokens, build_sequence_record
+from .group_image_sequences import SEQUENCE_EXTENSIONS
+
+# File count above which MappingGenerator switches to external grouping
+EXTERNAL_GROUPING_MIN_FILES = 2_000_000
+# Candidate records sorted in memory per spilled run
+EXTERNAL_RUN_SIZE = 500_000
+
+
+def _record_key(record: List[Any]) -> Tuple:
+    # (dir, base, ext, ordinal)
+    return record[0], record[1], record[2], record[3]
+
+
+def _group_key(record: List[Any]) -> Tuple:
+    return record[0], record[1], record[2]
+
+
+def _directory_key(file_path: str) -> str:
+    if os.sep == "\\":
+        cut = max(file_path.rfind("/"), file_path.rfind("\\"))
+    else:
+        cut = file_path.rfind("/")
+    return file_path[:cut] if cut >= 0 else ""
+
+
+def _make_records(candidates: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[List[Any]], List[Dict[str, Any]]]:
+    """
+    Parse frame tokens for a batch of (ordinal, node); returns (records, non-frame nodes).
+    A record keeps what finalizing needs (frame, size, name, path), not the node.
+    """
+    parsed = parse_frame_tokens([node.get("name", "") for _, node in candidates])
+    records = []
+    singles = []
+    for (ordinal, node), token in zip(candidates, parsed):
+        if token is None:
+            singles.append(node)
+            continue
+        path = node.get("path", "")
+        records.append([
+            _directory_key(path),
+            token[0],
+            node.get("extension", "").lower(),
+            ordinal,
+            token[1],
+            node.get("size", 0) or 0,
+            node.get("name", ""),
+            path,
+        ])
+    return records, singles
+
+
+def _write_run(records: List[List[Any]], spill_dir: str, run_number: int) -> str:
+    records.sort(key=_record_key)
+    run_path = os.path.join(spill_dir, f"run_{run_number:05d}.ndjson")
+    with open(run_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+    return run_path
+
+
+def _read_run(run_path: str) -> Iterator[List[Any]]:
+    with open(run_path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _finalize_group(run: List[List[Any]]) -> Tuple[str, Dict[str, Any]]:
+    if len(run) == 1:
+        _, _, ext, _, _, size, name, path = run[0]
+        return "single", {"name": name, "path": path, "type": "file", "size": size, "extension": ext}
+    first = run[0]
+    return "sequence", build_sequence_record(
+        str(Path(first[7]).parent),
+        first[1],
+        first[2],
+        [r[6] for r in run],
+        [r[4] for r in run],
+        [r[7] for r in run],
+        sum(r[5] for r in run),
+    )
+
+
+def iter_group_image_sequences_external(
+    files: Iterable[Dict[str, Any]],
+    run_size: int = EXTERNAL_RUN_SIZE,
+    spill_dir: Optional[str] = None,
+    verbose: bool = True,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Group an iterable of file nodes into sequences with bounded memory.
+
+    Yields ("single", file_node) and ("sequence", sequence_dict) pairs. Files that
+    can't be frames are yielded immediately; frame candidates are spilled in sorted
+    runs of run_size records under spill_dir (system temp if None) and merged, and
+    each sequence is yielded as soon as it is complete. Pass an iterator (e.g.
+    stream_mappings.iter_tree_files) rather than a list to keep the input out of memory.
+    """
+    work_dir = tempfile.mkdtemp(prefix="cleanincomings_seqgroup_", dir=spill_dir)
+    run_paths: List[str] = []
+    try:
+        candidates: List[Tuple[int, Dict[str, Any]]] = []
+        total_files = 0
+        for node in files:
+            ordinal = total_files
+            total_files += 1
+            if node.get("extension", "").lower() not in SEQUENCE_EXTENSIONS:
+                yield "single", node
+                continue
+            candidates.append((ordinal, node))
+            if len(candidates) >= run_size:
+                records, singles = _make_records(candidates)
+                candidates = []
+                for single in singles:
+                    yield "single", single
+                run_paths.append(_write_run(records, work_dir, len(run_paths)))
+
+        records, singles = _make_records(candidates)
+        candidates = []
+        for single in singles:
+            yield "single", single
+        if run_paths:
+            run_paths.append(_write_run(records, work_dir, len(run_paths)))
+            records = []
+            merged = heapq.merge(*[_read_run(run_path) for run_path in run_paths], key=_record_key)
+        else:
+            # Everything fit in one run: no need to touch the disk
+            records.sort(key=_record_key)
+            merged = iter(records)
+
+        if verbose:
+            print(f"[SEQUENCE_GROUPING] External grouping: {total_files} files, {len(run_paths)} spilled runs", file=sys.stderr)
+
+        for _, group in groupby(merged, key=_group_key):
+            yield _finalize_group(list(group))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -1,6 +1,8 @@
-import re
+import os
 from typing import Optional, Dict, Any
 
+from .frame_token_parser import parse_frame_token
+
 def extract_sequence_info(
     sequence,
     profile=None,
@@ -16,58 +18,22 @@ def extract_sequence_info(
     """
     Ported from MappingGenerator._extract_sequence_info: supports both filename and sequence dict/list, and performs mapping extraction and error handling as in the original.
     """
-    import os
     # Handle filename-only input (simple case)
     if isinstance(sequence, str):
         filename = sequence
         if not filename or not isinstance(filename, str):
             return None
-        if "sequence_" in filename or filename == "_####" or filename.endswith("_####"):
+        # All four layouts (name.####.ext, name_####.ext, name.####_suffix.ext,
+        # name_####_suffix.ext) in one precompiled match; see frame_token_parser.py
+        token = parse_frame_token(filename)
+        if token is None:
             return None
-            
-        # Multiple patterns to detect sequences with different frame number positions
-        patterns = [
-            # Pattern 1: basename.framenumber.extension (e.g., sequence.1001.exr)
-            r"^(.+?)\.(\d{1,10})(\.[^.]+)$",
-            # Pattern 2: basename_framenumber.extension (e.g., ASSET_01_v019_ALi_1001.exr) 
-            r"^(.+?)_(\d{4,10})(\.[^.]+)$",
-            # Pattern 3: basename.framenumber_suffix.extension (e.g., ASSET_01_v019.1001_ALi.exr)
-            r"^(.+?)\.(\d{4,10})_(.+?)(\.[^.]+)$",
-            # Pattern 4: basename_framenumber_suffix.extension (e.g., ASSET_01_v019_1001_ALi.exr)
-            r"^(.+?)_(\d{4,10})_(.+?)(\.[^.]+)$"
-        ]
-        
-        for pattern in patterns:
-            try:
-                match = re.match(pattern, filename, re.IGNORECASE)
-                if match:
-                    groups = match.groups()
-                    if len(groups) >= 3:
-                        if len(groups) == 3:  # Pattern 1 and 2
-                            base_name, frame_str, suffix = groups
-                        else:  # Pattern 3 and 4
-                            base_name, frame_str, middle_part, suffix = groups
-                            # Reconstruct base name to include the middle part for consistency
-                            base_name = f"{base_name}_{middle_part}" if middle_part else base_name
-                            
-                        if not base_name or base_name == "_" or "sequence_" in base_name:
-                            continue
-                            
-                        try:
-                            frame_num = int(frame_str)
-                            # Only consider it a valid frame if it's within reasonable range
-                            if 0 <= frame_num <= 999999:  # Reasonable frame number range
-                                return {
-                                    "base_name": base_name,
-                                    "frame": frame_num,
-                                    "suffix": suffix
-                                }
-                        except ValueError:
-                            continue
-            except Exception:
-                continue
-                
-        return None
+        base_name, frame_num, suffix = token
+        return {
+            "base_name": base_name,
+            "frame": frame_num,
+            "suffix": suffix
+        }
 
     # --- Full advanced logic for dict/list input ---
     # Extract the first file from the sequence
@@ -1,6 +1,8 @@
+import os
 import sys
 import time
 from typing import Dict, Any, List, Tuple
+from .frame_ranges import build_sequence_files
 
 def finalize_sequences(file_groups: Dict[str, Any], files: List[Any], single_files: List[Any], batch_id=None) -> Tuple[List[dict], List[Any]]:
     """Finalize the sequences from grouped files, with timeout protection."""
@@ -44,9 +46,13 @@ def finalize_sequences(file_groups: Dict[str, Any], files: List[Any], single_fil
                         single_files.extend(files_list)
                         continue
 
-                    frame_file_pairs = sorted(zip(frames, files_list), key=lambda x: x[0])
-                    sorted_frames = [pair[0] for pair in frame_file_pairs]
-                    sorted_files = [pair[1] for pair in frame_file_pairs]
+                    seq_files = build_sequence_files(
+                        group_data["directory"],
+                        [os.path.basename(f) for f in files_list],
+                        frames,
+                        files_list,
+                    )
+                    sorted_frames = seq_files.frames
 
                     sequence = {
                         "type": "sequence",
@@ -54,11 +60,15 @@ def finalize_sequences(file_groups: Dict[str, Any], files: List[Any], single_fil
                         "suffix": group_data["suffix"],
                         "extension": group_data.get("extension", group_data["suffix"]),
                         "directory": group_data["directory"],
-                        "files": sorted_files,
+                        "files": seq_files,
                         "frame_numbers": sorted_frames,
-                        "frame_range": f"{min(sorted_frames)}-{max(sorted_frames)}",
-                        "frame_count": len(sorted_files),
+                        "frame_range": f"{sorted_frames.first}-{sorted_frames.last}",
+                        "frame_count": len(files_list),
                         "size": group_data.get("size", 0),
+                        "pattern": seq_files.pattern,
+                        "padding": seq_files.padding,
+                        "frame_ranges": sorted_frames.to_json(),
+                        "gaps": [list(gap) for gap in sorted_frames.gaps],
                     }
 
                     sequences.append(sequence)
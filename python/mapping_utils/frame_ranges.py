@@ -0,0 +1,253 @@
+"""
+Compact Frame Ranges
+
+Sequences are stored as a filename pattern, a frame padding and run-length
+frame ranges instead of one path string and one int per frame. Concrete paths
+and frame numbers are produced lazily, and missing frames are computed from
+the gaps between ranges.
+
+SequenceFiles behaves like a read-only list of path strings (len, iteration,
+indexing, slicing), so existing code that reads sequence_info["files"] keeps
+working. Use compact_json_default with json.dumps to serialize the compact form
+and as_sequence_files to read it back.
+"""
+
+import os
+from bisect import bisect_right
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .frame_token_parser import FRAME_TOKEN_BUFFER_RE, LAYOUT_GROUPS
+
+FrameRange = Tuple[int, int]  # inclusive (start, end)
+
+
+class FrameRanges:
+    """Sorted, disjoint, inclusive frame ranges with list-like access to the frames."""
+
+    __slots__ = ("ranges", "_offsets", "_count")
+
+    def __init__(self, ranges: Iterable[Sequence[int]] = ()):
+        self.ranges: List[FrameRange] = [(int(r[0]), int(r[1])) for r in ranges]
+        self._offsets: List[int] = []
+        count = 0
+        for start, end in self.ranges:
+            self._offsets.append(count)
+            count += end - start + 1
+        self._count = count
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[int]) -> "FrameRanges":
+        """Run-length encode frame numbers (duplicates collapse)."""
+        ranges: List[List[int]] = []
+        for frame in sorted(set(frames)):
+            if ranges and frame == ranges[-1][1] + 1:
+                ranges[-1][1] = frame
+            else:
+                ranges.append([frame, frame])
+        return cls(ranges)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.ranges:
+            yield from range(start, end + 1)
+
+    def __contains__(self, frame) -> bool:
+        i = bisect_right(self.ranges, (frame, float("inf"))) - 1
+        return i >= 0 and self.ranges[i][0] <= frame <= self.ranges[i][1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("frame index out of range")
+        i = bisect_right(self._offsets, index) - 1
+        return self.ranges[i][0] + (index - self._offsets[i])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FrameRanges):
+            return self.ranges == other.ranges
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FrameRanges({self.to_string()!r})"
+
+    @property
+    def first(self) -> Optional[int]:
+        return self.ranges[0][0] if self.ranges else None
+
+    @property
+    def last(self) -> Optional[int]:
+        return self.ranges[-1][1] if self.ranges else None
+
+    @property
+    def gaps(self) -> List[FrameRange]:
+        """Missing frame ranges between first and last frame."""
+        return [
+            (prev_end + 1, next_start - 1)
+            for (_, prev_end), (next_start, _) in zip(self.ranges, self.ranges[1:])
+        ]
+
+    def missing_count(self) -> int:
+        return sum(end - start + 1 for start, end in self.gaps)
+
+    def missing_frames(self) -> Iterator[int]:
+        for start, end in self.gaps:
+            yield from range(start, end + 1)
+
+    def to_string(self) -> str:
+        """E.g. '1001-1050,1052-1100'."""
+        return ",".join(str(s) if s == e else f"{s}-{e}" for s, e in self.ranges)
+
+    def to_json(self) -> List[List[int]]:
+        return [[s, e] for s, e in self.ranges]
+
+
+class SequenceFiles:
+    """
+    Lazy, read-only list of the concrete file paths of a sequence.
+
+    Regular sequences are described by prefix + zero-padded frame + tail. Sequences
+    whose names can't be described that way (mixed padding or layouts) keep an
+    explicit, frame-sorted path list instead.
+    """
+
+    __slots__ = ("directory", "prefix", "tail", "padding", "frames", "_base", "_explicit")
+
+    def __init__(self, directory: str, prefix: str, tail: str, padding: int,
+                 frames: FrameRanges, explicit_paths: Optional[List[str]] = None):
+        self.directory = directory
+        self.prefix = prefix
+        self.tail = tail
+        self.padding = padding
+        self.frames = frames
+        self._base = os.path.join(directory, "")
+        self._explicit = explicit_paths
+
+    @property
+    def is_compact(self) -> bool:
+        return self._explicit is None
+
+    @property
+    def pattern(self) -> str:
+        """printf-style filename pattern, e.g. 'shot_v001.%04d.exr'."""
+        token = f"%0{self.padding}d" if self.padding else "%d"
+        return f"{self.prefix}{token}{self.tail}"
+
+    def name_for(self, frame: int) -> str:
+        return f"{self.prefix}{frame:0{self.padding}d}{self.tail}"
+
+    def path_for(self, frame: int) -> str:
+        return self._base + self.name_for(frame)
+
+    def __len__(self) -> int:
+        return len(self._explicit) if self._explicit is not None else len(self.frames)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._explicit is not None:
+            return iter(self._explicit)
+        base, prefix, tail, padding = self._base, self.prefix, self.tail, self.padding
+        return (f"{base}{prefix}{frame:0{padding}d}{tail}" for frame in self.frames)
+
+    def __getitem__(self, index):
+        if self._explicit is not None:
+            return self._explicit[index]
+        if isinstance(index, slice):
+            return [self.path_for(frame) for frame in self.frames[index]]
+        return self.path_for(self.frames[index])
+
+    def __repr__(self) -> str:
+        return f"SequenceFiles({os.path.join(self.directory, self.pattern)!r}, {self.frames.to_string()!r})"
+
+    def missing_paths(self) -> Iterator[str]:
+        """Paths of the frames missing between the first and last frame."""
+        for frame in self.frames.missing_frames():
+            yield self.path_for(frame)
+
+    @classmethod
+    def from_json(cls, data: Mapping) -> "SequenceFiles":
+        """Rebuild a sequence from its to_json() form (e.g. a proposal read back from JSON)."""
+        directory = data.get("directory", "")
+        if "paths" in data:
+            paths = list(data["paths"])
+            return cls(directory, os.path.basename(paths[0]) if paths else "", "", 0, FrameRanges(), explicit_paths=paths)
+        padding = int(data.get("padding") or 0)
+        token = f"%0{padding}d" if padding else "%d"
+        prefix, found, tail = data["pattern"].rpartition(token)
+        if not found:
+            raise ValueError(f"pattern {data['pattern']!r} has no {token} frame token")
+        return cls(directory, prefix, tail, padding, FrameRanges(data.get("frame_ranges", ())))
+
+    def to_json(self) -> Dict[str, Any]:
+        if self._explicit is not None:
+            return {"directory": self.directory, "paths": list(self._explicit)}
+        return {
+            "directory": self.directory,
+            "pattern": self.pattern,
+            "padding": self.padding,
+            "frame_ranges": self.frames.to_json(),
+        }
+
+
+def _split_frame_token(name: str, frame: int) -> Optional[Tuple[str, str, str]]:
+    """Split name into (prefix, frame digits, tail) at the token extract_sequence_info picked."""
+    match = FRAME_TOKEN_BUFFER_RE.match(name)
+    layout = LAYOUT_GROUPS.get(match.lastindex) if match else None
+    if layout is None:
+        return None
+    frame_group = layout[2]
+    digits = match.group(frame_group)
+    if int(digits) != frame:
+        return None
+    start, end = match.span(frame_group)
+    return name[:start], digits, name[end:]
+
+
+def build_sequence_files(directory: str, names: List[str], frames: List[int],
+                         paths: Optional[List[str]] = None) -> SequenceFiles:
+    """
+    Build the compact form of a sequence from its member names and frame numbers.
+
+    Falls back to an explicit (frame-sorted) path list when the members can't be
+    reproduced exactly from one pattern and padding.
+    """
+    base = os.path.join(directory, "")
+    if paths is None:
+        paths = [base + name for name in names]
+
+    frame_ranges = FrameRanges.from_frames(frames)
+    split = _split_frame_token(names[0], frames[0]) if names else None
+    if split is not None and len(frame_ranges) == len(names):
+        prefix, digits, tail = split
+        # Zero-padded names fix the width; otherwise try the observed width, then unpadded
+        paddings = [len(digits)] if digits[0] == "0" else [len(digits), 0]
+        for padding in paddings:
+            if all(name == f"{prefix}{frame:0{padding}d}{tail}" and path == base + name
+                   for name, frame, path in zip(names, frames, paths)):
+                return SequenceFiles(directory, prefix, tail, padding, frame_ranges)
+
+    ordered_paths = [path for _, path in sorted(zip(frames, paths), key=lambda pair: pair[0])]
+    return SequenceFiles(directory, names[0] if names else "", "", 0, frame_ranges, explicit_paths=ordered_paths)
+
+
+def as_sequence_files(files: Any) -> Any:
+    """
+    sequence_info["files"] as a list-like of paths: the JSON form of SequenceFiles is rebuilt,
+    anything else (a SequenceFiles, path strings, scan-tree file nodes) is returned as is.
+    """
+    if isinstance(files, Mapping) and ("pattern" in files or "paths" in files):
+        return SequenceFiles.from_json(files)
+    return files
+
+
+def compact_json_default(obj):
+    """json.dumps default= hook for the compact sequence types and proposal records/views."""
+    if isinstance(obj, (FrameRanges, SequenceFiles)):
+        return obj.to_json()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
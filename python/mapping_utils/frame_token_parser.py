@@ -0,0 +1,121 @@
+"""
+Frame Token Parser
+
+Parses the (base name, frame number, extension) token out of an image
+sequence filename. The four layouts extract_sequence_info accepts are
+compiled once into a single alternation and tried in one match:
+
+    name.####.ext            sequence.1001.exr
+    name_####.ext            ASSET_01_v019_ALi_1001.exr
+    name.####_suffix.ext     ASSET_01_v019.1001_ALi.exr
+    name_####_suffix.ext     ASSET_01_v019_1001_ALi.exr
+
+Alternatives are tried in that order, like the original cascade of
+re.match calls. If the layout that matched fails validation (frame above
+999999, "_" as base name) the later layouts are tried one by one, so results
+are identical to the cascade (tests/test_frame_token_parser.py checks this
+against the original implementation; tests/benchmarks times both).
+"""
+
+import re
+from typing import Optional, Tuple
+
+# The layouts in the order extract_sequence_info tries them
+FRAME_TOKEN_LAYOUTS = (
+    r"^(.+?)\.(\d{1,10})(\.[^.]+)$",          # name.####.ext
+    r"^(.+?)_(\d{4,10})(\.[^.]+)$",           # name_####.ext
+    r"^(.+?)\.(\d{4,10})_(.+?)(\.[^.]+)$",    # name.####_suffix.ext
+    r"^(.+?)_(\d{4,10})_(.+?)(\.[^.]+)$",     # name_####_suffix.ext
+)
+_LAYOUT_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in FRAME_TOKEN_LAYOUTS)
+
+# All four layouts as one alternation. match.lastindex tells which one matched: 3, 6, 10 or 14.
+# The base of the first two layouts is greedy: the extension can't contain a dot and the
+# frame digits can't contain "." or "_", so those layouts have a single possible split and
+# backtracking from the end finds it faster than the cascade's lazy scan from the start.
+FRAME_TOKEN_RE = re.compile(
+    r"^(?:"
+    r"(.+)\.(\d{1,10})(\.[^.]+)$"
+    r"|(.+)_(\d{4,10})(\.[^.]+)$"
+    r"|(.+?)\.(\d{4,10})_(.+?)(\.[^.]+)$"
+    r"|(.+?)_(\d{4,10})_(.+?)(\.[^.]+)$"
+    r")",
+    re.IGNORECASE,
+)
+_match_frame_token = FRAME_TOKEN_RE.match
+
+# Multi-line variant for parsing a newline-joined buffer of names in one finditer pass
+# (see batch_sequence_detection.parse_frame_tokens). [^.\n] keeps the extension from
+# running into the next line; the trailing [^\n]*$ consumes names that match no layout.
+FRAME_TOKEN_BUFFER_RE = re.compile(
+    r"^(?:"
+    r"(.+?)\.(\d{1,10})(\.[^.\n]+)$"          # name.####.ext
+    r"|(.+?)_(\d{4,10})(\.[^.\n]+)$"          # name_####.ext
+    r"|(.+?)\.(\d{4,10})_(.+?)(\.[^.\n]+)$"   # name.####_suffix.ext
+    r"|(.+?)_(\d{4,10})_(.+?)(\.[^.\n]+)$"    # name_####_suffix.ext
+    r")?[^\n]*$",
+    re.MULTILINE,
+)
+
+# match.lastindex -> (layout number, base group, frame group, middle group or None, ext group)
+LAYOUT_GROUPS = {
+    3: (0, 1, 2, None, 3),
+    6: (1, 4, 5, None, 6),
+    10: (2, 7, 8, 9, 10),
+    14: (3, 11, 12, 13, 14),
+}
+
+MAX_FRAME_NUMBER = 999999
+
+
+def _valid_token(base_name: str, frame_num: int) -> bool:
+    return bool(base_name) and base_name != "_" and "sequence_" not in base_name and 0 <= frame_num <= MAX_FRAME_NUMBER
+
+
+def _parse_layouts(filename: str, first_layout: int = 0) -> Optional[Tuple[str, int, str]]:
+    """The original cascade: try each layout from first_layout on with its own match."""
+    for layout_re in _LAYOUT_RES[first_layout:]:
+        match = layout_re.match(filename)
+        if not match:
+            continue
+        groups = match.groups()
+        if len(groups) == 3:
+            base_name, frame_str, suffix = groups
+        else:
+            base_name, frame_str, middle_part, suffix = groups
+            base_name = f"{base_name}_{middle_part}" if middle_part else base_name
+        frame_num = int(frame_str)
+        if _valid_token(base_name, frame_num):
+            return base_name, frame_num, suffix
+    return None
+
+
+def parse_frame_token(filename: str) -> Optional[Tuple[str, int, str]]:
+    """
+    Parse a filename into (base_name, frame, suffix), where suffix is the extension.
+
+    Returns None if the name isn't a sequence frame. Same results as
+    extract_sequence_info on a filename string.
+    """
+    if not filename or "sequence_" in filename or filename.endswith("_####"):
+        return None
+    match = _match_frame_token(filename)
+    if match is None:
+        return None
+    lastindex = match.lastindex
+    if lastindex == 3:
+        base_name, frame_str, suffix = match.group(1, 2, 3)
+        layout = 0
+    elif lastindex == 6:
+        base_name, frame_str, suffix = match.group(4, 5, 6)
+        layout = 1
+    else:
+        layout, base_group, frame_group, middle_group, ext_group = LAYOUT_GROUPS[lastindex]
+        base_name, frame_str, middle_part, suffix = match.group(base_group, frame_group, middle_group, ext_group)
+        base_name = f"{base_name}_{middle_part}"
+    frame_num = int(frame_str)
+    if frame_num <= MAX_FRAME_NUMBER and base_name != "_" and "sequence_" not in base_name:
+        return base_name, frame_num, suffix
+    # Rejected by this layout; the cascade would go on to the later ones
+    return _parse_layouts(filename, layout + 1)
+
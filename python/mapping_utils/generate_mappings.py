@@ -1,11 +1,12 @@
 import os
 import sys
 import traceback
-import uuid # Added for generating IDs for error proposals
 import time  # Add time for rate limiting
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from .process_pool_mapping import map_files_in_process_pool, should_use_process_pool
+from .proposal_record import next_proposal_id
 
 def generate_mappings(
     tree: Dict[str, Any],
@@ -18,10 +19,23 @@ def generate_mappings(
     create_simple_mapping=None,
     finalize_sequences=None,
     status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    root_output_dir: Optional[str] = None,
+    pattern_set=None,
+    use_process_pool: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+    run_report=None,
 ) -> List[Dict[str, Any]]:
     """
     Modularized mapping generation logic with rate limiting for progress updates.
     All dependencies must be passed as arguments.
+
+    Single files are mapped in a process pool (chunked, results in order) when a
+    precompiled pattern_set and root_output_dir are given and the job is large
+    enough; use_process_pool forces the choice. Otherwise, or if the pool fails,
+    the thread pool (max_workers threads, default min(16, 2 x CPUs)) is used.
+
+    If a RunReport (mapping_utils/run_report.py) is given, each stage is timed
+    into it and the proposal counts are recorded on it.
     """
     # Rate limiting for progress updates
     last_progress_update = 0
@@ -54,6 +68,7 @@ def generate_mappings(
 
     all_files = []
     safe_progress_update({"type": "mapping_generation", "data": {"status": "progress", "message": "Collecting files for mapping..."}})
+    stage_start = time.perf_counter()
 
     if "_all_files" in tree and tree["_all_files"]:
         print(f"Using _all_files list from folders-only tree", file=sys.stderr)
@@ -114,12 +129,17 @@ def generate_mappings(
                     collect_files_recursive(child_node, collected_list)
         collect_files_recursive(tree, all_files)
     
+    if run_report is not None:
+        run_report.add_stage("collect_files", time.perf_counter() - stage_start, len(all_files))
     print(f"Collected {len(all_files)} total files", file=sys.stderr)
     safe_progress_update({"type": "mapping_generation", "data": {"status": "progress", "message": f"Collected {len(all_files)} files. Grouping sequences..."}})
 
+    stage_start = time.perf_counter()
     sequences, single_files = group_image_sequences(
         all_files, batch_id, extract_sequence_info=extract_sequence_info, is_network_path=is_network_path
     )
+    if run_report is not None:
+        run_report.add_stage("group_sequences", time.perf_counter() - stage_start, len(all_files))
     print(f"Found {len(sequences)} image sequences and {len(single_files)} single files", file=sys.stderr)
     safe_progress_update({"type": "mapping_generation", "data": {"status": "progress", "message": f"Found {len(sequences)} sequences, {len(single_files)} single files."}})
     
@@ -130,6 +150,7 @@ def generate_mappings(
     
     # Rate limit sequence progress updates
     sequence_update_frequency = max(1, len(sequences) // 10) if sequences else 1  # Max 10 updates for sequences
+    stage_start = time.perf_counter()
     
     for idx, sequence_item in enumerate(sequences):
         # Only update progress every N sequences to avoid UI flood
@@ -207,7 +228,7 @@ def generate_mappings(
             sequence_name_for_proposal = f"{error_base_name_for_proposal}_####{error_suffix_for_proposal}" if error_base_name_for_proposal and error_suffix_for_proposal else seq_name_str
 
             error_proposal = {
-                "id": str(uuid.uuid4()),
+                "id": next_proposal_id(),
                 "name": sequence_name_for_proposal,
                 "source_directory": error_directory,
                 "files": error_files_list, 
@@ -227,6 +248,9 @@ def generate_mappings(
             }
             mappings.append(error_proposal)
     
+    if run_report is not None:
+        run_report.add_stage("sequence_proposals", time.perf_counter() - stage_start, len(sequences))
+
     if sequence_errors > 0:
         print(f"[WARNING] Failed to process {sequence_errors} sequences", file=sys.stderr)
         safe_progress_update({"type": "mapping_generation", "data": {"status": "warning", "message": f"Completed sequence processing with {sequence_errors} errors."}})
@@ -235,13 +259,46 @@ def generate_mappings(
     if single_files:
         safe_progress_update({"type": "mapping_generation", "data": {"status": "progress", "message": f"Processing {len(single_files)} single files..."}})
     
-    max_workers = min(16, os.cpu_count() * 2) # Ensure os.cpu_count() is not None
+    if max_workers is None:
+        max_workers = min(16, os.cpu_count() * 2) # Ensure os.cpu_count() is not None
     print(f"[INFO] Using {max_workers if max_workers else 'default'} parallel workers for file processing", file=sys.stderr)
     
     # Rate limit single file progress updates
     file_update_frequency = max(1, len(single_files) // 10) if single_files else 1  # Max 10 updates for files
     
-    if single_files: # Only run ThreadPoolExecutor if there are files to process
+    used_process_pool = False
+    stage_start = time.perf_counter()
+    if single_files and pattern_set is not None and root_output_dir is not None:
+        if use_process_pool is None:
+            use_process_pool = should_use_process_pool(len(single_files))
+        if use_process_pool:
+            mappings_before_pool = len(mappings)
+            try:
+                processed_count = 0
+                for chunk_result in map_files_in_process_pool(single_files, pattern_set, profile.get('rules', []), root_output_dir):
+                    for mapping in chunk_result:
+                        if mapping:
+                            if mapping.get("status") == "error":
+                                file_errors += 1
+                            mappings.append(mapping)
+                    processed_count += len(chunk_result)
+                    safe_progress_update({"type": "mapping_generation", "data": {
+                        "status": "progress",
+                        "message": f"Single file {processed_count}/{len(single_files)}",
+                        "current_file_count": processed_count,
+                        "total_files": len(single_files)
+                    }})
+                used_process_pool = True
+                if file_errors > 0:
+                    print(f"[WARNING] Failed to process {file_errors} files", file=sys.stderr)
+                    safe_progress_update({"type": "mapping_generation", "data": {"status": "warning", "message": f"Completed single file processing with {file_errors} errors."}})
+            except Exception as e:
+                # Discard partial results and redo the whole set in the thread pool
+                del mappings[mappings_before_pool:]
+                file_errors = 0
+                print(f"[WARNING] Process pool unavailable, falling back to thread pool: {type(e).__name__} - {e}", file=sys.stderr, flush=True)
+
+    if single_files and not used_process_pool: # Only run ThreadPoolExecutor if there are files to process
         try:
             # concurrent.futures is imported at the top
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -272,7 +329,7 @@ def generate_mappings(
                         # Create and append an error proposal for the file
                         file_node_for_error = future_to_file[future]
                         error_proposal = {
-                            "id": str(uuid.uuid4()),
+                            "id": next_proposal_id(),
                             "name": file_node_for_error.get('name', 'unknown_file'),
                             "sourcePath": file_node_for_error.get('path', 'unknown_path'),
                             "targetPath": None,
@@ -293,6 +350,10 @@ def generate_mappings(
             print(f"[ERROR] Major error during threaded file processing: {e}\n{traceback.format_exc()}", file=sys.stderr, flush=True)
             safe_progress_update({"type": "mapping_generation", "data": {"status": "error", "message": f"Error during threaded file processing: {e}"}})
 
+    if run_report is not None:
+        run_report.add_stage("single_files", time.perf_counter() - stage_start, len(single_files),
+                             executor="process_pool" if used_process_pool else f"thread_pool x{max_workers}")
+
     # Mapping summary prints
     auto_mapped = len([m for m in mappings if m and m.get("status") == "auto"]) # Added check for m not None
     manual_mapped = len([m for m in mappings if m and m.get("status") == "manual"])
@@ -303,6 +364,16 @@ def generate_mappings(
     print(f"Single files: {len(mappings) - sequence_count_summary}", file=sys.stderr)
     print(f"Auto-mapped: {auto_mapped}", file=sys.stderr)
     print(f"Manual required: {manual_mapped}", file=sys.stderr)
+    if run_report is not None:
+        run_report.counts.update({
+            "files": len(all_files),
+            "sequences": len(sequences),
+            "single_files": len(single_files),
+            "proposals": len(mappings),
+            "auto_mapped": auto_mapped,
+            "manual": manual_mapped,
+            "errors": sequence_errors + file_errors,
+        })
 
     safe_progress_update({"type": "mapping_generation", "data": {"status": "completed", "message": f"Mapping generation finished. {len(mappings)} total proposals."}})
     
@@ -0,0 +1,173 @@
+"""
+GUI Item View
+
+Lazy view of a mapping proposal in the flat item shape the GUI uses (id,
+source_path, filename, new_destination_path, ...). Fields are computed from
+the proposal when read instead of being copied into a second dict per
+proposal, so views always reflect the proposal's current state (e.g. after an
+incremental re-map). copy() / to_dict() give a plain dict when one is needed,
+such as when an item is stored on a tree widget.
+"""
+
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from .proposal_record import next_proposal_id
+
+GUI_ITEM_KEYS = (
+    "id", "source_path", "filename", "new_destination_path", "new_name", "type", "size",
+    "sequence_info", "matched_rules", "matched_tags", "normalized_parts", "status", "error_message",
+)
+
+
+def _tags(proposal) -> Dict[str, Any]:
+    tags_data = proposal.get("tags", {})
+    return tags_data if isinstance(tags_data, dict) else {}
+
+
+def _original_item(proposal) -> Dict[str, Any]:
+    return proposal.get("original_item") or {}
+
+
+def _source_path(proposal):
+    return str(_original_item(proposal).get("path", "N/A"))
+
+
+def _filename(proposal):
+    return _original_item(proposal).get("name", "N/A")
+
+
+def _new_destination_path(proposal):
+    return proposal.get("targetPath", "")
+
+
+def _new_name(proposal):
+    target_path = proposal.get("targetPath")
+    return Path(target_path).name if target_path else _original_item(proposal).get("name", "N/A")
+
+
+def _type(proposal):
+    return _original_item(proposal).get("type", "file").capitalize()
+
+
+def _size(proposal):
+    original_item = _original_item(proposal)
+    if original_item.get("type", "file").lower() == "sequence":
+        size = original_item.get("total_size_bytes")
+        if size is not None:
+            return size
+    return original_item.get("size")
+
+
+def _sequence_info(proposal):
+    # Ensure sequence_info is available for tooltip and other uses
+    sequence_info = proposal.get("sequence_info")
+    original_item = _original_item(proposal)
+    if not sequence_info and original_item.get("type", "file").lower() == "sequence":
+        return original_item
+    return sequence_info
+
+
+def _matched_rules(proposal):
+    return proposal.get("matched_rules", [])
+
+
+def _matched_tags(proposal):
+    return {k: v for k, v in _tags(proposal).items() if v is not None and v != ""}
+
+
+def _normalized_parts(proposal):
+    tags_data = _tags(proposal)
+    parts = {
+        "shot": tags_data.get("shot"),
+        "task": tags_data.get("task"),
+        "asset": tags_data.get("asset_name") or tags_data.get("asset") or tags_data.get("asset_type"),
+        "version": tags_data.get("version"),
+        "resolution": tags_data.get("resolution"),
+        "stage": tags_data.get("stage"),
+    }
+    return {k: v for k, v in parts.items() if v is not None}
+
+
+def _status(proposal):
+    return proposal.get("status", "unknown")
+
+
+def _error_message(proposal):
+    return proposal.get("error_message") or proposal.get("error")
+
+
+_FIELDS = {
+    "source_path": _source_path,
+    "filename": _filename,
+    "new_destination_path": _new_destination_path,
+    "new_name": _new_name,
+    "type": _type,
+    "size": _size,
+    "sequence_info": _sequence_info,
+    "matched_rules": _matched_rules,
+    "matched_tags": _matched_tags,
+    "normalized_parts": _normalized_parts,
+    "status": _status,
+    "error_message": _error_message,
+}
+
+
+class GuiItemView(MutableMapping):
+    """GUI item for one proposal; fields are derived on access, writes are kept as overrides."""
+
+    __slots__ = ("proposal", "id", "_overrides")
+
+    def __init__(self, proposal):
+        self.proposal = proposal
+        proposal_id = proposal.get("id")
+        self.id = proposal_id if proposal_id is not None else next_proposal_id()
+        self._overrides = None
+
+    def __getitem__(self, key: str) -> Any:
+        if self._overrides is not None and key in self._overrides:
+            return self._overrides[key]
+        if key == "id":
+            return self.id
+        field = _FIELDS.get(key)
+        if field is None:
+            raise KeyError(key)
+        return field(self.proposal)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "id":
+            self.id = value
+            return
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if self._overrides is None or key not in self._overrides:
+            raise KeyError(key)
+        del self._overrides[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from GUI_ITEM_KEYS
+        if self._overrides is not None:
+            for key in self._overrides:
+                if key not in _FIELDS:
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return key == "id" or key in _FIELDS or (self._overrides is not None and key in self._overrides)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the plain GUI item dict."""
+        return {key: self[key] for key in self}
+
+    def copy(self) -> Dict[str, Any]:
+        """Shallow copy as a plain dict, like dict.copy()."""
+        return self.to_dict()
+
+    def __repr__(self) -> str:
+        return f"GuiItemView({self.to_dict()!r})"
@@ -0,0 +1,100 @@
+"""
+Incremental Re-mapping
+
+Recomputes existing proposals after patterns.json or a profile changed, without
+rescanning or re-mapping everything. Each proposal keeps its extracted tags and
+matched rule, so only what the change can affect is recomputed:
+
+- Pattern changes: only the changed tag categories are re-extracted, and only
+  proposals whose tags actually changed get a new target path.
+- Rule changes: the old and new ProfileRuleIndex are compared per distinct
+  (task, asset) pair; only proposals whose base path choice changed are re-resolved.
+"""
+
+import os
+from typing import Any, Dict, List
+
+TAG_KEYS = ("shot", "task", "version", "resolution", "asset", "stage")
+
+
+def extraction_name(proposal: Dict[str, Any]) -> str:
+    """The string patterns were matched against when the proposal was created."""
+    if proposal.get("type") == "sequence":
+        sequence_info = proposal.get("sequence_info") or {}
+        if sequence_info.get("base_name"):
+            return sequence_info["base_name"]
+        files = sequence_info.get("files") or []
+        if len(files):
+            first_file = files[0]
+            return os.path.basename(first_file) if isinstance(first_file, str) else first_file.get("name", "")
+    return (proposal.get("original_item") or {}).get("name", "")
+
+
+def remap_proposals(
+    proposals: List[Dict[str, Any]],
+    old_pattern_set,
+    new_pattern_set,
+    old_rule_index,
+    new_rule_index,
+    root_output_dir: str,
+) -> Dict[str, Any]:
+    """
+    Update proposals in place for a pattern and/or rule change.
+
+    Returns a delta: {"updated": [changed proposals], "checked": int,
+    "changed_categories": [...], "rules_changed": bool}.
+    """
+    changed_categories = old_pattern_set.changed_categories(new_pattern_set)
+    rules_changed = old_rule_index is not new_rule_index and old_rule_index.rules_snapshot != new_rule_index.rules_snapshot
+
+    updated: List[Dict[str, Any]] = []
+    checked = 0
+    if not changed_categories and not rules_changed:
+        return {"updated": updated, "checked": checked, "changed_categories": changed_categories, "rules_changed": rules_changed}
+
+    choice_changed: Dict[tuple, bool] = {}
+    for proposal in proposals:
+        tags = proposal.get("tags")
+        if proposal.get("status") == "error" or not isinstance(tags, dict):
+            continue
+        checked += 1
+
+        new_tags = dict(tags)
+        if changed_categories:
+            name = extraction_name(proposal)
+            name_lower = name.lower()
+            for category in changed_categories:
+                new_tags[category] = new_pattern_set.extract_category(category, name, name_lower)
+        tags_changed = new_tags != tags
+
+        if not tags_changed:
+            if not rules_changed:
+                continue
+            key = (tags.get("task"), tags.get("asset"))
+            changed = choice_changed.get(key)
+            if changed is None:
+                changed = choice_changed[key] = old_rule_index.choose_base_path(*key) != new_rule_index.choose_base_path(*key)
+            if not changed:
+                continue
+
+        filename = (proposal.get("original_item") or {}).get("name", "")
+        result = new_rule_index.resolve(
+            root_output_dir,
+            filename,
+            new_tags.get("shot"),
+            new_tags.get("task"),
+            new_tags.get("asset"),
+            new_tags.get("stage"),
+            new_tags.get("version"),
+            new_tags.get("resolution"),
+        )
+        target_path = result.get("target_path")
+        if not target_path:
+            target_path = os.path.join(root_output_dir, "unmatched", filename)
+        proposal["tags"] = new_tags
+        proposal["targetPath"] = target_path
+        proposal["status"] = "auto" if target_path and not target_path.endswith("unmatched") else "manual"
+        proposal["matched_rules"] = [result["matched_rule"]] if result.get("matched_rule") else []
+        updated.append(proposal)
+
+    return {"updated": updated, "checked": checked, "changed_categories": changed_categories, "rules_changed": rules_changed}
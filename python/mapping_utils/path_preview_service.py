@@ -0,0 +1,147 @@
+"""
+Path Preview Service
+
+Answers "where would this item go with these edits?" for the batch edit UI
+without touching profiles.json or building temporary proposals. The
+profile's rules are compiled once into a ProfileRuleIndex and the last N
+(root, filename, tag tuple) -> path answers are kept in an LRU, so repeated
+previews (typing, backspacing, switching between selected items) are
+dictionary lookups.
+
+request() debounces: each call supersedes the previous pending one and
+only the last request within the debounce interval is computed. Scheduling
+is injected so the GUI can run callbacks on its own event loop (e.g.
+QTimer.singleShot); the default uses threading.Timer.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .profile_rule_index import ProfileRuleIndex, join_target_path
+
+# Preview fields that are tags, in ProfileRuleIndex.resolve_directory order
+PREVIEW_TAG_KEYS = ("shot", "task", "asset", "stage", "version", "resolution")
+DEFAULT_PREVIEW_CACHE_SIZE = 1024
+DEFAULT_DEBOUNCE_INTERVAL = 0.15  # seconds
+
+
+def _thread_timer_schedule(delay: float, callback: Callable[[], None]) -> None:
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+
+
+class PathPreviewService:
+    """Cached, debounced destination path previews for one compiled profile at a time."""
+
+    def __init__(self, max_entries: int = DEFAULT_PREVIEW_CACHE_SIZE,
+                 debounce_interval: float = DEFAULT_DEBOUNCE_INTERVAL,
+                 schedule: Optional[Callable[[float, Callable[[], None]], None]] = None):
+        self.max_entries = max_entries
+        self.debounce_interval = debounce_interval
+        self.schedule = schedule or _thread_timer_schedule
+        self._profile_name: Optional[str] = None
+        self._profile_rules: Optional[List[Dict[str, List[str]]]] = None
+        self._rule_index: Optional[ProfileRuleIndex] = None
+        self._results: "OrderedDict[tuple, str]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def set_profile(self, profile_name: str, profile_rules: List[Dict[str, List[str]]]) -> None:
+        """
+        Compile the profile's rules unless they are already the current ones (same name and
+        rules list object); cached previews are dropped when the profile changes.
+        """
+        if profile_rules is self._profile_rules and profile_name == self._profile_name and self._rule_index is not None:
+            return
+        rule_index = ProfileRuleIndex(profile_rules)
+        with self._lock:
+            self._profile_name = profile_name
+            self._profile_rules = profile_rules
+            self._rule_index = rule_index
+            self._results.clear()
+
+    @staticmethod
+    def tag_tuple(item_data: Dict[str, Any], changes: Dict[str, Any]) -> tuple:
+        """The item's normalized parts with changes applied; an empty value clears a part."""
+        parts = dict(item_data.get('normalized_parts') or {})
+        for key, value in changes.items():
+            if value is None or value == '':
+                parts.pop(key, None)
+            else:
+                parts[key] = value
+        return tuple(parts.get(key) for key in PREVIEW_TAG_KEYS)
+
+    def preview(self, item_data: Dict[str, Any], changes: Dict[str, Any], root_output_dir: str) -> str:
+        """
+        Predicted destination path for a GUI item with changes applied.
+        Returns an "Error: ..." string when no profile is set or the path can't be resolved.
+        """
+        rule_index = self._rule_index
+        if rule_index is None:
+            return "Error: No profile set."
+        filename = item_data.get('filename')
+        if not filename or not root_output_dir:
+            return "Error: Missing input data for preview."
+
+        tags = self.tag_tuple(item_data, changes)
+        key = (root_output_dir, filename, tags)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.hit_count += 1
+                return cached
+
+        directory_result = rule_index.resolve_directory(root_output_dir, *tags)
+        if directory_result["ambiguous_match"]:
+            result = f"Error: Ambiguous path for '{filename}'."
+        elif directory_result["target_dir"] is None:
+            result = f"Error: Could not determine target path for '{filename}'."
+        else:
+            result = join_target_path(directory_result["target_dir"], filename)
+
+        with self._lock:
+            self.miss_count += 1
+            self._results[key] = result
+            if len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
+
+    def request(self, item_data: Dict[str, Any], changes: Dict[str, Any], root_output_dir: str,
+                callback: Callable[[str], None],
+                schedule: Optional[Callable[[float, Callable[[], None]], None]] = None) -> int:
+        """
+        Debounced preview: callback(path) runs once the requests stop for debounce_interval.
+        Earlier pending requests are dropped. schedule overrides the service's scheduler for
+        this request (e.g. to run the callback on the GUI thread). Returns the generation number.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        changes_snapshot = dict(changes)
+
+        def _fire():
+            if generation != self._generation:
+                return  # Superseded by a newer request
+            callback(self.preview(item_data, changes_snapshot, root_output_dir))
+
+        (schedule or self.schedule)(self.debounce_interval, _fire)
+        return generation
+
+    def cancel_pending(self) -> None:
+        """Drop any pending debounced request."""
+        with self._lock:
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        total_requests = self.hit_count + self.miss_count
+        return {
+            'cache_size': len(self._results),
+            'hit_count': self.hit_count,
+            'miss_count': self.miss_count,
+            'hit_rate': round(self.hit_count / total_requests * 100, 2) if total_requests else 0,
+        }
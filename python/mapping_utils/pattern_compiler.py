@@ -0,0 +1,353 @@
+"""
+Pattern Compiler
+
+The compile stage for patterns.json regexes, used by PatternSet and by the
+Patterns editor when saving:
+
+1. Inline global flags such as a mid-pattern (?i) -- which Python's re
+   rejects, sending the pattern to substring matching -- are removed and
+   passed as compile flags instead.
+2. A static lint walks the parsed regex for constructs that backtrack
+   catastrophically: a repeated group that itself contains an unbounded
+   repeat ((a+)+), alternatives inside a repeat that can match the same
+   text ((a|ab)+), and adjacent unbounded repeats over the same characters.
+   Nested unbounded repeats are rejected; the other two warn.
+
+Patterns are otherwise compiled as written. What normalize_regex_patterns
+would change (d{3} -> \\d{3}) is only offered as a suggestion in the lint
+report: 'hd{2}' is a valid regex the author may well have meant.
+
+lint_patterns_config() additionally times each pattern against a stress
+corpus of long, near-miss filenames of increasing length, which catches
+slow patterns the static rules miss. It is meant for the editor's save
+path; PatternSet only runs the cheap static stages.
+"""
+
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from re import _parser as _sre_parse, _constants as _sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+    import sre_constants as _sre_constants
+
+from .normalize_patterns import normalize_regex_patterns
+
+_MAX_REPEAT = _sre_constants.MAX_REPEAT
+_MIN_REPEAT = _sre_constants.MIN_REPEAT
+_UNBOUNDED = _sre_constants.MAXREPEAT
+_SUBPATTERN = _sre_constants.SUBPATTERN
+_BRANCH = _sre_constants.BRANCH
+_LITERAL = _sre_constants.LITERAL
+_ASSERTS = (_sre_constants.ASSERT, _sre_constants.ASSERT_NOT)
+# No backtracking into these (Python 3.11+)
+_NO_BACKTRACK = tuple(op for op in (getattr(_sre_constants, "POSSESSIVE_REPEAT", None),
+                                    getattr(_sre_constants, "ATOMIC_GROUP", None)) if op is not None)
+
+_INLINE_FLAGS = {
+    "i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL,
+    "x": re.VERBOSE, "a": re.ASCII, "u": re.UNICODE, "L": re.LOCALE,
+}
+_GLOBAL_FLAG_GROUP_RE = re.compile(r"\(\?([aiLmsux]+)\)")
+
+# Stress timing: a single search slower than this warns / rejects the pattern (milliseconds)
+STRESS_WARN_MS = 5.0
+STRESS_REJECT_MS = 100.0
+# Subject lengths tried in order; small steps first so exponential patterns stop early
+STRESS_LENGTHS = (8, 10, 12, 14, 16, 18, 20, 22, 24, 28, 32, 48, 64, 128, 256)
+_STRESS_PUMPS = ("a", "A", "0", "_", ".", "-", " ", "A0", "a_", "0_", "_0", "A_0", "v0", "x0")
+_STRESS_TAILS = ("", "!", ".exr!")
+
+VERDICT_ORDER = {"ok": 0, "warn": 1, "reject": 2}
+
+
+def rewrite_inline_flags(pattern: str) -> Tuple[str, int]:
+    """
+    Remove global inline flag groups ("(?i)", "(?im)", ...) wherever they appear and
+    return (pattern without them, their re flags). Scoped groups like (?i:...),
+    escaped parentheses and character classes are left alone.
+    """
+    flags = 0
+    pieces = []
+    i, start, in_class = 0, 0, False
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal
+            if pattern.startswith("^", i + 1):
+                i += 1
+            if pattern.startswith("]", i + 1):
+                i += 1
+        elif char == "(":
+            match = _GLOBAL_FLAG_GROUP_RE.match(pattern, i)
+            if match:
+                for letter in match.group(1):
+                    flags |= _INLINE_FLAGS[letter]
+                pieces.append(pattern[start:i])
+                start = i = match.end()
+                continue
+        i += 1
+    if start == 0:
+        return pattern, 0
+    pieces.append(pattern[start:])
+    return "".join(pieces), flags
+
+
+def _is_unbounded_repeat(op, av) -> bool:
+    return op in (_MAX_REPEAT, _MIN_REPEAT) and av[1] == _UNBOUNDED
+
+
+def _contains_unbounded_repeat(subpattern) -> bool:
+    for op, av in subpattern:
+        if op in _NO_BACKTRACK:
+            continue
+        if _is_unbounded_repeat(op, av):
+            return True
+        for child in _children(op, av):
+            if _contains_unbounded_repeat(child):
+                return True
+    return False
+
+
+def _children(op, av) -> List[Any]:
+    """Sub-patterns nested in one parsed regex item."""
+    if op in (_MAX_REPEAT, _MIN_REPEAT):
+        return [av[2]]
+    if op == _SUBPATTERN:
+        return [av[-1]]
+    if op == _BRANCH:
+        return list(av[1])
+    if op in _ASSERTS:
+        return [av[1]]
+    if op == _sre_constants.GROUPREF_EXISTS:
+        return [branch for branch in av[1:] if branch is not None]
+    return []
+
+
+def _first_literal(subpattern) -> Optional[int]:
+    """The literal a branch must start with, or None if it can start with more than one character."""
+    for op, av in subpattern:
+        if op == _LITERAL:
+            return av
+        if op == _SUBPATTERN:
+            return _first_literal(av[-1])
+        return None
+    return None
+
+
+def _branches_overlap(branches) -> bool:
+    firsts = [_first_literal(branch) for branch in branches]
+    if any(first is None for first in firsts):
+        return True
+    return len(set(firsts)) != len(firsts)
+
+
+def _has_overlapping_branch(subpattern) -> bool:
+    """True if an alternation directly in subpattern (or its plain groups) has overlapping branches."""
+    for op, av in subpattern:
+        if op == _BRANCH and _branches_overlap(av[1]):
+            return True
+        if op == _SUBPATTERN and _has_overlapping_branch(av[-1]):
+            return True
+    return False
+
+
+def _lint_subpattern(subpattern, issues: List[Dict[str, str]]) -> None:
+    previous = None
+    for op, av in subpattern:
+        if op in _NO_BACKTRACK:
+            previous = None
+            continue
+        if op in (_MAX_REPEAT, _MIN_REPEAT):
+            body = av[2]
+            repeats = av[1] > 1
+            if repeats and _contains_unbounded_repeat(body):
+                level = "error" if av[1] == _UNBOUNDED else "warning"
+                issues.append({"level": level, "message": "nested quantifier: a repeated group contains an unbounded "
+                                                          "repeat (like (a+)+), which can backtrack exponentially"})
+            if repeats and _has_overlapping_branch(body):
+                issues.append({"level": "warning", "message": "repeated alternation whose branches can match the "
+                                                              "same text (like (a|ab)+)"})
+            if (previous is not None and _is_unbounded_repeat(op, av) and _is_unbounded_repeat(*previous)
+                    and (list(previous[1][2]) == list(body) or any(item[0] == _sre_constants.ANY for item in list(body) + list(previous[1][2])))):
+                issues.append({"level": "warning", "message": "adjacent unbounded quantifiers over the same characters "
+                                                              "(like \\d+\\d+ or .*.*)"})
+            _lint_subpattern(body, issues)
+        else:
+            for child in _children(op, av):
+                _lint_subpattern(child, issues)
+        previous = (op, av)
+
+
+def prepare_pattern(pattern: str, base_flags: int = re.IGNORECASE) -> Dict[str, Any]:
+    """
+    Static compile stage for one pattern (no timing).
+
+    Returns {"pattern": original, "source": rewritten regex, "flags": re flags,
+             "rewrites": [what was changed], "suggestions": [possible fixes, not applied],
+             "issues": [{"level", "message"}],
+             "error": compile error or None, "verdict": "ok" | "warn" | "reject"}.
+    A pattern that doesn't compile is matched as a plain substring by PatternSet ("warn");
+    catastrophic-backtracking constructs are "reject".
+    """
+    rewrites = []
+    suggestions = []
+    escaped = normalize_regex_patterns([pattern])[0]
+    if escaped != pattern:
+        suggestions.append(f"missing digit escapes? '{escaped}' (d{{n}} matches the letter d, \\d{{n}} digits)")
+    source, inline_flags = rewrite_inline_flags(pattern)
+    if inline_flags:
+        rewrites.append("moved inline flags to compile flags")
+    flags = base_flags | inline_flags
+
+    issues: List[Dict[str, str]] = []
+    error = None
+    try:
+        _lint_subpattern(_sre_parse.parse(source, flags), issues)
+        re.compile(source, flags)
+    except (re.error, ValueError) as e:
+        error = str(e)
+    # One line per kind of problem
+    unique_issues = []
+    for issue in issues:
+        if issue not in unique_issues:
+            unique_issues.append(issue)
+
+    if any(issue["level"] == "error" for issue in unique_issues):
+        verdict = "reject"
+    elif error or unique_issues:
+        verdict = "warn"
+    else:
+        verdict = "ok"
+    return {"pattern": pattern, "source": source, "flags": flags, "rewrites": rewrites,
+            "suggestions": suggestions, "issues": unique_issues, "error": error, "verdict": verdict}
+
+
+def compile_pattern(pattern: str, base_flags: int = re.IGNORECASE) -> Tuple[Optional["re.Pattern"], Dict[str, Any]]:
+    """Compiled regex and its prepare_pattern() result; None if the pattern is rejected or invalid."""
+    prepared = prepare_pattern(pattern, base_flags)
+    if prepared["error"] or prepared["verdict"] == "reject":
+        return None, prepared
+    return re.compile(prepared["source"], prepared["flags"]), prepared
+
+
+@lru_cache(maxsize=4096)
+def _extraction_pattern(pattern: str) -> Tuple[Optional["re.Pattern"], str]:
+    compiled, prepared = compile_pattern(pattern, re.IGNORECASE)
+    return compiled, prepared["error"] or "rejected for catastrophic backtracking"
+
+
+def compile_extraction_pattern(pattern: str) -> "re.Pattern":
+    """
+    Cached compile for the extract_*_simple functions, with the same rewrites and
+    rejections as PatternSet. Raises re.error when the pattern is matched as a substring.
+    """
+    compiled, reason = _extraction_pattern(pattern)
+    if compiled is None:
+        raise re.error(reason)
+    return compiled
+
+
+def _stress_subjects(compiled: "re.Pattern", length: int) -> List[str]:
+    literals = "".join(sorted({char for char in compiled.pattern if char.isalnum() or char in "_.-"}))[:8]
+    subjects = []
+    for pump in _STRESS_PUMPS + ((literals,) if literals else ()):
+        body = (pump * (length // len(pump) + 1))[:length]
+        subjects.extend(body + tail for tail in _STRESS_TAILS)
+    return subjects
+
+
+def stress_time_pattern(compiled: "re.Pattern", reject_ms: float = STRESS_REJECT_MS) -> Dict[str, Any]:
+    """
+    Worst single search time over the stress corpus. Lengths grow until the longest
+    one or until a search exceeds reject_ms. Returns {"worst_ms", "worst_subject", "max_length"}.
+    """
+    perf_counter = time.perf_counter
+    worst, worst_subject, max_length = 0.0, "", 0
+    for length in STRESS_LENGTHS:
+        max_length = length
+        for subject in _stress_subjects(compiled, length):
+            start = perf_counter()
+            compiled.search(subject)
+            elapsed = (perf_counter() - start) * 1000
+            if elapsed > worst:
+                worst, worst_subject = elapsed, subject
+                if worst > reject_ms:
+                    return {"worst_ms": round(worst, 3), "worst_subject": worst_subject, "max_length": max_length}
+    return {"worst_ms": round(worst, 3), "worst_subject": worst_subject, "max_length": max_length}
+
+
+def _config_patterns(config: Dict[str, Any]):
+    """(patterns.json key, task name or None, pattern) for every pattern string in the config."""
+    for key, value in config.items():
+        if isinstance(value, dict):
+            for name, pattern_list in value.items():
+                for pattern in pattern_list if isinstance(pattern_list, list) else []:
+                    if isinstance(pattern, str):
+                        yield key, name, pattern
+        elif isinstance(value, list):
+            for pattern in value:
+                if isinstance(pattern, str):
+                    yield key, None, pattern
+
+
+def lint_patterns_config(config: Dict[str, Any], stress: bool = True) -> Dict[str, Any]:
+    """
+    Lint (and with stress=True, stress-time) every pattern of a parsed patterns.json.
+
+    Returns {"verdict": worst verdict, "counts": {"ok", "warn", "reject"},
+             "patterns": [prepare_pattern() result + "key", "name", and "stress" when timed]}.
+    """
+    results = []
+    counts = {"ok": 0, "warn": 0, "reject": 0}
+    for key, name, pattern in _config_patterns(config):
+        compiled, result = compile_pattern(pattern)
+        result = dict(result, key=key, name=name)
+        # Statically rejected patterns are not timed; they could take arbitrarily long
+        if stress and compiled is not None:
+            stress_result = stress_time_pattern(compiled)
+            result["stress"] = stress_result
+            if stress_result["worst_ms"] > STRESS_REJECT_MS:
+                result["verdict"] = "reject"
+            elif stress_result["worst_ms"] > STRESS_WARN_MS and result["verdict"] == "ok":
+                result["verdict"] = "warn"
+        counts[result["verdict"]] += 1
+        results.append(result)
+    verdict = max(counts, key=lambda v: VERDICT_ORDER[v] if counts[v] else -1) if results else "ok"
+    return {"verdict": verdict, "counts": counts, "patterns": results}
+
+
+def format_lint_report(report: Dict[str, Any]) -> str:
+    """Plain-text rendering of lint_patterns_config() for the editor."""
+    counts = report["counts"]
+    lines = [f"Pattern check: {report['verdict'].upper()} "
+             f"({counts['ok']} ok, {counts['warn']} warnings, {counts['reject']} rejected)"]
+    for result in report["patterns"]:
+        if result["verdict"] == "ok" and not result["rewrites"] and not result["suggestions"]:
+            continue
+        label = f"{result['key']}:{result['name']}" if result["name"] else result["key"]
+        lines.append(f"\n[{result['verdict'].upper()}] [{label}] {result['pattern']}")
+        for rewrite in result["rewrites"]:
+            lines.append(f"    rewrite: {rewrite}")
+        for suggestion in result["suggestions"]:
+            lines.append(f"    suggestion: {suggestion}")
+        if result["error"]:
+            lines.append(f"    re.error: {result['error']} (matched as a plain substring)")
+        for issue in result["issues"]:
+            lines.append(f"    {issue['level']}: {issue['message']}")
+        stress = result.get("stress")
+        if stress and stress["worst_ms"] > STRESS_WARN_MS:
+            lines.append(f"    slow: {stress['worst_ms']:.1f} ms on a {len(stress['worst_subject'])}-character name "
+                         f"{stress['worst_subject'][:40]!r}...")
+    return "\n".join(lines)
@@ -0,0 +1,200 @@
+"""
+Pattern Performance Profiler
+
+Instrumentation mode for tag extraction. A PatternProfiler wraps a
+PatternSet and exposes the same extract_all(), returning identical results,
+while recording for every pattern in patterns.json how often it was
+evaluated, the cumulative time spent in it and how often it produced the
+tag (first match wins, so a pattern after an earlier match is not
+evaluated).
+
+The report lists patterns by cumulative time, the patterns that never
+matched during the run (dead or shadowed), and the regexes that failed to
+compile and fall back to substring matching (re.error, or rejected by the
+pattern compiler for catastrophic backtracking).
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pattern_compiler import prepare_pattern
+
+# Extraction order of PatternSet.extract_all
+PROFILED_CATEGORIES = ("shot", "task", "version", "resolution", "asset", "stage")
+_MATCHED_VALUE_CATEGORIES = ("shot", "version", "resolution")
+
+# (category, task name or "", position in its list)
+PatternKey = Tuple[str, str, int]
+
+
+def _compile_error(pattern_str: str) -> str:
+    # Why PatternSet matches this pattern as a substring
+    prepared = prepare_pattern(pattern_str, re.IGNORECASE)
+    if prepared["error"]:
+        return prepared["error"]
+    return "; ".join(issue["message"] for issue in prepared["issues"] if issue["level"] == "error")
+
+
+class PatternProfiler:
+    """Profiles pattern evaluation for one PatternSet. Thread-safe; one instance per profiled run."""
+
+    def __init__(self, pattern_set):
+        self.pattern_set = pattern_set
+        self._meta: Dict[PatternKey, Dict[str, Any]] = {}
+        self._entries: Dict[str, List[Tuple[PatternKey, str, Any]]] = {}
+        for category in PROFILED_CATEGORIES:
+            if category == "task":
+                continue
+            self._entries[category] = [
+                (self._register(category, "", position, pattern_str, compiled), pattern_str, compiled)
+                for position, (pattern_str, compiled) in enumerate(pattern_set.compiled[category])
+            ]
+        self._task_entries = [
+            (task_name, [(self._register("task", task_name, position, pattern_str, compiled), pattern_str, compiled)
+                         for position, (pattern_str, compiled) in enumerate(entries)])
+            for task_name, entries in pattern_set.compiled_tasks
+        ]
+        # key -> [evaluations, seconds, matches]
+        self._stats: Dict[PatternKey, List[float]] = {}
+        self._lock = threading.Lock()
+        self.files_profiled = 0
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+
+    def _register(self, category: str, name: str, position: int, pattern_str: str, compiled) -> PatternKey:
+        key = (category, name, position)
+        self._meta[key] = {
+            "category": category,
+            "name": name or None,
+            "pattern": pattern_str,
+            "mode": "regex" if compiled is not None else "substring",
+            "compile_error": _compile_error(pattern_str) if compiled is None else None,
+        }
+        return key
+
+    def extract_all(self, filename: str) -> Dict[str, Optional[str]]:
+        """Same result as PatternSet.extract_all, with per-pattern stats recorded."""
+        filename_lower = filename.lower()
+        samples: List[Tuple[PatternKey, float, bool]] = []
+        result = {}
+        for category in PROFILED_CATEGORIES:
+            if category == "task":
+                result[category] = self._extract_task(filename, filename_lower, samples)
+            else:
+                result[category] = self._extract_list(category, filename, filename_lower, samples)
+        self._merge(samples)
+        return result
+
+    def _extract_list(self, category, filename, filename_lower, samples) -> Optional[str]:
+        return_matched_value = category in _MATCHED_VALUE_CATEGORIES
+        perf_counter = time.perf_counter
+        for key, pattern_str, compiled in self._entries[category]:
+            start = perf_counter()
+            if compiled is not None:
+                match = compiled.search(filename)
+                samples.append((key, perf_counter() - start, match is not None))
+                if match:
+                    return match.group(0) if return_matched_value else pattern_str
+            else:
+                found = pattern_str.lower() in filename_lower
+                samples.append((key, perf_counter() - start, found))
+                if found:
+                    return pattern_str
+        return None
+
+    def _extract_task(self, filename, filename_lower, samples) -> Optional[str]:
+        perf_counter = time.perf_counter
+        for task_name, entries in self._task_entries:
+            for key, pattern_str, compiled in entries:
+                start = perf_counter()
+                if compiled is not None:
+                    found = compiled.search(filename) is not None
+                else:
+                    found = pattern_str.lower() in filename_lower
+                samples.append((key, perf_counter() - start, found))
+                if found:
+                    return task_name
+        return None
+
+    def _merge(self, samples: List[Tuple[PatternKey, float, bool]]) -> None:
+        with self._lock:
+            self.files_profiled += 1
+            stats = self._stats
+            for key, seconds, matched in samples:
+                entry = stats.get(key)
+                if entry is None:
+                    entry = stats[key] = [0, 0.0, 0]
+                entry[0] += 1
+                entry[1] += seconds
+                if matched:
+                    entry[2] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Profiling report as a JSON-serializable dict:
+        {"files_profiled", "total_time_ms", "patterns": [... by total time, descending],
+         "dead_patterns": [... never matched], "substring_fallbacks": [... failed to compile]}
+        """
+        with self._lock:
+            stats = {key: list(value) for key, value in self._stats.items()}
+            files_profiled = self.files_profiled
+        patterns = []
+        for key, meta in self._meta.items():
+            evaluations, seconds, matches = stats.get(key, (0, 0.0, 0))
+            patterns.append(dict(
+                meta,
+                evaluations=evaluations,
+                matches=matches,
+                total_time_ms=round(seconds * 1000, 3),
+                mean_time_us=round(seconds / evaluations * 1e6, 3) if evaluations else 0.0,
+            ))
+        patterns.sort(key=lambda entry: entry["total_time_ms"], reverse=True)
+        return {
+            "started_at": self.started_at,
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "files_profiled": files_profiled,
+            "total_time_ms": round(sum(entry["total_time_ms"] for entry in patterns), 3),
+            "patterns": patterns,
+            "dead_patterns": [entry for entry in patterns if entry["matches"] == 0],
+            "substring_fallbacks": [entry for entry in patterns if entry["mode"] == "substring"],
+        }
+
+    def export_json(self, path: str) -> Dict[str, Any]:
+        """Write the report to path as JSON and return it."""
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Pattern profile written to: {path}", file=sys.stderr)
+        return report
+
+
+def _pattern_label(entry: Dict[str, Any]) -> str:
+    category = f"{entry['category']}:{entry['name']}" if entry["name"] else entry["category"]
+    return f"[{category}] {entry['pattern']}"
+
+
+def format_pattern_report(report: Dict[str, Any], top: int = 25) -> str:
+    """Plain-text rendering of a PatternProfiler report for the GUI / console."""
+    lines = [
+        f"Pattern profile: {report['files_profiled']} filenames, "
+        f"{report['total_time_ms']:.1f} ms in {len(report['patterns'])} patterns",
+        "",
+        f"Most expensive patterns (top {top}):",
+    ]
+    for entry in report["patterns"][:top]:
+        lines.append(
+            f"  {entry['total_time_ms']:9.3f} ms  {entry['evaluations']:8d} evals  "
+            f"{entry['matches']:7d} matches  {entry['mean_time_us']:8.2f} us/eval  {_pattern_label(entry)}"
+        )
+    lines += ["", f"Never matched ({len(report['dead_patterns'])}):"]
+    for entry in report["dead_patterns"]:
+        shadowed = "  (never evaluated: earlier patterns always matched)" if report["files_profiled"] and not entry["evaluations"] else ""
+        lines.append(f"  {_pattern_label(entry)}{shadowed}")
+    lines += ["", f"Regexes matched as plain substrings ({len(report['substring_fallbacks'])}):"]
+    for entry in report["substring_fallbacks"]:
+        lines.append(f"  {_pattern_label(entry)}\n      reason: {entry['compile_error']}")
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""
+Precompiled Pattern Set
+
+Holds every pattern from patterns.json compiled once, so extraction does not
+re-run re.compile() per file. A PatternSet is picklable and can be shipped to
+worker processes as-is.
+"""
+
+import re
+import sys
+from typing import Dict, Any, List, Optional, Tuple
+
+from .pattern_compiler import compile_pattern
+
+# Categories whose extractor returns the matched substring for regex hits.
+# The others (asset, stage) return the original pattern string.
+_MATCHED_VALUE_CATEGORIES = ("shot", "version", "resolution")
+_PATTERN_VALUE_CATEGORIES = ("asset", "stage")
+
+# patterns.json key for every list-based category
+CATEGORY_CONFIG_KEYS = {
+    "shot": "shotPatterns",
+    "version": "versionPatterns",
+    "resolution": "resolutionPatterns",
+    "asset": "assetPatterns",
+    "stage": "stagePatterns",
+}
+
+CompiledEntry = Tuple[str, Optional["re.Pattern"]]
+
+
+def _compile_entry(pattern_str: str) -> CompiledEntry:
+    """
+    Compile a single pattern through the pattern compiler (inline flags become compile
+    flags). Invalid regex keeps None and falls back to substring matching, as do patterns
+    rejected for catastrophic backtracking.
+    """
+    compiled, prepared = compile_pattern(pattern_str, re.IGNORECASE)
+    if compiled is None and not prepared["error"]:
+        print(f"[PATTERNS] Rejected (catastrophic backtracking), matching as substring: {pattern_str}", file=sys.stderr)
+    return (pattern_str, compiled)
+
+
+class PatternSet:
+    """Compiled shot/task/version/resolution/asset/stage patterns with extractor-identical semantics."""
+
+    def __init__(self,
+                 shot_patterns: List[str] = None,
+                 task_patterns: Dict[str, List[str]] = None,
+                 version_patterns: List[str] = None,
+                 resolution_patterns: List[str] = None,
+                 asset_patterns: List[str] = None,
+                 stage_patterns: List[str] = None):
+        self.raw: Dict[str, Any] = {
+            "shot": list(shot_patterns or []),
+            "task": dict(task_patterns or {}),
+            "version": list(version_patterns or []),
+            "resolution": list(resolution_patterns or []),
+            "asset": list(asset_patterns or []),
+            "stage": list(stage_patterns or []),
+        }
+        self.compiled: Dict[str, List[CompiledEntry]] = {
+            category: [_compile_entry(p) for p in self.raw[category]]
+            for category in CATEGORY_CONFIG_KEYS
+        }
+        self.compiled_tasks: List[Tuple[str, List[CompiledEntry]]] = [
+            (task_name, [_compile_entry(p) for p in pattern_list])
+            for task_name, pattern_list in self.raw["task"].items()
+        ]
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PatternSet":
+        """Build a PatternSet from a parsed patterns.json dictionary."""
+        def _list(key):
+            value = config.get(key, [])
+            return value if isinstance(value, list) else []
+
+        task_patterns = config.get("taskPatterns", {})
+        return cls(
+            shot_patterns=_list("shotPatterns"),
+            task_patterns=task_patterns if isinstance(task_patterns, dict) else {},
+            version_patterns=_list("versionPatterns"),
+            resolution_patterns=_list("resolutionPatterns"),
+            asset_patterns=_list("assetPatterns"),
+            stage_patterns=_list("stagePatterns"),
+        )
+
+    def changed_categories(self, other: "PatternSet") -> List[str]:
+        """Categories whose patterns differ from other's (order matters: first match wins)."""
+        changed = []
+        for category in ("shot", "task", "version", "resolution", "asset", "stage"):
+            mine, theirs = self.raw[category], other.raw[category]
+            if category == "task":
+                mine, theirs = list(mine.items()), list(theirs.items())
+            if mine != theirs:
+                changed.append(category)
+        return changed
+
+    def extract_category(self, category: str, filename: str, filename_lower: str = None) -> Optional[str]:
+        """Extract a single tag category."""
+        if filename_lower is None:
+            filename_lower = filename.lower()
+        if category == "task":
+            return self.extract_task(filename, filename_lower)
+        return self._extract_list(category, filename, filename_lower)
+
+    def _extract_list(self, category: str, filename: str, filename_lower: str) -> Optional[str]:
+        return_matched_value = category in _MATCHED_VALUE_CATEGORIES
+        for pattern_str, compiled in self.compiled[category]:
+            if compiled is not None:
+                match = compiled.search(filename)
+                if match:
+                    return match.group(0) if return_matched_value else pattern_str
+            elif pattern_str.lower() in filename_lower:
+                return pattern_str
+        return None
+
+    def extract_task(self, filename: str, filename_lower: str = None) -> Optional[str]:
+        if filename_lower is None:
+            filename_lower = filename.lower()
+        for task_name, entries in self.compiled_tasks:
+            for pattern_str, compiled in entries:
+                if compiled is not None:
+                    if compiled.search(filename):
+                        return task_name
+                elif pattern_str.lower() in filename_lower:
+                    return task_name
+        return None
+
+    def extract_all(self, filename: str) -> Dict[str, Optional[str]]:
+        """Extract all tags from a filename. Same result shape as extract_all_patterns_cached."""
+        filename_lower = filename.lower()
+        return {
+            'shot': self._extract_list("shot", filename, filename_lower),
+            'task': self.extract_task(filename, filename_lower),
+            'version': self._extract_list("version", filename, filename_lower),
+            'resolution': self._extract_list("resolution", filename, filename_lower),
+            'asset': self._extract_list("asset", filename, filename_lower),
+            'stage': self._extract_list("stage", filename, filename_lower),
+        }
@@ -0,0 +1,97 @@
+"""
+Process Pool Mapping
+
+Runs single-file mapping in worker processes. Regex extraction and target path
+generation are pure Python and hold the GIL, so threads do not scale; worker
+processes do. Work is shipped in large chunks and each worker receives the
+PatternSet and profile once, through the pool initializer, which compiles
+the profile's ProfileRuleIndex.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Iterator, Optional
+
+from .proposal_record import next_proposal_id
+
+# Below this many single files the thread pool is used (process start-up isn't worth it)
+PROCESS_POOL_MIN_FILES = 5000
+# Number of file nodes shipped to a worker per task
+PROCESS_POOL_CHUNK_SIZE = 2000
+
+# Per-worker state, set once by _init_worker
+_worker_pattern_set = None
+_worker_profile_rules: List[Dict[str, List[str]]] = []
+_worker_root_output_dir: str = ""
+_worker_rule_index = None
+
+
+def _init_worker(pattern_set, profile_rules, root_output_dir):
+    global _worker_pattern_set, _worker_profile_rules, _worker_root_output_dir, _worker_rule_index
+    from .profile_rule_index import ProfileRuleIndex
+
+    _worker_pattern_set = pattern_set
+    _worker_profile_rules = profile_rules
+    _worker_root_output_dir = root_output_dir
+    # Compiled once per worker; its tag memo persists across chunks
+    _worker_rule_index = ProfileRuleIndex(profile_rules)
+
+
+def _map_chunk(file_nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map one chunk of file nodes inside a worker process."""
+    from .create_simple_mapping import create_simple_mapping
+
+    return [
+        create_simple_mapping(
+            node=node,
+            profile_rules=_worker_profile_rules,
+            root_output_dir=_worker_root_output_dir,
+            pattern_set=_worker_pattern_set,
+            rule_index=_worker_rule_index,
+        )
+        for node in file_nodes
+    ]
+
+
+def default_worker_count() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def should_use_process_pool(file_count: int, min_files: int = PROCESS_POOL_MIN_FILES) -> bool:
+    return file_count >= min_files and default_worker_count() > 1
+
+
+def map_files_in_process_pool(
+    single_files: List[Dict[str, Any]],
+    pattern_set,
+    profile_rules: List[Dict[str, List[str]]],
+    root_output_dir: str,
+    chunk_size: int = PROCESS_POOL_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Map single files in a process pool.
+
+    Yields one list of proposals per chunk, in the same order as single_files,
+    with IDs assigned in this process.
+    Raises whatever the pool raises (e.g. BrokenProcessPool) so the caller can
+    fall back to the thread pool.
+    """
+    if not single_files:
+        return
+    max_workers = max_workers or default_worker_count()
+    chunks = [single_files[i:i + chunk_size] for i in range(0, len(single_files), chunk_size)]
+    print(f"[INFO] Using process pool: {max_workers} workers, {len(chunks)} chunks of up to {chunk_size} files", file=sys.stderr)
+
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(chunks)),
+        initializer=_init_worker,
+        initargs=(pattern_set, profile_rules, root_output_dir),
+    ) as executor:
+        # executor.map returns results in submission order
+        for chunk_result in executor.map(_map_chunk, chunks):
+            # Worker ID counters overlap; number the proposals from the parent's counter
+            for proposal in chunk_result:
+                proposal["id"] = next_proposal_id()
+            yield chunk_result
@@ -0,0 +1,222 @@
+"""
+Profile Rule Index
+
+Compiles a profile's rules once for target path generation: lowercased
+keyword -> path hash maps for the task/asset lookups, the keyword list used for
+ambiguity checks, and the default footage fallback path. Resolved paths are
+memoized by their parsed tags, so files sharing the same tags resolve in O(1).
+"""
+
+import os
+from typing import Optional, Dict, Any, List, Tuple
+
+# Default keywords that identify a path rule as being for 'footage'
+# This helps in implementing the fallback logic (Rule 2.4)
+DEFAULT_FOOTAGE_KEYWORDS = ["footage", "video", "source", "plate", "plates"]
+
+
+def join_target_path(target_dir: str, filename: str) -> str:
+    """Append a filename to a resolved target directory (plain join unless the name has separators)."""
+    if filename and filename not in (".", "..") and os.sep not in filename and not (os.altsep and os.altsep in filename):
+        return os.path.join(target_dir, filename)
+    return os.path.normpath(os.path.join(target_dir, filename))
+
+
+class ProfileRuleIndex:
+    """Precompiled lookup structures for one profile's rules."""
+
+    def __init__(self, profile_rules: List[Dict[str, List[str]]], max_cache_size: int = 50000):
+        self.profile_rules = profile_rules
+        # Copy of the rules the index was compiled from, so callers can detect edits
+        self.rules_snapshot = [{k: list(v) for k, v in rule_obj.items()} for rule_obj in profile_rules]
+        self.max_cache_size = max_cache_size
+
+        # Exact keyword match: first rule (in profile order) wins
+        self.keyword_to_path: Dict[str, str] = {}
+        # Ambiguity check map: last rule wins, as in the original keyword map
+        all_profile_keywords_map: Dict[str, str] = {}
+        for rule_obj in profile_rules:
+            for path_key, keywords_in_rule in rule_obj.items():
+                for kw in keywords_in_rule:
+                    kw_lower = kw.lower()
+                    self.keyword_to_path.setdefault(kw_lower, path_key)
+                    all_profile_keywords_map[kw_lower] = path_key
+        self.ambiguity_items: List[Tuple[str, str]] = list(all_profile_keywords_map.items())
+
+        self.footage_path = self._find_footage_path(profile_rules)
+
+        self._choice_cache: Dict[Tuple[Optional[str], Optional[str]], Tuple] = {}
+        self._path_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def matches(self, profile_rules: List[Dict[str, List[str]]]) -> bool:
+        """True if profile_rules are still the rules this index was compiled from."""
+        return self.rules_snapshot == profile_rules
+
+    @staticmethod
+    def _find_footage_path(profile_rules: List[Dict[str, List[str]]]) -> str:
+        # Attempt 1: a rule whose keywords are exactly the default footage keywords
+        normalized_default_keywords_set = set(kw.lower() for kw in DEFAULT_FOOTAGE_KEYWORDS)
+        for rule_obj in profile_rules:
+            for path_key, keywords in rule_obj.items():
+                if set(kw.lower() for kw in keywords) == normalized_default_keywords_set:
+                    return path_key
+        # Attempt 2: any rule containing any default footage keyword
+        for rule_obj in profile_rules:
+            for path_key, keywords in rule_obj.items():
+                normalized_keywords_list = [kw.lower() for kw in keywords]
+                if any(ft_kw in normalized_keywords_list for ft_kw in DEFAULT_FOOTAGE_KEYWORDS):
+                    return path_key
+        # Fallback if no explicit footage rule found
+        return "unmapped_footage"
+
+    def _ambiguous_options(self, normalized_value: str) -> List[Dict[str, str]]:
+        details = [
+            {"keyword": pk_keyword, "path": pk_path_key}
+            for pk_keyword, pk_path_key in self.ambiguity_items
+            if pk_keyword in normalized_value
+        ]
+        if len(set(item["path"] for item in details)) > 1:
+            return sorted(details, key=lambda x: x["keyword"])
+        return []
+
+    def choose_base_path(self, parsed_task: Optional[str], parsed_asset: Optional[str]) -> Tuple[Optional[str], bool, bool, Tuple[Dict[str, str], ...]]:
+        """
+        Returns (chosen_base_sub_path, used_default_footage_rule, ambiguous_match, ambiguous_options)
+        for the given task/asset (Rules 2.1-2.4). Memoized: ambiguous_options is a shared tuple.
+        """
+        key = (parsed_task, parsed_asset)
+        cached = self._choice_cache.get(key)
+        if cached is not None:
+            return cached
+
+        normalized_task = parsed_task.lower() if parsed_task else None
+        normalized_asset = parsed_asset.lower() if parsed_asset else None
+
+        # Primary driver: Task, secondary driver: Asset
+        chosen_base_sub_path = None
+        if normalized_task:
+            chosen_base_sub_path = self.keyword_to_path.get(normalized_task)
+        if not chosen_base_sub_path and normalized_asset:
+            chosen_base_sub_path = self.keyword_to_path.get(normalized_asset)
+
+        used_default_footage_rule = False
+        ambiguous_options: List[Dict[str, str]] = []
+        if not chosen_base_sub_path:
+            # Ambiguity: one token containing keywords of different rules (task first)
+            if normalized_task:
+                ambiguous_options = self._ambiguous_options(normalized_task)
+            if not ambiguous_options and normalized_asset:
+                ambiguous_options = self._ambiguous_options(normalized_asset)
+            if not ambiguous_options:
+                used_default_footage_rule = True
+                chosen_base_sub_path = self.footage_path
+
+        result = (chosen_base_sub_path, used_default_footage_rule, bool(ambiguous_options), tuple(ambiguous_options))
+        self._choice_cache[key] = result
+        return result
+
+    def resolve(
+        self,
+        root_output_dir: str,
+        filename: str,
+        parsed_shot: Optional[str],
+        parsed_task: Optional[str],
+        parsed_asset: Optional[str],
+        parsed_stage: Optional[str],
+        parsed_version: Optional[str],
+        parsed_resolution: Optional[str],
+    ) -> Dict[str, Any]:
+        """Same contract as generate_simple_target_path, plus "matched_rule" (the chosen base path)."""
+        directory_result = self.resolve_directory(root_output_dir, parsed_shot, parsed_task, parsed_asset,
+                                                  parsed_stage, parsed_version, parsed_resolution)
+        target_dir = directory_result["target_dir"]
+        target_path = None if target_dir is None else join_target_path(target_dir, filename)
+
+        return {
+            "target_path": target_path,
+            "matched_rule": directory_result["matched_rule"],
+            "used_default_footage_rule": directory_result["used_default_footage_rule"],
+            "ambiguous_match": directory_result["ambiguous_match"],
+            # Each proposal gets its own copies, not the memoized options
+            "ambiguous_options": [dict(option) for option in directory_result["ambiguous_options"]],
+        }
+
+    def resolve_directory(
+        self,
+        root_output_dir: str,
+        parsed_shot: Optional[str],
+        parsed_task: Optional[str],
+        parsed_asset: Optional[str],
+        parsed_stage: Optional[str],
+        parsed_version: Optional[str],
+        parsed_resolution: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Memoized target directory for a tag tuple, shared by every filename with those tags
+        (read-only; ambiguous_options is a tuple). Returns {"target_dir" (None if ambiguous/unmatched),
+        "matched_rule", "used_default_footage_rule", "ambiguous_match", "ambiguous_options"}.
+        """
+        key = (root_output_dir, parsed_shot, parsed_task, parsed_asset, parsed_stage, parsed_version, parsed_resolution)
+        directory_result = self._path_cache.get(key)
+        if directory_result is None:
+            self.miss_count += 1
+            directory_result = self._resolve_directory(*key)
+            if len(self._path_cache) >= self.max_cache_size:
+                # Drop the oldest 10% of entries
+                for old_key in list(self._path_cache.keys())[:max(1, self.max_cache_size // 10)]:
+                    self._path_cache.pop(old_key, None)
+            self._path_cache[key] = directory_result
+        else:
+            self.hit_count += 1
+        return directory_result
+
+    def _resolve_directory(self, root_output_dir, parsed_shot, parsed_task, parsed_asset,
+                           parsed_stage, parsed_version, parsed_resolution) -> Dict[str, Any]:
+        chosen_base_sub_path, used_default_footage_rule, ambiguous_match, ambiguous_options = \
+            self.choose_base_path(parsed_task, parsed_asset)
+
+        # --- Construct Dynamic Path Segments (Rule 3.3, 4) ---
+        dynamic_segments_ordered = [
+            parsed_shot,
+            parsed_stage,
+            parsed_task,
+            parsed_asset,
+            parsed_resolution,
+            parsed_version
+        ]
+        final_dynamic_segments = []
+        for i, segment in enumerate(dynamic_segments_ordered):
+            if segment is not None and segment.strip() != "":
+                if i == 0:  # parsed_shot - preserve original case
+                    final_dynamic_segments.append(segment)
+                elif i == 4:  # parsed_resolution - convert to uppercase
+                    final_dynamic_segments.append(segment.upper())
+                else:  # parsed_stage, parsed_task, parsed_asset, parsed_version - convert to lowercase
+                    final_dynamic_segments.append(segment.lower())
+
+        # --- Assemble Final Directory (Rule 5) ---
+        if ambiguous_match or not chosen_base_sub_path:
+            target_dir = None
+        else:
+            path_parts = [os.path.abspath(root_output_dir), chosen_base_sub_path]
+            path_parts.extend(final_dynamic_segments)
+            target_dir = os.path.normpath(os.path.join(*path_parts))
+
+        return {
+            "target_dir": target_dir,
+            "matched_rule": None if ambiguous_match else chosen_base_sub_path,
+            "used_default_footage_rule": used_default_footage_rule,
+            "ambiguous_match": ambiguous_match,
+            "ambiguous_options": ambiguous_options,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        total_requests = self.hit_count + self.miss_count
+        return {
+            'cache_size': len(self._path_cache),
+            'hit_count': self.hit_count,
+            'miss_count': self.miss_count,
+            'hit_rate': round(self.hit_count / total_requests * 100, 2) if total_requests else 0,
+        }
@@ -0,0 +1,168 @@
+"""
+Compact Proposal Records
+
+Slotted record for mapping proposals with integer IDs. A ProposalRecord reads
+and writes like the proposal dicts it replaces (get, [], in, keys, items,
+json via compact_json_default), but stores each field in a slot instead of a
+per-proposal dict, and derives the constant fields (matched_rules list,
+used_default_footage_rule, ambiguous_match, ambiguous_options) instead of
+allocating them for every proposal.
+
+IDs come from a process-wide counter. Proposals made in process-pool workers
+are re-numbered in the parent (see process_pool_mapping.py) so IDs stay unique.
+"""
+
+import itertools
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
+
+_id_counter = itertools.count(1)
+
+
+def next_proposal_id() -> int:
+    """Next proposal ID. Starts at 1 so IDs are always truthy."""
+    return next(_id_counter)
+
+
+# Keys every record exposes, in the order the old proposal dicts used
+_BASE_KEYS = (
+    "id", "original_item", "targetPath", "type", "status", "tags",
+    "sequence_info", "matched_rules", "used_default_footage_rule",
+    "ambiguous_match", "ambiguous_options", "error_message",
+)
+# Keys only present when set (file proposals never had sequence_info)
+_OPTIONAL_KEYS = frozenset(("sequence_info", "error_message"))
+_SLOT_KEYS = frozenset(("id", "original_item", "targetPath", "type", "status", "tags", "sequence_info", "error_message"))
+# Derived keys and their values when not overridden
+_DEFAULTS = {"used_default_footage_rule": False, "ambiguous_match": False}
+
+
+class ProposalRecord(MutableMapping):
+    """A mapping proposal stored in slots; behaves like the proposal dict."""
+
+    __slots__ = (
+        "id", "original_item", "targetPath", "type", "status", "tags",
+        "sequence_info", "matched_rule", "error_message", "_extra",
+    )
+
+    def __init__(
+        self,
+        original_item: Dict[str, Any],
+        target_path: Optional[str],
+        item_type: str,
+        status: str,
+        tags: Dict[str, Any],
+        sequence_info: Optional[Dict[str, Any]] = None,
+        matched_rule: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+        proposal_id: Optional[int] = None,
+    ):
+        self.id = proposal_id if proposal_id is not None else next_proposal_id()
+        self.original_item = original_item
+        self.targetPath = target_path
+        self.type = item_type
+        self.status = status
+        self.tags = tags
+        self.sequence_info = sequence_info
+        self.matched_rule = matched_rule
+        self.error_message = error_message
+        # Non-default values for derived keys, plus any keys callers add
+        self._extra = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOT_KEYS:
+            if key in _OPTIONAL_KEYS and getattr(self, key) is None:
+                raise KeyError(key)
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        if key == "matched_rules":
+            return [self.matched_rule] if self.matched_rule else []
+        if key == "ambiguous_options":
+            return []
+        if key in _DEFAULTS:
+            return _DEFAULTS[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _SLOT_KEYS:
+            setattr(self, key, value)
+        elif key == "matched_rules" and (not value or len(value) == 1):
+            self.matched_rule = value[0] if value else None
+            if self._extra is not None:
+                self._extra.pop(key, None)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _OPTIONAL_KEYS and getattr(self, key) is not None:
+            setattr(self, key, None)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _BASE_KEYS:
+            if key in _OPTIONAL_KEYS and getattr(self, key) is None:
+                continue
+            yield key
+        if self._extra is not None:
+            for key in self._extra:
+                if key not in _BASE_KEYS:
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _OPTIONAL_KEYS:
+            return getattr(self, key) is not None
+        return key in _BASE_KEYS or (self._extra is not None and key in self._extra)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Fast path for the common lookups; avoids the KeyError round trip of Mapping.get
+        if key in _SLOT_KEYS:
+            value = getattr(self, key)
+            if value is None and key in _OPTIONAL_KEYS:
+                return default
+            return value
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the plain proposal dict."""
+        return {key: self[key] for key in self}
+
+    def copy(self) -> Dict[str, Any]:
+        """Shallow copy as a plain dict, like dict.copy()."""
+        return self.to_dict()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ProposalRecord):
+            return self is other or self.to_dict() == other.to_dict()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ProposalRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Slots only; rebuilt field by field so worker results unpickle cheaply
+        return (_rebuild_record, (
+            self.original_item, self.targetPath, self.type, self.status, self.tags,
+            self.sequence_info, self.matched_rule, self.error_message, self.id, self._extra,
+        ))
+
+
+def _rebuild_record(original_item, target_path, item_type, status, tags,
+                    sequence_info, matched_rule, error_message, proposal_id, extra) -> ProposalRecord:
+    record = ProposalRecord(original_item, target_path, item_type, status, tags,
+                            sequence_info, matched_rule, error_message, proposal_id)
+    record._extra = extra
+    return record
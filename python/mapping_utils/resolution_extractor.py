@@ -2,6 +2,8 @@ import re
 import sys
 from typing import Optional, List
 
+from .pattern_compiler import compile_extraction_pattern
+
 def extract_resolution_simple(filename: str, source_path: str, resolution_patterns: List[str]) -> Optional[str]:
     """
     Extract resolution information from a filename using patterns from patterns.json.
@@ -23,7 +25,7 @@ def extract_resolution_simple(filename: str, source_path: str, resolution_patter
         try:
             # Attempt to compile and match as regex, case-insensitive by default.
             # If pattern_str itself contains (?i), that will also ensure case-insensitivity.
-            compiled_pattern = re.compile(pattern_str, re.IGNORECASE)
+            compiled_pattern = compile_extraction_pattern(pattern_str)
             match = compiled_pattern.search(filename) # Search on original filename
             if match:
                 # print(f"[RESOLUTION_EXTRACTOR MATCH] Regex Pattern: '{pattern_str}', File: '{filename}', Matched Group: '{match.group(0)}'", file=sys.stderr, flush=True)  # (Silenced for normal use. Re-enable for troubleshooting.)
@@ -0,0 +1,170 @@
+"""
+Mapping Run Report
+
+Stage timing for one mapping run. Each stage (file collection, sequence
+grouping, sequence proposals, the single-file pool, the GUI transform, ...)
+is timed with time.perf_counter and recorded with its item count,
+throughput (items/sec) and the process' peak memory when the stage ended.
+
+The finished report is a JSON-serializable dict that travels with the
+proposals, can be rendered for the GUI log (format_run_report) and is
+appended as one line to a JSONL history file (append_run_history) so runs
+can be compared across releases.
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+RUN_REPORT_SCHEMA = 1
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Peak resident memory of this process so far, or None if the platform doesn't expose it."""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_process_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(_ProcessMemoryCounters), wintypes.DWORD]
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if get_process_memory_info(handle, ctypes.byref(counters), counters.cb):
+                return int(counters.PeakWorkingSetSize)
+        except Exception:
+            return None
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def _to_mb(value: Optional[int]) -> Optional[float]:
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+class RunReport:
+    """Timings of one mapping run. Stages are recorded in the order they finish. Thread-safe."""
+
+    def __init__(self, run_id: Optional[str] = None, context: Optional[Dict[str, Any]] = None):
+        self.run_id = run_id
+        self.context: Dict[str, Any] = dict(context or {})
+        self.counts: Dict[str, Any] = {}
+        self.stages: List[Dict[str, Any]] = []
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.finished_at: Optional[str] = None
+        self._start = time.perf_counter()
+        self._total_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, items: Optional[int] = None, **details) -> Iterator[Dict[str, Any]]:
+        """
+        Time a stage. The yielded dict can be updated inside the block, e.g.
+        stage["items"] = n once the count is known, or extra details such as the executor.
+        """
+        entry: Dict[str, Any] = {"name": name, "items": items}
+        entry.update(details)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            self.add_stage(entry.pop("name"), time.perf_counter() - start, **entry)
+
+    def add_stage(self, name: str, seconds: float, items: Optional[int] = None, **details) -> Dict[str, Any]:
+        """Record a stage timed elsewhere."""
+        entry = {
+            "name": name,
+            "seconds": round(seconds, 6),
+            "items": items,
+            "items_per_sec": round(items / seconds, 1) if items and seconds > 0 else None,
+            "peak_memory_mb": _to_mb(peak_memory_bytes()),
+        }
+        entry.update(details)
+        with self._lock:
+            self.stages.append(entry)
+        return entry
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop the run clock (first call only) and return the report."""
+        if self._total_seconds is None:
+            self._total_seconds = time.perf_counter() - self._start
+            self.finished_at = datetime.now().isoformat(timespec="seconds")
+        return self.as_dict()
+
+    def as_dict(self) -> Dict[str, Any]:
+        total_seconds = self._total_seconds if self._total_seconds is not None else time.perf_counter() - self._start
+        with self._lock:
+            stages = [dict(entry) for entry in self.stages]
+        return {
+            "schema": RUN_REPORT_SCHEMA,
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total_seconds": round(total_seconds, 6),
+            "peak_memory_mb": _to_mb(peak_memory_bytes()),
+            "stages": stages,
+            "counts": dict(self.counts),
+            "context": dict(self.context),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+        }
+
+
+def format_run_report(report: Dict[str, Any]) -> str:
+    """Plain-text rendering of a run report for the GUI log / console."""
+    peak = report.get("peak_memory_mb")
+    lines = [
+        f"Mapping run{' ' + report['run_id'] if report.get('run_id') else ''}: {report['total_seconds']:.3f} s"
+        + (f", peak memory {peak:.1f} MB" if peak is not None else "")
+    ]
+    for entry in report["stages"]:
+        items = f"{entry['items']:9d} items" if entry.get("items") is not None else " " * 15
+        rate = f"{entry['items_per_sec']:12.1f} items/s" if entry.get("items_per_sec") else " " * 20
+        executor = f"  ({entry['executor']})" if entry.get("executor") else ""
+        lines.append(f"  {entry['name']:<20} {entry['seconds']:9.3f} s  {items}  {rate}{executor}")
+    if report.get("counts"):
+        lines.append("  " + ", ".join(f"{key}: {value}" for key, value in report["counts"].items()))
+    return "\n".join(lines)
+
+
+def append_run_history(report: Dict[str, Any], path: str) -> bool:
+    """Append the report as one JSON line to path. Returns False (and logs) if it can't be written."""
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+        return True
+    except OSError as e:
+        print(f"Could not append run report to {path}: {e}", file=sys.stderr)
+        return False
@@ -2,6 +2,8 @@ import re
 import sys
 from typing import Optional, List
 
+from .pattern_compiler import compile_extraction_pattern
+
 def extract_shot_simple(filename: str, source_path: str, shot_patterns: List[str]) -> Optional[str]:
     """
     Extract shot information from a filename using patterns from patterns.json.
@@ -26,7 +28,7 @@ def extract_shot_simple(filename: str, source_path: str, shot_patterns: List[str
     for pattern_str in shot_patterns:
         # print(f"[SHOT_EXTRACTOR DEBUG] Trying pattern (regex attempt): '{pattern_str}' on '{filename}'", file=sys.stderr, flush=True)
         try:
-            compiled_pattern = re.compile(pattern_str, re.IGNORECASE)
+            compiled_pattern = compile_extraction_pattern(pattern_str)
             match = compiled_pattern.search(filename)
             if match:
                 matched_value = match.group(0) # Actual matched substring
@@ -2,6 +2,8 @@ import re
 import sys
 from typing import Optional, List
 
+from .pattern_compiler import compile_extraction_pattern
+
 def extract_stage_simple(filename: str, stage_patterns: List[str]) -> Optional[str]:
     """
     Extract stage information from a filename using patterns from patterns.json.
@@ -25,7 +27,7 @@ def extract_stage_simple(filename: str, stage_patterns: List[str]) -> Optional[s
     for pattern_str in stage_patterns:
         # print(f"[STAGE_EXTRACTOR DEBUG] Trying pattern (regex attempt): '{pattern_str}' on '{filename}'", file=sys.stderr, flush=True)
         try:
-            compiled_pattern = re.compile(pattern_str, re.IGNORECASE)
+            compiled_pattern = compile_extraction_pattern(pattern_str)
             match = compiled_pattern.search(filename)
             if match:
                 matched_value = match.group(0)
@@ -0,0 +1,241 @@
+"""
+Streaming Mapping Generation
+
+Yields mapping proposals as they are produced instead of returning one list at
+the end. Files are consumed from any iterable (a tree walk, NDJSON lines, ...):
+files that can't be sequence frames are mapped immediately, and sequence
+candidates are buffered per directory and grouped when their directory is
+complete. Memory is bounded by the open directories, not by the job size.
+
+A directory is considered complete when the input moves on to other
+directories. Tree walks (iter_tree_files) list every directory's files
+contiguously; for interleaved input, raise max_open_directories so several
+directories stay open at once and sequences are not split.
+
+With external_grouping, candidates are not buffered per directory but
+spilled to sorted runs on disk (see external_sequence_grouping.py): memory
+stays bounded however the input is ordered and however large a directory
+is, and sequences are yielded once the whole input has been read.
+"""
+
+import os
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .external_sequence_grouping import EXTERNAL_RUN_SIZE, iter_group_image_sequences_external
+from .group_image_sequences import SEQUENCE_EXTENSIONS
+from .proposal_record import next_proposal_id
+
+# Directories whose sequence candidates are held back at once
+MAX_OPEN_DIRECTORIES = 64
+
+
+def _node_from_path(file_path: str) -> Dict[str, Any]:
+    # Same minimal node generate_mappings builds for _all_files entries
+    path_obj = Path(file_path)
+    return {
+        "name": path_obj.name,
+        "path": str(path_obj),
+        "type": "file",
+        "size": 0,
+        "extension": path_obj.suffix.lower(),
+    }
+
+
+def file_node_from_record(record: Any) -> Optional[Dict[str, Any]]:
+    """Normalize one input record (path string or file node dict) to a file node."""
+    if isinstance(record, str):
+        return _node_from_path(record) if record else None
+    if not isinstance(record, dict):
+        return None
+    if not record.get("name") and record.get("path"):
+        node = _node_from_path(record["path"])
+        node.update({k: v for k, v in record.items() if k != "extension"})
+        return node
+    if "extension" not in record and record.get("name"):
+        node = dict(record)
+        node["extension"] = os.path.splitext(record["name"])[1].lower()
+        return node
+    return record
+
+
+def iter_tree_files(tree: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the file nodes of a scan tree, each folder's own files before its subfolders,
+    so every directory's files arrive contiguously. Supports the _all_files form.
+    """
+    if tree.get("_all_files"):
+        for file_path in tree["_all_files"]:
+            yield _node_from_path(file_path)
+        return
+
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        node_type = node.get("type", "unknown")
+        if node_type == "file":
+            yield node
+            continue
+        if node_type != "folder":
+            continue
+        subfolders = []
+        for child_node in node.get("children", []):
+            if child_node.get("type") == "file":
+                yield child_node
+            else:
+                subfolders.append(child_node)
+        # Reversed so subfolders are visited in their listed order
+        stack.extend(reversed(subfolders))
+
+
+def _directory_key(file_path: str) -> str:
+    cut = max(file_path.rfind("/"), file_path.rfind("\\"))
+    return file_path[:cut] if cut >= 0 else ""
+
+
+def _error_proposal(node: Dict[str, Any], item_type: str, error: Exception) -> Dict[str, Any]:
+    return {
+        "id": next_proposal_id(),
+        "name": node.get("name", f"unknown_{item_type}"),
+        "sourcePath": node.get("path", "unknown_path"),
+        "targetPath": None,
+        "status": "error",
+        "type": item_type,
+        "shot": None, "asset": None, "stage": None, "task": None, "version": None, "resolution": None,
+        "error_message": f"{type(error).__name__}: {error}",
+        "used_default_footage_rule": False,
+        "ambiguous_match": False,
+        "ambiguous_options": []
+    }
+
+
+def stream_mappings(
+    file_nodes: Iterable[Any],
+    profile: Dict[str, Any],
+    group_image_sequences: Callable[[List[Dict[str, Any]]], Any],
+    create_sequence_mapping: Callable[[Dict[str, Any], Dict[str, Any], Optional[str]], Any],
+    create_simple_mapping: Callable[[Dict[str, Any], Dict[str, Any]], Any],
+    status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_open_directories: int = 1,
+    external_grouping: bool = False,
+    spill_dir: Optional[str] = None,
+    run_size: int = EXTERNAL_RUN_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generator equivalent of generate_mappings. Yields proposals in production order:
+    non-sequence files as they arrive, then each directory's sequences and leftover
+    single frames once the directory is complete.
+
+    Args:
+        file_nodes: Iterable of file nodes or path strings
+        profile: Full profile dictionary
+        group_image_sequences: files -> (sequences, single_files)
+        create_sequence_mapping: (sequence, profile, base_name) -> proposal
+        create_simple_mapping: (file_node, profile) -> proposal
+        status_callback: Optional progress callback (rate limited)
+        max_open_directories: Directories whose sequence candidates are buffered at once.
+                              1 suits tree walks; use MAX_OPEN_DIRECTORIES for input
+                              that may interleave directories.
+        external_grouping: Group sequence candidates out of core instead of per directory
+                           (group_image_sequences and max_open_directories are then unused)
+        spill_dir: Directory for the sorted runs (system temp if None)
+        run_size: Candidates sorted in memory per spilled run
+    """
+    last_progress_update = 0.0
+    min_progress_interval = 0.5
+    produced = 0
+
+    def progress(message: str):
+        nonlocal last_progress_update
+        current_time = time.time()
+        if status_callback and current_time - last_progress_update >= min_progress_interval:
+            status_callback({"type": "mapping_generation", "data": {
+                "status": "progress",
+                "message": message,
+                "current_file_count": produced,
+            }})
+            last_progress_update = current_time
+
+    def map_single(node):
+        try:
+            return create_simple_mapping(node, profile)
+        except Exception as e:
+            print(f"[ERROR] Exception during mapping for file '{node.get('name', 'unknown_file')}': {type(e).__name__} - {e}\n{traceback.format_exc()}", file=sys.stderr, flush=True)
+            return _error_proposal(node, "file", e)
+
+    def map_sequence(sequence_item):
+        try:
+            seq_mapping = create_sequence_mapping(sequence_item, profile, sequence_item.get("base_name"))
+        except Exception as e:
+            print(f"[ERROR] Exception during mapping for sequence '{sequence_item.get('base_name', 'unknown_sequence')}': {type(e).__name__} - {e}", file=sys.stderr, flush=True)
+            seq_mapping = _error_proposal({"name": sequence_item.get("base_name"), "path": sequence_item.get("directory")}, "sequence", e)
+        if isinstance(seq_mapping, list):
+            yield from seq_mapping
+        elif seq_mapping:
+            yield seq_mapping
+
+    def flush_directory(candidates):
+        sequences, single_files = group_image_sequences(candidates)
+        for sequence_item in sequences:
+            yield from map_sequence(sequence_item)
+        for node in single_files:
+            mapping = map_single(node)
+            if mapping:
+                yield mapping
+
+    if status_callback:
+        status_callback({"type": "mapping_generation", "data": {"status": "starting", "message": "Streaming mapping generation..."}})
+
+    if external_grouping:
+        nodes = (node for node in map(file_node_from_record, file_nodes) if node is not None)
+        for kind, item in iter_group_image_sequences_external(nodes, run_size=run_size, spill_dir=spill_dir):
+            mappings = map_sequence(item) if kind == "sequence" else filter(None, [map_single(item)])
+            for mapping in mappings:
+                produced += 1
+                yield mapping
+            progress(f"Streamed {produced} proposals")
+    else:
+        open_directories: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        for record in file_nodes:
+            node = file_node_from_record(record)
+            if node is None:
+                continue
+            if node.get("extension", "").lower() not in SEQUENCE_EXTENSIONS:
+                mapping = map_single(node)
+                if mapping:
+                    produced += 1
+                    yield mapping
+                progress(f"Streamed {produced} proposals")
+                continue
+
+            directory = _directory_key(node.get("path", ""))
+            candidates = open_directories.get(directory)
+            if candidates is None:
+                # A new directory: the previous ones are complete unless the input interleaves
+                while open_directories and len(open_directories) >= max_open_directories:
+                    _, oldest = open_directories.popitem(last=False)
+                    for mapping in flush_directory(oldest):
+                        produced += 1
+                        yield mapping
+                candidates = open_directories[directory] = []
+            else:
+                open_directories.move_to_end(directory)
+            candidates.append(node)
+
+        while open_directories:
+            _, candidates = open_directories.popitem(last=False)
+            for mapping in flush_directory(candidates):
+                produced += 1
+                yield mapping
+            progress(f"Streamed {produced} proposals")
+
+    if status_callback:
+        status_callback({"type": "mapping_generation", "data": {
+            "status": "completed",
+            "message": f"Streamed {produced} proposals",
+            "current_file_count": produced,
+        }})
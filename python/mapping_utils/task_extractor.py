@@ -2,6 +2,8 @@ import re
 import sys
 from typing import Optional, Dict, Any, List
 
+from .pattern_compiler import compile_extraction_pattern
+
 def extract_task_simple(filename: str, source_path: str, task_patterns: Dict[str, List[str]]) -> Optional[str]:
     """
     Extract task information from a filename using patterns from patterns.json.
@@ -28,7 +30,7 @@ def extract_task_simple(filename: str, source_path: str, task_patterns: Dict[str
         for pattern_str in pattern_list:
             # print(f"[TASK_EXTRACTOR DEBUG] Trying pattern (regex attempt): '{pattern_str}' for task '{task}' on '{filename}'", file=sys.stderr, flush=True)
             try:
-                compiled_pattern = re.compile(pattern_str, re.IGNORECASE)
+                compiled_pattern = compile_extraction_pattern(pattern_str)
                 match = compiled_pattern.search(filename)
                 if match:
                     matched_value = match.group(0)
@@ -10,6 +10,8 @@ import os
 import sys
 import json
 import argparse
+import contextlib
+import time
 import traceback
 import uuid
 import subprocess
@@ -32,12 +34,16 @@ try:
     from .mapping import MappingGenerator
     from .fileops import FileOperations
     from .config_loader import load_profile_from_file, ProfileNotFoundError, ProfilesFileNotFoundError
+    from .mapping_utils.frame_ranges import compact_json_default
+    from .mapping_utils.stream_mappings import iter_tree_files, MAX_OPEN_DIRECTORIES
 except ImportError:
     # Fallback for direct script execution
     from scanner import FileSystemScanner
     from mapping import MappingGenerator
     from fileops import FileOperations
     from config_loader import load_profile_from_file, ProfileNotFoundError, ProfilesFileNotFoundError
+    from mapping_utils.frame_ranges import compact_json_default
+    from mapping_utils.stream_mappings import iter_tree_files, MAX_OPEN_DIRECTORIES
 
 
 def count_files_in_tree(tree: Dict[str, Any]) -> int:
@@ -154,6 +160,157 @@ def create_test_data() -> Dict[str, Any]:
     return {"success": True, "tree": test_tree, "proposals": mappings}
 
 
+class NDJSONWriter:
+    """Writes one compact JSON object per line, flushing often enough for live consumers."""
+
+    def __init__(self, stream, flush_interval: float = 0.05):
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._last_flush = 0.0
+
+    def write(self, obj: Dict[str, Any]):
+        self.stream.write(json.dumps(obj, separators=(",", ":"), default=compact_json_default))
+        self.stream.write("\n")
+        self.count += 1
+        now = time.monotonic()
+        if self.count == 1 or now - self._last_flush >= self.flush_interval:
+            self.stream.flush()
+            self._last_flush = now
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _iter_ndjson_records(lines):
+    """File records from NDJSON lines: a path string, a file node, or a folder node (walked)."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict) and record.get("type") == "folder":
+            yield from iter_tree_files(record)
+        else:
+            yield record
+
+
+def read_map_input(input_stream) -> Tuple[Dict[str, Any], Any, Optional[Dict[str, Any]]]:
+    """
+    Read the map command input without loading file records up front.
+
+    Two forms are accepted:
+      - NDJSON: a header object on the first line ({"profile_name", "root_output_dir",
+        "batchId"}), then one file record per line (path string, file node or folder node).
+      - A single JSON document {"tree": ..., "profile_name": ..., ...} (the original format).
+
+    Either header may set "external_grouping": true to group sequences out of core, or
+    "external_grouping_min_files": n to do so from n files on (the tree's file count, or
+    the NDJSON header's "file_count" when the sender knows it).
+
+    Returns (header, file record iterator, tree); tree is None for NDJSON input,
+    whose records may arrive out of directory order.
+    """
+    first_line = ""
+    for first_line in input_stream:
+        if first_line.strip():
+            break
+
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError:
+        header = None
+
+    if isinstance(header, dict) and "tree" not in header:
+        return header, _iter_ndjson_records(input_stream), None
+
+    if header is None:
+        # Multi-line (indented) single document
+        header = json.loads(first_line + input_stream.read())
+    tree = header.get("tree") or {}
+    # Tree may be wrapped in the scan result format
+    if isinstance(tree, dict) and "tree" in tree and "success" in tree:
+        tree = tree["tree"]
+    return header, iter_tree_files(tree), tree
+
+
+def run_map_command(input_stream, output_stream):
+    """
+    Stream mapping proposals as NDJSON.
+
+    Output lines: a {"event": "start"} line, one proposal per line as it is produced,
+    then a {"event": "summary"} line, or an {"event": "error"} line on failure.
+    Anything the mapping code prints goes to stderr so stdout stays valid NDJSON.
+    """
+    writer = NDJSONWriter(output_stream)
+    batch_id = None
+    try:
+        header, records, tree = read_map_input(input_stream)
+        batch_id = header.get("batchId")
+        profile_name = header.get("profile_name")
+        if not profile_name:
+            writer.write({"event": "error", "success": False, "error": "'profile_name' is required in input for map command.", "batchId": batch_id})
+            return
+
+        try:
+            profile = load_profile_from_file(profile_name)
+        except (ProfileNotFoundError, ProfilesFileNotFoundError) as e_profile_load:
+            writer.write({"event": "error", "success": False, "error": str(e_profile_load), "batchId": batch_id})
+            return
+        except ValueError as e_json_profile:
+            writer.write({"event": "error", "success": False, "error": f"Error reading profile configuration: {str(e_json_profile)}", "batchId": batch_id})
+            return
+
+        root_output_dir = header.get("root_output_dir") or os.getcwd()
+        print(f"[MAP] Profile: {profile_name}, root output: {root_output_dir}, batch: {batch_id}", file=sys.stderr)
+
+        start_time = time.monotonic()
+        counts = {"sequence": 0, "file": 0, "error": 0}
+        with contextlib.redirect_stdout(sys.stderr):
+            generator = MappingGenerator()
+            if header.get("external_grouping_min_files") is not None:
+                generator.set_external_grouping_threshold(header["external_grouping_min_files"])
+            if header.get("external_grouping"):
+                external_grouping = True
+            elif tree is not None:
+                external_grouping = generator.use_external_grouping(tree)
+            else:
+                file_count = header.get("file_count")
+                threshold = generator.external_grouping_threshold
+                external_grouping = bool(threshold and file_count is not None and file_count >= threshold)
+            writer.write({"event": "start", "success": True, "batchId": batch_id, "profile": profile_name})
+            proposals = generator.stream_mappings(
+                records,
+                profile,
+                root_output_dir,
+                batch_id=batch_id,
+                max_open_directories=MAX_OPEN_DIRECTORIES if tree is None else 1,
+                external_grouping=external_grouping,
+            )
+            for proposal in proposals:
+                if proposal.get("status") == "error":
+                    counts["error"] += 1
+                counts["sequence" if proposal.get("type") == "sequence" else "file"] += 1
+                writer.write(proposal)
+
+        writer.write({
+            "event": "summary",
+            "success": True,
+            "batchId": batch_id,
+            "total": counts["sequence"] + counts["file"],
+            "sequences": counts["sequence"],
+            "files": counts["file"],
+            "errors": counts["error"],
+            "elapsed_seconds": round(time.monotonic() - start_time, 3),
+        })
+    except Exception as e:
+        print(f"[ERROR] Top-level error in 'map' command: {str(e)}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        writer.write({"event": "error", "success": False, "error": f"Failed to process map command: {str(e)}", "batchId": batch_id})
+    finally:
+        writer.flush()
+
+
 def main():
     """Main CLI interface."""
     parser = argparse.ArgumentParser(description="VFX Folder Normalizer")
@@ -171,11 +328,14 @@ def main():
             "resume",
             "cancel",
             "validate",
+            "verify",
         ],
     )
     parser.add_argument("path", nargs="?", help="Path to scan")
     parser.add_argument(
-        "batch_id", nargs="?", help="Batch ID for progress and validation commands"
+        "batch_id", nargs="?",
+        help="Batch ID for progress and validation commands; resume/undo take the ID of a journaled "
+             "apply or GUI copy/move batch",
     )
 
     args = parser.parse_args()
@@ -183,7 +343,7 @@ def main():
     if args.command == "test":
         # Return test data for frontend development
         result = create_test_data()
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2, default=compact_json_default))
         return
 
     if args.command == "scan":
@@ -219,120 +379,8 @@ def main():
         print(json.dumps(progress, indent=2))
 
     elif args.command == "map":
-        # Read tree and profile from stdin
-        try:
-            input_data = json.loads(sys.stdin.read())
-            tree = input_data["tree"]
-            profile_name = input_data.get("profile_name") # Changed from "profile"
-
-            if not profile_name:
-                print(json.dumps({"success": False, "error": "'profile_name' is required in input for map command.", "batchId": input_data.get("batchId")}, indent=2))
-                return
-
-            try:
-                profile = load_profile_from_file(profile_name)
-            except (ProfileNotFoundError, ProfilesFileNotFoundError) as e_profile_load:
-                print(json.dumps({"success": False, "error": str(e_profile_load), "batchId": input_data.get("batchId")}, indent=2))
-                return
-            except ValueError as e_json_profile:
-                print(json.dumps({"success": False, "error": f"Error reading profile configuration: {str(e_json_profile)}", "batchId": input_data.get("batchId")}, indent=2))
-                return
-            except Exception as e_general_profile_load: # Catch any other unexpected error during profile load
-                print(json.dumps({"success": False, "error": f"An unexpected error occurred while loading profile '{profile_name}': {str(e_general_profile_load)}", "batchId": input_data.get("batchId")}, indent=2))
-                return
-            batch_id = input_data.get("batchId", None)
-
-            # Debug the received data
-            print(
-                f"Received input data keys: {list(input_data.keys())}", file=sys.stderr
-            )
-            print(f"Batch ID: {batch_id}", file=sys.stderr)
-            print(
-                f"Tree type: {type(tree)}, Tree keys: {list(tree.keys()) if isinstance(tree, dict) else 'Not a dict'}",
-                file=sys.stderr,
-            )
-
-            # IMPORTANT FIX: Check if tree is wrapped in scan result format
-            if isinstance(tree, dict) and "tree" in tree and "success" in tree:
-                print(
-                    f"Tree is wrapped in scan result format, extracting actual tree",
-                    file=sys.stderr,
-                )
-                actual_tree = tree["tree"]
-                print(
-                    f"Extracted tree name: {actual_tree.get('name', 'NO NAME')}",
-                    file=sys.stderr,
-                )
-                print(
-                    f"Extracted tree type: {actual_tree.get('type', 'NO TYPE')}",
-                    file=sys.stderr,
-                )
-                print(
-                    f"Extracted tree children count: {len(actual_tree.get('children', []))}",
-                    file=sys.stderr,
-                )
-                tree = actual_tree
-
-            print(f"Final tree name: {tree.get('name', 'NO NAME')}", file=sys.stderr)
-            print(
-                f"Final tree type field: {tree.get('type', 'NO TYPE')}", file=sys.stderr
-            )
-            print(
-                f"Final tree children count: {len(tree.get('children', []))}",
-                file=sys.stderr,
-            )
-            print(
-                f"Profile name: {profile.get('name', 'NO PROFILE NAME')}",
-                file=sys.stderr,
-            )
-
-            # Show first few children for debugging
-            children = tree.get("children", [])
-            for i, child in enumerate(children[:3]):
-                child_name = child.get("name", "NO NAME")
-                child_type = child.get("type", "NO TYPE")
-                child_children_count = len(child.get("children", []))
-                print(
-                    f"  Child {i+1}: {child_name} (type: {child_type}, children: {child_children_count})",
-                    file=sys.stderr,
-                )
-
-            generator = MappingGenerator()
-            # Generate mappings with batch ID for progress tracking
-            mappings = []
-            total_files = 0
-            error_occurred = False
-            error_message = ""
-            
-            try:
-                # Iterate through the tree and generate mappings
-                processed_files_count = 0
-                # The generate_mappings_with_progress might need adjustment if it was also sending websocket updates internally
-                # For now, assuming it yields mappings and doesn't directly call send_progress_update itself.
-                # If MappingGenerator.generate_mappings_with_progress itself uses websockets, it will need to be refactored.
-                for item_map in generator.generate_mappings_with_progress(tree, profile, batch_id):
-                    mappings.append(item_map)
-                    processed_files_count += 1
-
-            except Exception as e_map:
-                error_occurred = True
-                error_message = f"Error during mapping generation: {str(e_map)}"
-                print(f"[ERROR] {error_message}", file=sys.stderr)
-                traceback.print_exc(file=sys.stderr)
-            
-            if error_occurred:
-                print(json.dumps({"success": False, "error": error_message, "batchId": batch_id}, indent=2))
-            else:
-                print(json.dumps({"success": True, "proposals": mappings, "batchId": batch_id}, indent=2))
-
-        except Exception as e:
-            print(f"[ERROR] Top-level error in 'map' command: {str(e)}", file=sys.stderr)
-            traceback.print_exc(file=sys.stderr)
-            batch_id_for_error = None
-            # Attempt to get batch_id from input_data if it was successfully parsed
-            if 'input_data' in locals() and isinstance(input_data, dict):
-                batch_id_for_error = input_data.get("batchId")
-            print(json.dumps({"success": False, "error": f"Failed to process map command: {str(e)}", "batchId": batch_id_for_error}, indent=2))
+        # Header (+ tree or NDJSON file records) on stdin, NDJSON proposals on stdout
+        run_map_command(sys.stdin, sys.stdout)
     elif args.command == "apply":
         # Read mappings from stdin
         try:
@@ -349,6 +397,10 @@ def main():
                 operation_type = "move"
                 validate_sequences = True
                 batch_id = str(uuid.uuid4())
+                transfer_engine = None
+                priority = None
+                scheduler_settings = {}
+                checksum = None
                 print(
                     f"[DEBUG] Using old format, defaulting to operation_type: {operation_type}",
                     file=sys.stderr,
@@ -364,12 +416,20 @@ def main():
                 operation_type = input_data.get("operation_type", "move")
                 validate_sequences = input_data.get("validate_sequences", True)
                 batch_id = input_data.get("batch_id") or str(uuid.uuid4())
+                transfer_engine = input_data.get("transfer_engine")  # None: FileOperations default ("auto")
+                priority = input_data.get("priority")  # "high" / "normal" / "low"
+                checksum = input_data.get("checksum")  # "auto" / "xxh3_128" / "blake2b": inline digests + manifest
+                # I/O scheduler limits: {"volume_concurrency": n, "bandwidth_limit_mbps": x}
+                scheduler_settings = input_data.get("scheduler", {})
                 
                 # Get multithreaded settings
                 multithreaded_settings = input_data.get("multithreaded", {})
                 use_multithreaded = multithreaded_settings.get("enabled", False)
                 max_workers = multithreaded_settings.get("max_workers", 8)
                 file_workers = multithreaded_settings.get("file_workers", 4)
+                # Dual-lane batch executor: small-file lane width and shared in-flight budget
+                small_file_workers = multithreaded_settings.get("small_file_workers")
+                byte_budget_mb = multithreaded_settings.get("byte_budget_mb")
                 
                 print(
                     f"[DEBUG] Using new format, operation_type: {operation_type}",
@@ -389,6 +449,14 @@ def main():
             # Initialize FileOperations. WebSocket server is managed globally.
             print(f"[DEBUG] Initializing FileOperations.", file=sys.stderr)
             operations = FileOperations()
+            if scheduler_settings:
+                volume_concurrency = scheduler_settings.get("volume_concurrency")
+                bandwidth_limit_mbps = scheduler_settings.get("bandwidth_limit_mbps") or 0
+                operations.scheduler.configure(
+                    source_concurrency=volume_concurrency,
+                    destination_concurrency=volume_concurrency,
+                    bandwidth_limit=bandwidth_limit_mbps * 1024 * 1024,
+                )
             
             # Use multithreaded operations if enabled
             if use_multithreaded:
@@ -400,6 +468,11 @@ def main():
                     batch_id=batch_id,
                     max_workers=max_workers,
                     file_workers=file_workers,
+                    transfer_engine=transfer_engine,
+                    priority=priority,
+                    small_file_workers=small_file_workers,
+                    byte_budget=byte_budget_mb * 1024 * 1024 if byte_budget_mb else None,
+                    checksum=checksum,
                 )
             else:
                 print(f"[DEBUG] Using standard single-threaded operations", file=sys.stderr)
@@ -408,6 +481,9 @@ def main():
                     operation_type=operation_type,
                     validate_sequences=validate_sequences,
                     batch_id=batch_id,
+                    transfer_engine=transfer_engine,
+                    priority=priority,
+                    checksum=checksum,
                 )
             print(json.dumps(result, indent=2))
         except Exception as e:
@@ -501,9 +577,15 @@ def main():
             print(json.dumps({"error": f"Failed to pause operations: {str(e)}"}))
 
     elif args.command == "resume":
-        # Resume paused operations
+        # "resume <batch_id>": continue a journaled batch that stopped (apply, apply_multithreaded or a GUI
+        # copy/move, which logs its batch ID when it starts); without one, resume paused operations
         try:
             operations = FileOperations()
+            batch_id = args.path or args.batch_id
+            if batch_id:
+                result = operations.resume_batch(batch_id)
+                print(json.dumps(result, indent=2))
+                return
             operations.resume_operations()
             print(json.dumps({"success": True, "message": "Operations resumed"}))
         except Exception as e:
@@ -534,10 +616,25 @@ def main():
         except Exception as e:
             print(json.dumps({"error": f"Failed to validate sequences: {str(e)}"}))
 
+    elif args.command == "verify":
+        # Re-hash a batch's destinations against its checksum manifest
+        try:
+            target = args.path or args.batch_id
+            if not target:
+                print(json.dumps({"error": "verify needs a batch ID or a checksum manifest path"}))
+                return
+            operations = FileOperations()
+            result = operations.verify_batch(target)
+            print(json.dumps(result, indent=2))
+        except Exception as e:
+            print(json.dumps({"error": f"Failed to verify batch: {str(e)}"}))
+
     elif args.command == "undo":
+        # "undo <batch_id>" undoes that move batch; without one, the most recent finished move batch
         try:
             operations = FileOperations()
-            result = operations.undo_last_batch()
+            batch_id = args.path or args.batch_id
+            result = operations.undo_batch(batch_id) if batch_id else operations.undo_last_batch()
 
             print(json.dumps(result, indent=2))
         except Exception as e:
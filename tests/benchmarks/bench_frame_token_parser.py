@@ -0,0 +1,33 @@
+"""
+Times frame token parsing on a million names: the pre-frame_token_parser
+extract_sequence_info, the precompiled cascade and the single regex.
+
+    python tests/benchmarks/bench_frame_token_parser.py [count]
+"""
+
+import os
+import sys
+import time
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.dirname(TESTS_DIR), TESTS_DIR]
+
+from legacy_reference import baseline_extract_sequence_info  # noqa: E402
+from python.mapping_utils.frame_token_parser import _parse_layouts, parse_frame_token  # noqa: E402
+
+
+def main(count: int = 1_000_000) -> None:
+    names = [f"SH{i % 500:03d}_comp_v{i % 7:03d}.{1001 + i % 240:04d}.exr" if i % 4
+             else f"SH{i % 500:03d}_plate_{1001 + i % 240:04d}_ALi.dpx"
+             for i in range(count)]
+    for label, parse in (("baseline extract_sequence_info", baseline_extract_sequence_info),
+                         ("precompiled cascade", _parse_layouts),
+                         ("single regex", parse_frame_token)):
+        start = time.perf_counter()
+        for name in names:
+            parse(name)
+        print(f"{label}: {time.perf_counter() - start:.2f}s for {len(names)} names")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the app as the "python" package, like app_gui_pyqt5.py does
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture
+def file_operations(tmp_path):
+    """FileOperations journaling to a temporary operations.db, with its progress files under tmp_path."""
+    from python.fileops import FileOperations
+
+    ops = FileOperations(journal_path=str(tmp_path / "operations.db"))
+    ops.progress_dir = str(tmp_path / "_progress")
+    os.makedirs(ops.progress_dir, exist_ok=True)
+    yield ops
+    if ops.journal is not None:
+        ops.journal.close()
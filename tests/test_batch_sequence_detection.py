@@ -0,0 +1,55 @@
+import random
+
+from python.mapping_utils.batch_sequence_detection import group_image_sequences_batch, parse_frame_tokens
+from python.mapping_utils.extract_sequence_info import extract_sequence_info
+from python.mapping_utils.group_image_sequences import group_image_sequences
+
+
+def _node(path, size=0):
+    name = path.rsplit("/", 1)[-1]
+    extension = "." + name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    return {"name": name, "path": path, "type": "file", "size": size, "extension": extension}
+
+
+def _files(seed=3):
+    rng = random.Random(seed)
+    files = []
+    for shot in ("SH010", "SH020", "SH030"):
+        directory = f"/in/{shot}"
+        for frame in rng.sample(range(1001, 1050), 20):
+            files.append(_node(f"{directory}/{shot}_comp_v001.{frame:04d}.exr", frame))
+            files.append(_node(f"{directory}/{shot}_plate_{frame:04d}_ALi.dpx", frame))
+        files.extend([
+            _node(f"{directory}/{shot}_edit.mov", 5),
+            _node(f"{directory}/notes.txt", 1),
+            _node(f"{directory}/lone.1001.exr", 1),
+            _node(f"{directory}/sequence_0001.exr", 1),
+            _node(f"{directory}/big.1000000.exr", 1),
+            _node(f"{directory}/SH010_comp_v001.1001.EXR", 1),
+        ])
+    rng.shuffle(files)
+    return files
+
+
+def test_matches_group_image_sequences():
+    files = _files()
+    expected_sequences, expected_singles = group_image_sequences(list(files), extract_sequence_info=extract_sequence_info)
+    sequences, singles = group_image_sequences_batch(list(files), verbose=False)
+
+    assert [n["path"] for n in singles] == [n["path"] for n in expected_singles]
+    assert len(sequences) == len(expected_sequences)
+    for sequence, expected in zip(sequences, expected_sequences):
+        for key in ("base_name", "suffix", "directory", "frame_count"):
+            assert sequence[key] == expected[key]
+        # The compact form lists frames in frame order rather than input order, and its
+        # frame ranges hold each frame number once (SH010 has 1001 twice: .exr and .EXR)
+        assert sorted(sequence["files"]) == sorted(n["path"] for n in expected["files"])
+        assert list(sequence["frame_numbers"]) == sorted(set(expected["frame_numbers"]))
+        assert sequence["size"] == sum(n["size"] for n in expected["files"])
+
+
+def test_parse_frame_tokens_matches_extract_sequence_info():
+    names = [n["name"] for n in _files()] + ["", "a\n.1001.exr", "name.1001.exr\n", "_.1001.exr"]
+    for name, token in zip(names, parse_frame_tokens(names)):
+        info = extract_sequence_info(name) if name else None
+        assert token == ((info["base_name"], info["frame"]) if info else None), name
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+
+def _mappings(tmp_path, count=3):
+    mappings = []
+    for i in range(count):
+        src = tmp_path / "src" / f"f{i}.exr"
+        src.parent.mkdir(exist_ok=True)
+        src.write_bytes(b"x" * 10)
+        mappings.append({"id": str(i), "type": "file", "sourcePath": str(src), "targetPath": str(tmp_path / "dst" / f"f{i}.exr")})
+    return mappings
+
+
+def test_sequential_batch_state_is_dropped(file_operations, tmp_path):
+    result = file_operations.apply_mappings(_mappings(tmp_path), operation_type="copy", batch_id="state-done")
+    assert result["success"]
+    assert "state-done" not in file_operations.batch_directories
+    assert "state-done" not in file_operations.batch_priorities
+
+
+def test_cancelled_sequential_batch_state_is_dropped(file_operations, tmp_path):
+    file_operations.cancelled_operations.add("state-cancelled")
+    result = file_operations.apply_mappings(_mappings(tmp_path), operation_type="copy", batch_id="state-cancelled")
+    assert not result["success"]
+    assert not os.path.exists(str(tmp_path / "dst" / "f0.exr"))
+    assert "state-cancelled" not in file_operations.batch_directories
+    assert "state-cancelled" not in file_operations.batch_priorities
+
+
+def test_multithreaded_batch_state_is_dropped(file_operations, tmp_path):
+    result = file_operations.apply_mappings_multithreaded(_mappings(tmp_path), operation_type="copy", batch_id="state-mt", priority="high")
+    assert result["success"]
+    for state in (file_operations.batch_priorities, file_operations.batch_directories, file_operations.batch_resumes):
+        assert "state-mt" not in state
+
+
+def test_failed_batch_state_is_dropped(file_operations, tmp_path, monkeypatch):
+    def broken_plan(batch_id, destination_paths):
+        raise OSError("destination volume went away")
+
+    monkeypatch.setattr(file_operations, "_create_directory_plan", broken_plan)
+    for apply in (file_operations.apply_mappings, file_operations.apply_mappings_multithreaded):
+        with pytest.raises(OSError):
+            apply(_mappings(tmp_path), operation_type="copy", batch_id="state-failed", priority="low")
+        assert "state-failed" not in file_operations.batch_priorities
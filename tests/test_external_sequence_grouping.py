@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from python.mapping_utils.batch_sequence_detection import group_image_sequences_batch
+from python.mapping_utils.external_sequence_grouping import iter_group_image_sequences_external
+
+
+def _node(path, size):
+    name = path.rsplit("/", 1)[-1]
+    return {"name": name, "path": path, "type": "file", "size": size, "extension": "." + name.rsplit(".", 1)[-1]}
+
+
+def _shuffled_nodes(seed=7):
+    rng = random.Random(seed)
+    nodes = []
+    for d in range(12):
+        for base in ("comp", "plate_v002", "bg"):
+            for frame in rng.sample(range(1001, 1100), 40):
+                nodes.append(_node(f"/in/sh{d:03d}/{base}.{frame:04d}.exr", frame))
+        nodes.append(_node(f"/in/sh{d:03d}/lone.1001.exr", 3))
+        nodes.append(_node(f"/in/sh{d:03d}/notes.txt", 1))
+        nodes.append(_node(f"/in/sh{d:03d}/no_frame.exr", 2))
+    rng.shuffle(nodes)
+    return nodes
+
+
+def _sequence_key(sequence):
+    return sequence["directory"], sequence["base_name"], sequence["suffix"]
+
+
+def _sequence_view(sequence):
+    return list(sequence["files"]), sequence["frame_range"], sequence["size"]
+
+
+@pytest.mark.parametrize("run_size", [50, 100_000])  # spilled runs / one in-memory run
+def test_matches_batch_grouping(run_size, tmp_path):
+    nodes = _shuffled_nodes()
+    sequences, singles = group_image_sequences_batch(list(nodes), verbose=False)
+
+    # A generator: the grouping must not need a list (or indexes into one)
+    grouped = list(iter_group_image_sequences_external(
+        (node for node in nodes), run_size=run_size, spill_dir=str(tmp_path), verbose=False))
+    external_sequences = [item for kind, item in grouped if kind == "sequence"]
+    external_singles = [item for kind, item in grouped if kind == "single"]
+
+    assert {_sequence_key(s): _sequence_view(s) for s in external_sequences} == \
+        {_sequence_key(s): _sequence_view(s) for s in sequences}
+    assert sorted(n["path"] for n in external_singles) == sorted(n["path"] for n in singles)
+    assert list(tmp_path.iterdir()) == []  # Spilled runs are removed
+
+
+def test_non_candidates_are_yielded_before_input_ends():
+    seen = []
+
+    def files():
+        for node in (_node("/in/a/notes.txt", 1), _node("/in/a/comp.1001.exr", 1), _node("/in/a/comp.1002.exr", 1)):
+            seen.append(node["name"])
+            yield node
+
+    grouped = iter_group_image_sequences_external(files(), verbose=False)
+    kind, item = next(grouped)
+    assert (kind, item["name"]) == ("single", "notes.txt")
+    assert seen == ["notes.txt"]
+    assert [kind for kind, _ in grouped] == ["sequence"]
@@ -0,0 +1,54 @@
+import itertools
+
+import pytest
+
+from legacy_reference import baseline_extract_sequence_info
+from python.mapping_utils.extract_sequence_info import extract_sequence_info
+from python.mapping_utils.frame_token_parser import parse_frame_token
+
+
+def _corpus():
+    # Every layout, each way a layout can be rejected (frame too large, "_" base,
+    # "sequence_", "_####"), extensions with dots and names with newlines
+    parts = ["", "a", "_", ".", "shot", "SH010_comp", "plate.v001", "sequence_x", "A_B", "x.y_z"]
+    separators = ["", ".", "_", "__", "._", "_."]
+    frames = ["", "1", "01", "001", "1001", "0001001", "999999", "1000000", "12345678901"]
+    suffixes = ["", "_ALi", "_a.b", ".exr", ".EXR", ".tar.gz", ".", "_####", "\n"]
+    corpus = {"", "_####", "a_####", "sequence_0001.exr", "name.1001.exr\n", "_.1001.exr", "_1001.exr"}
+    for base, sep, frame, suffix, ext in itertools.product(parts, separators, frames, suffixes, ["", ".exr", ".dpx"]):
+        corpus.add(f"{base}{sep}{frame}{suffix}{ext}")
+    return sorted(corpus)
+
+
+CORPUS = _corpus()
+
+
+def test_extract_sequence_info_matches_baseline():
+    mismatches = [
+        (name, extract_sequence_info(name), baseline_extract_sequence_info(name))
+        for name in CORPUS
+        if extract_sequence_info(name) != baseline_extract_sequence_info(name)
+    ]
+    assert not mismatches, mismatches[:10]
+
+
+def test_parse_frame_token_matches_baseline():
+    for name in CORPUS:
+        expected = baseline_extract_sequence_info(name)
+        token = parse_frame_token(name)
+        if expected is None:
+            assert token is None, name
+        else:
+            assert token == (expected["base_name"], expected["frame"], expected["suffix"]), name
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("sequence.1001.exr", ("sequence", 1001, ".exr")),
+    ("ASSET_01_v019_ALi_1001.exr", ("ASSET_01_v019_ALi", 1001, ".exr")),
+    ("ASSET_01_v019.1001_ALi.exr", ("ASSET_01_v019_ALi", 1001, ".exr")),
+    ("ASSET_01_v019_1001_ALi.exr", ("ASSET_01_v019_ALi", 1001, ".exr")),
+    ("shot.1000000.exr", None),
+    ("sequence_0001.exr", None),
+])
+def test_layouts(name, expected):
+    assert parse_frame_token(name) == expected
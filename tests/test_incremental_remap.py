@@ -0,0 +1,103 @@
+import copy
+import json
+import os
+
+import pytest
+
+from python.mapping import MappingGenerator
+from python.mapping_utils.incremental_remap import extraction_name, remap_proposals
+from python.mapping_utils.pattern_set import PatternSet
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+PROFILE = "Simple Project"
+NAMES = [f"sh010_comp_v001.{frame:04d}.exr" for frame in range(1001, 1004)] + [
+    "sh020_plate_v002_4k.mov",
+    "EP01_hero_v003.mov",
+    "EP02_hero_v001.0001.exr",
+    "EP02_hero_v001.0002.exr",
+    "sh030_fx_ver004.ma",
+    "random.txt",
+]
+
+
+def _write_patterns(config_dir, patterns):
+    with open(os.path.join(config_dir, "patterns.json"), "w") as f:
+        json.dump(patterns, f)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """A copy of config/ and a MappingGenerator reading it: (config_dir, patterns, rules, generator)."""
+    with open(os.path.join(CONFIG_DIR, "patterns.json")) as f:
+        patterns = json.load(f)
+    with open(os.path.join(CONFIG_DIR, "profiles.json")) as f:
+        profiles = json.load(f)
+    config_dir = str(tmp_path)
+    _write_patterns(config_dir, patterns)
+    with open(os.path.join(config_dir, "profiles.json"), "w") as f:
+        json.dump(profiles, f)
+    return config_dir, patterns, profiles[PROFILE], MappingGenerator(os.path.join(config_dir, "patterns.json"))
+
+
+def _tree():
+    children = [{"name": name, "path": f"/in/{name}", "type": "file", "size": 1, "extension": os.path.splitext(name)[1]}
+                for name in NAMES]
+    return {"type": "folder", "name": "in", "path": "/in", "children": children}
+
+
+def _by_name(proposals):
+    return {(p["type"], extraction_name(p)): p for p in proposals}
+
+
+def _map(generator, rules):
+    profile = {"name": PROFILE, "rules": rules}
+    return generator.generate_mappings(_tree(), profile, "/out"), generator.pattern_set, generator.get_rule_index(profile)
+
+
+def _check_remap(config, new_patterns, new_rules):
+    config_dir, patterns, rules, generator = config
+    proposals, old_pattern_set, old_rule_index = _map(generator, rules)
+    before = copy.deepcopy(proposals)
+    if new_patterns is not patterns:
+        _write_patterns(config_dir, new_patterns)
+        assert generator.reload_patterns()
+    fresh, new_pattern_set, new_rule_index = _map(generator, new_rules)
+    delta = remap_proposals(proposals, old_pattern_set, new_pattern_set, old_rule_index, new_rule_index, "/out")
+
+    remapped, expected = _by_name(proposals), _by_name(fresh)
+    assert remapped.keys() == expected.keys()
+    for key, proposal in remapped.items():
+        for field in ("targetPath", "tags", "status", "matched_rules"):
+            assert proposal[field] == expected[key][field], (key, field)
+    # Every proposal whose target moved is reported
+    changed = {key for key, proposal in _by_name(before).items() if proposal["targetPath"] != expected[key]["targetPath"]}
+    assert changed
+    assert {(p["type"], extraction_name(p)) for p in delta["updated"]} >= changed
+    return delta
+
+
+def test_pattern_change_matches_fresh_map(config):
+    _, patterns, rules, _ = config
+    new_patterns = dict(patterns, shotPatterns=patterns["shotPatterns"] + [r"EP\d{2}"])
+    delta = _check_remap(config, new_patterns, rules)
+    assert delta["changed_categories"] == ["shot"]
+    assert not delta["rules_changed"]
+    assert len(delta["updated"]) == 2  # only the EP files got a shot
+
+
+def test_rule_change_matches_fresh_map(config):
+    _, patterns, rules, _ = config
+    # hero renders get their own folder, ahead of 3D/Renders
+    new_rules = [{"Assets/Hero": ["hero"]}] + [{path: [k for k in keywords if k != "hero"]} for rule in rules for path, keywords in rule.items()]
+    delta = _check_remap(config, patterns, new_rules)
+    assert delta["changed_categories"] == []
+    assert delta["rules_changed"]
+    assert len(delta["updated"]) == 2
+
+
+def test_no_change_updates_nothing(config):
+    _, patterns, rules, generator = config
+    proposals, pattern_set, rule_index = _map(generator, rules)
+    delta = remap_proposals(proposals, pattern_set, PatternSet.from_config(patterns), rule_index, rule_index, "/out")
+    assert delta["updated"] == []
+    assert delta["checked"] == 0
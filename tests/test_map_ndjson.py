@@ -0,0 +1,110 @@
+import io
+import json
+
+import pytest
+
+from python.mapping_utils import stream_mappings
+from python.mapping_utils.frame_ranges import as_sequence_files
+from python.normalizer import run_map_command
+
+PROFILE = "Simple Project"
+
+
+def _frames(shot, count=5):
+    return [f"/in/{shot}/{shot}_comp_v001.{frame:04d}.exr" for frame in range(1001, 1001 + count)]
+
+
+def _run(lines):
+    output = io.StringIO()
+    run_map_command(io.StringIO("".join(line + "\n" for line in lines)), output)
+    # Every stdout line is one JSON object
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def _header(**extra):
+    return json.dumps(dict({"profile_name": PROFILE, "root_output_dir": "/out", "batchId": "map-test"}, **extra))
+
+
+def _check_events(events, sequences, files):
+    assert events[0]["event"] == "start" and events[0]["success"]
+    assert events[-1]["event"] == "summary" and events[-1]["success"]
+    proposals = events[1:-1]
+    assert all("event" not in proposal for proposal in proposals)
+    assert events[-1]["sequences"] == sequences
+    assert events[-1]["files"] == files
+    assert events[-1]["total"] == len(proposals)
+    return proposals
+
+
+@pytest.mark.parametrize("external_grouping", [False, True])
+def test_ndjson_records(external_grouping):
+    # SH010 and SH020 frames interleave; the plate arrives between them
+    records = [path for pair in zip(_frames("SH010"), _frames("SH020")) for path in pair]
+    records.insert(3, "/in/SH010/SH010_plate.mov")
+    events = _run([_header(external_grouping=external_grouping)] + [json.dumps(record) for record in records])
+    proposals = _check_events(events, sequences=2, files=1)
+
+    sequences = {p["targetPath"]: p for p in proposals if p["type"] == "sequence"}
+    assert sorted(sequences) == [
+        "/out/Video/Footage/SH010/comp/v001/SH010_comp_v001.####.exr",
+        "/out/Video/Footage/SH020/comp/v001/SH020_comp_v001.####.exr",
+    ]
+    for target, proposal in sequences.items():
+        shot = target.split("/")[4]
+        # The compact frame list survives the JSON round trip
+        assert list(as_sequence_files(proposal["sequence_info"]["files"])) == _frames(shot)
+
+
+def test_tree_document():
+    children = [{"name": path.rsplit("/", 1)[-1], "path": path, "type": "file", "size": 1, "extension": ".exr"}
+                for path in _frames("SH010")]
+    tree = {"type": "folder", "name": "in", "path": "/in", "children": [
+        {"type": "folder", "name": "SH010", "path": "/in/SH010", "children": children}]}
+    events = _run([json.dumps({"tree": tree, "profile_name": PROFILE, "root_output_dir": "/out"})])
+    proposals = _check_events(events, sequences=1, files=0)
+    assert proposals[0]["sequence_info"]["frame_count"] == 5
+
+
+@pytest.fixture
+def external_runs(monkeypatch):
+    """Counts the map runs that grouped sequences out of core."""
+    calls = []
+    group = stream_mappings.iter_group_image_sequences_external
+
+    def counting_group(*args, **kwargs):
+        calls.append(None)
+        return group(*args, **kwargs)
+
+    monkeypatch.setattr(stream_mappings, "iter_group_image_sequences_external", counting_group)
+    return calls
+
+
+def _tree_document(**extra):
+    children = [{"name": path.rsplit("/", 1)[-1], "path": path, "type": "file", "size": 1, "extension": ".exr"}
+                for path in _frames("SH010")]
+    tree = {"type": "folder", "name": "SH010", "path": "/in/SH010", "children": children}
+    return json.dumps(dict({"tree": tree, "profile_name": PROFILE, "root_output_dir": "/out"}, **extra))
+
+
+@pytest.mark.parametrize("min_files, external", [(5, True), (6, False), (0, False)])
+def test_tree_external_grouping_threshold(external_runs, min_files, external):
+    events = _run([_tree_document(external_grouping_min_files=min_files)])
+    proposals = _check_events(events, sequences=1, files=0)
+    assert proposals[0]["sequence_info"]["frame_count"] == 5
+    assert bool(external_runs) == external
+
+
+@pytest.mark.parametrize("file_count, external", [(5, True), (4, False), (None, False)])
+def test_ndjson_external_grouping_threshold(external_runs, file_count, external):
+    header = {"external_grouping_min_files": 5}
+    if file_count is not None:
+        header["file_count"] = file_count
+    events = _run([_header(**header)] + [json.dumps(path) for path in _frames("SH010")])
+    _check_events(events, sequences=1, files=0)
+    assert bool(external_runs) == external
+
+
+def test_missing_profile_is_an_error_event():
+    events = _run([json.dumps({"root_output_dir": "/out"}), json.dumps("/in/a.mov")])
+    assert len(events) == 1
+    assert events[0]["event"] == "error" and not events[0]["success"]
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from python.file_operations_utils import parallel_copy
+from python.file_operations_utils.checksums import hash_file
+from python.file_operations_utils.parallel_copy import RangeCopyError, parallel_copy_file
+from python.file_operations_utils.transfer_engine import TransferCancelled
+
+MB = 1024 * 1024
+
+
+def _source(tmp_path, size, name="src.bin"):
+    path = tmp_path / name
+    path.write_bytes(os.urandom(size))
+    return str(path)
+
+
+def _failing_range(monkeypatch, offset):
+    # Fail every attempt of the range at offset, pass the rest through
+    copy_range = parallel_copy.copy_range
+
+    def flaky(src_fd, dst_fd, range_offset, *args, **kwargs):
+        if range_offset == offset:
+            raise OSError("injected range failure")
+        return copy_range(src_fd, dst_fd, range_offset, *args, **kwargs)
+
+    monkeypatch.setattr(parallel_copy, "copy_range", flaky)
+
+
+@pytest.mark.parametrize("size", [0, 1, MB - 1, 5 * MB + 12345])
+@pytest.mark.parametrize("engine", [None, "readinto"])
+def test_bytes_identical(tmp_path, size, engine):
+    src = _source(tmp_path, size)
+    dst = str(tmp_path / "dst.bin")
+    result = parallel_copy_file(src, dst, max_workers=4, range_size=MB, engine=engine)
+    with open(src, "rb") as a, open(dst, "rb") as b:
+        assert a.read() == b.read()
+    assert result["bytes"] == size
+    assert result["ranges"] == -(-size // MB)
+
+
+def test_checksum_matches_hash_file(tmp_path):
+    src = _source(tmp_path, 3 * MB + 7)
+    result = parallel_copy_file(src, str(tmp_path / "dst.bin"), max_workers=4, range_size=MB, checksum="blake2b")
+    assert result["digest"] == hash_file(src, "blake2b", range_size=MB)
+
+
+def test_cancel_removes_destination(tmp_path):
+    src = _source(tmp_path, 4 * MB)
+    dst = str(tmp_path / "dst.bin")
+    with pytest.raises(TransferCancelled):
+        parallel_copy_file(src, dst, max_workers=2, range_size=MB, chunk_size=64 * 1024, cancel_check=lambda: True)
+    assert not os.path.exists(dst)
+
+
+def test_failed_range_is_retried_and_destination_kept(tmp_path, monkeypatch):
+    src = _source(tmp_path, 4 * MB)
+    dst = str(tmp_path / "dst.bin")
+    _failing_range(monkeypatch, 2 * MB)
+    offsets = []
+    with pytest.raises(RangeCopyError) as error:
+        parallel_copy_file(src, dst, max_workers=4, range_size=MB, max_retries=1, offset_callback=offsets.append)
+    failed = [entry for entry in error.value.ranges if not entry["done"]]
+    assert [entry["offset"] for entry in failed] == [2 * MB]
+    assert failed[0]["attempts"] == 2
+    # Kept for a retry or resume, with the verified offset stopping at the failed range
+    assert os.path.getsize(dst) == 4 * MB
+    assert offsets[-1] == 2 * MB
+
+
+def test_resume_copies_only_the_rest(tmp_path, monkeypatch):
+    src = _source(tmp_path, 4 * MB + 100)
+    dst = str(tmp_path / "dst.bin")
+    _failing_range(monkeypatch, 3 * MB)
+    offsets = []
+    with pytest.raises(RangeCopyError):
+        parallel_copy_file(src, dst, max_workers=1, range_size=MB, max_retries=0, offset_callback=offsets.append)
+    monkeypatch.undo()
+
+    copied_offsets = []
+    copy_range = parallel_copy.copy_range
+
+    def recording(src_fd, dst_fd, offset, *args, **kwargs):
+        copied_offsets.append(offset)
+        return copy_range(src_fd, dst_fd, offset, *args, **kwargs)
+
+    monkeypatch.setattr(parallel_copy, "copy_range", recording)
+    result = parallel_copy_file(src, dst, max_workers=2, range_size=MB, resume_offset=offsets[-1], checksum="blake2b")
+    assert result["resumed_bytes"] == 3 * MB
+    assert sorted(copied_offsets) == [3 * MB, 4 * MB]
+    with open(src, "rb") as a, open(dst, "rb") as b:
+        assert a.read() == b.read()
+    # Resumed ranges are hashed from the source, so the digest is the full file's
+    assert result["digest"] == hash_file(src, "blake2b", range_size=MB)
+
+
+def test_resume_offset_ignored_for_a_different_file(tmp_path):
+    src = _source(tmp_path, 2 * MB)
+    dst = tmp_path / "dst.bin"
+    dst.write_bytes(b"stale")
+    result = parallel_copy_file(src, str(dst), max_workers=2, range_size=MB, resume_offset=MB)
+    assert result["resumed_bytes"] == 0
+    assert dst.read_bytes() == open(src, "rb").read()
@@ -0,0 +1,69 @@
+import itertools
+import json
+import os
+
+import pytest
+
+from legacy_reference import baseline_generate_simple_target_path
+from python.mapping_utils.generate_simple_target_path import generate_simple_target_path
+from python.mapping_utils.profile_rule_index import ProfileRuleIndex
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "profiles.json")
+
+SYNTHETIC_RULES = {
+    # Task and asset keywords, substrings shared across paths (ambiguity), an exact footage rule
+    "exact_footage": [
+        {"3D/Renders": ["beauty", "rgb", "Light"]},
+        {"Comp": ["comp", "precomp", "light_wrap"]},
+        {"Footage": ["footage", "video", "source", "plate", "plates"]},
+        {"Assets": ["hero", "prop"]},
+    ],
+    # Only a partial footage rule: the second fallback
+    "partial_footage": [
+        {"Renders": ["beauty"]},
+        {"Plates": ["plate", "scan"]},
+    ],
+    # No footage rule at all: unmapped_footage
+    "no_footage": [
+        {"Renders": ["beauty", "spec"]},
+        {"Comp": ["comp"]},
+    ],
+}
+
+TASKS = [None, "", "beauty", "BEAUTY", "comp", "light", "lightwrap", "precomp_light", "unknown", "beautyspec"]
+ASSETS = [None, "hero", "HERO", "heroprop", "plate", "nothing"]
+SHOTS = [None, "SH010", "sh020"]
+OTHERS = [(None, None, None), ("Layout", "v001", "4k"), ("", "V002", "hd")]
+
+
+def _rule_sets():
+    with open(PROFILES_PATH, "r", encoding="utf-8") as f:
+        profiles = json.load(f)
+    rule_sets = dict(SYNTHETIC_RULES)
+    rule_sets.update({name: rules for name, rules in profiles.items() if isinstance(rules, list)})
+    return rule_sets
+
+
+@pytest.mark.parametrize("rules_name, rules", sorted(_rule_sets().items()))
+def test_matches_baseline(rules_name, rules):
+    rule_index = ProfileRuleIndex(rules)
+    for task, asset, shot, (stage, version, resolution) in itertools.product(TASKS, ASSETS, SHOTS, OTHERS):
+        args = ("/out", rules, "plate.1001.exr", shot, task, asset, stage, version, resolution)
+        expected = baseline_generate_simple_target_path(*args)
+        # Once with the shared (memoizing) index, once built on the fly
+        for result in (generate_simple_target_path(*args, rule_index=rule_index), generate_simple_target_path(*args)):
+            result = {key: result[key] for key in expected}
+            assert result == expected, (task, asset, shot, stage, version, resolution)
+
+
+def test_ambiguous_options_are_not_shared():
+    rule_index = ProfileRuleIndex(SYNTHETIC_RULES["exact_footage"])
+    first = rule_index.resolve("/out", "a.exr", "SH010", "precomp_light", None, None, None, None)
+    assert first["ambiguous_match"] and first["ambiguous_options"]
+    expected = [dict(option) for option in first["ambiguous_options"]]
+    # One consumer editing its proposal's options doesn't change the next proposal's, or the cache
+    first["ambiguous_options"][0]["path"] = "edited"
+    first["ambiguous_options"].clear()
+    second = rule_index.resolve("/out", "b.exr", "SH010", "precomp_light", None, None, None, None)
+    assert second["ambiguous_options"] == expected
+    assert list(rule_index.choose_base_path("precomp_light", None)[3]) == expected
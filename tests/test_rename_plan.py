@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+import pytest
+
+from python.file_operations_utils import rename_plan
+from python.file_operations_utils.rename_plan import rename_files, split_by_device
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(os.path.basename(path))
+
+
+def test_split_by_device_same_volume(tmp_path):
+    src = str(tmp_path / "src" / "a.exr")
+    _touch(src)
+    # The destination folder doesn't exist yet: its nearest existing ancestor is compared
+    tasks = [(src, str(tmp_path / "dst" / "new" / "a.exr"), 1)]
+    same_volume, cross_device = split_by_device(tasks)
+    assert same_volume == tasks
+    assert cross_device == []
+
+
+def test_split_by_device_cross_device(tmp_path):
+    if not os.path.isdir("/dev/shm") or os.stat("/dev/shm").st_dev == os.stat(str(tmp_path)).st_dev:
+        pytest.skip("needs /dev/shm on a different device than the temp dir")
+    src = str(tmp_path / "src" / "a.exr")
+    _touch(src)
+    with tempfile.TemporaryDirectory(dir="/dev/shm") as other:
+        local = (src, str(tmp_path / "dst" / "a.exr"))
+        remote = (src, os.path.join(other, "a.exr"))
+        same_volume, cross_device = split_by_device([local, remote])
+    assert same_volume == [local]
+    assert cross_device == [remote]
+
+
+def test_rename_files(tmp_path):
+    pairs = []
+    for i in range(200):
+        src = str(tmp_path / "src" / f"f{i:04d}.exr")
+        _touch(src)
+        pairs.append((src, str(tmp_path / "dst" / f"f{i:04d}.exr")))
+    os.makedirs(str(tmp_path / "dst"))
+    # Missing sources fail by index without stopping the others
+    os.remove(pairs[5][0])
+    os.remove(pairs[150][0])
+    renamed = []
+
+    result = rename_files(pairs, max_workers=4, on_renamed=renamed.append)
+    assert result["renamed"] == 198
+    assert sorted(result["failed"]) == [5, 150]
+    assert all(isinstance(e, FileNotFoundError) for e in result["failed"].values())
+    assert not result["cancelled"]
+    assert sorted(renamed) == [i for i in range(200) if i not in (5, 150)]
+    assert all(os.path.exists(dst) for i, (_, dst) in enumerate(pairs) if i not in (5, 150))
+
+
+def test_rename_files_cancel(tmp_path, monkeypatch):
+    monkeypatch.setattr(rename_plan, "RENAME_CHUNK", 10)
+    pairs = []
+    for i in range(50):
+        src = str(tmp_path / f"f{i:02d}.exr")
+        _touch(src)
+        pairs.append((src, src + ".moved"))
+    checks = []
+
+    def cancel_check():
+        checks.append(None)
+        return len(checks) > 2
+
+    result = rename_files(pairs, max_workers=1, cancel_check=cancel_check)
+    assert result["cancelled"]
+    assert result["renamed"] == 20
+    # Unclaimed pairs are left alone
+    assert all(os.path.exists(src) for src, _ in pairs[20:])
+
+
+def test_rename_files_empty():
+    result = rename_files([])
+    assert result["renamed"] == 0
+    assert result["failed"] == {}
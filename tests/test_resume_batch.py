@@ -0,0 +1,71 @@
+import os
+
+from python.file_operations_utils.transfer_journal import STATUS_DONE, STATUS_IN_PROGRESS, STATUS_PLANNED
+
+
+def _make_files(directory, names):
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name in names:
+        path = os.path.join(directory, name)
+        with open(path, "w") as f:
+            f.write(f"original {name}")
+        paths.append(path)
+    return paths
+
+
+def _mappings(sources, target_dir):
+    return [{"id": str(i), "type": "file", "sourcePath": src, "targetPath": os.path.join(target_dir, os.path.basename(src))}
+            for i, src in enumerate(sources)]
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_resume_skips_done_files(file_operations, tmp_path):
+    sources = _make_files(str(tmp_path / "src"), ["a.txt", "b.txt", "c.txt", "d.txt"])
+    target_dir = str(tmp_path / "dst")
+    mappings = _mappings(sources, target_dir)
+    result = file_operations.apply_mappings_multithreaded(mappings, operation_type="copy", batch_id="resume-copy")
+    assert result["success_count"] == 4
+
+    # Simulate a crash: c and d never finished, and the sources changed since
+    journal = file_operations.journal
+    for mapping in mappings[2:]:
+        os.remove(mapping["targetPath"])
+        journal.record("resume-copy", mapping["targetPath"], STATUS_PLANNED if mapping["id"] == "2" else STATUS_IN_PROGRESS)
+    journal.finish_batch("resume-copy", "running")
+    for src in sources:
+        with open(src, "w") as f:
+            f.write("changed")
+
+    result = file_operations.resume_batch("resume-copy")
+    assert result["resumed"]["files_done"] == 2
+    assert result["resumed"]["files_remaining"] == 2
+    # Done files were not copied again; the rest were
+    assert [_read(m["targetPath"]) for m in mappings] == ["original a.txt", "original b.txt", "changed", "changed"]
+    statuses = {f["destination"]: f["status"] for f in journal.load_batch("resume-copy")["files"]}
+    assert set(statuses.values()) == {STATUS_DONE}
+
+
+def test_resume_counts_moves_that_ran_ahead_of_the_journal(file_operations, tmp_path):
+    sources = _make_files(str(tmp_path / "src"), ["a.txt", "b.txt"])
+    target_dir = str(tmp_path / "dst")
+    mappings = _mappings(sources, target_dir)
+    file_operations._begin_journal("resume-move", "move", [(m["sourcePath"], m["targetPath"], None) for m in mappings], {})
+    # a was moved just before the crash, its journal row still says planned
+    os.makedirs(target_dir)
+    os.rename(sources[0], mappings[0]["targetPath"])
+
+    result = file_operations.resume_batch("resume-move")
+    assert result["resumed"]["files_done"] == 1
+    assert result["resumed"]["files_remaining"] == 1
+    assert not any(os.path.exists(src) for src in sources)
+    assert [_read(m["targetPath"]) for m in mappings] == ["original a.txt", "original b.txt"]
+
+
+def test_resume_unknown_batch(file_operations):
+    result = file_operations.resume_batch("no-such-batch")
+    assert not result["success"]
@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+import pytest
+
+
+def _make_tree(root, names):
+    sources = []
+    for name in names:
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(name.encode() * 100)
+        sources.append(path)
+    return sources
+
+
+def _move_then_undo(file_operations, sources, target_dir, batch_id):
+    mappings = [{"id": str(i), "type": "file", "sourcePath": src, "targetPath": os.path.join(target_dir, f"{i}_{os.path.basename(src)}")}
+                for i, src in enumerate(sources)]
+    contents = {}
+    for src in sources:
+        with open(src, "rb") as f:
+            contents[src] = f.read()
+    result = file_operations.apply_mappings_multithreaded(mappings, operation_type="move", batch_id=batch_id)
+    assert result["success_count"] == len(sources)
+    assert not any(os.path.exists(src) for src in sources)
+
+    undo = file_operations.undo_batch(batch_id)
+    assert undo["success"], undo["failed"]
+    assert undo["success_count"] == len(sources)
+    assert not any(os.path.exists(m["targetPath"]) for m in mappings)
+    for src in sources:
+        with open(src, "rb") as f:
+            assert f.read() == contents[src]
+    return undo
+
+
+def test_move_undo_round_trip(file_operations, tmp_path):
+    # The move emptied shot folders; undo recreates them
+    sources = _make_tree(str(tmp_path / "src"), ["sh010/a.exr", "sh010/b.exr", "sh020/c.exr"])
+    undo = _move_then_undo(file_operations, sources, str(tmp_path / "dst"), "undo-same")
+    assert undo["renamed"] == 3
+    assert undo["copied_back"] == 0
+
+
+def test_move_undo_round_trip_across_devices(file_operations, tmp_path):
+    if not os.path.isdir("/dev/shm") or os.stat("/dev/shm").st_dev == os.stat(str(tmp_path)).st_dev:
+        pytest.skip("needs /dev/shm on a different device than the temp dir")
+    with tempfile.TemporaryDirectory(dir="/dev/shm") as target_dir:
+        sources = _make_tree(str(tmp_path / "src"), ["a.exr", "b.exr"])
+        undo = _move_then_undo(file_operations, sources, target_dir, "undo-cross")
+        assert undo["copied_back"] == 2
+
+
+def test_undo_leaves_retaken_sources(file_operations, tmp_path):
+    sources = _make_tree(str(tmp_path / "src"), ["a.exr", "b.exr"])
+    target = str(tmp_path / "dst" / "a.exr")
+    mappings = [{"id": "0", "type": "file", "sourcePath": sources[0], "targetPath": target}]
+    file_operations.apply_mappings_multithreaded(mappings, operation_type="move", batch_id="undo-taken")
+    with open(sources[0], "w") as f:
+        f.write("new file")
+
+    undo = file_operations.undo_batch("undo-taken")
+    assert not undo["success"]
+    assert undo["error_count"] == 1
+    assert os.path.exists(target)
+    with open(sources[0]) as f:
+        assert f.read() == "new file"
+
+
+def test_undo_last_batch(file_operations, tmp_path):
+    sources = _make_tree(str(tmp_path / "src"), ["a.exr"])
+    _move_then_undo(file_operations, sources, str(tmp_path / "dst"), "undo-first")
+    # An undone batch is not undone twice
+    assert not file_operations.undo_last_batch()["success"]
+
+
+def test_resume_refuses_undone_batch(file_operations, tmp_path):
+    sources = _make_tree(str(tmp_path / "src"), ["a.exr", "b.exr", "c.exr"])
+    _move_then_undo(file_operations, sources, str(tmp_path / "dst"), "undo-resume")
+
+    result = file_operations.resume_batch("undo-resume")
+    assert not result["success"]
+    assert "undone" in result["error"]
+    assert all(os.path.exists(src) for src in sources)
+
+
+def test_resume_skips_undone_files(file_operations, tmp_path):
+    sources = _make_tree(str(tmp_path / "src"), ["a.exr", "b.exr"])
+    target_dir = str(tmp_path / "dst")
+    mappings = [{"id": str(i), "type": "file", "sourcePath": src, "targetPath": os.path.join(target_dir, os.path.basename(src))}
+                for i, src in enumerate(sources)]
+    file_operations.apply_mappings_multithreaded(mappings, operation_type="move", batch_id="undo-partial")
+    file_operations.undo_batch("undo-partial")
+    # The batch was resumable again (e.g. reopened by hand): its undone files still stay put
+    file_operations.journal.finish_batch("undo-partial", "cancelled")
+
+    result = file_operations.resume_batch("undo-partial")
+    assert result["resumed"]["files_remaining"] == 0
+    assert all(os.path.exists(src) for src in sources)